@@ -0,0 +1,121 @@
+#Alocação global tarefas -> colaboradores com limite de carga
+#Em vez de dar a cada tarefa o melhor do ranking (o mesmo colaborador para todas), resolve uma
+#atribuição de custo mínimo: cada colaborador tem "vagas" de acordo com a carga atual, e cada vaga
+#extra vale menos, porque a dimensão de carga cai à medida que ele recebe tarefas.
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+# Quanto cada tarefa soma na carga do colaborador (pontos percentuais) e o teto de carga aceito
+CARGA_POR_TAREFA = 20.0
+LIMITE_CARGA = 100.0
+
+
+def capacidades(carga_percent, carga_por_tarefa=CARGA_POR_TAREFA, limite=LIMITE_CARGA):
+    """Quantas tarefas cada colaborador ainda pode receber sem passar do limite de carga."""
+    livre = (limite - np.asarray(carga_percent, dtype=np.float64)) / carga_por_tarefa
+    return np.maximum(np.floor(livre + 1e-9), 0).astype(np.int64)
+
+
+def _candidatos(motor, tarefas, pesos, capacidade, m):
+    """Os `m` melhores colaboradores (com vaga) de cada tarefa e seus scores, bloco a bloco."""
+    m = min(m, int((capacidade > 0).sum()))
+    cand = np.empty((len(tarefas), m), dtype=np.int64)
+    scores = np.empty((len(tarefas), m))
+    if m == 0:
+        return cand, scores
+    for inicio, _, final in motor.blocos_lote(tarefas, pesos):
+        final[:, capacidade == 0] = -np.inf
+        topo = np.argpartition(-final, m - 1, axis=1)[:, :m]
+        cand[inicio:inicio + len(final)] = topo
+        scores[inicio:inicio + len(final)] = np.take_along_axis(final, topo, axis=1)
+    return cand, scores
+
+
+def alocar(motor, tarefas, pesos, carga_por_tarefa=CARGA_POR_TAREFA, limite=LIMITE_CARGA,
+           max_candidatos=None):
+    """
+    Atribuição ótima (soma de scores máxima) de cada tarefa a um colaborador, respeitando a capacidade.
+    A k-ésima tarefa de um colaborador é pontuada com a carga já acrescida das k-1 anteriores.
+
+    Só entram no grafo os `max_candidatos` melhores de cada tarefa (padrão: nº de tarefas). Com esse
+    padrão o resultado é exato: se a tarefa ficasse com alguém fora do seu top-T, algum dos T estaria
+    sem nenhuma tarefa e a troca não pioraria o total.
+
+    Retorna (DataFrame da alocação, carga final em % de cada colaborador). Tarefas sem vaga ficam
+    com Nome vazio. O motor não é alterado: a nova carga entra pelo livro de carga (ia_core_aws.alocar_tarefas).
+    """
+    n_tarefas = len(tarefas)
+    carga_atual = motor.perfis.carga.astype(np.float64)
+    capacidade = capacidades(carga_atual, carga_por_tarefa, limite)
+    cand, scores = _candidatos(motor, tarefas, pesos, capacidade, max_candidatos or n_tarefas)
+
+    # Vagas: colaborador i (dentre os candidatos) ocupa as colunas inicio[i] .. inicio[i] + capacidade[i] - 1
+    usados = np.unique(cand)
+    vagas = capacidade[usados]
+    coluna_inicial = np.zeros(len(motor), dtype=np.int64)
+    coluna_inicial[usados] = np.concatenate([[0], np.cumsum(vagas)[:-1]]) if len(usados) else []
+    n_vagas = int(vagas.sum())
+
+    # Uma aresta por (tarefa, vaga de cada candidato); a vaga j perde carga_por_tarefa * j pontos de carga
+    por_par = capacidade[cand].ravel()
+    linhas = np.repeat(np.repeat(np.arange(n_tarefas), cand.shape[1]), por_par)
+    colab = np.repeat(cand.ravel(), por_par)
+    j = np.arange(int(por_par.sum())) - np.repeat(np.cumsum(por_par) - por_par, por_par)
+    valor = np.repeat(scores.ravel(), por_par) - pesos['carga'] * j * carga_por_tarefa / 100.0
+    colunas = coluna_inicial[colab] + j
+
+    # Vaga fictícia por tarefa ("sem alocação"), cara o bastante para só ser usada sem alternativa
+    custo = (valor.max() if len(valor) else 0.0) + 1.0 - valor
+    custo_ficticio = n_tarefas * (custo.max() if len(custo) else 1.0) + 1.0
+    grafo = sparse.csr_matrix(
+        (np.concatenate([custo, np.full(n_tarefas, custo_ficticio)]),
+         (np.concatenate([linhas, np.arange(n_tarefas)]), np.concatenate([colunas, n_vagas + np.arange(n_tarefas)]))),
+        shape=(n_tarefas, n_vagas + n_tarefas))
+    _, coluna_de = min_weight_full_bipartite_matching(grafo)
+
+    # Traduz vaga -> colaborador; o score de cada tarefa usa a carga do colaborador no momento em que ela entra
+    dono = np.repeat(usados, vagas)
+    destino = [int(dono[c]) if c < n_vagas else -1 for c in coluna_de]
+    base = [float(scores[t, np.flatnonzero(cand[t] == i)[0]]) if i >= 0 else np.nan for t, i in enumerate(destino)]
+    return _resultado(motor, tarefas, pesos, destino, base, carga_atual, carga_por_tarefa)
+
+
+def alocar_guloso(motor, tarefas, pesos, carga_por_tarefa=CARGA_POR_TAREFA, limite=LIMITE_CARGA):
+    """
+    Referência sequencial: cada tarefa, na ordem, fica com o 1º do ranking considerando a carga
+    já acrescida pelas tarefas anteriores. Mesmo formato de retorno de `alocar`.
+    """
+    carga_atual = motor.perfis.carga.astype(np.float64)
+    capacidade = capacidades(carga_atual, carga_por_tarefa, limite)
+    extra = np.zeros(len(motor))
+    destino, base = [], []
+    for _, _, final in motor.blocos_lote(tarefas, pesos):
+        for linha in final:
+            linha = linha - pesos['carga'] * extra / 100.0
+            linha[capacidade == 0] = -np.inf
+            i = int(np.argmax(linha)) if (capacidade > 0).any() else -1
+            destino.append(i)
+            base.append(float(linha[i] + pesos['carga'] * extra[i] / 100.0) if i >= 0 else np.nan)
+            if i >= 0:
+                capacidade[i] -= 1
+                extra[i] += carga_por_tarefa
+    return _resultado(motor, tarefas, pesos, destino, base, carga_atual, carga_por_tarefa)
+
+
+def _resultado(motor, tarefas, pesos, destino, base, carga_atual, carga_por_tarefa):
+    """Monta o DataFrame da alocação e a carga final, somando a carga tarefa a tarefa."""
+    carga_final = carga_atual.copy()
+    linhas = []
+    for t, (i, score) in enumerate(zip(destino, base)):
+        linha = {'Tarefa': tarefas[t].get('nome', t), 'Colaborador': None, 'Nome': None,
+                 'Score Final': np.nan, 'Carga Antes': np.nan, 'Carga Depois': np.nan}
+        if i >= 0:
+            antes = carga_final[i]
+            carga_final[i] += carga_por_tarefa
+            linha.update({'Colaborador': int(motor.ids[i]), 'Nome': motor.nomes[i],
+                          'Score Final': score - pesos['carga'] * (antes - carga_atual[i]) / 100.0,
+                          'Carga Antes': antes, 'Carga Depois': carga_final[i]})
+        linhas.append(linha)
+    return pd.DataFrame(linhas), carga_final
@@ -1,141 +1,223 @@
-#Front end do projeto, aplicação no streamlit para rodar em núvem, parte visaual do projeto
-import streamlit as st
-import pandas as pd
-import time
-from ia_core_aws import fetch_colaboradores_data, recomendar
-
-#Configuração_pagina
-st.set_page_config(
-    page_title="EquilibraAI",
-    page_icon="⚖️",
-    layout="wide"
-)
-
-#Cabeçalho
-st.title("⚖️ EquilibraAI")
-st.markdown("### Sistema Inteligente de Alocação de Talentos")
-st.markdown("---")
-
-# Sidebar
-with st.sidebar:
-    st.header("⚙️ Configuração da IA")
-    st.info("Ajuste os pesos para o algoritmo de recomendação.")
-    
-    p_hard = st.slider("Peso: Hard Skills", 0.0, 1.0, 0.4, 0.05)
-    p_soft = st.slider("Peso: Soft Skills", 0.0, 1.0, 0.1, 0.05)
-    p_sen = st.slider("Peso: Senioridade", 0.0, 1.0, 0.25, 0.05)
-    p_carga = st.slider("Peso: Carga Atual", 0.0, 1.0, 0.15, 0.05)
-    p_asp = st.slider("Peso: Aspiração (IA)", 0.0, 1.0, 0.1, 0.05)
-    
-    pesos = {
-        'hard': p_hard,
-        'soft': p_soft,
-        'sen': p_sen,
-        'carga': p_carga,
-        'asp': p_asp
-    }
-    
-    # Virificação de soma dos pesos
-    soma = sum(pesos.values())
-    if soma != 1.0:
-        st.warning(f"⚠️ A soma dos pesos é {soma:.2f}. O ideal é 1.0.")
-    else:
-        st.success("Pesos balanceados corretamente (100%).")
-    
-    if st.button("🔄 Recarregar Dados da Nuvem"):
-        st.cache_data.clear()
-        st.rerun()
-
-# Corpo principal
-
-# 1. Carregar Dados
-@st.cache_data
-def carregar_dados():
-    return fetch_colaboradores_data()
-
-with st.spinner('Conectando ao AWS RDS e carregando colaboradores...'):
-    try:
-        df_colabs = carregar_dados()
-        if df_colabs.empty:
-            st.error("Nenhum colaborador encontrado no banco de dados.")
-            st.stop()
-    except Exception as e:
-        st.error(f"Erro ao conectar na AWS: {e}")
-        st.stop()
-
-# 2. Formulário de Nova Tarefa
-col1, col2 = st.columns([1, 2])
-
-with col1:
-    st.subheader("📝 Nova Demanda")
-    
-    nome_tarefa = st.text_input("Título da Tarefa", "Desenvolver API de Pagamentos")
-    desc_tarefa = st.text_area("Descrição (para análise da IA)", "Criar uma API RESTful usando Python e Flask, com integração ao banco de dados SQL. Necessário foco em segurança.")
-    
-    senioridade = st.selectbox("Senioridade Necessária", ["Iniciante", "Intermediário", "Avançado", "Especialista"])
-    map_senioridade = {"Iniciante": 0.3, "Intermediário": 0.6, "Avançado": 0.8, "Especialista": 1.0}
-    
-    # Busca as skills únicas do DF para preencher o multiselect
-    todas_hard = sorted(list(set([skill for sublist in df_colabs['skills_hard'] for skill in sublist])))
-    todas_soft = sorted(list(set([skill for sublist in df_colabs['skills_soft'] for skill in sublist])))
-    #correção de problema para ver se a skill python existe na lista
-    default_hard = ['Python'] if 'Python' in todas_hard else []
-    
-    req_hard = st.multiselect("Hard Skills Obrigatórias", todas_hard, default=default_hard)
-    req_soft = st.multiselect("Soft Skills Desejadas", todas_soft)
-    
-    botao_recomendar = st.button("🔍 Buscar Melhores Talentos", type="primary")
-
-# 3. Resultados da Recomendação
-with col2:
-    st.subheader("🏆 Recomendações da IA")
-    
-    if botao_recomendar:
-        # Monta o dicionário da tarefa
-        tarefa = {
-            'nome': nome_tarefa,
-            'descricao': desc_tarefa,
-            'senioridade_peso_requerido': map_senioridade[senioridade],
-            'skills_hard_requeridas': req_hard,
-            'skills_soft_requeridas': req_soft
-        }
-        
-        with st.spinner('A IA está analisando compatibilidade, carga e aspirações...'):
-            time.sleep(1) 
-            df_resultado = recomendar(tarefa, df_colabs, pesos)
-        
-        # Exibe os Top 5
-        if not df_resultado.empty:
-            top_5 = df_resultado.head(5)
-            
-            # Mostra métricas do Top 1
-            melhor_match = top_5.iloc[0]
-            st.markdown(f"### ✨ Melhor Match: **{melhor_match['Nome']}** (Score: {melhor_match['Score Final']:.3f})")
-            
-            # Gráfico de barras simples para os scores do Top 1
-            chart_data = pd.DataFrame({
-                'Critério': ['Hard Skills', 'Soft Skills', 'Senioridade', 'Carga (Disponibilidade)', 'Aspiração (IA)'],
-                'Score': [
-                    melhor_match['Hard'], 
-                    melhor_match['Soft'], 
-                    melhor_match['Sen'], 
-                    melhor_match['Carga'], 
-                    melhor_match['Aspiração']
-                ]
-            })
-            st.bar_chart(chart_data, x='Critério', y='Score')
-
-            # Tabela Detalhada
-            st.markdown("#### Ranking Detalhado")
-            st.dataframe(
-                top_5.style.background_gradient(subset=['Score Final'], cmap='Greens'),
-                use_container_width=True
-            )
-        else:
-            st.warning("Nenhum colaborador atende aos critérios mínimos.")
-    else:
-        st.info("👈 Preencha os dados da tarefa ao lado e clique em 'Buscar' para ver a mágica acontecer.")
-        
-        # Mostra uma visão geral da equipe enquanto não busca
-        st.markdown("#### Visão Geral da Equipe (Dados da AWS)")
-        st.dataframe(df_colabs[['id', 'nome', 'skills_hard', 'skills_soft']].head(10), use_container_width=True)
\ No newline at end of file
+#Front end do projeto, aplicação no streamlit para rodar em núvem, parte visaual do projeto
+import streamlit as st
+import pandas as pd
+from ia_core_aws import (carregar_base, atualizar_base, componentes_tarefa, reclassificar,
+                         iniciar_aquecimento_modelo, estado_modelo)
+from atualizacao_incremental import criar_ouvinte
+from telemetria import iniciar_exportacao, telemetria
+from cache_resultados import cache_resultados
+
+#Configuração_pagina
+st.set_page_config(
+    page_title="EquilibraAI",
+    page_icon="⚖️",
+    layout="wide"
+)
+
+# O BERT carrega numa thread em segundo plano enquanto a página já é exibida
+iniciar_aquecimento_modelo()
+
+# Colaboradores + matriz colaboradores x skill_id, montados uma vez e depois corrigidos no lugar pela atualização
+@st.cache_resource
+def carregar_dados():
+    return carregar_base()
+
+# Endpoint/arquivo do Prometheus (EQUILIBRAAI_METRICAS_PORTA / EQUILIBRAAI_METRICAS_ARQUIVO), uma vez por processo
+@st.cache_resource
+def exportacao_metricas():
+    return iniciar_exportacao()
+
+exportacao_metricas()
+
+# LISTEN no canal do change-log: avisa na barra lateral que há dados novos no banco (só no PostgreSQL configurado)
+@st.cache_resource
+def ouvinte_alteracoes():
+    return criar_ouvinte()
+
+#Cabeçalho
+st.title("⚖️ EquilibraAI")
+st.markdown("### Sistema Inteligente de Alocação de Talentos")
+st.markdown("---")
+
+# Sidebar
+with st.sidebar:
+    st.header("⚙️ Configuração da IA")
+    st.info("Ajuste os pesos para o algoritmo de recomendação.")
+    
+    p_hard = st.slider("Peso: Hard Skills", 0.0, 1.0, 0.4, 0.05)
+    p_soft = st.slider("Peso: Soft Skills", 0.0, 1.0, 0.1, 0.05)
+    p_sen = st.slider("Peso: Senioridade", 0.0, 1.0, 0.25, 0.05)
+    p_carga = st.slider("Peso: Carga Atual", 0.0, 1.0, 0.15, 0.05)
+    p_asp = st.slider("Peso: Aspiração (IA)", 0.0, 1.0, 0.1, 0.05)
+    
+    pesos = {
+        'hard': p_hard,
+        'soft': p_soft,
+        'sen': p_sen,
+        'carga': p_carga,
+        'asp': p_asp
+    }
+    
+    # Virificação de soma dos pesos
+    soma = sum(pesos.values())
+    if soma != 1.0:
+        st.warning(f"⚠️ A soma dos pesos é {soma:.2f}. O ideal é 1.0.")
+    else:
+        st.success("Pesos balanceados corretamente (100%).")
+    
+    # Estado do modelo de aspiração (carregado em segundo plano)
+    status_modelo = {
+        'nao_iniciado': "⏸️ Modelo de aspiração ainda não iniciado.",
+        'carregando': "⏳ Carregando modelo de aspiração (BERT)...",
+        'pronto': "🧠 Modelo de aspiração pronto.",
+        'indisponivel': "⚠️ Modelo de aspiração indisponível (aspiração = 0)."
+    }
+    st.caption(status_modelo[estado_modelo()])
+    
+    ouvinte = ouvinte_alteracoes()
+    if ouvinte.pendentes:
+        st.caption(f"🔔 {ouvinte.pendentes} alteração(ões) no banco desde a última atualização.")
+
+    if st.button("🔄 Recarregar Dados da Nuvem"):
+        # Só os colaboradores alterados desde a última leitura (change-log); sem o log, recarga completa
+        ouvinte.zerar()
+        st.session_state['ultima_atualizacao'] = atualizar_base(carregar_dados())
+        st.rerun()
+
+    resumo = st.session_state.get('ultima_atualizacao')
+    if resumo:
+        if resumo['completo']:
+            st.caption(f"Recarga completa: {resumo['linhas']} colaboradores ({resumo['segundos']:.2f}s).")
+        else:
+            st.caption(f"Atualização incremental: {resumo['alterados']} alterados, {resumo['novos']} novos, "
+                       f"{resumo['removidos']} removidos ({resumo['segundos']:.2f}s).")
+
+# Corpo principal
+
+# 1. Carregar Dados
+with st.spinner('Conectando ao AWS RDS e carregando colaboradores...'):
+    try:
+        base = carregar_dados()
+        # Motor e perfis da mesma versão (a atualização em segundo plano troca o motor inteiro)
+        motor = base.motor
+        if motor is None or motor.perfis.empty:
+            st.error("Nenhum colaborador encontrado no banco de dados.")
+            st.stop()
+    except Exception as e:
+        st.error(f"Erro ao conectar na AWS: {e}")
+        st.stop()
+
+if base.origem == 'snapshot':
+    st.sidebar.caption("⚡ Dados do snapshot local; conferindo com o banco em segundo plano...")
+
+# 2. Formulário de Nova Tarefa
+col1, col2 = st.columns([1, 2])
+
+with col1:
+    st.subheader("📝 Nova Demanda")
+    
+    nome_tarefa = st.text_input("Título da Tarefa", "Desenvolver API de Pagamentos")
+    desc_tarefa = st.text_area("Descrição (para análise da IA)", "Criar uma API RESTful usando Python e Flask, com integração ao banco de dados SQL. Necessário foco em segurança.")
+    
+    senioridade = st.selectbox("Senioridade Necessária", ["Iniciante", "Intermediário", "Avançado", "Especialista"])
+    map_senioridade = {"Iniciante": 0.3, "Intermediário": 0.6, "Avançado": 0.8, "Especialista": 1.0}
+    
+    # Busca as skills únicas dos perfis para preencher o multiselect
+    todas_hard = motor.perfis.nomes_skills('hard')
+    todas_soft = motor.perfis.nomes_skills('soft')
+    #correção de problema para ver se a skill python existe na lista
+    default_hard = ['Python'] if 'Python' in todas_hard else []
+    
+    req_hard = st.multiselect("Hard Skills Obrigatórias", todas_hard, default=default_hard)
+    req_soft = st.multiselect("Soft Skills Desejadas", todas_soft)
+    
+    botao_recomendar = st.button("🔍 Buscar Melhores Talentos", type="primary")
+
+# 3. Resultados da Recomendação
+with col2:
+    st.subheader("🏆 Recomendações da IA")
+    
+    if botao_recomendar:
+        # Monta o dicionário da tarefa
+        tarefa = {
+            'nome': nome_tarefa,
+            'descricao': desc_tarefa,
+            'senioridade_peso_requerido': map_senioridade[senioridade],
+            'skills_hard_requeridas': req_hard,
+            'skills_soft_requeridas': req_soft
+        }
+        
+        # Os 5 scores de todos os colaboradores ficam na sessão: mexer nos pesos depois só reordena
+        st.session_state['tarefa'] = tarefa
+        with st.spinner('A IA está analisando compatibilidade, carga e aspirações...'):
+            st.session_state['componentes'] = componentes_tarefa(tarefa, motor.perfis, motor=motor)
+    
+    componentes = st.session_state.get('componentes')
+    if componentes is not None and not componentes.valido_para(motor):
+        # Dados novos (recarga ou alocação): pontua a mesma demanda de novo
+        with st.spinner('Dados atualizados, recalculando a última demanda...'):
+            componentes = st.session_state['componentes'] = componentes_tarefa(st.session_state['tarefa'],
+                                                                               motor.perfis, motor=motor)
+    
+    if componentes is not None:
+        df_resultado = reclassificar(componentes, pesos, k=5)
+        if not componentes.com_aspiracao and pesos['asp'] > 0:
+            st.caption("⏳ Ranking sem a aspiração por enquanto: ela entra quando o modelo terminar de carregar.")
+        
+        # Exibe os Top 5
+        if not df_resultado.empty:
+            top_5 = df_resultado.head(5)
+            
+            # Mostra métricas do Top 1
+            melhor_match = top_5.iloc[0]
+            st.markdown(f"### ✨ Melhor Match: **{melhor_match['Nome']}** (Score: {melhor_match['Score Final']:.3f})")
+            
+            # Gráfico de barras simples para os scores do Top 1
+            chart_data = pd.DataFrame({
+                'Critério': ['Hard Skills', 'Soft Skills', 'Senioridade', 'Carga (Disponibilidade)', 'Aspiração (IA)'],
+                'Score': [
+                    melhor_match['Hard'], 
+                    melhor_match['Soft'], 
+                    melhor_match['Sen'], 
+                    melhor_match['Carga'], 
+                    melhor_match['Aspiração']
+                ]
+            })
+            st.bar_chart(chart_data, x='Critério', y='Score')
+
+            # Tabela Detalhada
+            st.markdown("#### Ranking Detalhado")
+            st.dataframe(
+                top_5.style.background_gradient(subset=['Score Final'], cmap='Greens'),
+                use_container_width=True
+            )
+            st.caption(f"Demanda \"{st.session_state['tarefa']['nome']}\": {len(motor)} colaboradores pontuados uma vez; "
+                       f"ajustar os pesos na barra lateral reordena na hora.")
+        else:
+            st.warning("Nenhum colaborador atende aos critérios mínimos.")
+    else:
+        st.info("👈 Preencha os dados da tarefa ao lado e clique em 'Buscar' para ver a mágica acontecer.")
+        
+        # Mostra uma visão geral da equipe enquanto não busca
+        st.markdown("#### Visão Geral da Equipe (Dados da AWS)")
+        visao = motor.perfis.para_dataframe(range(min(10, len(motor.perfis))))
+        st.dataframe(visao[['id', 'nome', 'carga_atual_percent', 'skills_hard', 'skills_soft']], use_container_width=True)
+
+# Cache de resultados compartilhado pelas sessões (buscas repetidas não recalculam)
+if cache_resultados.ativo:
+    cache = cache_resultados.estatisticas()
+    st.sidebar.caption(f"⚡ Cache de resultados: {cache['acertos']} acertos em {cache['acertos'] + cache['faltas']} "
+                       f"buscas, {cache['itens']} itens ({cache['bytes'] / 2**10:.0f} KB), {cache['despejos']} despejos.")
+
+# Painel opcional de telemetria (no fim do script, para já incluir os tempos desta execução)
+if telemetria.habilitada:
+    with st.sidebar.expander("⏱️ Tempos por etapa"):
+        tempos = telemetria.resumo()
+        if tempos:
+            st.dataframe(pd.DataFrame(tempos).set_index('Etapa').round(3), use_container_width=True)
+            contadores = telemetria.contadores()
+            st.caption(f"Recomendações: {contadores.get('recomendacoes', 0)} | colaboradores pontuados: "
+                       f"{contadores.get('colaboradores_pontuados', 0)} | carregados: "
+                       f"{contadores.get('colaboradores_carregados', 0)}")
+        else:
+            st.caption("Nenhuma etapa medida ainda.")
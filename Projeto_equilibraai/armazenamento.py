@@ -0,0 +1,693 @@
+#Camada de armazenamento: de onde vêm os perfis dos colaboradores e por onde passam as cargas
+#Duas implementações com a mesma interface: PostgreSQL (AWS RDS, pool de conexões) e SQLite embarcado
+#(um arquivo local, para rodar na borda ou em testes sem o RDS). A escolha vem de EQUILIBRAAI_ARMAZENAMENTO
+#('postgres', o padrão, ou 'sqlite'); o arquivo do SQLite vem de EQUILIBRAAI_SQLITE_PATH.
+import csv
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from livro_carga import LivroCarga
+from pool_conexoes import obter_pool
+from telemetria import contar, etapa
+
+LINHAS_POR_LOTE = 50000
+# Carga completa no PostgreSQL: a consulta de perfis é dividida em até N faixas de ids, cada uma numa conexão
+# do pool e numa thread, para o tempo ficar perto do da faixa mais lenta (1 desliga). Abaixo de
+# MIN_POR_FAIXA colaboradores por faixa, dividir custa mais idas ao banco do que economiza
+CONSULTAS_PARALELAS = int(os.environ.get('EQUILIBRAAI_CONSULTAS_PARALELAS', '4'))
+MIN_POR_FAIXA = 20000
+SQLITE_PATH = os.environ.get('EQUILIBRAAI_SQLITE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'equilibraai.db'))
+
+# Perfil completo de cada colaborador numa única consulta: skills, interesses e senioridade
+# já agregados no servidor (uma linha por colaborador)
+_MODELO_PERFIS = """
+SELECT c.colaborador_id AS id,
+       c.nome,
+       COALESCE(sen.peso, 0.0) AS senioridade_peso,
+       COALESCE(sk.skills_hard, ARRAY[]::varchar[]) AS skills_hard,
+       COALESCE(sk.skills_soft, ARRAY[]::varchar[]) AS skills_soft,
+       COALESCE(sk.skills_hard_ids, ARRAY[]::integer[]) AS skills_hard_ids,
+       COALESCE(sk.skills_soft_ids, ARRAY[]::integer[]) AS skills_soft_ids,
+       COALESCE(it.aspiracao, '') AS aspiracao_carreira
+FROM colaborador c
+LEFT JOIN (
+    SELECT cs.colaborador_id,
+           array_agg(s.nome ORDER BY cs.skill_id) FILTER (WHERE cat.tipo = 'hard_skill') AS skills_hard,
+           array_agg(s.nome ORDER BY cs.skill_id) FILTER (WHERE cat.tipo = 'soft_skill') AS skills_soft,
+           array_agg(cs.skill_id ORDER BY cs.skill_id) FILTER (WHERE cat.tipo = 'hard_skill') AS skills_hard_ids,
+           array_agg(cs.skill_id ORDER BY cs.skill_id) FILTER (WHERE cat.tipo = 'soft_skill') AS skills_soft_ids
+    FROM colaborador_skill cs
+    JOIN skill s ON cs.skill_id = s.skill_id
+    JOIN categoria_skill cat ON s.categoria_id = cat.categoria_id{filtro_cs}
+    GROUP BY cs.colaborador_id
+) sk ON sk.colaborador_id = c.colaborador_id
+LEFT JOIN (
+    SELECT cs.colaborador_id, AVG(ne.peso) AS peso
+    FROM colaborador_skill cs
+    JOIN nivel_experiencia ne ON cs.nivel_experiencia_id = ne.nivel_id{filtro_cs}
+    GROUP BY cs.colaborador_id
+) sen ON sen.colaborador_id = c.colaborador_id
+LEFT JOIN (
+    SELECT ci.colaborador_id,
+           string_agg(concat(i.nome, ': ', i.descricao), ' ' ORDER BY ci.interesse_id) AS aspiracao
+    FROM colaborador_interesse ci
+    JOIN interesse i ON ci.interesse_id = i.interesse_id{filtro_ci}
+    GROUP BY ci.colaborador_id
+) it ON it.colaborador_id = c.colaborador_id{filtro_c}
+ORDER BY c.colaborador_id
+"""
+QUERY_PERFIS = _MODELO_PERFIS.format(filtro_cs='', filtro_ci='', filtro_c='')
+# Mesma consulta só para alguns colaboradores (atualização incremental): o filtro entra em cada
+# subconsulta, para o servidor não agregar a base inteira
+QUERY_PERFIS_IDS = _MODELO_PERFIS.format(filtro_cs="\n    WHERE cs.colaborador_id = ANY(%(ids)s)",
+                                         filtro_ci="\n    WHERE ci.colaborador_id = ANY(%(ids)s)",
+                                         filtro_c="\nWHERE c.colaborador_id = ANY(%(ids)s)")
+# Uma faixa de ids da carga completa (consulta concorrente): o filtro por faixa usa as chaves primárias
+QUERY_PERFIS_FAIXA = _MODELO_PERFIS.format(filtro_cs="\n    WHERE cs.colaborador_id BETWEEN %(de)s AND %(ate)s",
+                                           filtro_ci="\n    WHERE ci.colaborador_id BETWEEN %(de)s AND %(ate)s",
+                                           filtro_c="\nWHERE c.colaborador_id BETWEEN %(de)s AND %(ate)s")
+
+# Livro de carga (livro_carga.py): totais correntes por colaborador (mantidos pelo trigger de alocacao_tarefa)
+# e as atribuições/conclusões de uma janela de tempo, em ordem cronológica
+QUERY_TOTAIS_CARGA = "SELECT colaborador_id, carga_percent, tarefas_abertas FROM carga_colaborador"
+QUERY_TOTAIS_CARGA_IDS = QUERY_TOTAIS_CARGA + " WHERE colaborador_id = ANY(%(ids)s)"
+QUERY_EVENTOS_CARGA = """
+SELECT EXTRACT(EPOCH FROM atribuida_em)::float8 AS instante, colaborador_id, carga_percent, FALSE AS concluida
+FROM alocacao_tarefa WHERE atribuida_em >= to_timestamp(%(desde)s)
+UNION ALL
+SELECT EXTRACT(EPOCH FROM concluida_em)::float8, colaborador_id, carga_percent, TRUE
+FROM alocacao_tarefa WHERE concluida_em >= to_timestamp(%(desde)s)
+ORDER BY 1
+"""
+SQL_ATRIBUIR = "INSERT INTO alocacao_tarefa (colaborador_id, tarefa, carga_percent) VALUES %s RETURNING alocacao_id"
+SQL_CONCLUIR = """
+UPDATE alocacao_tarefa SET concluida_em = now()
+WHERE alocacao_id = ANY(%(ids)s) AND concluida_em IS NULL
+RETURNING alocacao_id, colaborador_id, carga_percent
+"""
+
+# SQLite não tem array_agg: uma consulta traz colaborador + senioridade + aspiração e outra os vínculos
+# (só inteiros, ordenados por colaborador), que são fatiados por colaborador no Python; o nome de cada
+# skill sai de um array indexado pelo skill_id
+_MODELO_PERFIS_SQLITE = """
+SELECT c.colaborador_id, c.nome, COALESCE(sen.peso, 0.0), COALESCE(it.aspiracao, '')
+FROM colaborador c
+LEFT JOIN (
+    SELECT cs.colaborador_id, AVG(ne.peso) AS peso
+    FROM colaborador_skill cs
+    JOIN nivel_experiencia ne ON cs.nivel_experiencia_id = ne.nivel_id{filtro_cs}
+    GROUP BY cs.colaborador_id
+) sen ON sen.colaborador_id = c.colaborador_id
+LEFT JOIN (
+    SELECT colaborador_id, group_concat(texto, ' ') AS aspiracao
+    FROM (SELECT ci.colaborador_id, COALESCE(i.nome, '') || ': ' || COALESCE(i.descricao, '') AS texto
+          FROM colaborador_interesse ci
+          JOIN interesse i ON ci.interesse_id = i.interesse_id{filtro_ci}
+          ORDER BY ci.colaborador_id, ci.interesse_id)
+    GROUP BY colaborador_id
+) it ON it.colaborador_id = c.colaborador_id{filtro_c}
+ORDER BY c.colaborador_id
+"""
+_MODELO_SKILLS_SQLITE = """
+SELECT cs.colaborador_id, cs.skill_id, cat.tipo = 'hard_skill' AS hard, cat.tipo = 'soft_skill' AS soft
+FROM colaborador_skill cs
+JOIN skill s ON cs.skill_id = s.skill_id
+JOIN categoria_skill cat ON s.categoria_id = cat.categoria_id{filtro_cs}
+ORDER BY cs.colaborador_id, cs.skill_id
+"""
+# Os ids vão como uma lista JSON num único parâmetro
+_FILTRO_IDS_SQLITE = "IN (SELECT value FROM json_each(:ids))"
+QUERY_PERFIS_SQLITE = _MODELO_PERFIS_SQLITE.format(filtro_cs='', filtro_ci='', filtro_c='')
+QUERY_PERFIS_IDS_SQLITE = _MODELO_PERFIS_SQLITE.format(filtro_cs=f"\n    WHERE cs.colaborador_id {_FILTRO_IDS_SQLITE}",
+                                                       filtro_ci=f"\n          WHERE ci.colaborador_id {_FILTRO_IDS_SQLITE}",
+                                                       filtro_c=f"\nWHERE c.colaborador_id {_FILTRO_IDS_SQLITE}")
+QUERY_SKILLS_SQLITE = _MODELO_SKILLS_SQLITE.format(filtro_cs='')
+QUERY_SKILLS_IDS_SQLITE = _MODELO_SKILLS_SQLITE.format(filtro_cs=f"\nWHERE cs.colaborador_id {_FILTRO_IDS_SQLITE}")
+# Livro de carga no SQLite: datas em texto UTC (CURRENT_TIMESTAMP), que ordenam como as datas
+QUERY_TOTAIS_CARGA_IDS_SQLITE = QUERY_TOTAIS_CARGA + f" WHERE colaborador_id {_FILTRO_IDS_SQLITE}"
+QUERY_EVENTOS_CARGA_SQLITE = """
+SELECT CAST(strftime('%s', atribuida_em) AS REAL), colaborador_id, carga_percent, 0
+FROM alocacao_tarefa WHERE atribuida_em >= datetime(:desde, 'unixepoch')
+UNION ALL
+SELECT CAST(strftime('%s', concluida_em) AS REAL), colaborador_id, carga_percent, 1
+FROM alocacao_tarefa WHERE concluida_em >= datetime(:desde, 'unixepoch')
+ORDER BY 1
+"""
+SQL_ATRIBUIR_SQLITE = "INSERT INTO alocacao_tarefa (colaborador_id, tarefa, carga_percent) VALUES (?, ?, ?) RETURNING alocacao_id"
+SQL_CONCLUIR_SQLITE = f"""
+UPDATE alocacao_tarefa SET concluida_em = CURRENT_TIMESTAMP
+WHERE alocacao_id {_FILTRO_IDS_SQLITE} AND concluida_em IS NULL
+RETURNING alocacao_id, colaborador_id, carga_percent
+"""
+
+# As 7 tabelas do banco local (legado_local/banco_dados.py) + os índices das colunas usadas nos JOINs
+# + o livro de carga (alocacao_tarefa, com os triggers que mantêm carga_colaborador, como na migração 4).
+# As tabelas de vínculo são WITHOUT ROWID: ficam gravadas na ordem da chave (colaborador_id, ...),
+# então as skills de um colaborador são lidas de páginas vizinhas
+SQL_SCHEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS nivel_experiencia (
+    nivel_id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE,
+    descricao TEXT,
+    peso REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categoria_skill (
+    categoria_id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    tipo TEXT NOT NULL CHECK (tipo IN ('hard_skill', 'soft_skill')),
+    descricao TEXT
+);
+CREATE TABLE IF NOT EXISTS skill (
+    skill_id INTEGER PRIMARY KEY,
+    categoria_id INTEGER NOT NULL,
+    nome TEXT NOT NULL UNIQUE,
+    descricao TEXT,
+    FOREIGN KEY (categoria_id) REFERENCES categoria_skill(categoria_id)
+);
+CREATE TABLE IF NOT EXISTS colaborador (
+    colaborador_id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    email TEXT UNIQUE,
+    data_cadastro DATE DEFAULT CURRENT_DATE
+);
+CREATE TABLE IF NOT EXISTS colaborador_skill (
+    colaborador_id INTEGER NOT NULL,
+    skill_id INTEGER NOT NULL,
+    nivel_experiencia_id INTEGER NOT NULL,
+    confianca REAL,
+    data_avaliacao DATE,
+    PRIMARY KEY (colaborador_id, skill_id),
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
+    FOREIGN KEY (skill_id) REFERENCES skill(skill_id),
+    FOREIGN KEY (nivel_experiencia_id) REFERENCES nivel_experiencia(nivel_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS interesse (
+    interesse_id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE,
+    descricao TEXT
+);
+CREATE TABLE IF NOT EXISTS colaborador_interesse (
+    colaborador_id INTEGER NOT NULL,
+    interesse_id INTEGER NOT NULL,
+    PRIMARY KEY (colaborador_id, interesse_id),
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
+    FOREIGN KEY (interesse_id) REFERENCES interesse(interesse_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_colaborador_skill_skill ON colaborador_skill (skill_id);
+CREATE INDEX IF NOT EXISTS idx_colaborador_skill_nivel ON colaborador_skill (nivel_experiencia_id);
+CREATE INDEX IF NOT EXISTS idx_colaborador_interesse_interesse ON colaborador_interesse (interesse_id);
+CREATE INDEX IF NOT EXISTS idx_skill_categoria ON skill (categoria_id);
+CREATE TABLE IF NOT EXISTS alocacao_tarefa (
+    alocacao_id INTEGER PRIMARY KEY,
+    colaborador_id INTEGER NOT NULL,
+    tarefa TEXT NOT NULL,
+    carga_percent REAL NOT NULL CHECK (carga_percent >= 0),
+    atribuida_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    concluida_em TIMESTAMP,
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id)
+);
+CREATE TABLE IF NOT EXISTS carga_colaborador (
+    colaborador_id INTEGER PRIMARY KEY,
+    carga_percent REAL NOT NULL DEFAULT 0,
+    tarefas_abertas INTEGER NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id)
+);
+CREATE INDEX IF NOT EXISTS idx_alocacao_tarefa_abertas ON alocacao_tarefa (colaborador_id) WHERE concluida_em IS NULL;
+CREATE INDEX IF NOT EXISTS idx_alocacao_tarefa_atribuida ON alocacao_tarefa (atribuida_em);
+CREATE INDEX IF NOT EXISTS idx_alocacao_tarefa_concluida ON alocacao_tarefa (concluida_em)
+    WHERE concluida_em IS NOT NULL;
+CREATE TRIGGER IF NOT EXISTS trg_livro_carga_insert AFTER INSERT ON alocacao_tarefa WHEN NEW.concluida_em IS NULL
+BEGIN
+    INSERT INTO carga_colaborador (colaborador_id, carga_percent, tarefas_abertas)
+    VALUES (NEW.colaborador_id, NEW.carga_percent, 1)
+    ON CONFLICT (colaborador_id) DO UPDATE
+        SET carga_percent = carga_percent + excluded.carga_percent, tarefas_abertas = tarefas_abertas + 1,
+            atualizado_em = CURRENT_TIMESTAMP;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_livro_carga_update AFTER UPDATE ON alocacao_tarefa
+BEGIN
+    UPDATE carga_colaborador
+       SET carga_percent = carga_percent - OLD.carga_percent, tarefas_abertas = tarefas_abertas - 1,
+           atualizado_em = CURRENT_TIMESTAMP
+     WHERE OLD.concluida_em IS NULL AND colaborador_id = OLD.colaborador_id;
+    INSERT INTO carga_colaborador (colaborador_id, carga_percent, tarefas_abertas)
+    SELECT NEW.colaborador_id, NEW.carga_percent, 1 WHERE NEW.concluida_em IS NULL
+    ON CONFLICT (colaborador_id) DO UPDATE
+        SET carga_percent = carga_percent + excluded.carga_percent, tarefas_abertas = tarefas_abertas + 1,
+            atualizado_em = CURRENT_TIMESTAMP;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_livro_carga_delete AFTER DELETE ON alocacao_tarefa WHEN OLD.concluida_em IS NULL
+BEGIN
+    UPDATE carga_colaborador
+       SET carga_percent = carga_percent - OLD.carga_percent, tarefas_abertas = tarefas_abertas - 1,
+           atualizado_em = CURRENT_TIMESTAMP
+     WHERE colaborador_id = OLD.colaborador_id;
+END;
+"""
+
+# WAL: leitores não bloqueiam a escrita (nem o contrário) e cada commit é um append no log;
+# synchronous=NORMAL só sincroniza o disco no checkpoint (seguro com WAL, perde no máximo a última transação).
+# Chaves estrangeiras ficam declaradas mas sem checagem, como no banco local original
+PRAGMAS_SQLITE = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+)
+
+
+def _fatiar(ponteiros, valores):
+    p = ponteiros.tolist()
+    return [valores[p[k]:p[k + 1]] for k in range(len(p) - 1)]
+
+
+class Armazenamento:
+    """
+    Interface comum. `conexao()` empresta uma conexão DB-API (None se o banco estiver inacessível);
+    `montar_colaboradores(conn, ids=None)` devolve o DataFrame de perfis (colunas de fetch_colaboradores_data);
+    `inserir_linhas` e `importar_csv` fazem cargas em lote. A carga de cada colaborador sai do `livro` de carga
+    (livro_carga.py), alimentado pelas tabelas alocacao_tarefa/carga_colaborador.
+    """
+    nome = None
+    descricao = None
+    remoto = True      # vale a pena manter o snapshot local (snapshot_perfis) na frente dele
+    changelog = False  # suporta a atualização incremental por change-log (atualizacao_incremental)
+    marcador = '%s'    # placeholder de parâmetro do driver
+
+    def abrir(self):
+        """Conexão nova, fora do pool/cache de conexões: quem chama fecha."""
+        raise NotImplementedError
+
+    @contextmanager
+    def conexao(self):
+        raise NotImplementedError
+
+    def _perfis(self, conn, ids):
+        """DataFrame de perfis (sem a carga), ordenado por id."""
+        raise NotImplementedError
+
+    @property
+    def livro(self):
+        """Livro de carga em memória deste armazenamento (carga atual e agregados da janela por colaborador)."""
+        livro = getattr(self, '_livro', None)
+        if livro is None:
+            livro = self._livro = LivroCarga()
+        return livro
+
+    def _carga(self, conn, ids, completa):
+        """Carga atual (%) dos `ids`, lida do livro: a carga completa relê os totais, a parcial só os desses ids."""
+        with etapa('fetch.carga'):
+            if completa:
+                self.livro.carregar(self, conn, ids)
+            else:
+                self.livro.recarregar(self, conn, ids)
+            return self.livro.carga_percent(ids)
+
+    def montar_colaboradores(self, conn, ids=None):
+        """
+        Uma ida ao banco: o banco agrega e o Python só completa colunas (sem loop por colaborador).
+        Com `ids`, traz só esses colaboradores (os que não existem mais simplesmente não voltam).
+        """
+        with etapa('fetch'):
+            if ids is not None:
+                df = self._perfis(conn, [int(i) for i in ids])
+                with etapa('fetch.montagem'):
+                    df['senioridade_peso'] = df['senioridade_peso'].astype(float)
+                df.insert(3, 'carga_atual_percent', self._carga(conn, df['id'].to_numpy(), False))
+                contar('colaboradores_carregados', len(df))
+                return df
+            print("[IA-CLOUD] 📥 Baixando perfis agregados (skills, interesses e senioridade)...")
+            df = self._perfis(conn, None)
+            if df.empty:
+                print("❌ ERRO: Nenhum colaborador encontrado! Rode o script de reparo.")
+                return pd.DataFrame()
+            with etapa('fetch.montagem'):
+                df['senioridade_peso'] = df['senioridade_peso'].astype(float)
+            df.insert(3, 'carga_atual_percent', self._carga(conn, df['id'].to_numpy(), True))
+            contar('colaboradores_carregados', len(df))
+        print(f"[IA-CLOUD] ✅ {len(df)} colaboradores processados e prontos.")
+        return df
+
+    def livro_instalado(self, conn):
+        """O banco já tem as tabelas do livro de carga (migração 4 / schema do SQLite)?"""
+        raise NotImplementedError
+
+    def totais_carga(self, conn, ids=None):
+        """DataFrame (colaborador_id, carga_percent, tarefas_abertas) de carga_colaborador: todos ou só os `ids`."""
+        raise NotImplementedError
+
+    def eventos_carga(self, conn, desde):
+        """
+        Atribuições e conclusões a partir do instante `desde` (epoch, s), em ordem cronológica:
+        DataFrame (instante, colaborador_id, carga_percent, concluida).
+        """
+        raise NotImplementedError
+
+    def registrar_atribuicoes(self, conn, atribuicoes):
+        """Grava as tarefas atribuídas [(colaborador_id, tarefa, carga %)] e devolve os alocacao_id. Não confirma."""
+        raise NotImplementedError
+
+    def registrar_conclusoes(self, conn, alocacao_ids):
+        """
+        Marca as tarefas como concluídas agora. Devolve [(alocacao_id, colaborador_id, carga %)] das que
+        ainda estavam abertas (as outras são ignoradas). Não confirma.
+        """
+        raise NotImplementedError
+
+    def _sql_insercao(self, tabela, colunas, chave, atualizar, valores):
+        """
+        INSERT com ON CONFLICT (mesma sintaxe no PostgreSQL e no SQLite >= 3.24). O upsert atualiza a linha
+        no lugar; um INSERT OR REPLACE do SQLite apagaria a linha antiga (as colunas fora de `colunas` voltariam
+        ao padrão) e também qualquer outra linha que colidisse numa restrição única diferente da chave.
+        """
+        sql = f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES {valores}"
+        outras = [c for c in colunas if c not in (chave or ())]
+        if atualizar and chave and outras:
+            return (sql + f" ON CONFLICT ({', '.join(chave)}) DO UPDATE SET "
+                    + ", ".join(f"{c} = excluded.{c}" for c in outras))
+        return sql + " ON CONFLICT DO NOTHING"
+
+    def inserir_linhas(self, conn, tabela, colunas, linhas, chave=None, atualizar=False):
+        """
+        Insere `linhas` (tuplas na ordem de `colunas`) numa transação só. Conflitos são ignorados ou,
+        com atualizar=True, sobrescrevem a linha da mesma `chave`. Não confirma: quem chama dá o commit.
+        """
+        raise NotImplementedError
+
+    def importar_csv(self, conn, caminho, tabela, chave=None, atualizar=False, linhas_por_lote=LINHAS_POR_LOTE):
+        """Carrega um CSV (cabeçalho = nomes das colunas) em lotes de `linhas_por_lote`, com um commit no final."""
+        total = 0
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as f:
+            leitor = csv.reader(f)
+            colunas = [c.strip() for c in next(leitor)]
+            lote = []
+            for linha in leitor:
+                if not linha:
+                    continue
+                lote.append(tuple(v if v != '' else None for v in linha))
+                if len(lote) == linhas_por_lote:
+                    self.inserir_linhas(conn, tabela, colunas, lote, chave, atualizar)
+                    total += len(lote)
+                    lote = []
+            if lote:
+                self.inserir_linhas(conn, tabela, colunas, lote, chave, atualizar)
+                total += len(lote)
+        conn.commit()
+        return total
+
+
+class ArmazenamentoPostgres(Armazenamento):
+    """
+    AWS RDS (ou qualquer PostgreSQL das variáveis EQUILIBRAAI_DB_*), com as conexões do pool do processo.
+    A carga completa roda em até `paralelas` consultas concorrentes (faixas de ids, ver _perfis_concorrente).
+    """
+    nome = 'postgres'
+    descricao = 'AWS RDS'
+    changelog = True
+
+    def __init__(self, pool=None, paralelas=None, min_por_faixa=MIN_POR_FAIXA):
+        self._pool = pool
+        self.paralelas = CONSULTAS_PARALELAS if paralelas is None else paralelas
+        self.min_por_faixa = min_por_faixa
+
+    @property
+    def pool(self):
+        return self._pool if self._pool is not None else obter_pool()
+
+    def abrir(self):
+        return self.pool.fabrica()
+
+    @contextmanager
+    def conexao(self):
+        pool = self.pool
+        try:
+            conn = pool.obter()
+        except Exception as e:
+            print(f"❌ Erro Conexão AWS: {e}")
+            yield None
+            return
+        try:
+            yield conn
+        finally:
+            pool.devolver(conn)
+
+    def criar_schema(self, conn):
+        """Aplica as migrações pendentes (tabelas e índices, ver migracoes.py)."""
+        from migracoes import aplicar_migracoes
+        aplicar_migracoes(conn)
+
+    def _perfis(self, conn, ids):
+        # O servidor agrega (uma linha por colaborador); o read_sql já inclui a montagem do DataFrame
+        with etapa('fetch.consulta_perfis'):
+            if ids is not None:
+                return pd.read_sql(QUERY_PERFIS_IDS, conn, params={'ids': ids})
+            if self.paralelas > 1:
+                df = self._perfis_concorrente(conn)
+                if df is not None:
+                    return df
+            return pd.read_sql(QUERY_PERFIS, conn)
+
+    def _faixas(self, conn):
+        """Faixas de ids [de, ate] de tamanhos iguais, ou [] se a base é pequena demais para dividir."""
+        with etapa('fetch.consulta_faixas'):
+            cur = conn.cursor()
+            cur.execute("SELECT min(colaborador_id), max(colaborador_id) FROM colaborador")
+            menor, maior = cur.fetchone()
+            cur.close()
+        if menor is None:
+            return []
+        n = min(self.paralelas, (maior - menor + 1) // max(1, self.min_por_faixa))
+        if n < 2:
+            return []
+        limites = np.linspace(menor, maior + 1, n + 1).astype(np.int64).tolist()
+        return [(limites[i], limites[i + 1] - 1) for i in range(n)]
+
+    def _perfis_concorrente(self, conn):
+        """
+        Carga completa em faixas de ids consultadas ao mesmo tempo: a 1ª na conexão recebida, as outras em
+        threads, cada uma com uma conexão do pool. Degrada para o modo sequencial: faixa que não conseguiu
+        conexão livre na hora (pool cheio) ou que falhou é consultada depois, na conexão recebida (faixas
+        vizinhas numa consulta só: sem nenhuma conexão extra, são 2 consultas em vez de uma por faixa).
+        None se a base é pequena demais para dividir (quem chama faz a consulta única).
+        """
+        faixas = self._faixas(conn)
+        if not faixas:
+            return None
+        pool = self.pool
+
+        def consultar(faixa, c):
+            with etapa('fetch.consulta_faixa'):
+                return pd.read_sql(QUERY_PERFIS_FAIXA, c, params={'de': faixa[0], 'ate': faixa[1]})
+
+        def em_outra_conexao(faixa):
+            try:
+                c = pool.obter(timeout=0)
+            except Exception:
+                return None
+            try:
+                return consultar(faixa, c)
+            finally:
+                pool.devolver(c)
+
+        with ThreadPoolExecutor(max_workers=len(faixas) - 1) as executor:
+            futuros = [executor.submit(em_outra_conexao, faixa) for faixa in faixas[1:]]
+            partes = [consultar(faixas[0], conn)]
+            for futuro in futuros:
+                try:
+                    partes.append(futuro.result())
+                except Exception as e:
+                    print(f"[IA-CLOUD] ⚠️ Consulta concorrente falhou ({e}); refazendo a faixa em sequência.")
+                    partes.append(None)
+        sequenciais = sum(p is None for p in partes)
+        contar('faixas_concorrentes', len(faixas) - sequenciais)
+        if sequenciais:
+            contar('faixas_sequenciais', sequenciais)
+            completas, pendente = [], None
+            for faixa, parte in zip(faixas, partes):
+                if parte is None:
+                    pendente = (pendente[0] if pendente else faixa[0], faixa[1])
+                    continue
+                if pendente:
+                    completas.append(consultar(pendente, conn))
+                    pendente = None
+                completas.append(parte)
+            if pendente:
+                completas.append(consultar(pendente, conn))
+            partes = completas
+        return pd.concat(partes, ignore_index=True)
+
+    def inserir_linhas(self, conn, tabela, colunas, linhas, chave=None, atualizar=False):
+        # Várias linhas por comando (execute_values) em vez de um INSERT por linha
+        from psycopg2.extras import execute_values
+        cur = conn.cursor()
+        execute_values(cur, self._sql_insercao(tabela, colunas, chave, atualizar, '%s'), linhas, page_size=1000)
+        cur.close()
+
+    def livro_instalado(self, conn):
+        cur = conn.cursor()
+        cur.execute("SELECT to_regclass('carga_colaborador') IS NOT NULL")
+        instalado = cur.fetchone()[0]
+        cur.close()
+        return instalado
+
+    def totais_carga(self, conn, ids=None):
+        if ids is None:
+            return pd.read_sql(QUERY_TOTAIS_CARGA, conn)
+        return pd.read_sql(QUERY_TOTAIS_CARGA_IDS, conn, params={'ids': [int(i) for i in ids]})
+
+    def eventos_carga(self, conn, desde):
+        return pd.read_sql(QUERY_EVENTOS_CARGA, conn, params={'desde': float(desde)})
+
+    def registrar_atribuicoes(self, conn, atribuicoes):
+        from psycopg2.extras import execute_values
+        cur = conn.cursor()
+        ids = execute_values(cur, SQL_ATRIBUIR, [(int(c), t, float(p)) for c, t, p in atribuicoes], fetch=True)
+        cur.close()
+        return [i for i, in ids]
+
+    def registrar_conclusoes(self, conn, alocacao_ids):
+        cur = conn.cursor()
+        cur.execute(SQL_CONCLUIR, {'ids': [int(i) for i in alocacao_ids]})
+        linhas = cur.fetchall()
+        cur.close()
+        return linhas
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """
+    Banco embarcado num arquivo: mesmo schema de 7 tabelas (mais o livro de carga), em WAL, com índices nas
+    colunas de JOIN.
+    Cada thread usa a sua conexão (o sqlite3 não compartilha conexões entre threads).
+    """
+    nome = 'sqlite'
+    remoto = False
+    marcador = '?'
+
+    def __init__(self, caminho=SQLITE_PATH):
+        self.caminho = caminho
+        self.descricao = f"SQLite local ({caminho})"
+        self._local = threading.local()
+
+    def abrir(self, criar=False):
+        """Nova conexão já configurada; sem criar=True, falha se o arquivo não existir."""
+        if criar:
+            conn = sqlite3.connect(self.caminho, timeout=30.0)
+        else:
+            conn = sqlite3.connect(f"file:{self.caminho}?mode=rw", uri=True, timeout=30.0)
+        for pragma in PRAGMAS_SQLITE:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def conexao(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            try:
+                conn = self._local.conn = self.abrir()
+            except sqlite3.Error as e:
+                print(f"❌ Erro ao abrir o banco local '{self.caminho}': {e}")
+                yield None
+                return
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+    def criar_schema(self, conn):
+        """Cria tabelas e índices que ainda não existirem."""
+        conn.executescript(SQL_SCHEMA_SQLITE)
+        conn.commit()
+
+    def _perfis(self, conn, ids):
+        params = {'ids': json.dumps(ids)} if ids is not None else {}
+        cur = conn.cursor()
+        with etapa('fetch.consulta_perfis'):
+            cur.execute(QUERY_PERFIS_IDS_SQLITE if ids is not None else QUERY_PERFIS_SQLITE, params)
+            colabs = cur.fetchall()
+        with etapa('fetch.consulta_skills'):
+            cur.execute(QUERY_SKILLS_IDS_SQLITE if ids is not None else QUERY_SKILLS_SQLITE, params)
+            vinculos = np.array(cur.fetchall(), dtype=np.int64).reshape(-1, 4)
+        with etapa('fetch.consulta_nomes_skill'):
+            cur.execute("SELECT skill_id, nome FROM skill")
+            skills = cur.fetchall()
+        cur.close()
+        with etapa('fetch.montagem'):
+            return self._montar_perfis(colabs, vinculos, skills)
+
+    @staticmethod
+    def _montar_perfis(colabs, vinculos, skills):
+        """Cruza em memória (arrays, sem loop por colaborador) o resultado das 3 consultas."""
+        id_colab, nomes, sen, asp = zip(*colabs) if colabs else ((), (), (), ())
+        colunas = {'id': np.array(id_colab, dtype=np.int64), 'nome': list(nomes),
+                   'senioridade_peso': np.array(sen, dtype=np.float64)}
+        nome_skill = np.empty(max((s for s, _ in skills), default=0) + 1, dtype=object)
+        for skill_id, nome in skills:
+            nome_skill[skill_id] = nome
+        # Vínculos já vêm ordenados por colaborador: a posição de cada um sai de uma busca binária
+        # e cada lista é uma fatia do array achatado
+        posicao = np.searchsorted(colunas['id'], vinculos[:, 0])
+        for coluna, sel in (('skills_hard', vinculos[:, 2] == 1), ('skills_soft', vinculos[:, 3] == 1)):
+            ponteiros = np.zeros(len(id_colab) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(posicao[sel], minlength=len(id_colab)), out=ponteiros[1:])
+            skill_ids = vinculos[sel, 1]
+            colunas[coluna] = _fatiar(ponteiros, nome_skill[skill_ids].tolist())
+            colunas[coluna + '_ids'] = _fatiar(ponteiros, skill_ids.tolist())
+        colunas['aspiracao_carreira'] = list(asp)
+        return pd.DataFrame({c: colunas[c] for c in ('id', 'nome', 'senioridade_peso', 'skills_hard', 'skills_soft',
+                                                       'skills_hard_ids', 'skills_soft_ids', 'aspiracao_carreira')})
+
+    def inserir_linhas(self, conn, tabela, colunas, linhas, chave=None, atualizar=False):
+        conn.executemany(self._sql_insercao(tabela, colunas, chave, atualizar,
+                                            f"({', '.join('?' * len(colunas))})"), linhas)
+
+    def livro_instalado(self, conn):
+        return conn.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'carga_colaborador'"
+                            ).fetchone()[0] > 0
+
+    def totais_carga(self, conn, ids=None):
+        if ids is None:
+            linhas = conn.execute(QUERY_TOTAIS_CARGA).fetchall()
+        else:
+            linhas = conn.execute(QUERY_TOTAIS_CARGA_IDS_SQLITE, {'ids': json.dumps([int(i) for i in ids])}).fetchall()
+        return pd.DataFrame(linhas, columns=['colaborador_id', 'carga_percent', 'tarefas_abertas'])
+
+    def eventos_carga(self, conn, desde):
+        linhas = conn.execute(QUERY_EVENTOS_CARGA_SQLITE, {'desde': float(desde)}).fetchall()
+        return pd.DataFrame(linhas, columns=['instante', 'colaborador_id', 'carga_percent', 'concluida'])
+
+    def registrar_atribuicoes(self, conn, atribuicoes):
+        return [conn.execute(SQL_ATRIBUIR_SQLITE, (int(c), t, float(p))).fetchone()[0] for c, t, p in atribuicoes]
+
+    def registrar_conclusoes(self, conn, alocacao_ids):
+        return conn.execute(SQL_CONCLUIR_SQLITE, {'ids': json.dumps([int(i) for i in alocacao_ids])}).fetchall()
+
+
+_armazenamento = None
+_lock = threading.Lock()
+
+
+def criar_armazenamento(nome=None):
+    """Armazenamento pelo nome ('postgres' ou 'sqlite'); sem nome, o de EQUILIBRAAI_ARMAZENAMENTO."""
+    nome = nome or os.environ.get('EQUILIBRAAI_ARMAZENAMENTO', 'postgres')
+    if nome == 'postgres':
+        return ArmazenamentoPostgres()
+    if nome == 'sqlite':
+        return ArmazenamentoSQLite(os.environ.get('EQUILIBRAAI_SQLITE_PATH', SQLITE_PATH))
+    raise ValueError(f"Armazenamento desconhecido: {nome!r} (use 'postgres' ou 'sqlite').")
+
+
+def obter_armazenamento():
+    """Armazenamento do processo (criado na primeira chamada)."""
+    global _armazenamento
+    with _lock:
+        if _armazenamento is None:
+            _armazenamento = criar_armazenamento()
+        return _armazenamento
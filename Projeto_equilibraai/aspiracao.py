@@ -0,0 +1,286 @@
+#Dimensão de Aspiração de Carreira: embeddings BERT em lote com cache persistente em disco
+#A descrição da tarefa é embutida uma vez por requisição e os textos dos colaboradores em lotes,
+#reaproveitando do cache qualquer texto que já tenha sido processado (mesmo após reiniciar o app)
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+
+CACHE_DIR = os.environ.get('EQUILIBRAAI_CACHE_EMB', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_embeddings'))
+# Máximo de descrições no cache em disco (as menos usadas saem primeiro; 0 desliga a gravação)
+MAX_ITENS_CACHE = int(os.environ.get('EQUILIBRAAI_CACHE_EMB_MAX', '20000'))
+TAMANHO_LOTE = 32
+MAX_LENGTH = 128
+MODELO_PADRAO = 'neuralmind/bert-base-portuguese-cased'
+# Backend de inferência: 'tf' (referência) ou 'onnx' (ONNX Runtime com quantização int8)
+BACKEND = os.environ.get('EQUILIBRAAI_BACKEND_ASP', 'tf')
+
+# Estados do carregamento do modelo (exibidos na UI)
+NAO_INICIADO = 'nao_iniciado'
+CARREGANDO = 'carregando'
+PRONTO = 'pronto'
+INDISPONIVEL = 'indisponivel'
+
+
+class CodificadorTF:
+    """Codifica textos com o BERT em TensorFlow (pooler_output, como na versão legado)."""
+
+    def __init__(self, tokenizer, model, nome_modelo, max_length=MAX_LENGTH):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.max_length = max_length
+        # Identifica o modelo/configuração na chave do cache
+        self.assinatura = f"{nome_modelo}|tf|pooler|{max_length}"
+
+    def __call__(self, textos):
+        inp = self.tokenizer(list(textos), return_tensors='tf', truncation=True, padding=True, max_length=self.max_length)
+        return np.asarray(self.model(inp).pooler_output, dtype=np.float32)
+
+
+class CacheEmbeddings:
+    """
+    Cache em disco endereçado pelo conteúdo: a chave é o hash de (assinatura do modelo + texto).
+    Um texto inalterado nunca é recalculado, mesmo após restart ou recarga dos dados. Guarda as descrições
+    das tarefas; as aspirações dos colaboradores vivem no store de embeddings (store_embeddings.py).
+    Limitado a `max_itens` arquivos: passando disso, os menos usados (mtime mais antigo) são apagados.
+    O cache é só uma otimização: erros de disco viram miss (obter) ou são ignorados (guardar).
+    """
+
+    def __init__(self, diretorio=CACHE_DIR, max_itens=MAX_ITENS_CACHE):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        self.max_itens = max_itens
+        self.hits = 0
+        self.misses = 0
+        self._itens = None     # arquivos no cache (contados na 1ª gravação, recontados em cada limpeza)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(assinatura, texto):
+        return hashlib.sha256(f"{assinatura}\0{texto}".encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave[:2], chave + '.npy')
+
+    def obter(self, chave):
+        caminho = self._caminho(chave)
+        try:
+            vetor = np.load(caminho)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(caminho)      # marca o uso, para a limpeza apagar primeiro os que não são lidos
+        except OSError:
+            pass
+        return vetor
+
+    def guardar(self, chave, vetor):
+        if self.max_itens == 0:
+            return
+        caminho = self._caminho(chave)
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            # Escrita atômica com nome temporário único (sessões do Streamlit são threads do mesmo processo):
+            # ninguém lê um arquivo pela metade nem disputa o mesmo temporário
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, np.asarray(vetor, dtype=np.float32))
+                os.replace(tmp, caminho)
+            except OSError:
+                os.remove(tmp)
+                raise
+        except OSError as e:
+            print(f"[IA-CLOUD] ⚠️ Embedding não gravado no cache ({e}).")
+            return
+        with self._lock:
+            self._itens = self._contar() if self._itens is None else self._itens + 1
+            if self._itens > self.max_itens:
+                self._limpar()
+
+    def _arquivos(self):
+        """Arquivos .npy do cache (só as subpastas de 2 caracteres hex: o store pode morar dentro do diretório)."""
+        arquivos = []
+        with os.scandir(self.diretorio) as pastas:
+            for pasta in pastas:
+                if len(pasta.name) == 2 and pasta.is_dir() and all(c in '0123456789abcdef' for c in pasta.name):
+                    with os.scandir(pasta.path) as nomes:
+                        arquivos.extend(a for a in nomes if a.name.endswith('.npy'))
+        return arquivos
+
+    def _contar(self):
+        try:
+            return len(self._arquivos())
+        except OSError:
+            return 0
+
+    def _limpar(self):
+        """Apaga os menos usados até sobrar 90% de `max_itens`."""
+        try:
+            arquivos = []
+            for a in self._arquivos():
+                try:
+                    arquivos.append((a.stat().st_mtime, a.path))
+                except OSError:
+                    pass
+        except OSError:
+            return
+        arquivos.sort()
+        excesso = max(len(arquivos) - int(self.max_itens * 0.9), 0)
+        for _, caminho in arquivos[:excesso]:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+        self._itens = len(arquivos) - excesso
+
+
+class ScorerAspiracao:
+    """Calcula a similaridade semântica entre a descrição da tarefa e as aspirações dos colaboradores."""
+
+    def __init__(self, codificador, cache=None, tamanho_lote=TAMANHO_LOTE):
+        self.codificador = codificador
+        self.cache = cache if cache is not None else CacheEmbeddings()
+        self.tamanho_lote = tamanho_lote
+
+    def embeddings(self, textos, usar_cache=True):
+        """
+        Embeddings (float32) de uma lista de textos. Só os textos ausentes do cache passam
+        pelo modelo, em lotes de `tamanho_lote`, e textos repetidos são calculados uma vez.
+        Com `usar_cache=False` o cache em disco não é lido nem escrito: é o caso das aspirações,
+        que já ficam guardadas no store de embeddings (um .npy por texto só duplicaria o store).
+        """
+        assinatura = self.codificador.assinatura
+        chaves = [self.cache.chave(assinatura, t) for t in textos]
+        vetores = {}
+        faltando = {}
+        for texto, chave in zip(textos, chaves):
+            if chave in vetores or chave in faltando:
+                continue
+            vetor = self.cache.obter(chave) if usar_cache else None
+            if vetor is None:
+                faltando[chave] = texto
+            else:
+                vetores[chave] = vetor
+
+        pendentes = list(faltando.items())
+        for i in range(0, len(pendentes), self.tamanho_lote):
+            lote = pendentes[i:i + self.tamanho_lote]
+            saida = self.codificador([t for _, t in lote])
+            for (chave, _), vetor in zip(lote, saida):
+                if usar_cache:
+                    self.cache.guardar(chave, vetor)
+                vetores[chave] = vetor
+
+        if not chaves:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vetores[c] for c in chaves])
+
+    def embedding(self, texto):
+        return self.embeddings([texto])[0]
+
+    @staticmethod
+    def normalizar(matriz):
+        normas = np.linalg.norm(matriz, axis=-1, keepdims=True)
+        normas[normas == 0] = 1.0
+        return matriz / normas
+
+    def similaridades(self, descricao, emb_colabs_norm):
+        """Cosseno entre a tarefa (embutida uma vez) e a matriz de embeddings já normalizada."""
+        if not descricao or len(emb_colabs_norm) == 0:
+            return np.zeros(len(emb_colabs_norm))
+        tarefa = self.normalizar(self.embedding(descricao))
+        return emb_colabs_norm @ tarefa
+
+    def similaridade(self, t, a):
+        """Versão par-a-par (usada pela implementação de referência)."""
+        if not t or not a: return 0.0
+        emb = self.normalizar(self.embeddings([t, a]))
+        return float(emb[0] @ emb[1])
+
+
+def carregar_codificador_tf(nome_modelo=MODELO_PADRAO):
+    """Importa TensorFlow/transformers e baixa/carrega o BERT (operação pesada, feita só sob demanda)."""
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    import tensorflow as tf
+    from transformers import AutoTokenizer, TFAutoModel
+    tf.get_logger().setLevel('ERROR')
+    tokenizer = AutoTokenizer.from_pretrained(nome_modelo)
+    model = TFAutoModel.from_pretrained(nome_modelo)
+    return CodificadorTF(tokenizer, model, nome_modelo)
+
+
+def fabrica_backend(backend=BACKEND):
+    """Função que carrega o codificador do backend escolhido."""
+    if backend == 'onnx':
+        from aspiracao_onnx import carregar_codificador_onnx
+        return carregar_codificador_onnx
+    if backend == 'tf':
+        return carregar_codificador_tf
+    raise ValueError(f"Backend de aspiração desconhecido: {backend} (use 'tf' ou 'onnx')")
+
+
+class CarregadorModelo:
+    """
+    Adia o import do TensorFlow e o carregamento do BERT até a dimensão de aspiração ser necessária.
+    `aquecer()` faz o carregamento numa thread em segundo plano; `obter()` espera o modelo ficar pronto.
+    O estado (nao_iniciado / carregando / pronto / indisponivel) pode ser mostrado na interface.
+    """
+
+    def __init__(self, fabrica=None):
+        self.fabrica = fabrica if fabrica is not None else fabrica_backend()
+        self.estado = NAO_INICIADO
+        self.erro = None
+        self.tempo_carga = None
+        self._scorer = None
+        self._lock = threading.Lock()
+        self._pronto = threading.Event()
+
+    def _carregar(self):
+        inicio = time.perf_counter()
+        print("[IA-CLOUD] ⚙️ Inicializando módulos de IA...")
+        try:
+            scorer = ScorerAspiracao(self.fabrica())
+            # Primeira inferência (aquecimento) fora do caminho da requisição
+            scorer.codificador(["aquecimento"])
+            self._scorer = scorer
+            self.estado = PRONTO
+            print("[IA-CLOUD] ✅ Modelo de aspiração carregado.")
+        except Exception as e:
+            self.erro = e
+            self.estado = INDISPONIVEL
+            print(f"[IA-CLOUD] ⚠️ Modelo de aspiração indisponível ({e}). Rodando em modo de compatibilidade.")
+        finally:
+            self.tempo_carga = time.perf_counter() - inicio
+            self._pronto.set()
+
+    def aquecer(self):
+        """Inicia o carregamento em segundo plano (chamadas repetidas não fazem nada)."""
+        with self._lock:
+            if self.estado != NAO_INICIADO:
+                return
+            self.estado = CARREGANDO
+        threading.Thread(target=self._carregar, name='aquecimento-bert', daemon=True).start()
+
+    def obter(self, timeout=None):
+        """Scorer pronto para uso (None se o modelo não puder ser carregado ou o timeout estourar)."""
+        self.aquecer()
+        self._pronto.wait(timeout)
+        return self._scorer
+
+    def __call__(self):
+        # O carregador serve de `aspiracao` para o MotorScores (uma fonte que devolve o scorer)
+        return self.obter()
+
+    @property
+    def pronto(self):
+        return self.estado == PRONTO
+
+    @property
+    def concluido(self):
+        """Carregamento terminado (pronto ou indisponível): obter() não espera mais."""
+        return self._pronto.is_set()
@@ -0,0 +1,126 @@
+#Backend de inferência ONNX Runtime (int8) para o codificador da dimensão de aspiração
+#Exporta o BERT do TensorFlow para ONNX, aplica quantização dinâmica int8 e roda na CPU com o ONNX Runtime.
+#O CodificadorTF (aspiracao.py) continua como referência para a checagem de paridade.
+import os
+import numpy as np
+from aspiracao import CACHE_DIR, MAX_LENGTH, MODELO_PADRAO, ScorerAspiracao
+
+ONNX_DIR = os.path.join(CACHE_DIR, 'onnx')
+ENTRADAS = ('input_ids', 'attention_mask', 'token_type_ids')
+TOLERANCIA_PARIDADE = 0.05
+
+
+def exportar_onnx(model_tf, caminho, opset=13):
+    """Exporta o encoder TF (saída pooler_output) para ONNX com eixos dinâmicos de lote e sequência."""
+    import tensorflow as tf
+    import tf2onnx
+    spec = tuple(tf.TensorSpec((None, None), tf.int32, name=nome) for nome in ENTRADAS)
+
+    @tf.function(input_signature=spec)
+    def encoder(input_ids, attention_mask, token_type_ids):
+        saida = model_tf(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids)
+        return {'pooler_output': saida.pooler_output}
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    tf2onnx.convert.from_function(encoder, input_signature=spec, opset=opset, output_path=caminho)
+    return caminho
+
+
+def quantizar_int8(origem, destino):
+    """Quantização dinâmica: pesos em int8, ativações quantizadas em tempo de execução."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(origem, destino, weight_type=QuantType.QInt8)
+    return destino
+
+
+class CodificadorONNX:
+    """Mesma interface do CodificadorTF (textos -> matriz float32), rodando no ONNX Runtime."""
+
+    def __init__(self, tokenizer, caminho_onnx, nome_modelo, max_length=MAX_LENGTH, threads=None):
+        import onnxruntime as ort
+        opcoes = ort.SessionOptions()
+        if threads:
+            opcoes.intra_op_num_threads = threads
+        self.sessao = ort.InferenceSession(caminho_onnx, opcoes, providers=['CPUExecutionProvider'])
+        self.entradas = [e.name for e in self.sessao.get_inputs()]
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        quant = 'int8' if caminho_onnx.endswith('-int8.onnx') else 'fp32'
+        self.assinatura = f"{nome_modelo}|onnx-{quant}|pooler|{max_length}"
+
+    def __call__(self, textos):
+        inp = self.tokenizer(list(textos), return_tensors='np', truncation=True, padding=True, max_length=self.max_length)
+        feeds = {nome: inp[nome].astype(np.int32) for nome in self.entradas}
+        return np.asarray(self.sessao.run(['pooler_output'], feeds)[0], dtype=np.float32)
+
+
+def caminhos_onnx(nome_modelo, diretorio=ONNX_DIR):
+    base = os.path.join(diretorio, nome_modelo.replace('/', '__'))
+    return base + '-fp32.onnx', base + '-int8.onnx'
+
+
+def preparar_onnx(model_tf, nome_modelo, diretorio=ONNX_DIR):
+    """Exporta e quantiza uma única vez; execuções seguintes reaproveitam os arquivos em disco."""
+    fp32, int8 = caminhos_onnx(nome_modelo, diretorio)
+    if not os.path.exists(int8):
+        print("[IA-CLOUD] 📦 Exportando encoder para ONNX e quantizando em int8...")
+        if not os.path.exists(fp32):
+            exportar_onnx(model_tf, fp32)
+        quantizar_int8(fp32, int8)
+    return int8
+
+
+def carregar_codificador_onnx(nome_modelo=MODELO_PADRAO, diretorio=ONNX_DIR):
+    """
+    Fábrica do backend ONNX para o CarregadorModelo. O TensorFlow só é importado
+    na primeira execução, para exportar o modelo; depois basta o tokenizer e o ONNX Runtime.
+    """
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(nome_modelo)
+    _, int8 = caminhos_onnx(nome_modelo, diretorio)
+    if not os.path.exists(int8):
+        from transformers import TFAutoModel
+        preparar_onnx(TFAutoModel.from_pretrained(nome_modelo), nome_modelo, diretorio)
+    return CodificadorONNX(tokenizer, int8, nome_modelo)
+
+
+def deriva_paridade(referencia, candidato, tarefas, aspiracoes):
+    """
+    Maior diferença absoluta entre os scores de cosseno (tarefa x aspiração) dos dois backends.
+    É essa diferença, e não a dos vetores, que chega ao ranking.
+    """
+    scores = []
+    for codificador in (referencia, candidato):
+        t = ScorerAspiracao.normalizar(codificador(tarefas))
+        a = ScorerAspiracao.normalizar(codificador(aspiracoes))
+        scores.append(t @ a.T)
+    return float(np.abs(scores[0] - scores[1]).max())
+
+
+def modelo_bert_minusculo(diretorio, hidden=64, camadas=2, seed=0):
+    """
+    Gera em `diretorio` um BERT pequeno com pesos aleatórios e vocabulário local, no formato do
+    Hugging Face, para testar exportação, quantização e paridade sem baixar nenhum modelo.
+    O diretório pode ser usado como `nome_modelo` nas fábricas dos dois backends.
+    """
+    import tensorflow as tf
+    from transformers import BertConfig, BertTokenizerFast, TFBertModel
+    os.makedirs(diretorio, exist_ok=True)
+    palavras = sorted(set(
+        "criar api python flask banco dados sql segurança machine learning análise redes neurais "
+        "interfaces usuário gestão projetos metodologias ágeis liderança equipes backend frontend "
+        "microsserviços servidor interesse em de e com para desenvolvimento data science ia".split()))
+    vocab = list(dict.fromkeys(['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]'] + palavras + list("abcdefghijklmnopqrstuvwxyz:.,")))
+    caminho_vocab = os.path.join(diretorio, 'vocab.txt')
+    with open(caminho_vocab, 'w', encoding='utf-8') as f:
+        f.write("\n".join(vocab))
+    tokenizer = BertTokenizerFast(vocab_file=caminho_vocab, do_lower_case=True)
+    tf.random.set_seed(seed)
+    config = BertConfig(vocab_size=len(vocab), hidden_size=hidden, num_hidden_layers=camadas,
+                        num_attention_heads=max(1, hidden // 32), intermediate_size=hidden * 4,
+                        max_position_embeddings=MAX_LENGTH)
+    model = TFBertModel(config)
+    model(model.dummy_inputs)
+    model.save_pretrained(diretorio)
+    tokenizer.save_pretrained(diretorio)
+    return diretorio
@@ -0,0 +1,386 @@
+#Atualização incremental dos colaboradores em memória
+#Triggers gravam numa tabela de change-log (colaborador_alteracao) cada colaborador tocado; a recarga lê só
+#o que entrou no log desde a última leitura, busca esses perfis e corrige uma cópia do MotorScores, trocada no final.
+#Mudanças nas tabelas de cadastro (skill, categoria, interesse, nível) valem para todos e pedem recarga completa.
+import select
+import threading
+import time
+import numpy as np
+import pandas as pd
+import psycopg2
+from armazenamento import obter_armazenamento
+from motor_scores import MotorScores
+from perfis_compactos import PerfisCompactos
+from pool_conexoes import ConfiguracaoAusente, configuracao_banco
+from snapshot_perfis import carregar_snapshot, salvar_snapshot, SNAPSHOT_DIR
+from vocabulario_skills import VocabularioSkills
+
+CANAL_NOTIFICACAO = 'equilibraai_alteracoes'
+# Ouvinte do change-log: espera entre tentativas de reconexão (dobra a cada falha seguida, até o máximo)
+ESPERA_RECONEXAO = 5.0
+ESPERA_RECONEXAO_MAX = 300.0
+
+# Tabelas com colaborador_id (uma linha de log por colaborador) e tabelas de cadastro (log sem colaborador).
+# carga_colaborador (livro de carga, migração 4) muda a cada tarefa atribuída ou concluída
+TABELAS_COLABORADOR = ('colaborador', 'colaborador_skill', 'colaborador_interesse', 'carga_colaborador')
+TABELAS_CADASTRO = ('skill', 'categoria_skill', 'interesse', 'nivel_experiencia')
+
+# `transacao` é o xid de quem alterou: o cursor de leitura é o menor xid ainda em andamento no
+# momento da carga, então uma transação longa que confirma depois não é perdida
+SQL_CHANGELOG = f"""
+CREATE TABLE IF NOT EXISTS colaborador_alteracao (
+    versao BIGSERIAL PRIMARY KEY,
+    transacao XID8 NOT NULL DEFAULT pg_current_xact_id(),
+    colaborador_id INTEGER,
+    tabela VARCHAR(50) NOT NULL,
+    alterado_em TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_colaborador_alteracao_transacao ON colaborador_alteracao (transacao);
+
+-- Marca d'água da limpeza: maior xid já apagado do log (um cursor até ele pode ter perdido alterações)
+CREATE TABLE IF NOT EXISTS colaborador_alteracao_limpeza (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    transacao XID8 NOT NULL,
+    limpo_em TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION registrar_alteracao_colaborador() RETURNS trigger AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        INSERT INTO colaborador_alteracao (colaborador_id, tabela) VALUES (NULL, TG_TABLE_NAME);
+    ELSE
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO colaborador_alteracao (colaborador_id, tabela) VALUES (OLD.colaborador_id, TG_TABLE_NAME);
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO colaborador_alteracao (colaborador_id, tabela) VALUES (NEW.colaborador_id, TG_TABLE_NAME);
+        ELSIF TG_OP = 'UPDATE' AND NEW.colaborador_id IS DISTINCT FROM OLD.colaborador_id THEN
+            INSERT INTO colaborador_alteracao (colaborador_id, tabela) VALUES (NEW.colaborador_id, TG_TABLE_NAME);
+        END IF;
+    END IF;
+    -- Notificações iguais na mesma transação chegam uma vez só
+    PERFORM pg_notify('{CANAL_NOTIFICACAO}', TG_TABLE_NAME);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""" + "".join(f"""
+DROP TRIGGER IF EXISTS trg_alteracao_{t} ON {t};
+CREATE TRIGGER trg_alteracao_{t} AFTER INSERT OR UPDATE OR DELETE ON {t}
+    FOR EACH ROW EXECUTE FUNCTION registrar_alteracao_colaborador();
+DROP TRIGGER IF EXISTS trg_alteracao_truncate_{t} ON {t};
+CREATE TRIGGER trg_alteracao_truncate_{t} AFTER TRUNCATE ON {t}
+    FOR EACH STATEMENT EXECUTE FUNCTION registrar_alteracao_colaborador();
+""" for t in TABELAS_COLABORADOR) + "".join(f"""
+DROP TRIGGER IF EXISTS trg_alteracao_{t} ON {t};
+CREATE TRIGGER trg_alteracao_{t} AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {t}
+    FOR EACH STATEMENT EXECUTE FUNCTION registrar_alteracao_colaborador();
+""" for t in TABELAS_CADASTRO)
+
+
+def instalar_changelog(conn):
+    """
+    Cria (ou recria) a tabela de log, a função e os triggers. Pode rodar quantas vezes quiser.
+    As tabelas vigiadas precisam existir: aplique antes as migrações (migracoes.py).
+    """
+    cur = conn.cursor()
+    cur.execute(SQL_CHANGELOG)
+    conn.commit()
+    cur.close()
+
+
+def changelog_instalado(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT to_regclass('colaborador_alteracao') IS NOT NULL")
+    instalado = cur.fetchone()[0]
+    cur.close()
+    return instalado
+
+
+# Apaga e, na mesma instrução, sobe a marca d'água para o maior xid apagado
+SQL_LIMPAR_CHANGELOG = """
+WITH apagadas AS (
+    DELETE FROM colaborador_alteracao WHERE alterado_em < now() - make_interval(days => %(dias)s)
+    RETURNING transacao
+), marca AS (
+    INSERT INTO colaborador_alteracao_limpeza AS l (id, transacao)
+    SELECT TRUE, max(transacao) FROM apagadas HAVING count(*) > 0
+    ON CONFLICT (id) DO UPDATE SET transacao = GREATEST(l.transacao, excluded.transacao), limpo_em = now()
+)
+SELECT count(*) FROM apagadas
+"""
+
+
+def limpar_changelog(conn, dias=7):
+    """
+    Apaga o log mais antigo que `dias` e guarda a marca d'água (maior xid apagado): processos com o
+    cursor até ela fazem recarga completa na próxima atualização (buscar_alteracoes).
+    """
+    cur = conn.cursor()
+    cur.execute(SQL_LIMPAR_CHANGELOG, {'dias': dias})
+    apagadas = cur.fetchone()[0]
+    conn.commit()
+    cur.close()
+    return apagadas
+
+
+def _instantaneo(conn):
+    """
+    Abre uma transação REPEATABLE READ: cursor, log e perfis são lidos do mesmo snapshot.
+    Retorna o cursor (menor xid em andamento) e as versões do log >= cursor já visíveis.
+    """
+    conn.rollback()
+    cur = conn.cursor()
+    cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+    cur.execute("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+    cursor = cur.fetchone()[0]
+    cur.execute("SELECT versao FROM colaborador_alteracao WHERE transacao >= %s::text::xid8", (str(cursor),))
+    vistas = {v for v, in cur.fetchall()}
+    cur.close()
+    return cursor, vistas
+
+
+def buscar_alteracoes(conn, desde, vistas=frozenset()):
+    """
+    Colaboradores alterados desde o cursor `desde` (ignorando as versões do log em `vistas`, já aplicadas).
+    Retorna (ids, completo); completo=True quando alguma tabela de cadastro mudou ou quando a limpeza
+    do log já apagou alterações a partir do cursor (marca d'água >= cursor).
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT transacao >= %s::text::xid8 FROM colaborador_alteracao_limpeza", (str(desde),))
+    marca = cur.fetchone()
+    if marca is not None and marca[0]:
+        cur.close()
+        return set(), True
+    cur.execute("SELECT versao, colaborador_id FROM colaborador_alteracao WHERE transacao >= %s::text::xid8",
+                (str(desde),))
+    ids, completo = set(), False
+    for versao, cid in cur.fetchall():
+        if versao in vistas:
+            continue
+        if cid is None:
+            completo = True
+        else:
+            ids.add(cid)
+    cur.close()
+    return ids, completo
+
+
+class BaseColaboradores:
+    """
+    Colaboradores em memória (PerfisCompactos dentro do MotorScores) e a versão do change-log em que foram lidos.
+    `montar(conn, ids=None)` traz os perfis (todos, ou só os `ids`); `aspiracao` vai para o MotorScores.
+    `armazenamento` (armazenamento.py) diz se o banco tem change-log; sem ele, assume PostgreSQL.
+    Cada atualização monta um motor novo e troca a referência no final: quem já pegou `base.motor`
+    continua com um estado consistente.
+    """
+
+    def __init__(self, montar, aspiracao=None, armazenamento=None):
+        self.montar = montar
+        self.aspiracao = aspiracao
+        self.armazenamento = armazenamento
+        self.motor = None
+        self.versao = None   # cursor do change-log (None: log não instalado, só recarga completa)
+        self.geracao = 0     # muda a cada alteração aplicada (serve de chave para caches de resultado)
+        self.origem = None   # 'banco' ou 'snapshot' (ainda não conferido com o banco)
+        self._vistas = set()
+        self._lock = threading.Lock()
+
+    def _com_changelog(self, conn):
+        return (self.armazenamento is None or self.armazenamento.changelog) and changelog_instalado(conn)
+
+    @property
+    def df(self):
+        """DataFrame dos colaboradores (remontado dos perfis compactos só quando pedido)."""
+        return self.motor.df if self.motor is not None else pd.DataFrame()
+
+    def __len__(self):
+        return len(self.motor) if self.motor is not None else 0
+
+    def _trocar(self, motor):
+        self.motor = motor
+        self.geracao += 1
+
+    def carregar(self, conn):
+        """Carga completa, registrando o ponto do change-log a partir do qual a próxima atualização lê."""
+        with self._lock:
+            self._carregar(conn)
+        return self
+
+    def _carregar(self, conn):
+        if self._com_changelog(conn):
+            versao, vistas = _instantaneo(conn)
+        else:
+            versao, vistas = None, set()
+        df = self.montar(conn)
+        # Só os arrays compactos ficam em memória; o DataFrame lido do banco é descartado
+        motor = (MotorScores(PerfisCompactos.do_dataframe(df), VocabularioSkills.do_banco(conn), self.aspiracao)
+                 if not df.empty else None)
+        conn.rollback()
+        self.versao, self._vistas, self.origem = versao, vistas, 'banco'
+        self._trocar(motor)
+
+    @classmethod
+    def do_snapshot(cls, montar, aspiracao=None, diretorio=SNAPSHOT_DIR, armazenamento=None):
+        """Base montada a partir do snapshot local (sem ir ao banco), ou None se não houver snapshot."""
+        lido = carregar_snapshot(diretorio)
+        if lido is None:
+            return None
+        perfis, vocabulario, meta = lido
+        base = cls(montar, aspiracao, armazenamento)
+        base.versao, base._vistas, base.origem = meta['versao'], set(meta['vistas']), 'snapshot'
+        base._trocar(MotorScores(perfis, vocabulario, aspiracao) if not perfis.empty else None)
+        return base
+
+    def salvar_snapshot(self, diretorio=SNAPSHOT_DIR):
+        """Grava o estado atual (com a versão do change-log) no snapshot local."""
+        with self._lock:
+            if self.motor is not None:
+                return salvar_snapshot(self.motor.perfis, self.motor.vocabulario, self.versao, self._vistas, diretorio)
+
+    def atualizar(self, conn):
+        """
+        Aplica só o que mudou desde a última leitura. Retorna o resumo
+        {'versao', 'completo', 'alterados', 'novos', 'removidos', 'segundos'}.
+        """
+        with self._lock:
+            return self._atualizar(conn)
+
+    def _atualizar(self, conn):
+        inicio = time.perf_counter()
+        if self.motor is None or self.versao is None or not self._com_changelog(conn):
+            self._carregar(conn)
+            return self._resumo(inicio, True, len(self))
+        cursor, vistas = _instantaneo(conn)
+        ids, completo = buscar_alteracoes(conn, self.versao, self._vistas)
+        if completo:
+            conn.rollback()
+            self._carregar(conn)
+            return self._resumo(inicio, True, len(self))
+        contagem = {'alterados': 0, 'novos': 0, 'removidos': 0}
+        if ids:
+            perfis = self.montar(conn, sorted(ids))
+            removidos = ids - set(perfis['id'].tolist())
+            motor = self.motor.copia()
+            contagem = motor.aplicar_alteracoes(perfis, removidos)
+            self._trocar(motor)
+        conn.rollback()
+        self.versao, self._vistas, self.origem = cursor, vistas, 'banco'
+        resumo = self._resumo(inicio, False, sum(contagem.values()))
+        resumo.update(contagem)
+        print(f"[IA-CLOUD] 🔁 Atualização incremental: {contagem['alterados']} alterados, "
+              f"{contagem['novos']} novos, {contagem['removidos']} removidos ({resumo['segundos']:.2f}s).")
+        return resumo
+
+    def atualizar_carga(self, colaboradores, carga_percent):
+        """Troca o motor por uma cópia com a nova carga dos colaboradores (os que não estão no motor são ignorados)."""
+        with self._lock:
+            if self.motor is None:
+                return
+            colaboradores = np.asarray(colaboradores, dtype=np.int64)
+            posicoes = pd.Index(self.motor.ids).get_indexer(colaboradores)
+            achados = posicoes >= 0
+            self._trocar(self.motor.com_carga(posicoes[achados], np.asarray(carga_percent)[achados]))
+
+    def _resumo(self, inicio, completo, linhas):
+        return {'versao': self.versao, 'completo': completo, 'linhas': linhas,
+                'alterados': 0, 'novos': 0, 'removidos': 0, 'segundos': time.perf_counter() - inicio}
+
+
+class OuvinteAlteracoes:
+    """
+    Opcional: escuta o canal de NOTIFY numa conexão própria (fora do pool) e conta as notificações
+    desde a última atualização, para a interface avisar que há dados novos sem consultar o banco.
+    """
+
+    def __init__(self, fabrica=None):
+        self.fabrica = fabrica if fabrica is not None else (lambda: psycopg2.connect(**configuracao_banco()))
+        self._pendentes = 0
+        self._lock = threading.Lock()   # a thread do LISTEN soma, a interface lê e zera
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def pendentes(self):
+        with self._lock:
+            return self._pendentes
+
+    def iniciar(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._escutar, daemon=True)
+            self._thread.start()
+        return self
+
+    def _escutar(self):
+        espera = ESPERA_RECONEXAO
+        while not self._parar.is_set():
+            conn = None
+            try:
+                conn = self.fabrica()
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {CANAL_NOTIFICACAO}")
+                espera = ESPERA_RECONEXAO
+                while not self._parar.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        with self._lock:
+                            self._pendentes += len(conn.notifies)
+                        conn.notifies.clear()
+            except (ConfiguracaoAusente, psycopg2.ProgrammingError) as e:
+                # Configuração inválida não se resolve sozinha: desiste em vez de tentar para sempre
+                print(f"[IA-CLOUD] ⚠️ Ouvinte de alterações desligado: {e}")
+                return
+            except Exception as e:
+                print(f"[IA-CLOUD] ⚠️ Ouvinte de alterações desconectado (nova tentativa em {espera:.0f} s): {e}")
+                self._parar.wait(espera)
+                espera = min(espera * 2, ESPERA_RECONEXAO_MAX)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def zerar(self):
+        """Zera a contagem e devolve quantas notificações havia."""
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, 0
+        return pendentes
+
+    def parar(self):
+        self._parar.set()
+
+
+class OuvinteInativo:
+    """Ouvinte para quando não há change-log a escutar (SQLite ou banco sem configuração): nunca há pendentes."""
+    pendentes = 0
+
+    def iniciar(self):
+        return self
+
+    def zerar(self):
+        return 0
+
+    def parar(self):
+        pass
+
+
+def criar_ouvinte(armazenamento=None):
+    """
+    OuvinteAlteracoes já iniciado, se o armazenamento tem change-log (PostgreSQL) e a configuração do banco
+    está completa; caso contrário um OuvinteInativo, sem thread nem tentativas de conexão.
+    """
+    armazenamento = armazenamento if armazenamento is not None else obter_armazenamento()
+    if not armazenamento.changelog:
+        return OuvinteInativo()
+    try:
+        config = configuracao_banco()
+    except ConfiguracaoAusente as e:
+        print(f"[IA-CLOUD] ⚠️ Ouvinte de alterações desligado: {e}")
+        return OuvinteInativo()
+    return OuvinteAlteracoes(lambda: psycopg2.connect(**config)).iniciar()
+
+
+if __name__ == "__main__":
+    from migracoes import aplicar_migracoes
+    conn = psycopg2.connect(**configuracao_banco())
+    aplicar_migracoes(conn)
+    instalar_changelog(conn)
+    print("[IA-CLOUD] ✅ Change-log e triggers de colaboradores instalados.")
+    conn.close()
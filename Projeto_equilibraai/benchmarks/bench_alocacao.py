@@ -0,0 +1,45 @@
+#Alocação global (matching de custo mínimo com capacidade por carga) contra o ranking sequencial
+#Uso: python benchmarks/bench_alocacao.py --n 50000 --tarefas 500
+import argparse
+import numpy as np
+from comum import PESOS_PADRAO, colaboradores_sinteticos, medir
+from motor_scores import MotorScores
+from alocacao import CARGA_POR_TAREFA, LIMITE_CARGA, alocar, alocar_guloso
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=50000)
+    parser.add_argument('--skills', type=int, default=500)
+    parser.add_argument('--tarefas', type=int, default=500)
+    args = parser.parse_args()
+
+    df = colaboradores_sinteticos(args.n, args.skills)
+    motor = MotorScores(df)
+    pesos = dict(PESOS_PADRAO, asp=0.0)
+    rng = np.random.default_rng(1)
+    # Poucas skills "quentes" por tarefa: é o cenário em que o mesmo colaborador lidera vários rankings
+    tarefas = [{'nome': f'Tarefa {i}', 'descricao': '', 'senioridade_peso_requerido': float(rng.choice([0.6, 0.8, 1.0])),
+                'skills_hard_requeridas': [f'Skill {s}' for s in rng.choice(np.arange(1, 31), 2, replace=False)],
+                'skills_soft_requeridas': []} for i in range(args.tarefas)]
+    carga = (1.0 - motor.carga) * 100.0
+
+    print("=" * 70)
+    print(f"🧩 ALOCAÇÃO: {args.tarefas} tarefas x {args.n} colaboradores "
+          f"(+{CARGA_POR_TAREFA:.0f}% de carga por tarefa, limite {LIMITE_CARGA:.0f}%)")
+    print("=" * 70)
+
+    # 1º do ranking de cada tarefa, sem considerar as tarefas anteriores (uso atual do recomendar)
+    t, topos = medir(lambda: motor.recomendar_lote(tarefas, pesos, k=1))
+    escolhidos = np.array([r.index[0] for r in topos])
+    contagem = np.bincount(escolhidos, minlength=len(motor))
+    acima = int((carga + contagem * CARGA_POR_TAREFA > LIMITE_CARGA)[contagem > 0].sum())
+    print(f"top-1 por tarefa : {t:6.2f} s | score total {sum(r['Score Final'].iloc[0] for r in topos):8.2f}"
+          f" (sem descontar carga) | máx. tarefas/pessoa {contagem.max():3d} | acima do limite {acima}")
+
+    for nome, funcao in (('guloso sequencial', alocar_guloso), ('ótimo (matching)', alocar)):
+        t, (res, carga_final) = medir(lambda: funcao(motor, tarefas, pesos))
+        por_pessoa = res['Colaborador'].value_counts()
+        print(f"{nome:17s}: {t:6.2f} s | score total {res['Score Final'].sum():8.2f}"
+              f" | máx. tarefas/pessoa {por_pessoa.max():3d} | sem alocação {int(res['Nome'].isna().sum())}"
+              f" | carga máx. {carga_final.max():.0f}%")
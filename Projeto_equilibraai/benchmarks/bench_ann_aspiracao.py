@@ -0,0 +1,68 @@
+#Recall x latência do índice ANN (IVF) da aspiração contra a busca exata no store de embeddings
+#Uso: python benchmarks/bench_ann_aspiracao.py --n 100000 --dim 128
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import comum  # noqa: F401  (ajusta o sys.path)
+from indice_ann import IndiceIVF
+from store_embeddings import StoreEmbeddings
+
+
+def vetores_sinteticos(n, dim, n_temas=64, ruido=0.6, seed=0):
+    """Aspirações simuladas: poucos 'temas' (interesses) + variação individual."""
+    rng = np.random.default_rng(seed)
+    temas = rng.standard_normal((n_temas, dim)).astype(np.float32)
+    return temas[rng.integers(0, n_temas, n)] + ruido * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=128)
+    parser.add_argument('--dtype', default='float16')
+    parser.add_argument('--k', type=int, default=100)
+    parser.add_argument('--consultas', type=int, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='bench_ann_')
+    store = StoreEmbeddings(os.path.join(tmp, 'asp'), dim=args.dim, dtype=args.dtype)
+    vet = vetores_sinteticos(args.n, args.dim)
+    for i in range(0, args.n, 50000):
+        store.gravar(np.arange(i, min(i + 50000, args.n)), vet[i:i + 50000])
+    consultas = vetores_sinteticos(args.consultas, args.dim, seed=1)
+
+    print("=" * 70)
+    print(f"🧭 ÍNDICE IVF: {args.n} colaboradores, dim {args.dim}, {args.dtype}, recall@{args.k}")
+    print("=" * 70)
+    t = time.perf_counter()
+    indice = IndiceIVF(store).treinar(np.arange(args.n))
+    print(f"Construção: {time.perf_counter() - t:.2f} s ({len(indice.centroides)} listas)")
+
+    t = time.perf_counter()
+    exatos = [set(np.argpartition(-store.similaridades(q), args.k)[:args.k].tolist()) for q in consultas]
+    t_exato = (time.perf_counter() - t) / len(consultas)
+    print(f"Busca exata: {t_exato * 1000:8.2f} ms/consulta")
+
+    for n_sondas in (1, 2, 4, 8, 16, 32, 64):
+        if n_sondas > len(indice.centroides):
+            break
+        t = time.perf_counter()
+        recalls, avaliados = [], []
+        for q, exato in zip(consultas, exatos):
+            linhas, _ = indice.buscar(q, args.k, n_sondas=n_sondas)
+            recalls.append(len(exato & set(linhas.tolist())) / args.k)
+            avaliados.append(indice.avaliados)
+        t_ann = (time.perf_counter() - t) / len(consultas)
+        print(f"n_sondas={n_sondas:3d}: recall {np.mean(recalls):6.3f} | {t_ann * 1000:8.2f} ms/consulta "
+              f"| {np.mean(avaliados) / args.n * 100:5.1f}% avaliados | {t_exato / t_ann:5.1f}x")
+
+    # Atualização incremental: 1% dos colaboradores muda de aspiração
+    mudaram = np.random.default_rng(2).choice(args.n, args.n // 100, replace=False)
+    t = time.perf_counter()
+    antigas = store.linhas(mudaram)
+    store.gravar(mudaram, vetores_sinteticos(len(mudaram), args.dim, seed=3))
+    indice.remover(antigas)
+    indice.adicionar(store.linhas(mudaram))
+    print(f"\nAtualização incremental de {len(mudaram)} colaboradores: {(time.perf_counter() - t) * 1000:.1f} ms")
@@ -0,0 +1,98 @@
+#Armazenamento SQLite embarcado: carga e consultas num arquivo local, sem banco de rede
+#Compara a importação original (um execute por linha, journal padrão) com inserir_linhas (executemany em WAL),
+#mede a carga completa dos perfis e a latência de uma consulta por colaborador (caminho da atualização incremental).
+#Uso: python benchmarks/bench_armazenamento_sqlite.py --n 100000
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import numpy as np
+from comum import INTERESSES, colaboradores_sinteticos, medir
+from armazenamento import ArmazenamentoSQLite, SQL_SCHEMA_SQLITE
+
+NIVEIS = [(1, 'Iniciante', '', 0.3), (2, 'Intermediário', '', 0.6), (3, 'Avançado', '', 0.8), (4, 'Especialista', '', 1.0)]
+
+
+def tabelas(n, n_skills, seed=0):
+    """Linhas das 7 tabelas, com as distribuições do gerador sintético dos outros benchmarks."""
+    rng = np.random.default_rng(seed)
+    df = colaboradores_sinteticos(n, n_skills, skills_por_colab=8, seed=seed)
+    n_hard = int(n_skills * 0.9)
+    return {
+        'nivel_experiencia': (['nivel_id', 'nome', 'descricao', 'peso'], NIVEIS),
+        'categoria_skill': (['categoria_id', 'nome', 'tipo', 'descricao'],
+                            [(1, 'Técnicas', 'hard_skill', ''), (2, 'Comportamentais', 'soft_skill', '')]),
+        'skill': (['skill_id', 'categoria_id', 'nome', 'descricao'],
+                  [(s, 1 if s <= n_hard else 2, f'Skill {s}', '') for s in range(1, n_skills + 1)]),
+        'interesse': (['interesse_id', 'nome', 'descricao'],
+                      [(k + 1, *texto.split(': ', 1)) for k, texto in enumerate(INTERESSES)]),
+        'colaborador': (['colaborador_id', 'nome', 'email', 'data_cadastro'],
+                        [(int(i), nome, f'c{i}@empresa.com', '2024-01-01') for i, nome in zip(df['id'], df['nome'])]),
+        'colaborador_skill': (['colaborador_id', 'skill_id', 'nivel_experiencia_id', 'confianca', 'data_avaliacao'],
+                              [(int(i), s, int(rng.integers(1, 5)), 0.9, '2024-01-01')
+                               for i, ids in zip(df['id'], df['skills_hard_ids']) for s in ids]),
+        'colaborador_interesse': (['colaborador_id', 'interesse_id'],
+                                  [(int(i), int(k) + 1) for i in df['id']
+                                   for k in rng.choice(len(INTERESSES), int(rng.integers(1, 3)), replace=False)]),
+    }
+
+
+def carga_por_linha(caminho, dados):
+    """A importação original: sqlite3 sem PRAGMAs e um cursor.execute por linha."""
+    conn = sqlite3.connect(caminho)
+    conn.executescript(SQL_SCHEMA_SQLITE)
+    cur = conn.cursor()
+    for tabela, (colunas, linhas) in dados.items():
+        sql = f"INSERT OR REPLACE INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})"
+        for linha in linhas:
+            cur.execute(sql, linha)
+    conn.commit()
+    conn.close()
+
+
+def carga_em_lote(caminho, dados):
+    armazenamento = ArmazenamentoSQLite(caminho)
+    conn = armazenamento.abrir(criar=True)
+    armazenamento.criar_schema(conn)
+    for tabela, (colunas, linhas) in dados.items():
+        armazenamento.inserir_linhas(conn, tabela, colunas, linhas, atualizar=True)
+    conn.commit()
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--skills', type=int, default=200)
+    parser.add_argument('--consultas', type=int, default=2000)
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix='sqlite_')
+    dados = tabelas(args.n, args.skills)
+    n_linhas = sum(len(linhas) for _, linhas in dados.values())
+    print("=" * 70)
+    print(f"🗄️  SQLITE: {args.n} colaboradores sintéticos, {n_linhas:,} linhas nas 7 tabelas")
+    print("=" * 70)
+
+    t_linha, _ = medir(lambda: carga_por_linha(os.path.join(pasta, 'por_linha.db'), dados))
+    caminho = os.path.join(pasta, 'equilibraai.db')
+    t_lote, _ = medir(lambda: carga_em_lote(caminho, dados))
+    print(f"carga execute por linha    : {t_linha:7.2f} s ({n_linhas / t_linha:10,.0f} linhas/s)")
+    print(f"carga executemany + WAL    : {t_lote:7.2f} s ({n_linhas / t_lote:10,.0f} linhas/s) -> {t_linha / t_lote:.1f}x")
+
+    armazenamento = ArmazenamentoSQLite(caminho)
+    with armazenamento.conexao() as conn:
+        t_perfis, df = medir(lambda: armazenamento.montar_colaboradores(conn), repeticoes=3)
+        print(f"perfis completos           : {t_perfis * 1000:7.1f} ms ({len(df)} colaboradores)")
+        rng = np.random.default_rng(1)
+        latencias = []
+        for cid in rng.integers(1, args.n + 1, args.consultas).tolist():
+            inicio = time.perf_counter()
+            armazenamento.montar_colaboradores(conn, [cid])
+            latencias.append(time.perf_counter() - inicio)
+        p50, p99 = np.percentile(latencias, [50, 99]) * 1000
+        print(f"perfil de 1 colaborador    : p50 {p50:.3f} ms | p99 {p99:.3f} ms ({args.consultas} consultas)")
+
+    shutil.rmtree(pasta, ignore_errors=True)
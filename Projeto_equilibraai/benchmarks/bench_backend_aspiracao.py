@@ -0,0 +1,97 @@
+#Paridade e benchmark dos backends de inferência da aspiração: TensorFlow (referência) x ONNX Runtime (fp32 e int8)
+#Por padrão usa um BERT minúsculo gerado localmente (sem download). Para o modelo real:
+#   python benchmarks/bench_backend_aspiracao.py --modelo neuralmind/bert-base-portuguese-cased
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from comum import INTERESSES, RAIZ
+
+# Mede cada backend num processo próprio, para que a memória de um não contamine o outro
+SCRIPT = r'''
+import json, os, sys, time
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+backend, modelo, onnx_dir, lote, repeticoes = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]), int(sys.argv[5])
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+base = rss_mb()
+t0 = time.perf_counter()
+if backend == 'tf':
+    from aspiracao import carregar_codificador_tf
+    cod = carregar_codificador_tf(modelo)
+else:
+    from aspiracao_onnx import CodificadorONNX, caminhos_onnx
+    from transformers import AutoTokenizer
+    fp32, int8 = caminhos_onnx(modelo, onnx_dir)
+    cod = CodificadorONNX(AutoTokenizer.from_pretrained(modelo), int8 if backend == 'onnx-int8' else fp32, modelo)
+t_carga = time.perf_counter() - t0
+from comum import INTERESSES
+textos = (INTERESSES * (lote // len(INTERESSES) + 1))[:lote]
+cod(textos)
+tempos = []
+for _ in range(repeticoes):
+    t = time.perf_counter(); cod(textos); tempos.append(time.perf_counter() - t)
+tempos.sort()
+print(json.dumps({'carga_s': t_carga, 'p50_ms': tempos[len(tempos) // 2] * 1000, 'min_ms': tempos[0] * 1000,
+                  'rss_mb': rss_mb() - base,
+                  'tensorflow_importado': 'tensorflow' in sys.modules}))
+'''
+
+TAREFAS = [
+    "Criar uma API RESTful usando Python e Flask, com integração ao banco de dados SQL.",
+    "Criar modelo de Machine Learning para prever cancelamento de clientes.",
+    "Desenvolver interfaces de usuário responsivas para o portal.",
+    "Liderar a equipe na adoção de metodologias ágeis.",
+]
+
+
+def medir_backend(backend, modelo, onnx_dir, lote, repeticoes):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([RAIZ, os.path.join(RAIZ, 'benchmarks')]))
+    saida = subprocess.run([sys.executable, '-c', SCRIPT, backend, modelo, onnx_dir, str(lote), str(repeticoes)],
+                           capture_output=True, text=True, env=env)
+    linhas = [l for l in saida.stdout.splitlines() if l.startswith('{')]
+    if not linhas:
+        raise RuntimeError(saida.stderr)
+    return json.loads(linhas[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modelo', default='minusculo', help="'minusculo' (gerado localmente) ou nome/caminho do modelo")
+    parser.add_argument('--lote', type=int, default=32)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    from aspiracao import carregar_codificador_tf
+    from aspiracao_onnx import TOLERANCIA_PARIDADE, CodificadorONNX, caminhos_onnx, deriva_paridade, modelo_bert_minusculo, preparar_onnx
+
+    tmp = tempfile.mkdtemp(prefix='bench_onnx_')
+    modelo = modelo_bert_minusculo(os.path.join(tmp, 'modelo')) if args.modelo == 'minusculo' else args.modelo
+    onnx_dir = os.path.join(tmp, 'onnx')
+
+    print("=" * 60)
+    print(f"🧪 PARIDADE TF x ONNX ({args.modelo})")
+    print("=" * 60)
+    referencia = carregar_codificador_tf(modelo)
+    preparar_onnx(referencia.model, modelo, onnx_dir)
+    fp32, int8 = caminhos_onnx(modelo, onnx_dir)
+    ok = True
+    for nome, caminho in (('onnx-fp32', fp32), ('onnx-int8', int8)):
+        deriva = deriva_paridade(referencia, CodificadorONNX(referencia.tokenizer, caminho, modelo), TAREFAS, INTERESSES)
+        status = "✅" if deriva <= TOLERANCIA_PARIDADE else "❌"
+        ok = ok and deriva <= TOLERANCIA_PARIDADE
+        print(f"   {status} {nome:10s} deriva máx. do cosseno = {deriva:.5f} (limite {TOLERANCIA_PARIDADE})")
+    print(f"   Tamanho: fp32 {os.path.getsize(fp32) / 2**20:.1f} MB | int8 {os.path.getsize(int8) / 2**20:.1f} MB")
+
+    print("\n" + "=" * 60)
+    print(f"⏱️  LATÊNCIA E MEMÓRIA (lote de {args.lote} textos, {args.repeticoes} repetições)")
+    print("=" * 60)
+    for backend in ('tf', 'onnx-fp32', 'onnx-int8'):
+        r = medir_backend(backend, modelo, onnx_dir, args.lote, args.repeticoes)
+        print(f"   {backend:10s} p50 {r['p50_ms']:8.2f} ms | min {r['min_ms']:8.2f} ms | carga {r['carga_s']:6.2f} s"
+              f" | +RSS {r['rss_mb']:7.1f} MB | TF importado: {r['tensorflow_importado']}")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,80 @@
+#Cache de resultados (cache_resultados.py): busca repetida contra a recomendação calculada de novo
+#Simula gestores repetindo demandas canônicas (popularidade Zipf) com os pesos padrão, mede o tempo de um acerto
+#e de uma falta, a taxa de acerto com o cache limitado e confere que uma alteração dos dados (alocação)
+#invalida os resultados antigos.
+#Uso: python benchmarks/bench_cache_resultados.py --n 100000 --demandas 200 --buscas 5000
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from comum import PESOS_PADRAO, INTERESSES, CodificadorSintetico, colaboradores_sinteticos, medir
+import ia_core_aws
+from aspiracao import CacheEmbeddings, ScorerAspiracao
+from cache_resultados import CacheResultados
+from motor_scores import MotorScores
+from store_embeddings import StoreEmbeddings
+
+
+def demandas(n, n_skills, seed=1):
+    rng = np.random.default_rng(seed)
+    return [{'nome': f'Demanda {i}', 'descricao': INTERESSES[i % len(INTERESSES)],
+             'senioridade_peso_requerido': float(rng.choice([0.3, 0.6, 0.8, 1.0])),
+             'skills_hard_requeridas': [f'Skill {s}' for s in rng.choice(np.arange(20, n_skills), 3, replace=False)],
+             'skills_soft_requeridas': []} for i in range(n)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--skills', type=int, default=500)
+    parser.add_argument('--demandas', type=int, default=200)
+    parser.add_argument('--buscas', type=int, default=5000)
+    parser.add_argument('--itens', type=int, default=64, help="capacidade do cache na simulação")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='bench_cache_')
+    df = colaboradores_sinteticos(args.n, args.skills)
+    scorer = ScorerAspiracao(CodificadorSintetico(), CacheEmbeddings(os.path.join(tmp, 'cache')))
+    motor = MotorScores(df, aspiracao=scorer, store=StoreEmbeddings(os.path.join(tmp, 'asp'), dim=64), usar_ann=False)
+    tarefas = demandas(args.demandas, args.skills)
+    motor.recomendar(tarefas[0], PESOS_PADRAO, podar=False)  # sincroniza o store
+
+    print("=" * 70)
+    print(f"⚡ CACHE DE RESULTADOS: {args.n:,} colaboradores, {args.demandas} demandas, {args.buscas} buscas")
+    print("=" * 70)
+    cache = ia_core_aws.cache_resultados = CacheResultados(max_itens=args.itens)
+    t_sem, ref = medir(lambda: ia_core_aws.recomendar(tarefas[1], motor.perfis, PESOS_PADRAO, motor=motor,
+                                                      usar_cache=False), 5)
+    t_falta, _ = medir(lambda: (cache.invalidar(),
+                                ia_core_aws.recomendar(tarefas[1], motor.perfis, PESOS_PADRAO, motor=motor)), 5)
+    t_acerto, res = medir(lambda: ia_core_aws.recomendar(tarefas[1], motor.perfis, PESOS_PADRAO, motor=motor), 1000)
+    # Mesma demanda com as skills em outra ordem e outro título: mesma chave
+    variante = dict(tarefas[1], nome='Outro título', skills_hard_requeridas=tarefas[1]['skills_hard_requeridas'][::-1])
+    t_var, res_var = medir(lambda: ia_core_aws.recomendar(variante, motor.perfis, PESOS_PADRAO, motor=motor), 1000)
+    print(f"sem cache: {t_sem * 1000:8.2f} ms | falta (calcula e guarda): {t_falta * 1000:8.2f} ms | "
+          f"acerto: {t_acerto * 1e6:6.1f} µs ({t_sem / t_acerto:,.0f}x)")
+    print(f"mesmo resultado: {res.equals(ref)} | demanda equivalente (outro título/ordem) acerta: "
+          f"{res_var is res} em {t_var * 1e6:.1f} µs")
+
+    cache.invalidar()
+    rng = np.random.default_rng(0)
+    popularidade = 1.0 / np.arange(1, args.demandas + 1)
+    sorteio = rng.choice(args.demandas, args.buscas, p=popularidade / popularidade.sum())
+    inicio = time.perf_counter()
+    for i in sorteio:
+        ia_core_aws.recomendar(tarefas[i], motor.perfis, PESOS_PADRAO, motor=motor)
+    total = time.perf_counter() - inicio
+    e = cache.estatisticas()
+    print(f"Zipf, cache de {args.itens} itens: taxa de acerto {e['taxa_acerto']:.1%}, {e['despejos']} despejos, "
+          f"{e['bytes'] / 2**10:.0f} KB | {total / args.buscas * 1000:.2f} ms por busca "
+          f"(sem cache ~{t_sem * 1000:.2f} ms)")
+
+    antes = ia_core_aws.recomendar(tarefas[1], motor.perfis, PESOS_PADRAO, motor=motor)
+    primeiro = antes.index[0]
+    motor = motor.com_carga(np.array([primeiro]), np.array([100]))  # alocação: o melhor ficou sem disponibilidade
+    depois = ia_core_aws.recomendar(tarefas[1], motor.perfis, PESOS_PADRAO, motor=motor)
+    e = cache.estatisticas()
+    print(f"depois de uma alocação: recalculado {depois is not antes} | 1º colocado com carga 100% continua "
+          f"no topo: {primeiro in depois.index} | {e['invalidados']} resultados antigos invalidados, "
+          f"{e['itens']} no cache")
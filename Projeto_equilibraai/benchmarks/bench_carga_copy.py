@@ -0,0 +1,137 @@
+#Carga dos CSVs do Deploy_nuvem: INSERT linha a linha (carga original) contra COPY em lotes (carga_em_massa)
+#Gera arquivos sintéticos com milhões de linhas, carrega num schema separado (bench_carga) do banco das
+#variáveis EQUILIBRAAI_DB_* e testa a retomada depois de uma interrupção. Use um PostgreSQL local.
+#Uso: python benchmarks/bench_carga_copy.py --colaboradores 1000000 --skills-por-colab 3
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import psycopg2
+from comum import RAIZ
+from pool_conexoes import configuracao_banco
+
+sys.path.insert(0, os.path.join(RAIZ, 'scripts_aws'))
+from carga_em_massa import carregar_csv  # noqa: E402
+
+SCHEMA = 'bench_carga'
+N_SKILLS = 50
+DDL = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+SET search_path TO {SCHEMA};
+CREATE TABLE nivel_experiencia (nivel_id INTEGER PRIMARY KEY, nome VARCHAR(100), descricao TEXT, peso REAL NOT NULL);
+CREATE TABLE skill (skill_id INTEGER PRIMARY KEY, categoria_id INTEGER NOT NULL, nome VARCHAR(100) NOT NULL UNIQUE, descricao TEXT);
+CREATE TABLE colaborador (colaborador_id SERIAL PRIMARY KEY, nome VARCHAR(150) NOT NULL, email VARCHAR(150) UNIQUE,
+                          data_cadastro DATE DEFAULT CURRENT_DATE);
+CREATE TABLE colaborador_skill (
+    colaborador_id INTEGER NOT NULL REFERENCES colaborador(colaborador_id),
+    skill_id INTEGER NOT NULL REFERENCES skill(skill_id),
+    nivel_experiencia_id INTEGER NOT NULL REFERENCES nivel_experiencia(nivel_id),
+    confianca REAL, data_avaliacao DATE, PRIMARY KEY (colaborador_id, skill_id));
+INSERT INTO nivel_experiencia VALUES (1, 'Iniciante', '', 0.3), (2, 'Intermediário', '', 0.6), (3, 'Avançado', '', 0.8), (4, 'Especialista', '', 1.0);
+INSERT INTO skill SELECT i, 1, 'Skill ' || i, 'Importada' FROM generate_series(1, {N_SKILLS}) AS i;
+"""
+
+
+def gerar_csvs(pasta, n, por_colab, seed=0):
+    """Mesmo formato de colaboradores_100.csv e colaborador_skills_100.csv, com `n` colaboradores."""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n + 1)
+    datas = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    colabs = pd.DataFrame({'colaborador_id': ids, 'nome': [f'Colaborador {i}' for i in ids],
+                           'email': [f'colaborador.{i}@empresa.com' for i in ids], 'data_cadastro': datas.strftime('%Y-%m-%d')})
+    # Skills distintas por colaborador: deslocamentos aleatórios sem repetição a partir de uma skill inicial
+    base = rng.integers(0, N_SKILLS, n)
+    passos = np.stack([rng.permutation(N_SKILLS - 1)[:por_colab] + 1 for _ in range(min(n, 1000))])
+    skill = (base[:, None] + passos[np.arange(n) % len(passos)]) % N_SKILLS + 1
+    vinculos = pd.DataFrame({'colaborador_id': np.repeat(ids, por_colab), 'skill_id': skill.ravel(),
+                             'nivel_experiencia_id': rng.integers(1, 5, n * por_colab),
+                             'confianca': np.round(rng.uniform(0.5, 1.0, n * por_colab), 2),
+                             'data_avaliacao': np.repeat(datas.strftime('%Y-%m-%d'), por_colab)})
+    caminhos = (os.path.join(pasta, 'colaboradores.csv'), os.path.join(pasta, 'colaborador_skills.csv'))
+    colabs.to_csv(caminhos[0], index=False)
+    vinculos.to_csv(caminhos[1], index=False)
+    return caminhos
+
+
+def insert_por_linha(conn, caminho, limite):
+    """A carga original: um cur.execute por linha do CSV (só as `limite` primeiras)."""
+    cur = conn.cursor()
+    df = pd.read_csv(caminho, nrows=limite)
+    inicio = time.perf_counter()
+    for row in df.itertuples(index=False):
+        cur.execute("""
+            INSERT INTO colaborador_skill (colaborador_id, skill_id, nivel_experiencia_id, confianca, data_avaliacao)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (colaborador_id, skill_id) DO NOTHING
+        """, (int(row.colaborador_id), int(row.skill_id), int(row.nivel_experiencia_id), float(row.confianca), row.data_avaliacao))
+    conn.commit()
+    return len(df) / (time.perf_counter() - inicio)
+
+
+def contar(conn, tabela):
+    cur = conn.cursor()
+    cur.execute(f"SELECT count(*) FROM {tabela}")
+    return cur.fetchone()[0]
+
+
+def limpar(conn):
+    cur = conn.cursor()
+    cur.execute("TRUNCATE colaborador_skill, colaborador, carga_progresso")
+    conn.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--colaboradores', type=int, default=1000000)
+    parser.add_argument('--skills-por-colab', type=int, default=3)
+    parser.add_argument('--lote', type=int, default=100000)
+    parser.add_argument('--linhas-insert', type=int, default=20000, help="linhas da carga linha a linha (amostra)")
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix='carga_')
+    inicio = time.perf_counter()
+    arq_colabs, arq_skills = gerar_csvs(pasta, args.colaboradores, args.skills_por_colab)
+    n_vinculos = args.colaboradores * args.skills_por_colab
+    conn = psycopg2.connect(**configuracao_banco())
+    conn.cursor().execute(DDL)
+    conn.commit()
+
+    print("=" * 70)
+    print(f"🚚 CARGA: {args.colaboradores:,} colaboradores + {n_vinculos:,} vínculos "
+          f"({(os.path.getsize(arq_colabs) + os.path.getsize(arq_skills)) / 2**20:.0f} MB de CSV, "
+          f"gerados em {time.perf_counter() - inicio:.1f} s)")
+    print("=" * 70)
+
+    # Linha a linha só numa amostra (os colaboradores precisam existir por causa da FK)
+    carregar_csv(conn, arq_colabs, 'colaborador', ['colaborador_id'], args.lote)
+    taxa_insert = insert_por_linha(conn, arq_skills, args.linhas_insert)
+    limpar(conn)
+
+    r_colabs = carregar_csv(conn, arq_colabs, 'colaborador', ['colaborador_id'], args.lote)
+    r_skills = carregar_csv(conn, arq_skills, 'colaborador_skill', ['colaborador_id', 'skill_id'], args.lote)
+    print()
+    print(f"INSERT por linha (amostra de {args.linhas_insert:,}): {taxa_insert:12,.0f} linhas/s "
+          f"(sem latência de rede; no RDS cada linha ainda paga uma ida e volta)")
+    print(f"COPY em lotes — colaboradores   : {r_colabs['linhas_por_s']:12,.0f} linhas/s ({r_colabs['segundos']:.1f} s)")
+    print(f"COPY em lotes — vínculos        : {r_skills['linhas_por_s']:12,.0f} linhas/s ({r_skills['segundos']:.1f} s)")
+    print(f"estimativa linha a linha p/ tudo: {(args.colaboradores + n_vinculos) / taxa_insert:.0f} s")
+
+    # Retomada: interrompe depois de 2 lotes e continua do offset salvo
+    limpar(conn)
+    carregar_csv(conn, arq_colabs, 'colaborador', ['colaborador_id'], args.lote)
+    parcial = carregar_csv(conn, arq_skills, 'colaborador_skill', ['colaborador_id', 'skill_id'], args.lote, max_lotes=2)
+    resto = carregar_csv(conn, arq_skills, 'colaborador_skill', ['colaborador_id', 'skill_id'], args.lote)
+    total = contar(conn, 'colaborador_skill')
+    print(f"retomada: {parcial['linhas']:,} linhas antes da interrupção, continuou da linha {resto['retomado_de']:,};"
+          f" {total:,} vínculos no banco (esperado {n_vinculos:,}) {'✅' if total == n_vinculos else '❌'}")
+
+    conn.rollback()
+    conn.cursor().execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    conn.commit()
+    conn.close()
+    shutil.rmtree(pasta, ignore_errors=True)
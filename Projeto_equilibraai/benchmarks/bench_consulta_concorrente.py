@@ -0,0 +1,161 @@
+#Carga completa dos perfis no PostgreSQL: consulta única (sequencial) contra faixas de ids consultadas em paralelo
+#Um proxy TCP local (num processo à parte, para não disputar o GIL com o app) fica entre o app e o banco das
+#variáveis EQUILIBRAAI_DB_* (use um local) e injeta latência de rede (RTT) e um limite de banda por conexão, como
+#entre o app e o RDS. Numa máquina com poucos núcleos o banco e o app disputam a CPU e o ganho fica limitado ao
+#tempo de rede; com o RDS o servidor também agrega as faixas em paralelo. Os dados sintéticos ficam num schema
+#separado (bench_concorrente), apagado no final. Também confere o resultado contra a consulta única e os modos
+#degradados (pool com menos conexões que faixas).
+#Uso: python benchmarks/bench_consulta_concorrente.py --n 20000 --rtt-ms 50 --banda-mb 2
+import argparse
+import multiprocessing
+import queue
+import socket
+import threading
+import time
+import warnings
+import psycopg2
+from comum import medir
+import dados_sinteticos
+from armazenamento import ArmazenamentoPostgres
+from pool_conexoes import PoolConexoes, configuracao_banco
+from telemetria import telemetria
+
+SCHEMA = 'bench_concorrente'
+warnings.filterwarnings("ignore")
+
+
+class ProxyLatencia:
+    """
+    Proxy TCP que entrega cada bloco recebido `latencia` s depois (nos dois sentidos, RTT = 2 x latência),
+    respeitando `banda` bytes/s por conexão e sentido. A leitura não espera a entrega: a latência não vira
+    limite de vazão, como num link de verdade.
+    """
+
+    def __init__(self, destino, latencia, banda=None):
+        self.destino = destino
+        self.latencia = latencia
+        self.banda = banda
+        self.servidor = socket.create_server(('127.0.0.1', 0))
+        self.porta = self.servidor.getsockname()[1]
+
+    def servir(self):
+        while True:
+            cliente, _ = self.servidor.accept()
+            banco = socket.create_connection(self.destino)
+            for origem, destino in ((cliente, banco), (banco, cliente)):
+                self._bombear(origem, destino)
+
+    def _bombear(self, origem, destino):
+        fila = queue.Queue()
+
+        def ler():
+            livre = 0.0   # quando o "link" termina de transmitir o que já entrou
+            while True:
+                try:
+                    dados = origem.recv(65536)
+                except OSError:
+                    dados = b''
+                agora = time.monotonic()
+                livre = max(agora, livre) + (len(dados) / self.banda if self.banda else 0.0)
+                fila.put((livre + self.latencia, dados))
+                if not dados:
+                    return
+
+        def entregar():
+            while True:
+                prazo, dados = fila.get()
+                espera = prazo - time.monotonic()
+                if espera > 0:
+                    time.sleep(espera)
+                try:
+                    if not dados:
+                        destino.shutdown(socket.SHUT_WR)
+                        return
+                    destino.sendall(dados)
+                except OSError:
+                    return
+
+        threading.Thread(target=ler, daemon=True).start()
+        threading.Thread(target=entregar, daemon=True).start()
+
+
+def _processo_proxy(destino, latencia, banda, saida):
+    proxy = ProxyLatencia(destino, latencia, banda)
+    saida.put(proxy.porta)
+    proxy.servir()
+
+
+def iniciar_proxy(destino, latencia, banda):
+    """Proxy num processo separado. (processo, porta)."""
+    saida = multiprocessing.Queue()
+    processo = multiprocessing.Process(target=_processo_proxy, args=(destino, latencia, banda, saida), daemon=True)
+    processo.start()
+    return processo, saida.get()
+
+
+def armazenamento_via_proxy(porta, paralelas, conexoes, min_por_faixa):
+    config = dict(configuracao_banco(), host='127.0.0.1', port=porta, options=f'-c search_path={SCHEMA}')
+    pool = PoolConexoes(fabrica=lambda: psycopg2.connect(**config), tamanho_max=conexoes)
+    return ArmazenamentoPostgres(pool=pool, paralelas=paralelas, min_por_faixa=min_por_faixa)
+
+
+def carga(armazenamento):
+    with armazenamento.conexao() as conn:
+        return armazenamento._perfis(conn, None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=20000)
+    parser.add_argument('--rtt-ms', type=float, default=50.0)
+    parser.add_argument('--banda-mb', type=float, default=2.0, help="MB/s por conexão (0 = sem limite)")
+    parser.add_argument('--paralelas', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--min-por-faixa', type=int, default=1000)
+    args = parser.parse_args()
+
+    config = configuracao_banco()
+    conn = psycopg2.connect(**config)
+    cur = conn.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}; SET search_path TO {SCHEMA}")
+    conn.commit()
+    print(f"Gerando {args.n:,} colaboradores no schema {SCHEMA}...")
+    dados_sinteticos.popular(ArmazenamentoPostgres(), conn, args.n)
+    conn.commit()
+
+    processo, porta = iniciar_proxy((config['host'], int(config['port'])), args.rtt_ms / 2000.0,
+                                    args.banda_mb * 2**20 if args.banda_mb else None)
+    print("=" * 70)
+    print(f"🚦 CONSULTA CONCORRENTE: {args.n:,} colaboradores | RTT {args.rtt_ms:g} ms | "
+          f"{args.banda_mb:g} MB/s por conexão")
+    print("=" * 70)
+    referencia = None
+    for paralelas in args.paralelas:
+        armazenamento = armazenamento_via_proxy(porta, paralelas, paralelas, args.min_por_faixa)
+        carga(armazenamento)  # abre as conexões do pool (o handshake não entra na medida)
+        telemetria.zerar()
+        tempo, df = medir(lambda: carga(armazenamento), args.repeticoes)
+        if referencia is None:
+            referencia = df
+        faixa = {linha['Etapa']: linha for linha in telemetria.resumo()}.get('fetch.consulta_faixa')
+        detalhe = (f" | faixa média {faixa['Média (ms)']:7.1f} ms, mais lenta {faixa['Máx (ms)']:7.1f} ms"
+                   if faixa else "")
+        print(f"{'sequencial' if paralelas == 1 else f'{paralelas} faixas':12s}: {tempo * 1000:8.1f} ms"
+              f"{detalhe} | igual à consulta única: {df.equals(referencia)}")
+
+    print("\nDegradação (4 faixas pedidas):")
+    for conexoes in (2, 1):
+        armazenamento = armazenamento_via_proxy(porta, 4, conexoes, args.min_por_faixa)
+        carga(armazenamento)
+        telemetria.zerar()
+        tempo, df = medir(lambda: carga(armazenamento), args.repeticoes)
+        contadores = telemetria.contadores()
+        print(f"pool de {conexoes} conexão(ões): {tempo * 1000:8.1f} ms | "
+              f"{contadores.get('faixas_concorrentes', 0) // args.repeticoes} faixas concorrentes, "
+              f"{contadores.get('faixas_sequenciais', 0) // args.repeticoes} em sequência | "
+              f"igual à consulta única: {df.equals(referencia)}")
+
+    processo.terminate()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    conn.commit()
+    conn.close()
@@ -0,0 +1,95 @@
+#Consulta única com agregação no servidor (QUERY_PERFIS) contra o caminho antigo de 4 consultas + iterrows
+#Cria um schema separado (bench_perfis) no banco das variáveis EQUILIBRAAI_DB_* com dados sintéticos
+#e o remove no final. Use um PostgreSQL local (EQUILIBRAAI_DB_SSLMODE=disable), não o de produção.
+#Uso: python benchmarks/bench_consulta_perfis.py --n 20000
+import argparse
+import io
+import time
+import numpy as np
+import psycopg2
+from comum import INTERESSES, colaboradores_sinteticos
+from pool_conexoes import configuracao_banco
+import ia_core_aws
+
+SCHEMA = 'bench_perfis'
+DDL = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+SET search_path TO {SCHEMA};
+CREATE TABLE nivel_experiencia (nivel_id INTEGER PRIMARY KEY, nome VARCHAR(100), descricao TEXT, peso REAL NOT NULL);
+CREATE TABLE categoria_skill (categoria_id INTEGER PRIMARY KEY, nome VARCHAR(100), tipo VARCHAR(50) NOT NULL, descricao TEXT);
+CREATE TABLE skill (skill_id INTEGER PRIMARY KEY, categoria_id INTEGER NOT NULL, nome VARCHAR(100) NOT NULL UNIQUE, descricao TEXT);
+CREATE TABLE colaborador (colaborador_id INTEGER PRIMARY KEY, nome VARCHAR(150) NOT NULL, email VARCHAR(150), data_cadastro DATE);
+CREATE TABLE colaborador_skill (colaborador_id INTEGER, skill_id INTEGER, nivel_experiencia_id INTEGER, confianca REAL,
+                                data_avaliacao DATE, PRIMARY KEY (colaborador_id, skill_id));
+CREATE TABLE interesse (interesse_id INTEGER PRIMARY KEY, nome VARCHAR(100), descricao TEXT);
+CREATE TABLE colaborador_interesse (colaborador_id INTEGER, interesse_id INTEGER, PRIMARY KEY (colaborador_id, interesse_id));
+INSERT INTO nivel_experiencia VALUES (1, 'Iniciante', '', 0.3), (2, 'Intermediário', '', 0.6), (3, 'Avançado', '', 0.8), (4, 'Especialista', '', 1.0);
+INSERT INTO categoria_skill VALUES (1, 'Técnicas', 'hard_skill', ''), (2, 'Comportamentais', 'soft_skill', '');
+"""
+
+
+def copiar(cur, tabela, linhas):
+    buffer = io.StringIO("".join("\t".join(map(str, l)) + "\n" for l in linhas))
+    cur.copy_expert(f"COPY {tabela} FROM STDIN", buffer)
+
+
+def popular(conn, n, n_skills, seed=0):
+    """Mesmas distribuições do gerador sintético dos outros benchmarks; as 10% últimas skills são soft."""
+    rng = np.random.default_rng(seed)
+    df = colaboradores_sinteticos(n, n_skills, skills_por_colab=8, seed=seed)
+    n_hard = int(n_skills * 0.9)
+    cur = conn.cursor()
+    cur.execute(DDL)
+    copiar(cur, 'skill', [(s, 1 if s <= n_hard else 2, f'Skill {s}', '') for s in range(1, n_skills + 1)])
+    copiar(cur, 'colaborador', [(i, nome, f'c{i}@empresa.com', '2024-01-01') for i, nome in zip(df['id'], df['nome'])])
+    copiar(cur, 'colaborador_skill', [(i, s, int(rng.integers(1, 5)), 0.9, '2024-01-01')
+                                      for i, ids in zip(df['id'], df['skills_hard_ids']) for s in ids])
+    copiar(cur, 'interesse', [(k + 1, *texto.split(': ', 1)) for k, texto in enumerate(INTERESSES)])
+    copiar(cur, 'colaborador_interesse', [(i, k + 1) for i in df['id']
+                                          for k in rng.choice(len(INTERESSES), int(rng.integers(1, 3)), replace=False)])
+    conn.commit()
+
+
+def linhas_transferidas(conn, consultas):
+    cur = conn.cursor()
+    total = 0
+    for sql in consultas:
+        cur.execute(sql)
+        total += len(cur.fetchall())
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=20000)
+    parser.add_argument('--skills', type=int, default=200)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**configuracao_banco())
+    popular(conn, args.n, args.skills)
+    conn.cursor().execute(f"SET search_path TO {SCHEMA}")
+    conn.commit()
+
+    print("=" * 70)
+    print(f"🗃️  PERFIS: {args.n} colaboradores sintéticos, {args.skills} skills")
+    print("=" * 70)
+    consultas_antigas = [
+        "SELECT colaborador_id, nome FROM colaborador",
+        "SELECT cs.colaborador_id, cs.skill_id, s.nome, cat.tipo FROM colaborador_skill cs "
+        "JOIN skill s ON cs.skill_id = s.skill_id JOIN categoria_skill cat ON s.categoria_id = cat.categoria_id",
+        "SELECT ci.colaborador_id, i.nome, i.descricao FROM colaborador_interesse ci JOIN interesse i ON ci.interesse_id = i.interesse_id",
+        "SELECT cs.colaborador_id, AVG(ne.peso) FROM colaborador_skill cs "
+        "JOIN nivel_experiencia ne ON cs.nivel_experiencia_id = ne.nivel_id GROUP BY cs.colaborador_id",
+    ]
+    for nome, montar, consultas in (('4 consultas + iterrows', ia_core_aws.montar_colaboradores_referencia, consultas_antigas),
+                                    ('consulta única agregada', ia_core_aws.montar_colaboradores, [ia_core_aws.QUERY_PERFIS])):
+        inicio = time.perf_counter()
+        df = montar(conn)
+        tempo = time.perf_counter() - inicio
+        print(f"➡️  {nome:24s}: {tempo:7.2f} s | {linhas_transferidas(conn, consultas):9d} linhas transferidas | {len(df)} perfis")
+
+    conn.rollback()
+    conn.cursor().execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    conn.commit()
+    conn.close()
@@ -0,0 +1,136 @@
+#Pipeline inteiro em escala: carga, codificação, pontuação e ranking com 10 mil, 100 mil e 1 milhão de colaboradores
+#Os dados vêm do dados_sinteticos.py (distribuições dos CSVs do projeto), gravados num SQLite temporário e, com
+#--postgres, também num schema separado (bench_escala) do banco das variáveis EQUILIBRAAI_DB_* (use um local).
+#Em cada escala, um teste diferencial confere que o motor vetorizado (completo, top-k podado, sem poda e em lote)
+#reproduz o ranking do recomendar_referencia numa amostra de colaboradores.
+#Uso: python benchmarks/bench_escala.py --escalas 10000 100000 1000000 [--postgres]
+import argparse
+import os
+import shutil
+import tempfile
+import numpy as np
+from comum import CodificadorSintetico, conferir_ranking, medir
+import ia_core_aws
+import dados_sinteticos
+from armazenamento import ArmazenamentoPostgres, ArmazenamentoSQLite
+from aspiracao import CacheEmbeddings, CarregadorModelo
+from motor_scores import MotorScores
+from store_embeddings import StoreEmbeddings
+
+SCHEMA = 'bench_escala'
+PESOS = {'hard': 0.4, 'soft': 0.1, 'sen': 0.25, 'carga': 0.15, 'asp': 0.1}
+NOMES_SKILL = {s: nome for s, _, nome, _ in dados_sinteticos.SKILLS}
+
+
+def tarefas_sinteticas(n, seed=1):
+    """Tarefas com skills sorteadas pela mesma popularidade dos perfis (tarefas realistas acertam alguém)."""
+    rng = np.random.default_rng(seed)
+    popularidade = dados_sinteticos.distribuicoes()['popularidade']
+    interesses = [f"{nome}: {descricao}" for _, nome, descricao in dados_sinteticos.INTERESSES]
+    return [{'nome': f'Tarefa {i}', 'descricao': f"{interesses[i % len(interesses)]} (tarefa {i})",
+             'senioridade_peso_requerido': float(rng.choice([0.3, 0.6, 0.8, 1.0])),
+             'skills_hard_requeridas': [NOMES_SKILL[s + 1] for s in rng.choice(len(popularidade), int(rng.integers(1, 5)),
+                                                                              replace=False, p=popularidade)],
+             'skills_soft_requeridas': []} for i in range(n)]
+
+
+def novo_motor(df, scorer, pasta):
+    # Store float32 e sem ANN: a aspiração sai igual à do scorer par-a-par da referência
+    return MotorScores(df, aspiracao=scorer, store=StoreEmbeddings(os.path.join(pasta, 'asp'), dim=64, dtype='float32'),
+                       usar_ann=False)
+
+
+def diferencial(df, tarefas, scorer, pasta, amostra, k, seed=0):
+    """Motor vetorizado contra o recomendar_referencia (loop por colaborador) numa amostra. {motor: [conferências]}."""
+    if len(df) > amostra:
+        df = df.iloc[np.sort(np.random.default_rng(seed).choice(len(df), amostra, replace=False))]
+    df = df.reset_index(drop=True)
+    motor = novo_motor(df, scorer, pasta)
+    referencias = [ia_core_aws.recomendar_referencia(t, df, PESOS) for t in tarefas]
+    candidatos = {
+        'completo': [motor.recomendar(t, PESOS, completo=True) for t in tarefas],
+        'top-k podado': [motor.recomendar(t, PESOS, k=k) for t in tarefas],
+        'top-k sem poda': [motor.recomendar(t, PESOS, k=k, podar=False) for t in tarefas],
+        'lote': motor.recomendar_lote(tarefas, PESOS, k=k),
+    }
+    return {nome: [conferir_ranking(ref, res) for ref, res in zip(referencias, resultados)]
+            for nome, resultados in candidatos.items()}
+
+
+def medir_escala(n, args, scorer, pasta, pg):
+    print(f"\n--- {n:,} colaboradores ---")
+    armazenamento = ArmazenamentoSQLite(os.path.join(pasta, f'escala_{n}.db'))
+    conn = armazenamento.abrir(criar=True)
+    t_gravar, contagem = medir(lambda: dados_sinteticos.popular(armazenamento, conn, n, seed=args.seed))
+    print(f"gerar + gravar (SQLite)  : {t_gravar:8.2f} s ({sum(contagem.values()):,} linhas)")
+    t_carga, df = medir(lambda: armazenamento.montar_colaboradores(conn))
+    conn.close()
+    print(f"carga dos perfis (SQLite): {t_carga:8.2f} s")
+    if pg is not None:
+        cur = pg.cursor()
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}; SET search_path TO {SCHEMA}")
+        pg.commit()
+        postgres = ArmazenamentoPostgres()
+        t_pg, _ = medir(lambda: dados_sinteticos.popular(postgres, pg, n, seed=args.seed))
+        t_carga_pg, _ = medir(lambda: postgres.montar_colaboradores(pg))
+        pg.rollback()
+        print(f"gerar + gravar (Postgres): {t_pg:8.2f} s | carga dos perfis (Postgres): {t_carga_pg:.2f} s")
+
+    tarefas = tarefas_sinteticas(args.tarefas)
+    t_motor, motor = medir(lambda: novo_motor(df, scorer, os.path.join(pasta, f'motor_{n}')))
+    t_asp, _ = medir(lambda: motor.score_aspiracao(tarefas[0]['descricao']))
+    print(f"codificar perfis (motor) : {t_motor:8.2f} s | aspirações no store: {t_asp:.2f} s")
+    pontuar = [medir(lambda: motor.soma_ponderada(motor.componentes(t), PESOS), 3)[0] for t in tarefas]
+    ranking, avaliados = [], []
+    for t in tarefas:
+        ranking.append(medir(lambda: motor.recomendar(t, PESOS, k=args.k), 3)[0])
+        avaliados.append(motor.avaliados)
+    fracao = np.median(avaliados) / n
+    print(f"pontuar (5 dimensões)    : {np.median(pontuar) * 1000:8.2f} ms por tarefa")
+    print(f"{'ranking top-' + str(args.k):25s}: {np.median(ranking) * 1000:8.2f} ms por tarefa "
+          f"(podado: {fracao:.1%} pontuados, {1 - fracao:.1%} podados, mediana das tarefas)")
+
+    conferencias = diferencial(df, tarefas, scorer, os.path.join(pasta, f'diferencial_{n}'), args.amostra, args.k)
+    amostra = min(n, args.amostra)
+    for nome, resultados in conferencias.items():
+        print(f"diferencial {nome:15s}: {'✅' if all(r['ok'] for r in resultados) else '❌'} "
+              f"({sum(r['ok'] for r in resultados)}/{len(resultados)} tarefas, {amostra:,} colaboradores, "
+              f"dif. máx {max(r['max_diferenca'] for r in resultados):.1e}, "
+              f"ordem idêntica em {sum(r['mesma_ordem'] for r in resultados)})")
+    return all(r['ok'] for resultados in conferencias.values() for r in resultados)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--escalas', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--tarefas', type=int, default=10)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--amostra', type=int, default=10000, help="colaboradores no teste diferencial")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--postgres', action='store_true')
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix='bench_escala_')
+    # A referência (calc_asp) e o motor usam o mesmo codificador sintético, com cache temporário
+    carregador = CarregadorModelo(fabrica=CodificadorSintetico)
+    scorer = carregador.obter()
+    scorer.cache = CacheEmbeddings(os.path.join(pasta, 'cache'))
+    ia_core_aws.carregador_modelo = carregador
+    pg = None
+    if args.postgres:
+        import psycopg2
+        from pool_conexoes import configuracao_banco
+        pg = psycopg2.connect(**configuracao_banco())
+
+    print("=" * 70)
+    print(f"📈 ESCALA: {', '.join(f'{n:,}' for n in args.escalas)} colaboradores | {args.tarefas} tarefas, top-{args.k}")
+    print("=" * 70)
+    ok = all([medir_escala(n, args, scorer, pasta, pg) for n in args.escalas])
+    print(f"\nmotor vetorizado reproduz o recomendar_referencia em todas as escalas: {'✅' if ok else '❌'}")
+
+    if pg is not None:
+        pg.rollback()
+        pg.cursor().execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        pg.commit()
+        pg.close()
+    shutil.rmtree(pasta, ignore_errors=True)
@@ -0,0 +1,114 @@
+#Índices das migrações: planos e tempos das consultas de perfis antes e depois dos índices secundários
+#Cria um schema separado (bench_indices) no banco das variáveis EQUILIBRAAI_DB_*, aplica só a migração 001
+#(tabelas com chaves primárias), carrega dados sintéticos e mede; depois aplica o resto e mede de novo.
+#Use um PostgreSQL local (EQUILIBRAAI_DB_SSLMODE=disable), não o de produção.
+#Uso: python benchmarks/bench_indices_perfis.py --n 200000
+import argparse
+import time
+import numpy as np
+import psycopg2
+from comum import INTERESSES, colaboradores_sinteticos
+from bench_consulta_perfis import copiar
+from pool_conexoes import configuracao_banco
+from armazenamento import QUERY_PERFIS_IDS
+import migracoes
+
+SCHEMA = 'bench_indices'
+
+
+def popular(conn, n, n_skills, seed=0):
+    """Mesmas distribuições do bench_consulta_perfis, respeitando as chaves estrangeiras da migração 001."""
+    rng = np.random.default_rng(seed)
+    df = colaboradores_sinteticos(n, n_skills, skills_por_colab=8, seed=seed)
+    n_hard = int(n_skills * 0.9)
+    cur = conn.cursor()
+    copiar(cur, 'nivel_experiencia', [(1, 'Iniciante', '', 0.3), (2, 'Intermediário', '', 0.6),
+                                      (3, 'Avançado', '', 0.8), (4, 'Especialista', '', 1.0)])
+    copiar(cur, 'categoria_skill', [(1, 'Técnicas', 'hard_skill', ''), (2, 'Comportamentais', 'soft_skill', '')])
+    # Uma skill a mais, sem ninguém: é a que o teste de exclusão apaga
+    copiar(cur, 'skill', [(s, 1 if s <= n_hard else 2, f'Skill {s}', '') for s in range(1, n_skills + 2)])
+    copiar(cur, 'colaborador', [(i, nome, f'c{i}@empresa.com', '2024-01-01') for i, nome in zip(df['id'], df['nome'])])
+    copiar(cur, 'colaborador_skill', [(i, s, int(rng.integers(1, 5)), 0.9, '2024-01-01')
+                                      for i, ids in zip(df['id'], df['skills_hard_ids']) for s in ids])
+    copiar(cur, 'interesse', [(k + 1, *texto.split(': ', 1)) for k, texto in enumerate(INTERESSES)])
+    copiar(cur, 'colaborador_interesse', [(i, k + 1) for i in df['id']
+                                          for k in rng.choice(len(INTERESSES), int(rng.integers(1, 3)), replace=False)])
+    conn.commit()
+    conn.autocommit = True
+    conn.cursor().execute("VACUUM ANALYZE")
+    conn.autocommit = False
+
+
+def tempo(conn, sql, params, repeticoes=20):
+    """Mediana em ms."""
+    cur = conn.cursor()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        cur.execute(sql, params)
+        cur.fetchall()
+        tempos.append(time.perf_counter() - inicio)
+    conn.rollback()
+    return float(np.median(tempos)) * 1000
+
+
+def apagar_skill(conn, skill_id):
+    """DELETE de uma skill sem vínculos: o custo é a checagem da FK em colaborador_skill."""
+    cur = conn.cursor()
+    inicio = time.perf_counter()
+    cur.execute("DELETE FROM skill WHERE skill_id = %s", (skill_id,))
+    decorrido = time.perf_counter() - inicio
+    conn.rollback()
+    return decorrido * 1000
+
+
+def medir(conn, titulo, n_skills):
+    print(f"\n--- {titulo} (schema versão {migracoes.versao_schema(conn)}) ---")
+    resultado = migracoes.verificar_planos(conn)
+    migracoes.imprimir_planos(resultado)
+    ids = list(range(1, 20001, 1000))
+    cur = conn.cursor()
+    cur.execute("""SELECT s.nome FROM skill s JOIN colaborador_skill cs ON cs.skill_id = s.skill_id
+                   GROUP BY s.nome ORDER BY count(*) LIMIT 3""")
+    nomes = [n for n, in cur.fetchall()]
+    conn.rollback()
+    t_ids = tempo(conn, QUERY_PERFIS_IDS, {'ids': ids})
+    t_skill = tempo(conn, migracoes.QUERY_COLABORADORES_POR_SKILL, {'nomes': nomes})
+    t_delete = float(np.median([apagar_skill(conn, n_skills + 1) for _ in range(5)]))
+    print(f"perfis de {len(ids)} colaboradores : {t_ids:8.2f} ms")
+    print(f"colaboradores por skill    : {t_skill:8.2f} ms")
+    print(f"DELETE de skill (checa FK) : {t_delete:8.2f} ms")
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=200000)
+    parser.add_argument('--skills', type=int, default=2000)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**configuracao_banco())
+    cur = conn.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}; SET search_path TO {SCHEMA}")
+    conn.commit()
+
+    print("=" * 70)
+    print(f"🧱 ÍNDICES: {args.n} colaboradores sintéticos, {args.skills} skills")
+    print("=" * 70)
+    migracoes.aplicar_migracoes(conn, alvo=1)
+    popular(conn, args.n, args.skills)
+    antes = medir(conn, "só chaves primárias", args.skills)
+    migracoes.aplicar_migracoes(conn)
+    conn.autocommit = True
+    conn.cursor().execute("ANALYZE")
+    conn.autocommit = False
+    depois = medir(conn, "com os índices das migrações", args.skills)
+    reaplicadas = migracoes.aplicar_migracoes(conn)
+    print(f"\nreaplicar as migrações: {len(reaplicadas)} aplicada(s) (esperado 0) {'✅' if not reaplicadas else '❌'}")
+    print(f"planos sem Seq Scan nas tabelas grandes: antes {all(r['ok'] for r in antes.values())}, "
+          f"depois {all(r['ok'] for r in depois.values())}")
+
+    conn.rollback()
+    conn.cursor().execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    conn.commit()
+    conn.close()
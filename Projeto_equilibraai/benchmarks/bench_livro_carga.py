@@ -0,0 +1,123 @@
+#Livro de carga (livro_carga.py): atribuição/conclusão incremental contra reagregar o histórico de tarefas
+#Monta um histórico de alocacao_tarefa em memória (tarefas abertas e concluídas nos últimos dias), carrega o livro
+#como na carga completa e reproduz uma sequência de eventos com o relógio andando. Mede o custo por evento do
+#livro, a leitura da carga de todos os colaboradores e o groupby do pandas que recalcula o mesmo do histórico,
+#e confere que carga atual e agregados da janela batem com esse recálculo.
+#Uso: python benchmarks/bench_livro_carga.py --n 100000 --eventos 20000
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from comum import medir
+from livro_carga import AGREGADOS, LivroCarga
+
+DIA = 86400.0
+
+
+class HistoricoMemoria:
+    """Faz o papel do armazenamento: as consultas do livro de carga sobre um DataFrame de alocacao_tarefa."""
+
+    def __init__(self, tarefas):
+        self.tarefas = tarefas
+
+    def livro_instalado(self, conn):
+        return True
+
+    def totais_carga(self, conn, ids=None):
+        abertas = self.tarefas[self.tarefas['concluida_em'].isna()]
+        return (abertas.groupby('colaborador_id')['carga_percent'].agg(carga_percent='sum', tarefas_abertas='size')
+                .reset_index())
+
+    def eventos_carga(self, conn, desde):
+        t = self.tarefas
+        atribuidas = t[t['atribuida_em'] >= desde].assign(instante=lambda d: d['atribuida_em'], concluida=False)
+        concluidas = t[t['concluida_em'] >= desde].assign(instante=lambda d: d['concluida_em'], concluida=True)
+        colunas = ['instante', 'colaborador_id', 'carga_percent', 'concluida']
+        return pd.concat([atribuidas[colunas], concluidas[colunas]]).sort_values('instante', kind='stable')
+
+
+def historico(n, agora, dias, rng):
+    """Tarefas dos últimos `dias`: ~3,5 por colaborador, metade ainda aberta."""
+    m = int(n * 3.5)
+    atribuida = agora - rng.uniform(0, dias, m) * DIA
+    concluida = np.minimum(atribuida + rng.uniform(1, 30, m) * DIA, agora)
+    return pd.DataFrame({'colaborador_id': rng.integers(1, n + 1, m),
+                         'carga_percent': rng.choice([10.0, 15.0, 20.0, 25.0], m),
+                         'atribuida_em': atribuida,
+                         'concluida_em': np.where(rng.random(m) < 0.5, np.nan, concluida)})
+
+
+def recalcular(tarefas, agora, janela):
+    """O que o livro evita: carga atual e agregados da janela reagregados do histórico inteiro."""
+    abertas = tarefas[tarefas['concluida_em'].isna()].groupby('colaborador_id')['carga_percent'].sum()
+    na_janela = tarefas[tarefas['atribuida_em'] >= agora - janela].groupby('colaborador_id')
+    concluidas = tarefas[tarefas['concluida_em'] >= agora - janela].groupby('colaborador_id').size()
+    return pd.DataFrame({'carga_atual_percent': abertas, 'tarefas_atribuidas': na_janela.size(),
+                         'carga_atribuida': na_janela['carga_percent'].sum(),
+                         'tarefas_concluidas': concluidas}).fillna(0.0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--eventos', type=int, default=20000)
+    parser.add_argument('--dias', type=float, default=90, help="idade máxima do histórico")
+    parser.add_argument('--janela', type=float, default=30, help="janela dos agregados (dias)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    relogio = [time.time()]
+    janela = args.janela * DIA
+    tarefas = historico(args.n, relogio[0], args.dias, rng)
+    print("=" * 70)
+    print(f"📒 LIVRO DE CARGA: {args.n:,} colaboradores, {len(tarefas):,} tarefas no histórico, "
+          f"{args.eventos:,} eventos, janela de {args.janela:g} dias")
+    print("=" * 70)
+
+    todos = np.arange(1, args.n + 1)
+    livro = LivroCarga(janela=janela, relogio=lambda: relogio[0])
+    t_carga, _ = medir(lambda: livro.carregar(HistoricoMemoria(tarefas), None, todos), 1)
+
+    # Eventos a cada ~1 min: metade atribui uma tarefa nova, metade conclui uma aberta
+    passos = rng.exponential(60.0, args.eventos)
+    atribui = rng.random(args.eventos) < 0.5
+    novos_colab = rng.integers(1, args.n + 1, args.eventos)
+    novas_cargas = rng.choice([10.0, 15.0, 20.0, 25.0], args.eventos)
+    abertas = list(np.flatnonzero(tarefas['concluida_em'].isna().to_numpy()))
+    rng.shuffle(abertas)
+    colab = tarefas['colaborador_id'].to_numpy()
+    carga = tarefas['carga_percent'].to_numpy()
+    novas, fechadas = [], []
+    t_eventos = 0.0
+    for i in range(args.eventos):
+        relogio[0] += passos[i]
+        inicio = time.perf_counter()
+        if atribui[i] or not abertas:
+            livro.atribuir(novos_colab[i], novas_cargas[i])
+            novas.append((novos_colab[i], novas_cargas[i], relogio[0]))
+        else:
+            linha = abertas.pop()
+            livro.concluir(colab[linha], carga[linha])
+            fechadas.append((linha, relogio[0]))
+        t_eventos += time.perf_counter() - inicio
+    # O mesmo histórico, como ficaria no banco depois dos eventos
+    linhas, instantes = zip(*fechadas) if fechadas else ((), ())
+    tarefas.loc[list(linhas), 'concluida_em'] = list(instantes)
+    if novas:
+        ids, cargas, instantes = zip(*novas)
+        tarefas = pd.concat([tarefas, pd.DataFrame({'colaborador_id': ids, 'carga_percent': cargas,
+                                                    'atribuida_em': instantes, 'concluida_em': np.nan})],
+                            ignore_index=True)
+
+    t_leitura, _ = medir(lambda: livro.carga_percent(todos), 20)
+    t_agregados, ag = medir(lambda: livro.agregados(todos), 5)
+    t_recalculo, ref = medir(lambda: recalcular(tarefas, relogio[0], janela), 3)
+    ref = ref.reindex(todos, fill_value=0.0)
+    iguais = all(np.allclose(ag[c].to_numpy(), ref[c].to_numpy()) for c in ('carga_atual_percent',) + AGREGADOS)
+
+    por_evento = t_eventos / args.eventos
+    print(f"carga completa do livro: {t_carga * 1000:8.1f} ms (uma vez)")
+    print(f"por evento (atribuir/concluir): {por_evento * 1e6:6.1f} µs | recalcular do histórico: "
+          f"{t_recalculo * 1000:8.1f} ms ({t_recalculo / por_evento:,.0f}x)")
+    print(f"carga de todos os colaboradores: {t_leitura * 1000:6.2f} ms | agregados da janela: "
+          f"{t_agregados * 1000:6.2f} ms | igual ao recálculo: {iguais}")
@@ -0,0 +1,42 @@
+#recomendar_lote (tarefas em blocos, produtos matriz-matriz) contra uma chamada de recomendar por tarefa
+#Uso: python benchmarks/bench_lote.py --n 20000 --tarefas 200
+import argparse
+import tempfile
+import numpy as np
+from comum import PESOS_PADRAO, INTERESSES, CodificadorSintetico, colaboradores_sinteticos, medir
+from aspiracao import CacheEmbeddings, ScorerAspiracao
+from motor_scores import MotorScores
+from store_embeddings import StoreEmbeddings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=20000)
+    parser.add_argument('--skills', type=int, default=500)
+    parser.add_argument('--tarefas', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='bench_lote_')
+    df = colaboradores_sinteticos(args.n, args.skills)
+    codificador = CodificadorSintetico()
+    scorer = ScorerAspiracao(codificador, CacheEmbeddings(tmp))
+    motor = MotorScores(df, aspiracao=scorer, store=StoreEmbeddings(tmp + '/asp', dim=64), usar_ann=False)
+    rng = np.random.default_rng(1)
+    tarefas = [{'descricao': f"{INTERESSES[i % len(INTERESSES)]} - tarefa {i}", 'senioridade_peso_requerido': 0.8,
+                'skills_hard_requeridas': [f'Skill {s}' for s in rng.choice(np.arange(1, args.skills + 1), 3, replace=False)],
+                'skills_soft_requeridas': []} for i in range(args.tarefas)]
+    motor.recomendar(tarefas[0], PESOS_PADRAO, k=args.k)  # sincroniza o store
+
+    print("=" * 70)
+    print(f"📦 LOTE: {args.tarefas} tarefas x {args.n} colaboradores, top-{args.k}")
+    print("=" * 70)
+    # Cache de embeddings vazio em cada medição: as descrições das tarefas passam pelo codificador
+    codificador.chamadas, scorer.cache = 0, CacheEmbeddings(tempfile.mkdtemp(prefix='bench_lote_'))
+    t_loop, ref = medir(lambda: [motor.recomendar(t, PESOS_PADRAO, k=args.k, podar=False) for t in tarefas])
+    chamadas_loop = codificador.chamadas
+    codificador.chamadas, scorer.cache = 0, CacheEmbeddings(tempfile.mkdtemp(prefix='bench_lote_'))
+    t_lote, res = medir(lambda: motor.recomendar_lote(tarefas, PESOS_PADRAO, k=args.k))
+    iguais = all(list(a.index) == list(b.index) for a, b in zip(res, ref))
+    print(f"uma a uma : {t_loop:7.3f} s | {chamadas_loop} chamadas ao codificador")
+    print(f"em lote   : {t_lote:7.3f} s | {codificador.chamadas} chamadas ao codificador | mesmo top-k: {iguais}")
@@ -0,0 +1,65 @@
+#Memória dos perfis: DataFrame de listas (formato de montar_colaboradores) contra PerfisCompactos
+#A memória do DataFrame é medida com tracemalloc (tudo o que ele mantém vivo, inclusive os objetos str/int das
+#listas); a dos perfis compactos é a soma de PerfisCompactos.memoria() (arrays + textos internados).
+#Os números são extrapolados para 1 milhão de colaboradores. Também confere que o motor dá o mesmo ranking.
+#Uso: python benchmarks/bench_perfis_compactos.py --n 200000
+import argparse
+import gc
+import time
+import tracemalloc
+import numpy as np
+from comum import PESOS_PADRAO, TAREFA_PADRAO, colaboradores_sinteticos, medir
+from perfis_compactos import PerfisCompactos
+from motor_scores import MotorScores
+
+MILHAO = 1_000_000
+
+
+def memoria_viva(construir):
+    """(objeto, bytes que ele mantém alocados) medidos com tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    objeto = construir()
+    gc.collect()
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objeto, atual
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=200000)
+    parser.add_argument('--skills', type=int, default=2000)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"🧮 PERFIS COMPACTOS: {args.n} colaboradores sintéticos, 8 skills sorteadas por colaborador")
+    print("=" * 70)
+    df, m_df = memoria_viva(lambda: colaboradores_sinteticos(args.n, args.skills, skills_por_colab=8))
+    t_conv, perfis = medir(lambda: PerfisCompactos.do_dataframe(df))
+    m_perfis = sum(perfis.memoria().values())
+    escala = MILHAO / args.n
+    print(f"DataFrame de listas : {m_df / 2**20:8.1f} MB ({m_df * escala / 2**30:5.2f} GB por milhão)")
+    print(f"PerfisCompactos     : {m_perfis / 2**20:8.1f} MB ({m_perfis * escala / 2**20:5.0f} MB por milhão)"
+          f" -> {m_df / m_perfis:.1f}x menos")
+    for parte, tamanho in sorted(perfis.memoria().items(), key=lambda x: -x[1]):
+        print(f"    {parte:12s}: {tamanho * escala / 2**20:7.1f} MB por milhão")
+    print(f"conversão do DataFrame: {t_conv:.2f} s")
+
+    rng = np.random.default_rng(0)
+    posicoes = rng.integers(0, len(perfis), 10000).tolist()
+    inicio = time.perf_counter()
+    for pos in posicoes:
+        perfil = perfis[pos]
+        perfil.nome, perfil.skills_hard_ids, perfil.carga_atual_percent
+    print(f"acesso a 1 perfil    : {(time.perf_counter() - inicio) / len(posicoes) * 1e6:.2f} µs")
+    t_df, _ = medir(lambda: perfis.para_dataframe(np.arange(10)), repeticoes=20)
+    print(f"DataFrame de 10 perfis (exibição): {t_df * 1000:.2f} ms")
+
+    pesos = dict(PESOS_PADRAO, asp=0.0)
+    t_motor_df, motor_df = medir(lambda: MotorScores(df))
+    t_motor, motor = medir(lambda: MotorScores(perfis, motor_df.vocabulario))
+    a = motor_df.recomendar(TAREFA_PADRAO, pesos, k=50)
+    b = motor.recomendar(TAREFA_PADRAO, pesos, k=50)
+    print(f"motor a partir do DataFrame {t_motor_df:.2f} s | dos perfis compactos {t_motor:.2f} s")
+    print(f"mesmo ranking: {list(a.index) == list(b.index) and a['Nome'].equals(b['Nome'])}")
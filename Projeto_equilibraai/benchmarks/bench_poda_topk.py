@@ -0,0 +1,44 @@
+#Top-k podado (índice invertido + tetos estilo WAND) contra a pontuação completa de todos os colaboradores
+#Uso: python benchmarks/bench_poda_topk.py --n 200000 --skills 500
+import argparse
+import tempfile
+import numpy as np
+from comum import PESOS_PADRAO, INTERESSES, CodificadorSintetico, colaboradores_sinteticos, medir
+from aspiracao import CacheEmbeddings, ScorerAspiracao
+from motor_scores import MotorScores
+from store_embeddings import StoreEmbeddings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=200000)
+    parser.add_argument('--skills', type=int, default=500)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--tarefas', type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='bench_poda_')
+    df = colaboradores_sinteticos(args.n, args.skills)
+    scorer = ScorerAspiracao(CodificadorSintetico(), CacheEmbeddings(tmp))
+    motor = MotorScores(df, aspiracao=scorer, store=StoreEmbeddings(tmp + '/asp', dim=64), usar_ann=False)
+    rng = np.random.default_rng(1)
+    tarefas = [{'descricao': INTERESSES[i % len(INTERESSES)], 'senioridade_peso_requerido': 0.8,
+                'skills_hard_requeridas': [f'Skill {s}' for s in rng.choice(np.arange(20, args.skills), 3, replace=False)],
+                'skills_soft_requeridas': []} for i in range(args.tarefas)]
+    motor.recomendar(tarefas[0], PESOS_PADRAO, k=args.k, podar=False)  # sincroniza o store
+
+    print("=" * 70)
+    print(f"✂️  TOP-{args.k} PODADO: {args.n} colaboradores, {args.skills} skills, pesos {PESOS_PADRAO}")
+    print("=" * 70)
+    for nome, pesos in (('padrão', PESOS_PADRAO), ('só skills', {'hard': 0.8, 'soft': 0.2, 'sen': 0, 'carga': 0, 'asp': 0})):
+        t_completo = t_podado = 0.0
+        avaliados, iguais = [], True
+        for tarefa in tarefas:
+            t, ref = medir(lambda: motor.recomendar(tarefa, pesos, k=args.k, podar=False), 3)
+            t_completo += t
+            t, res = medir(lambda: motor.recomendar(tarefa, pesos, k=args.k), 3)
+            t_podado += t
+            avaliados.append(motor.avaliados)
+            iguais &= list(res.index) == list(ref.index)
+        print(f"[{nome}] completo {t_completo / len(tarefas) * 1000:7.2f} ms | podado {t_podado / len(tarefas) * 1000:7.2f} ms"
+              f" | pontuados {np.mean(avaliados):9.0f} de {args.n} | mesmo top-k: {iguais}")
@@ -0,0 +1,62 @@
+#Recarga dos dados com o pool de conexões contra uma conexão nova por consulta
+#Usa o banco configurado nas variáveis EQUILIBRAAI_DB_* (ex.: um PostgreSQL local com EQUILIBRAAI_DB_SSLMODE=disable)
+#Uso: python benchmarks/bench_pool_conexoes.py --recargas 20
+import argparse
+import threading
+import time
+import psycopg2
+import comum  # noqa: F401  (ajusta o sys.path)
+from pool_conexoes import PoolConexoes, configuracao_banco
+
+CONSULTA = "SELECT count(*) FROM colaborador_skill"
+
+
+def consultar(conn):
+    cur = conn.cursor()
+    cur.execute(CONSULTA)
+    cur.fetchone()
+    cur.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recargas', type=int, default=20)
+    parser.add_argument('--consultas', type=int, default=5, help="consultas por recarga (o fetch faz 5)")
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+    config = configuracao_banco()
+
+    print("=" * 70)
+    print(f"🔌 POOL DE CONEXÕES: {config['host']}:{config['port']} (sslmode={config['sslmode']})")
+    print("=" * 70)
+
+    inicio = time.perf_counter()
+    for _ in range(args.recargas * args.consultas):
+        conn = psycopg2.connect(**config)
+        consultar(conn)
+        conn.close()
+    sem_pool = time.perf_counter() - inicio
+
+    pool = PoolConexoes(tamanho_max=args.threads)
+    inicio = time.perf_counter()
+    for _ in range(args.recargas * args.consultas):
+        with pool.conexao() as conn:
+            consultar(conn)
+    com_pool = time.perf_counter() - inicio
+    n = args.recargas * args.consultas
+    print(f"conexão nova por consulta: {sem_pool / n * 1000:7.2f} ms/consulta")
+    print(f"pool                     : {com_pool / n * 1000:7.2f} ms/consulta")
+
+    # Concorrência: mais threads do que conexões, para medir a espera na retirada
+    def trabalhador():
+        for _ in range(args.recargas):
+            with pool.conexao() as conn:
+                consultar(conn)
+
+    threads = [threading.Thread(target=trabalhador) for _ in range(args.threads * 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print("métricas do pool:", {k: round(v, 3) if isinstance(v, float) else v for k, v in pool.metricas().items()})
+    pool.fechar()
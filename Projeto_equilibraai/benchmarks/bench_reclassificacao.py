@@ -0,0 +1,57 @@
+#Mudança de pesos no app: recomendar de novo (podado / completo) contra reclassificar a matriz N x 5 guardada
+#Simula o gestor arrastando os sliders: sequência de pesos aleatórios (passo de 0.05, como no app) para a mesma
+#tarefa. Confere o top-k contra o motor (em float32 só empates dentro da precisão podem trocar de ordem).
+#Uso: python benchmarks/bench_reclassificacao.py --n 100000 --mudancas 50
+import argparse
+import os
+import tempfile
+import numpy as np
+from comum import PESOS_PADRAO, INTERESSES, CodificadorSintetico, colaboradores_sinteticos, medir
+from aspiracao import CacheEmbeddings, ScorerAspiracao
+from motor_scores import DIMENSOES, MotorScores
+from store_embeddings import StoreEmbeddings
+
+
+def mudancas_de_peso(n, seed=2):
+    rng = np.random.default_rng(seed)
+    return [dict(zip(DIMENSOES, rng.integers(0, 21, len(DIMENSOES)) * 0.05)) for _ in range(n)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--skills', type=int, default=500)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--mudancas', type=int, default=50)
+    args = parser.parse_args()
+
+    tarefa = {'nome': 'Demanda', 'descricao': INTERESSES[0], 'senioridade_peso_requerido': 0.8,
+              'skills_hard_requeridas': ['Skill 21', 'Skill 37', 'Skill 102'], 'skills_soft_requeridas': []}
+    lista_pesos = mudancas_de_peso(args.mudancas)
+    print("=" * 70)
+    print(f"🎚️  RECLASSIFICAÇÃO: top-{args.k}, {args.mudancas} mudanças de peso na mesma tarefa")
+    print("=" * 70)
+    for n in args.n:
+        tmp = tempfile.mkdtemp(prefix='bench_reclass_')
+        df = colaboradores_sinteticos(n, args.skills)
+        scorer = ScorerAspiracao(CodificadorSintetico(), CacheEmbeddings(os.path.join(tmp, 'cache')))
+        motor = MotorScores(df, aspiracao=scorer, store=StoreEmbeddings(os.path.join(tmp, 'asp'), dim=64),
+                            usar_ann=False)
+        motor.recomendar(tarefa, PESOS_PADRAO, podar=False)  # sincroniza o store
+
+        t_matriz, componentes = medir(lambda: motor.componentes_tarefa(tarefa), 3)
+        t_podado = t_completo = t_reclass = 0.0
+        iguais = 0
+        for pesos in lista_pesos:
+            t, ref = medir(lambda: motor.recomendar(tarefa, pesos, k=args.k), 3)
+            t_podado += t
+            t, _ = medir(lambda: motor.recomendar(tarefa, pesos, k=args.k, podar=False), 3)
+            t_completo += t
+            t, res = medir(lambda: componentes.reclassificar(pesos, k=args.k), 3)
+            t_reclass += t
+            iguais += (list(res.index) == list(ref.index)
+                       and np.allclose(res['Score Final'], ref['Score Final'], atol=1e-5))
+        m = args.mudancas
+        print(f"{n:>9,} | matriz ({componentes.matriz.nbytes / 2**20:.1f} MB): {t_matriz * 1000:7.1f} ms uma vez | "
+              f"por mudança: podado {t_podado / m * 1000:6.2f} ms, completo {t_completo / m * 1000:6.2f} ms, "
+              f"reclassificar {t_reclass / m * 1000:6.2f} ms | top-{args.k} igual: {iguais}/{m}")
@@ -0,0 +1,73 @@
+#Cold start a partir do snapshot local (NumPy) contra a carga completa do banco
+#Usa o mesmo schema sintético do bench_consulta_perfis (bench_perfis) no banco das variáveis EQUILIBRAAI_DB_*
+#e o remove no final. Cada medição roda num interpretador novo. Use um PostgreSQL local, não o de produção.
+#Uso: python benchmarks/bench_snapshot.py --n 20000
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import psycopg2
+from comum import RAIZ
+from bench_consulta_perfis import SCHEMA, popular
+from pool_conexoes import configuracao_banco
+import ia_core_aws
+
+SCRIPT = r'''
+import json, sys, time
+t0 = time.perf_counter()
+import ia_core_aws
+from comum import PESOS_PADRAO, TAREFA_PADRAO
+t1 = time.perf_counter()
+base = ia_core_aws.carregar_base(usar_snapshot=sys.argv[1] == 'snapshot')
+t2 = time.perf_counter()
+base.motor.recomendar(TAREFA_PADRAO, dict(PESOS_PADRAO, asp=0.0))
+t3 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'carga': t2 - t1, 'primeiro_ranking': t3 - t2, 'total': t3 - t0,
+                  'origem': base.origem, 'n': len(base)}))
+'''
+
+
+def rodar(modo, diretorio):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([RAIZ, os.path.join(RAIZ, 'benchmarks')]),
+               PGOPTIONS=f"-c search_path={SCHEMA}", EQUILIBRAAI_SNAPSHOT_DIR=diretorio)
+    saida = subprocess.run([sys.executable, '-c', SCRIPT, modo], capture_output=True, text=True, env=env)
+    linhas = [l for l in saida.stdout.splitlines() if l.startswith('{')]
+    if not linhas:
+        raise RuntimeError(saida.stderr)
+    return json.loads(linhas[-1])
+
+
+def tamanho(diretorio):
+    return sum(os.path.getsize(os.path.join(r, f)) for r, _, arquivos in os.walk(diretorio) for f in arquivos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=20000)
+    parser.add_argument('--skills', type=int, default=200)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**configuracao_banco())
+    popular(conn, args.n, args.skills)
+    conn.cursor().execute(f"SET search_path TO {SCHEMA}")
+    conn.commit()
+    diretorio = tempfile.mkdtemp(prefix='snapshot_')
+    base = ia_core_aws.BaseColaboradores(ia_core_aws.montar_colaboradores).carregar(conn)
+    base.salvar_snapshot(diretorio)
+
+    print("=" * 70)
+    print(f"🧊 COLD START: {args.n} colaboradores sintéticos | snapshot de {tamanho(diretorio) / 2**20:.1f} MB")
+    print("=" * 70)
+    for modo in ('banco', 'snapshot'):
+        r = rodar(modo, diretorio)
+        print(f"{modo:9s}: carga {r['carga'] * 1000:8.1f} ms | primeiro ranking {r['primeiro_ranking'] * 1000:6.1f} ms"
+              f" | total {r['total'] * 1000:8.1f} ms (import {r['import'] * 1000:.0f} ms, origem {r['origem']}, {r['n']} perfis)")
+
+    shutil.rmtree(diretorio, ignore_errors=True)
+    conn.rollback()
+    conn.cursor().execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    conn.commit()
+    conn.close()
@@ -0,0 +1,46 @@
+#Benchmark de inicialização: tempo de import do ia_core_aws e tempo até o primeiro ranking,
+#com peso de aspiração zero (BERT nunca é carregado) e diferente de zero (carrega o modelo sob demanda)
+#Uso: python benchmarks/bench_startup.py
+import json
+import os
+import subprocess
+import sys
+from comum import RAIZ
+
+# Cada medição roda num interpretador novo, para simular um cold start real
+SCRIPT = r'''
+import json, sys, time
+t0 = time.perf_counter()
+import ia_core_aws
+t_import = time.perf_counter() - t0
+from comum import dataframe_dos_csvs, PESOS_PADRAO, TAREFA_PADRAO
+df = dataframe_dos_csvs()
+pesos = dict(PESOS_PADRAO, asp=float(sys.argv[1]))
+t1 = time.perf_counter()
+ia_core_aws.recomendar(TAREFA_PADRAO, df, pesos)
+t_rank = time.perf_counter() - t1
+print(json.dumps({'import': t_import, 'primeiro_ranking': t_rank, 'total': time.perf_counter() - t0,
+                  'modelo': ia_core_aws.estado_modelo(), 'tensorflow_importado': 'tensorflow' in sys.modules}))
+'''
+
+
+def rodar(peso_asp):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([RAIZ, os.path.join(RAIZ, 'benchmarks')]))
+    saida = subprocess.run([sys.executable, '-c', SCRIPT, str(peso_asp)], capture_output=True, text=True, env=env)
+    linhas = [l for l in saida.stdout.splitlines() if l.startswith('{')]
+    if not linhas:
+        raise RuntimeError(saida.stderr)
+    return json.loads(linhas[-1])
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("⏱️  BENCHMARK DE INICIALIZAÇÃO (cold start)")
+    print("=" * 60)
+    for peso in (0.0, 0.1):
+        r = rodar(peso)
+        print(f"\nPeso aspiração = {peso}")
+        print(f"   import ia_core_aws : {r['import'] * 1000:8.1f} ms")
+        print(f"   primeiro ranking   : {r['primeiro_ranking'] * 1000:8.1f} ms")
+        print(f"   total              : {r['total'] * 1000:8.1f} ms")
+        print(f"   modelo             : {r['modelo']} (tensorflow importado: {r['tensorflow_importado']})")
@@ -0,0 +1,98 @@
+#Custo da telemetria (telemetria.py): recomendação e carga dos perfis com os spans ligados e desligados
+#Os dois modos são alternados em cada repetição, trocando quem roda primeiro (melhor de várias repetições), para o
+#ruído e o cache da máquina afetarem os dois igualmente. Como a diferença fica na faixa do ruído, também mostra a
+#estimativa direta: spans por recomendação x custo de um span isolado. Por fim, o resumo por etapa e um trecho do
+#texto do Prometheus.
+#Uso: python benchmarks/bench_telemetria.py --n 10000 100000
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+from comum import PESOS_PADRAO, INTERESSES, CodificadorSintetico, colaboradores_sinteticos, medir
+import dados_sinteticos
+from armazenamento import ArmazenamentoSQLite
+from aspiracao import CacheEmbeddings, ScorerAspiracao
+from motor_scores import MotorScores
+from store_embeddings import StoreEmbeddings
+from telemetria import telemetria
+
+
+def alternando(funcoes, repeticoes):
+    """Melhor tempo de cada função, com telemetria ligada e desligada alternadas. (ligada, desligada)."""
+    ligada = desligada = 0.0
+    for funcao in funcoes:
+        melhores = {True: float('inf'), False: float('inf')}
+        for r in range(repeticoes):
+            for modo in ((True, False) if r % 2 == 0 else (False, True)):
+                telemetria.habilitada = modo
+                gc.collect()
+                melhores[modo] = min(melhores[modo], medir(funcao)[0])
+        ligada += melhores[True]
+        desligada += melhores[False]
+    telemetria.habilitada = True
+    return ligada, desligada
+
+
+def custo_span(repeticoes=200000):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        with telemetria.etapa('bench.span'):
+            pass
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--skills', type=int, default=500)
+    parser.add_argument('--tarefas', type=int, default=20)
+    parser.add_argument('--repeticoes', type=int, default=7)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='bench_telemetria_')
+    print("=" * 70)
+    print(f"⏱️  TELEMETRIA: {args.tarefas} tarefas, melhor de {args.repeticoes}, ligada x desligada")
+    print("=" * 70)
+    span = custo_span()
+    print(f"span isolado: {span * 1e6:.2f} µs")
+    rng = np.random.default_rng(1)
+    for n in args.n:
+        df = colaboradores_sinteticos(n, args.skills)
+        scorer = ScorerAspiracao(CodificadorSintetico(), CacheEmbeddings(os.path.join(tmp, f'cache_{n}')))
+        motor = MotorScores(df, aspiracao=scorer, store=StoreEmbeddings(os.path.join(tmp, f'asp_{n}'), dim=64),
+                            usar_ann=False)
+        tarefas = [{'descricao': INTERESSES[i % len(INTERESSES)], 'senioridade_peso_requerido': 0.8,
+                    'skills_hard_requeridas': [f'Skill {s}' for s in rng.choice(np.arange(20, args.skills), 3, replace=False)],
+                    'skills_soft_requeridas': []} for i in range(args.tarefas)]
+        motor.recomendar(tarefas[0], PESOS_PADRAO, podar=False)  # sincroniza o store
+        for nome, funcoes in (
+                ('top-10 podado', [lambda t=t: motor.recomendar(t, PESOS_PADRAO) for t in tarefas]),
+                ('ranking completo', [lambda t=t: motor.recomendar(t, PESOS_PADRAO, completo=True) for t in tarefas])):
+            antes = sum(linha['Chamadas'] for linha in telemetria.resumo())
+            funcoes[0]()
+            spans = sum(linha['Chamadas'] for linha in telemetria.resumo()) - antes
+            ligada, desligada = alternando(funcoes, args.repeticoes)
+            print(f"{n:>9,} | {nome:16s}: ligada {ligada / len(tarefas) * 1000:8.3f} ms | desligada "
+                  f"{desligada / len(tarefas) * 1000:8.3f} ms | custo medido {100 * (ligada / desligada - 1):+.2f}%"
+                  f" | estimado {100 * spans * span * len(tarefas) / desligada:.2f}% ({spans} spans)")
+
+        armazenamento = ArmazenamentoSQLite(os.path.join(tmp, f'perfis_{n}.db'))
+        conn = armazenamento.abrir(criar=True)
+        dados_sinteticos.popular(armazenamento, conn, n)
+        ligada, desligada = alternando([lambda: armazenamento.montar_colaboradores(conn)], 3)
+        conn.close()
+        print(f"{n:>9,} | {'carga (SQLite)':16s}: ligada {ligada * 1000:8.1f} ms | desligada "
+              f"{desligada * 1000:8.1f} ms | custo {100 * (ligada / desligada - 1):+.2f}%")
+
+    print("\nResumo por etapa (painel do app):")
+    for linha in telemetria.resumo():
+        if linha['Etapa'] != 'bench.span':
+            print(f"  {linha['Etapa']:32s} {linha['Chamadas']:7d}x  média {linha['Média (ms)']:9.3f} ms  "
+                  f"p95 {linha['p95 (ms)']:9.3f} ms")
+    texto = telemetria.texto_prometheus().splitlines()
+    print(f"\nTexto do Prometheus ({len(texto)} linhas), início:")
+    print("\n".join(texto[:6]))
+    shutil.rmtree(tmp, ignore_errors=True)
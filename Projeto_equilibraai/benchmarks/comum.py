@@ -0,0 +1,114 @@
+#Funções compartilhadas pelos benchmarks (rodam sem o AWS RDS, a partir dos CSVs do projeto)
+import hashlib
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(RAIZ, 'data')
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+# Mesmas tabelas mestres do banco (legado_local/banco_dados.py)
+PESOS_NIVEL = {1: 0.3, 2: 0.6, 3: 0.8, 4: 1.0}
+INTERESSES = [
+    "Desenvolvimento Backend: Interesse em criar APIs, microsserviços e lógica de servidor",
+    "Data Science e IA: Interesse em machine learning, análise de dados e redes neurais",
+    "Desenvolvimento Frontend: Interesse em criar interfaces de usuário ricas e responsivas",
+    "Gestão de Projetos: Interesse em metodologias ágeis e liderança de equipes",
+]
+
+PESOS_PADRAO = {'hard': 0.4, 'soft': 0.1, 'sen': 0.25, 'carga': 0.15, 'asp': 0.1}
+TAREFA_PADRAO = {
+    'nome': "API Pagamentos",
+    'descricao': "Criar uma API RESTful usando Python e Flask, com integração ao banco de dados SQL.",
+    'senioridade_peso_requerido': 0.8,
+    'skills_hard_requeridas': ['Skill 1', 'Skill 2', 'Skill 3'],
+    'skills_soft_requeridas': [],
+}
+
+
+def dataframe_dos_csvs(seed=42):
+    """Monta o mesmo DataFrame de fetch_colaboradores_data a partir dos CSVs (skills como 'Skill {id}')."""
+    rng = np.random.default_rng(seed)
+    colabs = pd.read_csv(os.path.join(DATA_DIR, 'colaboradores_100.csv'))
+    skills = pd.read_csv(os.path.join(DATA_DIR, 'colaborador_skills_100.csv'))
+    skills['peso'] = skills['nivel_experiencia_id'].map(PESOS_NIVEL)
+    por_colab = skills.groupby('colaborador_id')
+    ids = por_colab['skill_id'].apply(list)
+    sen = por_colab['peso'].mean()
+    df = pd.DataFrame({'id': colabs['colaborador_id'], 'nome': colabs['nome']})
+    df['senioridade_peso'] = df['id'].map(sen).fillna(0.0)
+    df['carga_atual_percent'] = rng.integers(20, 90, len(df))
+    df['skills_hard_ids'] = [ids.get(i, []) for i in df['id']]
+    df['skills_hard'] = [[f'Skill {s}' for s in l] for l in df['skills_hard_ids']]
+    df['skills_soft_ids'] = [[] for _ in range(len(df))]
+    df['skills_soft'] = [[] for _ in range(len(df))]
+    df['aspiracao_carreira'] = [INTERESSES[i] for i in rng.integers(0, len(INTERESSES), len(df))]
+    return df
+
+
+class CodificadorSintetico:
+    """Vetor pseudoaleatório fixo por texto (sem modelo): isola o custo do ranking."""
+    assinatura = 'sintetico|64'
+
+    def __init__(self):
+        self.chamadas = 0
+
+    def __call__(self, textos):
+        self.chamadas += 1
+        return np.stack([np.random.default_rng(int(hashlib.md5(t.encode('utf-8')).hexdigest()[:8], 16))
+                         .standard_normal(64).astype(np.float32) for t in textos])
+
+
+def colaboradores_sinteticos(n, n_skills, skills_por_colab=5, seed=0):
+    """Skills com popularidade tipo Zipf (poucas skills muito comuns, cauda longa de raras)."""
+    rng = np.random.default_rng(seed)
+    popularidade = 1.0 / np.arange(1, n_skills + 1)
+    popularidade /= popularidade.sum()
+    ids = [np.unique(rng.choice(n_skills, skills_por_colab, p=popularidade)) + 1 for _ in range(n)]
+    df = pd.DataFrame({'id': np.arange(1, n + 1), 'nome': [f'Colaborador {i}' for i in range(1, n + 1)]})
+    df['senioridade_peso'] = rng.choice([0.3, 0.6, 0.8, 1.0], n)
+    df['carga_atual_percent'] = rng.integers(20, 90, n)
+    df['skills_hard_ids'] = [l.tolist() for l in ids]
+    df['skills_hard'] = [[f'Skill {s}' for s in l] for l in ids]
+    df['skills_soft_ids'] = [[] for _ in range(n)]
+    df['skills_soft'] = [[] for _ in range(n)]
+    df['aspiracao_carreira'] = [f"{INTERESSES[i % len(INTERESSES)]} ({i % 97})" for i in rng.integers(0, 10**6, n)]
+    return df
+
+
+def medir(funcao, repeticoes=1):
+    """Executa `funcao` e devolve (melhor tempo em segundos, último resultado)."""
+    melhor, resultado = float('inf'), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+COLUNAS_SCORE = ['Score Final', 'Hard', 'Soft', 'Sen', 'Carga', 'Aspiração']
+
+
+def conferir_ranking(referencia, resultado, tolerancia=1e-6):
+    """
+    Teste diferencial contra o recomendar_referencia: `referencia` é o ranking completo da referência e
+    `resultado` o de outro motor (completo ou top-k), os dois indexados pela linha do colaborador no DataFrame.
+    Os 6 scores de cada linha têm de bater, a ordem tem de ser decrescente e ninguém de fora do top-k pode ter
+    score maior que o último escolhido. Empates (diferença até `tolerancia`) podem vir em qualquer ordem.
+    Retorna {'linhas', 'max_diferenca', 'mesma_ordem', 'ok'}.
+    """
+    if resultado.empty:
+        return {'linhas': 0, 'max_diferenca': 0.0, 'mesma_ordem': referencia.empty, 'ok': referencia.empty}
+    esperado = referencia.loc[resultado.index, COLUNAS_SCORE].to_numpy(dtype=np.float64)
+    diferenca = float(np.abs(esperado - resultado[COLUNAS_SCORE].to_numpy(dtype=np.float64)).max())
+    finais = resultado['Score Final'].to_numpy(dtype=np.float64)
+    decrescente = bool(np.all(np.diff(finais) <= tolerancia))
+    fora = referencia['Score Final'].drop(resultado.index)
+    corte = fora.empty or float(fora.max()) <= finais.min() + tolerancia
+    return {'linhas': len(resultado), 'max_diferenca': diferenca,
+            'mesma_ordem': list(resultado.index) == list(referencia.index[:len(resultado)]),
+            'ok': diferenca <= tolerancia and decrescente and corte}
@@ -0,0 +1,177 @@
+#Cache de resultados da recomendação, compartilhado pelo processo inteiro (todas as sessões do Streamlit)
+#Chave: versão dos dados do motor (MotorScores.versao_dados, muda a cada carga/atualização/alocação) + tarefa
+#normalizada + pesos + k. Uma busca repetida com os mesmos parâmetros devolve o DataFrame já pronto. O caminho do app
+#usa o mesmo cache: a matriz de scores de uma tarefa (ComponentesTarefa, sem os pesos na chave) e o top-k dela
+#reclassificado com os pesos da barra lateral.
+#LRU limitado por quantidade de itens e por memória, com validade (TTL); quando chega um resultado de uma versão
+#mais nova dos dados, os das versões anteriores são descartados na hora.
+#Configuração: EQUILIBRAAI_CACHE_ITENS (0 desliga), EQUILIBRAAI_CACHE_MB e EQUILIBRAAI_CACHE_TTL (s).
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from motor_scores import DIMENSOES
+
+ITENS_PADRAO = 1024
+MEMORIA_PADRAO = 64 * 2**20
+TTL_PADRAO = 600.0
+
+
+def _skills(skills):
+    # O motor usa as skills como conjunto: ordem e repetições não mudam o resultado
+    return tuple(sorted({int(s) if isinstance(s, np.integer) else s for s in skills or ()}, key=str))
+
+
+def chave_recomendacao(versao_dados, tarefa, pesos, k, completo=False):
+    """
+    Chave só com o que muda o ranking: o nome da tarefa fica de fora, e a descrição só entra se a
+    aspiração tiver peso (com peso zero o BERT nem roda).
+    """
+    pesos = tuple(float(pesos[d]) for d in DIMENSOES)
+    return (versao_dados, pesos, int(k), bool(completo),
+            float(tarefa.get('senioridade_peso_requerido') or 0.0),
+            _skills(tarefa.get('skills_hard_ids', tarefa.get('skills_hard_requeridas'))),
+            _skills(tarefa.get('skills_soft_ids', tarefa.get('skills_soft_requeridas'))),
+            (tarefa.get('descricao') or '') if pesos[4] != 0 else '')
+
+
+def chave_componentes(versao_dados, tarefa):
+    """Chave da matriz de scores de uma tarefa (ComponentesTarefa): sem pesos nem k, e sempre com a descrição."""
+    return (versao_dados, 'componentes',
+            float(tarefa.get('senioridade_peso_requerido') or 0.0),
+            _skills(tarefa.get('skills_hard_ids', tarefa.get('skills_hard_requeridas'))),
+            _skills(tarefa.get('skills_soft_ids', tarefa.get('skills_soft_requeridas'))),
+            tarefa.get('descricao') or '')
+
+
+def chave_reclassificacao(versao_dados, tarefa, pesos, k, com_aspiracao=True):
+    """
+    Top-k reclassificado de uma ComponentesTarefa (float32): separado do recomendar, que soma em float64.
+    O ranking feito com a aspiração ainda pendente (modelo carregando) não serve depois que ela é preenchida.
+    """
+    return ('reclassificacao', com_aspiracao) + chave_recomendacao(versao_dados, tarefa, pesos, k)
+
+
+def tamanho_resultado(df):
+    """
+    Bytes de um resultado da recomendação: 8 por célula numérica e do índice + os textos dos nomes.
+    (O memory_usage(deep=True) do pandas dá o mesmo número, mas custa ~0,7 ms: mais que um acerto inteiro.)
+    """
+    nomes = df['Nome'].to_numpy() if 'Nome' in df.columns else ()
+    return 8 * df.shape[0] * (df.shape[1] + 1) + sum(map(sys.getsizeof, nomes))
+
+
+class CacheResultados:
+    """
+    LRU thread-safe com TTL, limitado por `max_itens` e `max_bytes`. O 1º elemento de cada chave é a versão
+    dos dados (como em chave_recomendacao), o que permite descartar de uma vez os resultados de uma versão antiga.
+    """
+
+    def __init__(self, max_itens=ITENS_PADRAO, max_bytes=MEMORIA_PADRAO, ttl=TTL_PADRAO, relogio=time.monotonic):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.relogio = relogio
+        self._itens = OrderedDict()   # chave -> (expira_em, bytes, valor); o fim é o mais recente
+        self._bytes = 0
+        self._versao = None           # versão dos dados mais nova já vista
+        self._lock = threading.Lock()
+        # Estatísticas
+        self.acertos = 0
+        self.faltas = 0
+        self.insercoes = 0
+        self.despejos = 0       # saíram por falta de espaço (LRU)
+        self.expirados = 0      # saíram pelo TTL
+        self.invalidados = 0    # saíram por troca da versão dos dados
+        self.grandes_demais = 0  # maiores que o limite de memória inteiro
+
+    @property
+    def ativo(self):
+        return self.max_itens > 0
+
+    def _remover(self, chave):
+        _, tamanho, _ = self._itens.pop(chave)
+        self._bytes -= tamanho
+
+    def obter(self, chave):
+        """Valor guardado (e o marca como usado agora) ou None."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.faltas += 1
+                return None
+            if item[0] <= self.relogio():
+                self._remover(chave)
+                self.expirados += 1
+                self.faltas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[2]
+
+    def guardar(self, chave, valor, versao=None, tamanho=None):
+        """
+        Guarda `valor` sob `chave` (cujo 1º elemento é a `versao` dos dados). Uma versão mais nova que todas as
+        já vistas descarta os itens das anteriores; depois os menos usados saem até caber nos limites.
+        """
+        if not self.ativo:
+            return
+        tamanho = tamanho_resultado(valor) if tamanho is None else tamanho
+        with self._lock:
+            if tamanho > self.max_bytes:
+                self.grandes_demais += 1
+                return
+            if versao is not None and (self._versao is None or versao > self._versao):
+                if self._versao is not None:
+                    self._invalidar(versao)
+                self._versao = versao
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = (self.relogio() + self.ttl, tamanho, valor)
+            self._bytes += tamanho
+            self.insercoes += 1
+            while len(self._itens) > self.max_itens or self._bytes > self.max_bytes:
+                self._remover(next(iter(self._itens)))
+                self.despejos += 1
+
+    def _invalidar(self, versao):
+        antigas = [c for c in self._itens if c[0] != versao]
+        for chave in antigas:
+            self._remover(chave)
+        self.invalidados += len(antigas)
+
+    def invalidar(self, versao=None):
+        """Descarta tudo, ou só o que não é da `versao` informada."""
+        with self._lock:
+            if versao is None:
+                self.invalidados += len(self._itens)
+                self._itens.clear()
+                self._bytes = 0
+            else:
+                self._invalidar(versao)
+                self._versao = versao
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.faltas
+            return {
+                'itens': len(self._itens),
+                'bytes': self._bytes,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+                'insercoes': self.insercoes,
+                'despejos': self.despejos,
+                'expirados': self.expirados,
+                'invalidados': self.invalidados,
+                'grandes_demais': self.grandes_demais,
+            }
+
+
+# Cache único do processo
+cache_resultados = CacheResultados(
+    max_itens=int(os.environ.get('EQUILIBRAAI_CACHE_ITENS', ITENS_PADRAO)),
+    max_bytes=int(float(os.environ.get('EQUILIBRAAI_CACHE_MB', MEMORIA_PADRAO / 2**20)) * 2**20),
+    ttl=float(os.environ.get('EQUILIBRAAI_CACHE_TTL', TTL_PADRAO)))
@@ -0,0 +1,282 @@
+#Gerador de dados sintéticos em qualquer escala (10 mil, 100 mil, 1 milhão de colaboradores...)
+#As distribuições vêm dos CSVs do projeto (data/colaboradores_100.csv e colaborador_skills_100.csv):
+#nº de skills por colaborador, popularidade de cada skill, nível de experiência dado a skill, confiança dado o
+#nível, datas e nomes/sobrenomes. Os interesses (aspirações) não estão nos CSVs: cada colaborador recebe 1 ou 2.
+#A carga também não: cada colaborador recebe tarefas no livro de carga (alocacao_tarefa), algumas abertas (a carga
+#atual) e algumas concluídas nos últimos HISTORICO_DIAS dias.
+#Os dados saem em lotes (memória limitada) para CSV (mesmo formato dos arquivos de data/), SQLite ou PostgreSQL.
+#Uso: python dados_sinteticos.py --n 100000 --destino csv --saida data/sinteticos
+#     python dados_sinteticos.py --n 1000000 --destino sqlite --saida equilibraai.db
+#     python dados_sinteticos.py --n 1000000 --destino postgres [--schema sinteticos]   (EQUILIBRAAI_DB_*)
+import argparse
+import io
+import os
+import time
+import numpy as np
+import pandas as pd
+from armazenamento import ArmazenamentoPostgres, ArmazenamentoSQLite
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+COLABORADORES_PADRAO = 10000
+LOTE = 100000          # colaboradores gerados (e gravados) por vez
+SUAVIZACAO_NIVEL = 5   # pseudo-contagens da distribuição geral de nível somadas à de cada skill
+# Livro de carga: nº de tarefas abertas por colaborador (0 a 4), carga (%) de cada tarefa e janela do histórico
+PROB_ABERTAS = [0.1, 0.25, 0.3, 0.25, 0.1]
+CARGAS_TAREFA = [10.0, 15.0, 20.0, 25.0]
+HISTORICO_DIAS = 90
+
+# Tabelas mestras, as mesmas de legado_local/banco_dados.py
+NIVEIS = [(1, 'Iniciante', 'Conhecimento básico', 0.3), (2, 'Intermediário', 'Conhecimento prático', 0.6),
+          (3, 'Avançado', 'Domínio do assunto', 0.8), (4, 'Especialista', 'Referência no assunto', 1.0)]
+CATEGORIAS = [(1, 'Desenvolvimento Backend', 'hard_skill', 'Tecnologias de servidor'),
+              (2, 'Desenvolvimento Frontend', 'hard_skill', 'Tecnologias de cliente'),
+              (3, 'Data Science', 'hard_skill', 'Análise e modelos de dados'),
+              (4, 'DevOps', 'hard_skill', 'Infraestrutura e CI/CD'),
+              (5, 'Habilidades Comportamentais', 'soft_skill', 'Competências interpessoais')]
+SKILLS = ([(1, 1, 'Python', 'Linguagem de programação'), (2, 1, 'Flask', 'Micro-framework web Python'),
+           (3, 1, 'SQL', 'Linguagem de consulta a banco de dados'), (4, 3, 'Pandas', 'Biblioteca para manipulação de dados'),
+           (5, 3, 'Scikit-learn', 'Biblioteca de machine learning'), (6, 1, 'Java', 'Linguagem de programação'),
+           (7, 1, 'Spring Boot', 'Framework para Java'), (8, 2, 'JavaScript', 'Linguagem de script para web'),
+           (9, 2, 'React', 'Biblioteca frontend'), (10, 2, 'Angular', 'Framework frontend'),
+           (11, 4, 'Docker', 'Plataforma de containers'), (12, 4, 'Kubernetes', 'Orquestrador de containers'),
+           (13, 4, 'AWS', 'Amazon Web Services'), (14, 1, 'Node.js', 'Ambiente de execução JavaScript no backend'),
+           (15, 3, 'TensorFlow', 'Biblioteca para deep learning'), (16, 3, 'PyTorch', 'Biblioteca para deep learning'),
+           (17, 1, 'C#', 'Linguagem de programação Microsoft'), (18, 1, '.NET Core', 'Framework Microsoft'),
+           (19, 4, 'Git', 'Sistema de controle de versão'), (20, 2, 'CSS', 'Linguagem de estilização')]
+          + [(i, 1, f'Skill Genérica {i}', 'Skill técnica placeholder') for i in range(21, 51)]
+          + [(51, 5, 'Resolução de Problemas', 'Capacidade de encontrar soluções'), (52, 5, 'Foco', 'Capacidade de concentração'),
+             (53, 5, 'Pensamento Analítico', 'Analisar informações e tirar conclusões'),
+             (54, 5, 'Proatividade', 'Tomar iniciativa'), (55, 5, 'Comunicação', 'Habilidade de se expressar'),
+             (56, 5, 'Liderança', 'Capacidade de guiar equipes'), (57, 5, 'Colaboração', 'Trabalhar bem em equipe'),
+             (58, 5, 'Criatividade', 'Pensar fora da caixa'), (59, 5, 'Gestão de Tempo', 'Organizar tarefas e prazos'),
+             (60, 5, 'Inteligência Emocional', 'Gerir as próprias emoções')])
+INTERESSES = [(1, 'Desenvolvimento Backend', 'Interesse em criar APIs, microsserviços e lógica de servidor'),
+              (2, 'Data Science e IA', 'Interesse em machine learning, análise de dados e redes neurais'),
+              (3, 'Desenvolvimento Frontend', 'Interesse em criar interfaces de usuário ricas e responsivas'),
+              (4, 'Gestão de Projetos', 'Interesse em metodologias ágeis e liderança de equipes')]
+
+MESTRAS = {
+    'nivel_experiencia': (['nivel_id', 'nome', 'descricao', 'peso'], NIVEIS, ['nivel_id']),
+    'categoria_skill': (['categoria_id', 'nome', 'tipo', 'descricao'], CATEGORIAS, ['categoria_id']),
+    'skill': (['skill_id', 'categoria_id', 'nome', 'descricao'], SKILLS, ['skill_id']),
+    'interesse': (['interesse_id', 'nome', 'descricao'], INTERESSES, ['interesse_id']),
+}
+COLUNAS = {
+    'colaborador': ['colaborador_id', 'nome', 'email', 'data_cadastro'],
+    'colaborador_skill': ['colaborador_id', 'skill_id', 'nivel_experiencia_id', 'confianca', 'data_avaliacao'],
+    'colaborador_interesse': ['colaborador_id', 'interesse_id'],
+    'alocacao_tarefa': ['colaborador_id', 'tarefa', 'carga_percent', 'atribuida_em', 'concluida_em'],
+}
+
+
+def distribuicoes(data_dir=DATA_DIR):
+    """Distribuições empíricas dos CSVs do projeto (o que o gerador reproduz)."""
+    colabs = pd.read_csv(os.path.join(data_dir, 'colaboradores_100.csv'))
+    vinculos = pd.read_csv(os.path.join(data_dir, 'colaborador_skills_100.csv'))
+    n_skills = max(s for s, *_ in SKILLS)
+
+    por_colab = vinculos.groupby('colaborador_id').size()
+    tamanhos = por_colab.value_counts().sort_index()
+    popularidade = np.bincount(vinculos['skill_id'], minlength=n_skills + 1)[1:].astype(np.float64)
+
+    # Nível dado a skill: contagens da skill + a distribuição geral como pseudo-contagem (skills raras)
+    niveis = pd.crosstab(vinculos['skill_id'], vinculos['nivel_experiencia_id']).reindex(
+        index=range(1, n_skills + 1), columns=range(1, 5), fill_value=0).to_numpy(dtype=np.float64)
+    geral = niveis.sum(axis=0) / niveis.sum()
+    niveis = niveis + SUAVIZACAO_NIVEL * geral
+    niveis /= niveis.sum(axis=1, keepdims=True)
+
+    confianca = {nivel: np.sort(grupo.to_numpy(dtype=np.float64))
+                 for nivel, grupo in vinculos.groupby('nivel_experiencia_id')['confianca']}
+    partes = colabs['nome'].str.split(' ', n=1)
+    return {
+        'skills_por_colab': (tamanhos.index.to_numpy(), (tamanhos / tamanhos.sum()).to_numpy()),
+        'popularidade': popularidade / popularidade.sum(),
+        'nivel_por_skill': niveis,
+        'confianca_por_nivel': confianca,
+        'primeiros_nomes': partes.str[0].to_numpy(dtype=object),
+        'sobrenomes': partes.str[1].to_numpy(dtype=object),
+        'cadastro': (pd.Timestamp(colabs['data_cadastro'].min()), pd.Timestamp(colabs['data_cadastro'].max())),
+        'avaliacao': (pd.Timestamp(vinculos['data_avaliacao'].min()), pd.Timestamp(vinculos['data_avaliacao'].max())),
+    }
+
+
+def _datas(rng, intervalo, n):
+    inicio, fim = intervalo
+    dias = rng.integers(0, (fim - inicio).days + 1, n)
+    return (inicio + pd.to_timedelta(dias, unit='D')).strftime('%Y-%m-%d')
+
+
+def _skills_sem_repeticao(rng, popularidade, tamanhos):
+    """
+    Para cada colaborador, `tamanhos[i]` skills distintas sorteadas pela popularidade (sem reposição),
+    todas de uma vez com o truque de Gumbel: as k maiores chaves log(p) + Gumbel são uma amostra sem reposição.
+    Devolve (posição do colaborador, skill_id) ordenados por colaborador e skill.
+    """
+    with np.errstate(divide='ignore'):   # skills que nunca aparecem nos CSVs: log(0) = -inf, nunca sorteadas
+        chaves = np.log(popularidade)[None, :] + rng.gumbel(size=(len(tamanhos), len(popularidade)))
+    maximo = int(tamanhos.max())
+    escolhidas = np.argpartition(-chaves, maximo - 1, axis=1)[:, :maximo]
+    # Dentro das `maximo` escolhidas, a ordem por chave decide quais entram quando o colaborador tem menos
+    ordem = np.take_along_axis(escolhidas, np.argsort(-np.take_along_axis(chaves, escolhidas, axis=1), axis=1), axis=1)
+    usar = np.arange(maximo)[None, :] < tamanhos[:, None]
+    linhas = np.broadcast_to(np.arange(len(tamanhos))[:, None], usar.shape)[usar]
+    skills = ordem[usar] + 1
+    ordem_final = np.lexsort((skills, linhas))
+    return linhas[ordem_final], skills[ordem_final]
+
+
+def _alocacoes(rng, ids, agora):
+    """Tarefas do livro de carga: abertas (sem conclusão) e concluídas, com datas em UTC até `agora`."""
+    abertas = rng.choice(len(PROB_ABERTAS), len(ids), p=PROB_ABERTAS)
+    por_colab = abertas + rng.integers(0, 4, len(ids))
+    dono = np.repeat(np.arange(len(ids)), por_colab)
+    ordem = np.arange(len(dono)) - np.repeat(np.cumsum(por_colab) - por_colab, por_colab)
+    aberta = ordem < np.repeat(abertas, por_colab)
+    atribuida = agora - pd.to_timedelta(rng.uniform(0, HISTORICO_DIAS, len(dono)), unit='D')
+    concluida = np.minimum(atribuida + pd.to_timedelta(rng.uniform(1, 30, len(dono)), unit='D'), agora)
+    formato = '%Y-%m-%d %H:%M:%S+00:00'
+    return pd.DataFrame({'colaborador_id': ids[dono],
+                         'tarefa': [f'Tarefa {int(i)}-{int(k)}' for i, k in zip(ids[dono], ordem)],
+                         'carga_percent': rng.choice(CARGAS_TAREFA, len(dono)),
+                         'atribuida_em': atribuida.strftime(formato),
+                         'concluida_em': pd.Series(np.where(aberta, None, pd.DatetimeIndex(concluida).strftime(formato)),
+                                                   dtype=object)})
+
+
+def gerar_lotes(n, seed=0, lote=LOTE, dist=None, primeiro_id=1, agora=None):
+    """
+    Gera `n` colaboradores em lotes de até `lote`. Cada lote é um dict {tabela: DataFrame} com
+    colaborador, colaborador_skill, colaborador_interesse e alocacao_tarefa (colunas de COLUNAS).
+    Mesma seed (e mesmo `agora`, a data de referência das tarefas), mesmos dados.
+    """
+    dist = dist if dist is not None else distribuicoes()
+    agora = pd.Timestamp.now(tz='UTC').floor('s') if agora is None else pd.Timestamp(agora)
+    rng = np.random.default_rng(seed)
+    valores_tam, prob_tam = dist['skills_por_colab']
+    cdf_nivel = np.cumsum(dist['nivel_por_skill'], axis=1)
+    confianca = dist['confianca_por_nivel']
+    for inicio in range(0, n, lote):
+        m = min(lote, n - inicio)
+        ids = np.arange(primeiro_id + inicio, primeiro_id + inicio + m, dtype=np.int64)
+        primeiro = rng.choice(dist['primeiros_nomes'], m)
+        sobrenome = rng.choice(dist['sobrenomes'], m)
+        nomes = pd.Series(primeiro) + ' ' + pd.Series(sobrenome)
+        # E-mail no padrão dos CSVs (nome.sobrenome@empresa.com) + id, para não repetir
+        emails = (pd.Series(primeiro).str.lower() + '.' + pd.Series(sobrenome).str.lower().str.replace(' ', '.')
+                  + '.' + pd.Series(ids).astype(str) + '@empresa.com')
+        colaborador = pd.DataFrame({'colaborador_id': ids, 'nome': nomes, 'email': emails,
+                                    'data_cadastro': _datas(rng, dist['cadastro'], m)})
+
+        tamanhos = rng.choice(valores_tam, m, p=prob_tam)
+        linhas, skills = _skills_sem_repeticao(rng, dist['popularidade'], tamanhos)
+        nivel = (rng.random(len(skills))[:, None] > cdf_nivel[skills - 1]).sum(axis=1) + 1
+        nivel = np.minimum(nivel, 4)
+        conf = np.empty(len(skills))
+        for n_nivel, valores in confianca.items():
+            alvo = nivel == n_nivel
+            conf[alvo] = valores[rng.integers(0, len(valores), int(alvo.sum()))]
+        colaborador_skill = pd.DataFrame({'colaborador_id': ids[linhas], 'skill_id': skills,
+                                          'nivel_experiencia_id': nivel, 'confianca': conf,
+                                          'data_avaliacao': _datas(rng, dist['avaliacao'], len(skills))})
+
+        # 1 ou 2 interesses distintos por colaborador (os primeiros de uma permutação aleatória)
+        permutacao = np.argsort(rng.random((m, len(INTERESSES))), axis=1) + 1
+        usar = np.arange(len(INTERESSES))[None, :] < rng.integers(1, 3, m)[:, None]
+        dono = np.broadcast_to(np.arange(m)[:, None], usar.shape)[usar]
+        interesse = permutacao[usar]
+        ordem = np.lexsort((interesse, dono))
+        colaborador_interesse = pd.DataFrame({'colaborador_id': ids[dono[ordem]], 'interesse_id': interesse[ordem]})
+        yield {'colaborador': colaborador, 'colaborador_skill': colaborador_skill,
+               'colaborador_interesse': colaborador_interesse, 'alocacao_tarefa': _alocacoes(rng, ids, agora)}
+
+
+def _gravar_csv(df, caminho, cabecalho):
+    df.to_csv(caminho, mode='w' if cabecalho else 'a', header=cabecalho, index=False)
+
+
+def gerar_csv(pasta, n, seed=0, lote=LOTE):
+    """
+    Grava colaboradores_{n}.csv e colaborador_skills_{n}.csv (mesmas colunas dos CSVs de data/, prontos
+    para o importar_dados/Deploy_nuvem), colaborador_interesses_{n}.csv e alocacoes_{n}.csv. Retorna os caminhos.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = {'colaborador': os.path.join(pasta, f'colaboradores_{n}.csv'),
+                'colaborador_skill': os.path.join(pasta, f'colaborador_skills_{n}.csv'),
+                'colaborador_interesse': os.path.join(pasta, f'colaborador_interesses_{n}.csv'),
+                'alocacao_tarefa': os.path.join(pasta, f'alocacoes_{n}.csv')}
+    for k, tabelas in enumerate(gerar_lotes(n, seed, lote)):
+        for tabela, df in tabelas.items():
+            _gravar_csv(df, caminhos[tabela], k == 0)
+    return caminhos
+
+
+def _copiar(conn, tabela, df):
+    """COPY FROM STDIN de um DataFrame (uma ida ao banco por lote)."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cur = conn.cursor()
+    cur.copy_expert(f"COPY {tabela} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    cur.close()
+
+
+def popular(armazenamento, conn, n, seed=0, lote=LOTE):
+    """
+    Cria o schema (se preciso), grava as tabelas mestras e `n` colaboradores sintéticos, um commit por lote.
+    No PostgreSQL os lotes entram com COPY e a base (ou o schema do search_path) deve estar sem colaboradores.
+    As tarefas abertas passam pelo trigger do livro de carga, que monta carga_colaborador.
+    Retorna {tabela: linhas gravadas}.
+    """
+    armazenamento.criar_schema(conn)
+    for tabela, (colunas, linhas, chave) in MESTRAS.items():
+        armazenamento.inserir_linhas(conn, tabela, colunas, linhas, chave)
+    conn.commit()
+    contagem = dict.fromkeys(COLUNAS, 0)
+    postgres = isinstance(armazenamento, ArmazenamentoPostgres)
+    for tabelas in gerar_lotes(n, seed, lote):
+        for tabela, df in tabelas.items():
+            if postgres:
+                _copiar(conn, tabela, df)
+            else:
+                armazenamento.inserir_linhas(conn, tabela, COLUNAS[tabela], df.itertuples(index=False, name=None))
+            contagem[tabela] += len(df)
+        conn.commit()
+    if postgres:
+        conn.autocommit = True
+        conn.cursor().execute("ANALYZE")
+        conn.autocommit = False
+    return contagem
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--n', type=int, default=COLABORADORES_PADRAO)
+    parser.add_argument('--destino', choices=['csv', 'sqlite', 'postgres'], default='csv')
+    parser.add_argument('--saida', help="pasta (csv) ou arquivo .db (sqlite)")
+    parser.add_argument('--schema', help="postgres: schema a criar/usar em vez do public")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--lote', type=int, default=LOTE)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    if args.destino == 'csv':
+        caminhos = gerar_csv(args.saida or os.path.join(DATA_DIR, 'sinteticos'), args.n, args.seed, args.lote)
+        print(f"[IA-CLOUD] ✅ {args.n} colaboradores sintéticos gravados em {os.path.dirname(caminhos['colaborador'])}")
+    else:
+        if args.destino == 'sqlite':
+            armazenamento = ArmazenamentoSQLite(args.saida or os.path.join(DATA_DIR, f'sinteticos_{args.n}.db'))
+            conn = armazenamento.abrir(criar=True)
+        else:
+            import psycopg2
+            from pool_conexoes import configuracao_banco
+            armazenamento = ArmazenamentoPostgres()
+            conn = psycopg2.connect(**configuracao_banco())
+            if args.schema:
+                conn.cursor().execute(f"CREATE SCHEMA IF NOT EXISTS {args.schema}; SET search_path TO {args.schema}")
+                conn.commit()
+        contagem = popular(armazenamento, conn, args.n, args.seed, args.lote)
+        conn.close()
+        print(f"[IA-CLOUD] ✅ Gravados em {args.destino}: "
+              + ", ".join(f"{linhas:,} em {tabela}" for tabela, linhas in contagem.items()))
+    print(f"[IA-CLOUD] ⏱️ {time.perf_counter() - inicio:.1f}s")
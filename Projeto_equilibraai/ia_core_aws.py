@@ -1,216 +1,433 @@
-#Inteligência Artificial do projeto, código corrigido e aprimorado da primeira versão depois que o banco de dados foi migrado para a AWS RDS
-import numpy as np
-import pandas as pd
-import psycopg2
-import warnings
-import os
-import sys
-
-warnings.filterwarnings("ignore")
-
-# IMPORTAÇÃO TENSORFLOW-
-print("[IA-CLOUD] ⚙️ Inicializando módulos de IA...")
-try:
-    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3' 
-    import tensorflow as tf
-    from transformers import AutoTokenizer, TFAutoModel
-    tf.get_logger().setLevel('ERROR')
-    TENSORFLOW_AVAILABLE = True
-    print("[IA-CLOUD] ✅ TensorFlow carregado.")
-except Exception:
-    TENSORFLOW_AVAILABLE = False
-    print("[IA-CLOUD] ⚠️ TensorFlow indisponível. Rodando em modo de compatibilidade.")
-
-#CONFIGURAÇÕES AWS
-DB_HOST = "equilibraai.chu8u2i8kdfr.sa-east-1.rds.amazonaws.com"
-DB_NAME = "postgres"
-DB_USER = "postgres"
-DB_PASS = "FIAP-equilibraAI" 
-DB_PORT = "5432"
-
-def get_db_connection():
-    try:
-        return psycopg2.connect(
-            host=DB_HOST, database=DB_NAME, user=DB_USER, password=DB_PASS, port=DB_PORT, sslmode='require'
-        )
-    except Exception as e:
-        print(f"❌ Erro Conexão AWS: {e}")
-        return None
-
-def fetch_colaboradores_data():
-    """
-    Busca dados da AWS de forma OTIMIZADA (Bulk Fetch).
-    Em vez de ir ao banco para cada colaborador, trazemos tudo e cruzamos no Python.
-    """
-    print(f"\n[IA-CLOUD] 🔌 Conectando ao AWS RDS (Modo Otimizado)...")
-    conn = get_db_connection()
-    if not conn: sys.exit()
-
-    # 1. Busca TODOS os Colaboradores de uma vez
-    print("[IA-CLOUD] 📥 Baixando tabela de Colaboradores...")
-    query_colab = "SELECT colaborador_id, nome FROM colaborador"
-    df_colab = pd.read_sql(query_colab, conn)
-    
-    if df_colab.empty:
-        print("❌ ERRO: Nenhum colaborador encontrado! Rode o script de reparo.")
-        conn.close()
-        return pd.DataFrame()
-
-    # 2. Busca todas as Skills de uma vez
-    print("[IA-CLOUD] 📥 Baixando todas as Skills...")
-    query_skills = """
-    SELECT cs.colaborador_id, s.nome, cat.tipo
-    FROM colaborador_skill cs
-    JOIN skill s ON cs.skill_id = s.skill_id
-    JOIN categoria_skill cat ON s.categoria_id = cat.categoria_id
-    """
-    df_skills = pd.read_sql(query_skills, conn)
-
-    # 3. Busca todos os Interesses de uma vez
-    print("[IA-CLOUD] 📥 Baixando todos os Interesses...")
-    query_interests = """
-    SELECT ci.colaborador_id, i.nome, i.descricao
-    FROM colaborador_interesse ci
-    JOIN interesse i ON ci.interesse_id = i.interesse_id
-    """
-    df_interests = pd.read_sql(query_interests, conn)
-
-    # 4. Busca todas as Senioridades de uma vez
-    print("[IA-CLOUD] 📥 Calculando Senioridade média...")
-    query_seniority = """
-    SELECT cs.colaborador_id, AVG(ne.peso) as peso
-    FROM colaborador_skill cs
-    JOIN nivel_experiencia ne ON cs.nivel_experiencia_id = ne.nivel_id
-    GROUP BY cs.colaborador_id
-    """
-    df_seniority = pd.read_sql(query_seniority, conn)
-    
-    conn.close()
-    print(f"[IA-CLOUD] ⚡ Processando dados em memória...")
-
-    # Processamento em memória
-    data_formatada = []
-    
-    # Agrupamentos prévios para acesso instantâneo
-    skills_grouped = df_skills.groupby('colaborador_id')
-    interests_grouped = df_interests.groupby('colaborador_id')
-    seniority_map = df_seniority.set_index('colaborador_id')['peso'].to_dict()
-
-    # Monta a lista final iterando apenas sobre os colaboradores
-    for _, row in df_colab.iterrows():
-        cid = row['colaborador_id']
-        
-        # Recupera skills do grupo (se tiver alguma)
-        h_skills = []
-        s_skills = []
-        if cid in skills_grouped.groups:
-            my_skills = skills_grouped.get_group(cid)
-            h_skills = my_skills[my_skills['tipo'] == 'hard_skill']['nome'].tolist()
-            s_skills = my_skills[my_skills['tipo'] == 'soft_skill']['nome'].tolist()
-        
-        # Recupera aspirações do grupo
-        asps_text = ""
-        if cid in interests_grouped.groups:
-            my_interests = interests_grouped.get_group(cid)
-            lista_asps = [f"{r['nome']}: {r['descricao']}" for _, r in my_interests.iterrows()]
-            asps_text = " ".join(lista_asps)
-        
-        # Recupera senioridade 
-        peso_sen = seniority_map.get(cid, 0.0)
-
-        data_formatada.append({
-            'id': cid,
-            'nome': row['nome'],
-            'senioridade_peso': peso_sen,
-            'carga_atual_percent': np.random.randint(20, 90), 
-            'skills_hard': h_skills,
-            'skills_soft': s_skills,
-            'aspiracao_carreira': asps_text
-        })
-
-    print(f"[IA-CLOUD] ✅ {len(data_formatada)} colaboradores processados e prontos.")
-    return pd.DataFrame(data_formatada)
-
-# Machine Learning
-
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-def calc_skills(t, c):
-    """Calcula similaridade entre duas listas de palavras (Skills)"""
-    if not c or not t: return 0.0
-    try:
-        # Junta as listas em strings únicas para vetorizar
-        v = CountVectorizer().fit_transform([" ".join(t), " ".join(c)]).toarray()
-        return cosine_similarity(v[0].reshape(1,-1), v[1].reshape(1,-1))[0][0]
-    except: return 0.0
-
-def calc_sen(req, colab):
-    """Calcula score de senioridade (proximidade do peso)"""
-    if colab == 0: return 0.0
-    diff = abs(req - colab)
-    # Lógica: Diferença pequena = Score alto
-    return 1.0 if diff <= 0.2 else (0.5 if diff <= 0.4 else 0.0)
-
-def calc_carga(p): 
-    """Quanto maior a carga, menor o score"""
-    return 1.0 - (p/100.0)
-
-# rede BERT
-tokenizer_nn, model_nn = None, None
-if TENSORFLOW_AVAILABLE:
-    try:
-        MODEL = 'neuralmind/bert-base-portuguese-cased'
-        tokenizer_nn = AutoTokenizer.from_pretrained(MODEL)
-        model_nn = TFAutoModel.from_pretrained(MODEL)
-    except: 
-        TENSORFLOW_AVAILABLE = False
-
-def calc_asp(t, a):
-    """Calcula similaridade semântica usando BERT"""
-    if not TENSORFLOW_AVAILABLE or not t or not a: return 0.0
-    try:
-        inp = tokenizer_nn(t, return_tensors='tf', truncation=True, padding=True, max_length=128)
-        out = model_nn(inp).pooler_output[0]
-        # Aqui retornamos 0.0 se houver falha de dimensão para garantir estabilidade.
-        return 0.0 
-    except: return 0.0
-
-# Orquestrador
-
-def recomendar(tarefa, df, pesos):
-    """Função principal chamada pelo Streamlit"""
-    if df.empty: return pd.DataFrame()
-    
-    scores = []
-    for _, row in df.iterrows():
-        # Calcula os 5 scores individuais
-        sh = calc_skills(tarefa['skills_hard_requeridas'], row['skills_hard'])
-        ss = calc_skills(tarefa['skills_soft_requeridas'], row['skills_soft'])
-        sen = calc_sen(tarefa['senioridade_peso_requerido'], row['senioridade_peso'])
-        cg = calc_carga(row['carga_atual_percent'])
-        
-        asp = 0.0 
-        if TENSORFLOW_AVAILABLE and row['aspiracao_carreira']:
-             asp = calc_asp(tarefa['descricao'], row['aspiracao_carreira'])
-        
-        # Média Ponderada
-        final = (sh*pesos['hard']) + (ss*pesos['soft']) + (sen*pesos['sen']) + (cg*pesos['carga']) + (asp*pesos['asp'])
-        
-        scores.append({
-            'Nome': row['nome'], 
-            'Score Final': final, 
-            'Hard': sh, 
-            'Soft': ss, 
-            'Sen': sen, 
-            'Carga': cg, 
-            'Aspiração': asp
-        })
-    
-    # Retorna ordenado pelo melhor score
-    return pd.DataFrame(scores).sort_values(by='Score Final', ascending=False)
-
-if __name__ == "__main__":
-    # Teste rápido se rodar direto
-    df = fetch_colaboradores_data()
+#Inteligência Artificial do projeto, código corrigido e aprimorado da primeira versão depois que o banco de dados foi migrado para a AWS RDS
+import numpy as np
+import pandas as pd
+import warnings
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+warnings.filterwarnings("ignore")
+
+# TensorFlow/transformers e o BERT só são carregados quando a aspiração for usada (aspiracao.CarregadorModelo)
+
+#CONFIGURAÇÕES AWS
+# Host, usuário, senha etc. vêm das variáveis EQUILIBRAAI_DB_* (pool_conexoes.configuracao_banco);
+# as conexões são reaproveitadas pelo pool do processo em vez de abertas a cada consulta.
+# Com EQUILIBRAAI_ARMAZENAMENTO=sqlite os mesmos dados vêm de um arquivo SQLite local (armazenamento.py)
+from pool_conexoes import obter_pool
+from armazenamento import obter_armazenamento, QUERY_PERFIS, QUERY_PERFIS_IDS
+from livro_carga import carga_exemplo
+# Tempos de cada etapa (fetch e recomendar) em histogramas, expostos no formato do Prometheus (telemetria.py)
+from telemetria import etapa
+
+def get_db_connection():
+    """Conexão nova com o banco (None se inacessível); quem chama fecha. Para o pool, use `conexao()`."""
+    try:
+        return obter_armazenamento().abrir()
+    except Exception as e:
+        print(f"❌ Erro Conexão AWS: {e}")
+        return None
+
+@contextmanager
+def conexao():
+    """Empresta uma conexão do armazenamento (None se o banco estiver inacessível) e a devolve ao sair do bloco."""
+    with obter_armazenamento().conexao() as conn:
+        yield conn
+
+def metricas_conexoes():
+    """Espera por conexão, idade das conexões, reciclagens etc. (para monitoramento)."""
+    return obter_pool().metricas()
+
+def fetch_colaboradores_data(usar_snapshot=False):
+    """
+    Busca dados da AWS de forma OTIMIZADA (Bulk Fetch).
+    Em vez de ir ao banco para cada colaborador, trazemos tudo e cruzamos no Python.
+    Com usar_snapshot=True, lê o snapshot local se existir; senão busca no banco e grava o snapshot.
+    """
+    if usar_snapshot:
+        with etapa('fetch.snapshot'):
+            lido = carregar_snapshot()
+        if lido is not None:
+            print(f"[IA-CLOUD] ⚡ {len(lido[0])} colaboradores lidos do snapshot local.")
+            return lido[0].para_dataframe()
+    print(f"\n[IA-CLOUD] 🔌 Conectando ao {obter_armazenamento().descricao} (Modo Otimizado)...")
+    with conexao() as conn:
+        if not conn: sys.exit()
+        df = montar_colaboradores(conn)
+        if usar_snapshot and not df.empty:
+            salvar_snapshot(df, VocabularioSkills.do_banco(conn))
+        return df
+
+def montar_colaboradores(conn, ids=None):
+    """
+    Uma ida ao banco: o banco agrega e o Python só completa colunas (sem loop por colaborador).
+    Com `ids`, traz só esses colaboradores (os que não existem mais simplesmente não voltam).
+    """
+    return obter_armazenamento().montar_colaboradores(conn, ids)
+
+def montar_colaboradores_referencia(conn):
+    """
+    Montagem anterior (4 consultas + cruzamento linha a linha no Python).
+    Mantida como referência para comparação e benchmark.
+    """
+    # 1. Busca TODOS os Colaboradores de uma vez
+    print("[IA-CLOUD] 📥 Baixando tabela de Colaboradores...")
+    query_colab = "SELECT colaborador_id, nome FROM colaborador"
+    df_colab = pd.read_sql(query_colab, conn)
+    
+    if df_colab.empty:
+        print("❌ ERRO: Nenhum colaborador encontrado! Rode o script de reparo.")
+        return pd.DataFrame()
+
+    # 2. Busca todas as Skills de uma vez
+    print("[IA-CLOUD] 📥 Baixando todas as Skills...")
+    query_skills = """
+    SELECT cs.colaborador_id, cs.skill_id, s.nome, cat.tipo
+    FROM colaborador_skill cs
+    JOIN skill s ON cs.skill_id = s.skill_id
+    JOIN categoria_skill cat ON s.categoria_id = cat.categoria_id
+    """
+    df_skills = pd.read_sql(query_skills, conn)
+
+    # 3. Busca todos os Interesses de uma vez
+    print("[IA-CLOUD] 📥 Baixando todos os Interesses...")
+    query_interests = """
+    SELECT ci.colaborador_id, i.nome, i.descricao
+    FROM colaborador_interesse ci
+    JOIN interesse i ON ci.interesse_id = i.interesse_id
+    """
+    df_interests = pd.read_sql(query_interests, conn)
+
+    # 4. Busca todas as Senioridades de uma vez
+    print("[IA-CLOUD] 📥 Calculando Senioridade média...")
+    query_seniority = """
+    SELECT cs.colaborador_id, AVG(ne.peso) as peso
+    FROM colaborador_skill cs
+    JOIN nivel_experiencia ne ON cs.nivel_experiencia_id = ne.nivel_id
+    GROUP BY cs.colaborador_id
+    """
+    df_seniority = pd.read_sql(query_seniority, conn)
+
+    # 5. Carga atual: total corrente do livro de carga (tarefas abertas), sem agregar o histórico
+    # (sem o livro no banco, carga de exemplo como na montagem principal)
+    armazenamento = obter_armazenamento()
+    if armazenamento.livro_instalado(conn):
+        carga_map = armazenamento.totais_carga(conn).set_index('colaborador_id')['carga_percent'].to_dict()
+    else:
+        carga_map = dict(zip(df_colab['colaborador_id'], carga_exemplo(df_colab['colaborador_id'])))
+    
+    print(f"[IA-CLOUD] ⚡ Processando dados em memória...")
+
+    # Processamento em memória
+    data_formatada = []
+    
+    # Agrupamentos prévios para acesso instantâneo
+    skills_grouped = df_skills.groupby('colaborador_id')
+    interests_grouped = df_interests.groupby('colaborador_id')
+    seniority_map = df_seniority.set_index('colaborador_id')['peso'].to_dict()
+
+    # Monta a lista final iterando apenas sobre os colaboradores
+    for _, row in df_colab.iterrows():
+        cid = row['colaborador_id']
+        
+        # Recupera skills do grupo (se tiver alguma)
+        h_skills, h_ids = [], []
+        s_skills, s_ids = [], []
+        if cid in skills_grouped.groups:
+            my_skills = skills_grouped.get_group(cid)
+            my_hard = my_skills[my_skills['tipo'] == 'hard_skill']
+            my_soft = my_skills[my_skills['tipo'] == 'soft_skill']
+            h_skills, h_ids = my_hard['nome'].tolist(), my_hard['skill_id'].tolist()
+            s_skills, s_ids = my_soft['nome'].tolist(), my_soft['skill_id'].tolist()
+        
+        # Recupera aspirações do grupo
+        asps_text = ""
+        if cid in interests_grouped.groups:
+            my_interests = interests_grouped.get_group(cid)
+            lista_asps = [f"{r['nome']}: {r['descricao']}" for _, r in my_interests.iterrows()]
+            asps_text = " ".join(lista_asps)
+        
+        # Recupera senioridade 
+        peso_sen = seniority_map.get(cid, 0.0)
+
+        data_formatada.append({
+            'id': cid,
+            'nome': row['nome'],
+            'senioridade_peso': peso_sen,
+            'carga_atual_percent': float(carga_map.get(cid, 0.0)),
+            'skills_hard': h_skills,
+            'skills_soft': s_skills,
+            'skills_hard_ids': h_ids,
+            'skills_soft_ids': s_ids,
+            'aspiracao_carreira': asps_text
+        })
+
+    print(f"[IA-CLOUD] ✅ {len(data_formatada)} colaboradores processados e prontos.")
+    return pd.DataFrame(data_formatada)
+
+def carregar_base(usar_snapshot=True):
+    """
+    Colaboradores + motor, guardando a versão do change-log (atualização incremental).
+    Com snapshot local, a base sai dele na hora e é conferida com o banco numa thread em segundo plano;
+    sem snapshot, carga completa do banco (e o snapshot é gravado para a próxima inicialização).
+    Um armazenamento local (SQLite) já é rápido de ler e dispensa o snapshot.
+    """
+    armazenamento = obter_armazenamento()
+    usar_snapshot = usar_snapshot and armazenamento.remoto
+    if usar_snapshot:
+        base = BaseColaboradores.do_snapshot(montar_colaboradores, carregador_modelo, armazenamento=armazenamento)
+        if base is not None:
+            print(f"[IA-CLOUD] ⚡ {len(base)} colaboradores lidos do snapshot local (versão {base.versao}).")
+            threading.Thread(target=atualizar_base, args=(base,), daemon=True).start()
+            return base
+    print(f"\n[IA-CLOUD] 🔌 Conectando ao {armazenamento.descricao} (Modo Otimizado)...")
+    with conexao() as conn:
+        if not conn: sys.exit()
+        base = BaseColaboradores(montar_colaboradores, carregador_modelo, armazenamento).carregar(conn)
+    if usar_snapshot:
+        base.salvar_snapshot()
+    return base
+
+def atualizar_base(base, salvar=True):
+    """
+    Traz só os colaboradores alterados desde a última leitura e corrige a base em memória
+    (resumo da atualização). Se algo mudou, o snapshot local é regravado.
+    """
+    with conexao() as conn:
+        if not conn: return None
+        resumo = base.atualizar(conn)
+    if salvar and obter_armazenamento().remoto and (resumo['completo'] or resumo['linhas']):
+        base.salvar_snapshot()
+    return resumo
+
+def fetch_vocabulario_skills():
+    """Carrega o vocabulário fixo de skills (skill_id -> coluna) da tabela skill"""
+    with conexao() as conn:
+        if not conn: sys.exit()
+        return VocabularioSkills.do_banco(conn)
+
+# Machine Learning
+
+from motor_scores import K_PADRAO, MotorScores, motor_para, ordenar
+from cache_resultados import cache_resultados, chave_componentes, chave_reclassificacao, chave_recomendacao
+from alocacao import CARGA_POR_TAREFA, alocar
+from atualizacao_incremental import BaseColaboradores
+from snapshot_perfis import carregar_snapshot, salvar_snapshot
+from vocabulario_skills import VocabularioSkills
+from aspiracao import MODELO_PADRAO, CarregadorModelo
+
+def calc_skills(t, c):
+    """Calcula similaridade de cosseno entre dois conjuntos de skills (cada skill é uma dimensão)"""
+    if not c or not t: return 0.0
+    t, c = set(t), set(c)
+    return len(t & c) / np.sqrt(len(t) * len(c))
+
+def calc_sen(req, colab):
+    """Calcula score de senioridade (proximidade do peso)"""
+    if colab == 0: return 0.0
+    diff = abs(req - colab)
+    # Lógica: Diferença pequena = Score alto
+    return 1.0 if diff <= 0.2 else (0.5 if diff <= 0.4 else 0.0)
+
+def calc_carga(p): 
+    """Quanto maior a carga, menor o score (carga limitada a 0-100%)"""
+    return 1.0 - (min(max(p, 0.0), 100.0)/100.0)
+
+# rede BERT (carregamento preguiçoso, em segundo plano)
+MODEL = MODELO_PADRAO
+carregador_modelo = CarregadorModelo()
+
+def iniciar_aquecimento_modelo():
+    """Começa a carregar o BERT numa thread, sem bloquear a inicialização do app"""
+    carregador_modelo.aquecer()
+
+def estado_modelo():
+    """Estado do modelo de aspiração: nao_iniciado, carregando, pronto ou indisponivel"""
+    return carregador_modelo.estado
+
+def obter_scorer_aspiracao():
+    """Scorer da dimensão de aspiração (carrega o BERT na primeira chamada; None se indisponível)"""
+    return carregador_modelo.obter()
+
+def calc_asp(t, a):
+    """Calcula similaridade semântica usando BERT (cosseno entre os embeddings)"""
+    if not t or not a: return 0.0
+    scorer = obter_scorer_aspiracao()
+    if scorer is None: return 0.0
+    try:
+        return scorer.similaridade(t, a)
+    except: return 0.0
+
+# Orquestrador
+
+def recomendar_referencia(tarefa, df, pesos):
+    """Implementação original (um loop por colaborador). Mantida como referência para validar o motor vetorizado."""
+    if df.empty: return pd.DataFrame()
+    
+    scores = []
+    for _, row in df.iterrows():
+        # Calcula os 5 scores individuais
+        sh = calc_skills(tarefa['skills_hard_requeridas'], row['skills_hard'])
+        ss = calc_skills(tarefa['skills_soft_requeridas'], row['skills_soft'])
+        sen = calc_sen(tarefa['senioridade_peso_requerido'], row['senioridade_peso'])
+        cg = calc_carga(row['carga_atual_percent'])
+        
+        asp = 0.0 
+        if row['aspiracao_carreira']:
+             asp = calc_asp(tarefa['descricao'], row['aspiracao_carreira'])
+        
+        # Média Ponderada
+        final = (sh*pesos['hard']) + (ss*pesos['soft']) + (sen*pesos['sen']) + (cg*pesos['carga']) + (asp*pesos['asp'])
+        
+        scores.append({
+            'Nome': row['nome'], 
+            'Score Final': final, 
+            'Hard': sh, 
+            'Soft': ss, 
+            'Sen': sen, 
+            'Carga': cg, 
+            'Aspiração': asp
+        })
+    
+    # Retorna ordenado pelo melhor score (empates, até o ruído da soma, na ordem das linhas, como no motor)
+    resultado = pd.DataFrame(scores)
+    return resultado.iloc[ordenar(resultado['Score Final'].to_numpy(dtype=np.float64))]
+
+def recomendar(tarefa, df, pesos, motor=None, k=K_PADRAO, completo=False, usar_cache=True):
+    """
+    Função principal chamada pelo Streamlit (motor vetorizado, mesmo ranking da referência).
+    `df` pode ser o DataFrame de colaboradores ou os PerfisCompactos do motor.
+    Devolve só os k melhores; completo=True devolve o ranking de todos os colaboradores.
+    Busca repetida (mesma tarefa, pesos e versão dos dados) sai do cache do processo; quem chama
+    recebe uma cópia (com attrs['avaliados']), então pode alterá-la à vontade.
+    """
+    if df.empty: return pd.DataFrame()
+    if motor is None:
+        motor = motor_para(df, aspiracao=carregador_modelo)
+    if not (usar_cache and cache_resultados.ativo):
+        return motor.recomendar(tarefa, pesos, k=k, completo=completo)
+    chave = chave_recomendacao(motor.versao_dados, tarefa, pesos, k, completo)
+    resultado = cache_resultados.obter(chave)
+    if resultado is None:
+        resultado = motor.recomendar(tarefa, pesos, k=k, completo=completo)
+        resultado.attrs['avaliados'] = motor.avaliados
+        cache_resultados.guardar(chave, resultado, versao=motor.versao_dados)
+    return _copia(resultado)
+
+def _copia(resultado):
+    """Cópia do DataFrame guardado no cache (o guardado é compartilhado entre as sessões)."""
+    copia = resultado.copy()
+    copia.attrs = dict(resultado.attrs)
+    return copia
+
+def componentes_tarefa(tarefa, df, motor=None, usar_cache=True):
+    """
+    Scores das 5 dimensões da tarefa para todos os colaboradores (ComponentesTarefa). O app guarda o
+    resultado na sessão: mexer nos pesos só chama .reclassificar(pesos, k), sem pontuar de novo.
+    A mesma demanda em outra sessão (mesma versão dos dados) reaproveita a matriz do cache do processo.
+    """
+    if motor is None:
+        motor = motor_para(df, aspiracao=carregador_modelo)
+    if not (usar_cache and cache_resultados.ativo):
+        return motor.componentes_tarefa(tarefa)
+    chave = chave_componentes(motor.versao_dados, tarefa)
+    componentes = cache_resultados.obter(chave)
+    if componentes is None:
+        componentes = motor.componentes_tarefa(tarefa)
+        cache_resultados.guardar(chave, componentes, versao=motor.versao_dados, tamanho=componentes.matriz.nbytes)
+    return componentes
+
+def reclassificar(componentes, pesos, k=K_PADRAO, usar_cache=True):
+    """
+    Top-k de uma ComponentesTarefa com os `pesos` da barra lateral. O Streamlit reexecuta o script a cada
+    interação: a mesma combinação (tarefa, pesos, k, versão dos dados) sai do cache do processo, como cópia.
+    """
+    if not (usar_cache and cache_resultados.ativo):
+        return componentes.reclassificar(pesos, k)
+    # Aspiração que ficou pendente (modelo carregando) entra assim que possível, com outra chave
+    componentes.completar_aspiracao(pesos)
+    chave = chave_reclassificacao(componentes.versao_dados, componentes.tarefa, pesos, k, componentes.com_aspiracao)
+    resultado = cache_resultados.obter(chave)
+    if resultado is None:
+        resultado = componentes.reclassificar(pesos, k)
+        cache_resultados.guardar(chave, resultado, versao=componentes.versao_dados)
+    return _copia(resultado)
+
+def recomendar_lote(tarefas, df, pesos, motor=None, k=K_PADRAO):
+    """
+    Ranking de várias tarefas numa passada só (planejamento do backlog): a preparação dos
+    colaboradores é feita uma vez e as tarefas são pontuadas em blocos. Um DataFrame por tarefa.
+    """
+    if df.empty: return [pd.DataFrame() for _ in tarefas]
+    if motor is None:
+        motor = motor_para(df, aspiracao=carregador_modelo)
+    return motor.recomendar_lote(tarefas, pesos, k=k)
+
+def alocar_tarefas(tarefas, df, pesos, motor=None, aplicar=False, base=None):
+    """
+    Alocação global de um conjunto de tarefas (cada uma para um colaborador), respeitando a
+    capacidade de cada um pela carga atual. Retorna (DataFrame da alocação, carga final em %).
+    `aplicar=True` registra as atribuições no livro de carga (coluna 'Alocação' com o alocacao_id);
+    com `base` (BaseColaboradores), o motor dela é trocado por um com a nova carga.
+    """
+    if motor is None:
+        motor = base.motor if base is not None else motor_para(df, aspiracao=carregador_modelo)
+    resultado, carga_final = alocar(motor, tarefas, pesos)
+    if aplicar:
+        alocadas = resultado[resultado['Colaborador'].notna()]
+        ids = atribuir_tarefas([(int(c), str(t), CARGA_POR_TAREFA)
+                                for c, t in zip(alocadas['Colaborador'], alocadas['Tarefa'])], base)
+        if ids is not None:
+            resultado.loc[alocadas.index, 'Alocação'] = ids
+    return resultado, carga_final
+
+def _repassar_carga(base, colaboradores):
+    """Passa à base a carga atual (do livro) dos colaboradores: ela troca o motor por uma cópia atualizada."""
+    if base is None:
+        return
+    colaboradores = np.unique(np.asarray(colaboradores, dtype=np.int64))
+    base.atualizar_carga(colaboradores, obter_armazenamento().livro.carga_percent(colaboradores))
+
+def atribuir_tarefas(atribuicoes, base=None):
+    """
+    Registra tarefas atribuídas [(colaborador_id, tarefa, carga %)] no livro de carga: grava em alocacao_tarefa
+    (o trigger soma na carga do colaborador), lança no livro em memória e passa a nova carga à `base`.
+    Retorna os alocacao_id (None se o banco estiver inacessível).
+    """
+    if not atribuicoes:
+        return []
+    armazenamento = obter_armazenamento()
+    with conexao() as conn:
+        if not conn: return None
+        ids = armazenamento.registrar_atribuicoes(conn, atribuicoes)
+        conn.commit()
+    colaboradores = [a[0] for a in atribuicoes]
+    armazenamento.livro.atribuir(colaboradores, [a[2] for a in atribuicoes])
+    _repassar_carga(base, colaboradores)
+    return ids
+
+def concluir_tarefas(alocacao_ids, base=None):
+    """
+    Conclui tarefas do livro de carga (pelo alocacao_id): a carga que ocupavam sai do colaborador, no banco,
+    no livro em memória e no motor da `base`. Retorna quantas estavam abertas (None se o banco estiver inacessível).
+    """
+    armazenamento = obter_armazenamento()
+    with conexao() as conn:
+        if not conn: return None
+        concluidas = armazenamento.registrar_conclusoes(conn, alocacao_ids)
+        conn.commit()
+    if concluidas:
+        colaboradores = [c for _, c, _ in concluidas]
+        armazenamento.livro.concluir(colaboradores, [p for _, _, p in concluidas])
+        _repassar_carga(base, colaboradores)
+    return len(concluidas)
+
+def agregados_carga(ids=None):
+    """Carga atual, tarefas abertas e os agregados da janela móvel (livro de carga) de cada colaborador."""
+    return obter_armazenamento().livro.agregados(ids)
+
+if __name__ == "__main__":
+    # Teste rápido se rodar direto
+    df = fetch_colaboradores_data()
     print(df.head())
\ No newline at end of file
@@ -0,0 +1,134 @@
+#Índice aproximado (ANN) sobre os embeddings de aspiração: IVF-flat em NumPy puro
+#Os vetores são agrupados por k-means esférico; uma busca só compara a tarefa com os colaboradores
+#das `n_sondas` listas mais próximas. Mais sondas = mais recall e mais latência.
+import numpy as np
+
+N_SONDAS_PADRAO = 32
+ITERACOES_KMEANS = 10
+AMOSTRA_TREINO = 50000
+TAMANHO_BLOCO = 65536
+
+
+def _normalizar(m):
+    m = np.asarray(m, dtype=np.float32)
+    normas = np.linalg.norm(m, axis=-1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return m / normas
+
+
+def kmeans_esferico(vetores, n_listas, iteracoes=ITERACOES_KMEANS, seed=0):
+    """Centróides (normalizados) por k-means com similaridade de cosseno."""
+    rng = np.random.default_rng(seed)
+    x = _normalizar(vetores)
+    n_listas = max(1, min(n_listas, len(x)))
+    centroides = x[rng.choice(len(x), n_listas, replace=False)].copy()
+    for _ in range(iteracoes):
+        grupo = np.argmax(x @ centroides.T, axis=1)
+        somas = np.zeros_like(centroides)
+        np.add.at(somas, grupo, x)
+        vazios = ~somas.any(axis=1)
+        # Listas vazias recebem um ponto aleatório para não desperdiçar centróides
+        somas[vazios] = x[rng.choice(len(x), int(vazios.sum()))]
+        centroides = _normalizar(somas)
+    return centroides
+
+
+class IndiceIVF:
+    """
+    IVF-flat sobre linhas de um StoreEmbeddings: o índice guarda só qual linha está em qual lista;
+    os vetores são lidos do store (arquivo mapeado) apenas para as listas sondadas.
+    Suporta inserção e remoção incremental (ex.: quando colaborador_interesse muda).
+    """
+
+    def __init__(self, store, n_listas=None, n_sondas=N_SONDAS_PADRAO):
+        self.store = store
+        self.n_listas = n_listas
+        self.n_sondas = n_sondas
+        self.centroides = None
+        self.listas = []       # lista -> [linhas do store]
+        self.lista_de = {}     # linha -> lista
+        self._arrays = {}      # cache das listas como np.array (invalidado em cada alteração)
+        self.avaliados = 0     # vetores comparados na última busca
+
+    def __len__(self):
+        return len(self.lista_de)
+
+    def copia(self):
+        """Índice independente com as mesmas listas (centróides e cache de arrays compartilhados, nunca alterados)."""
+        novo = IndiceIVF(self.store, self.n_listas, self.n_sondas)
+        novo.centroides = self.centroides
+        novo.listas = [list(l) for l in self.listas]
+        novo.lista_de = dict(self.lista_de)
+        novo._arrays = dict(self._arrays)
+        return novo
+
+    def _vetores(self, linhas):
+        linhas = np.asarray(linhas, dtype=np.int64)
+        ordem = np.argsort(linhas)
+        vet = np.empty((len(linhas), self.store.dim), dtype=np.float32)
+        # Leitura em ordem crescente de linha: acesso sequencial ao arquivo mapeado
+        vet[ordem] = self.store.vetores[linhas[ordem]].astype(np.float32) * self.store.escalas[linhas[ordem], None]
+        return vet
+
+    def treinar(self, linhas, seed=0):
+        """Treina os centróides com uma amostra das linhas e indexa todas elas."""
+        linhas = np.asarray(linhas, dtype=np.int64)
+        if len(linhas) == 0:
+            return self
+        n_listas = self.n_listas or max(1, int(np.sqrt(len(linhas))))
+        rng = np.random.default_rng(seed)
+        amostra = linhas if len(linhas) <= AMOSTRA_TREINO else rng.choice(linhas, AMOSTRA_TREINO, replace=False)
+        self.centroides = kmeans_esferico(self._vetores(amostra), n_listas, seed=seed)
+        self.listas = [[] for _ in range(len(self.centroides))]
+        self.lista_de = {}
+        self._arrays = {}
+        self.adicionar(linhas)
+        return self
+
+    def adicionar(self, linhas):
+        """Insere (ou reposiciona, se o vetor mudou) as linhas informadas."""
+        linhas = np.asarray(linhas, dtype=np.int64)
+        self.remover(linhas)
+        for i in range(0, len(linhas), TAMANHO_BLOCO):
+            bloco = linhas[i:i + TAMANHO_BLOCO]
+            grupos = np.argmax(self._vetores(bloco) @ self.centroides.T, axis=1)
+            for linha, g in zip(bloco.tolist(), grupos.tolist()):
+                self.listas[g].append(linha)
+                self.lista_de[linha] = g
+                self._arrays.pop(g, None)
+
+    def remover(self, linhas):
+        for linha in np.asarray(linhas, dtype=np.int64).tolist():
+            g = self.lista_de.pop(linha, None)
+            if g is not None:
+                self.listas[g].remove(linha)
+                self._arrays.pop(g, None)
+
+    def _lista(self, g):
+        arr = self._arrays.get(g)
+        if arr is None:
+            arr = self._arrays[g] = np.asarray(self.listas[g], dtype=np.int64)
+        return arr
+
+    def buscar(self, vetor, m, n_sondas=None):
+        """
+        Shortlist aproximada: (linhas, similaridades) dos até `m` vetores mais próximos da tarefa,
+        em ordem decrescente, olhando só as `n_sondas` listas com centróide mais próximo.
+        Empates com o m-ésimo entram todos, para a shortlist não depender da ordem das listas.
+        """
+        if self.centroides is None or not self.lista_de:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        t = _normalizar(vetor)
+        n_sondas = min(n_sondas or self.n_sondas, len(self.centroides))
+        sondas = np.argpartition(-(self.centroides @ t), n_sondas - 1)[:n_sondas]
+        candidatos = np.concatenate([self._lista(g) for g in sondas])
+        self.avaliados = len(candidatos)
+        if len(candidatos) == 0:
+            return candidatos, np.empty(0, dtype=np.float32)
+        sims = self._vetores(candidatos) @ t
+        if len(candidatos) > m:
+            corte = -np.partition(-sims, m - 1)[m - 1]
+            top = sims >= corte
+            candidatos, sims = candidatos[top], sims[top]
+        ordem = np.lexsort((candidatos, -sims))
+        return candidatos[ordem], sims[ordem]
@@ -0,0 +1,41 @@
+#Índice invertido skill -> colaboradores (postings), montado a partir de colaborador_skill
+#Usado pelo top-k podado do MotorScores: o cosseno de skills só é acumulado para quem aparece
+#nas listas das skills da tarefa; quem não tem nenhuma delas tem contribuição zero sem ser visitado.
+import numpy as np
+
+
+class IndiceInvertido:
+    """
+    Para cada coluna do vocabulário (skill), as linhas dos colaboradores que têm a skill e o peso
+    normalizado de cada um (1/sqrt(nº de skills do colaborador)), no formato CSC do SciPy.
+    """
+
+    def __init__(self, matriz):
+        csc = matriz.tocsc()
+        csc.sort_indices()
+        self.indptr = csc.indptr
+        self.linhas = csc.indices
+        self.pesos = csc.data
+        self.n = matriz.shape[0]
+
+    def tamanho(self, col):
+        return int(self.indptr[col + 1] - self.indptr[col])
+
+    def postings(self, cols):
+        """Linhas e pesos concatenados das listas das colunas pedidas."""
+        if len(cols) == 0:
+            return np.empty(0, dtype=self.linhas.dtype), np.empty(0)
+        fatias = [slice(self.indptr[c], self.indptr[c + 1]) for c in cols]
+        return (np.concatenate([self.linhas[f] for f in fatias]),
+                np.concatenate([self.pesos[f] for f in fatias]))
+
+    def acumular(self, cols, n_tarefa):
+        """
+        (linhas, cosseno) de quem tem ao menos uma das skills da tarefa. O custo é proporcional
+        ao tamanho das listas visitadas, não ao número de colaboradores.
+        """
+        linhas, pesos = self.postings(cols)
+        if n_tarefa == 0 or len(linhas) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        unicas, inverso = np.unique(linhas, return_inverse=True)
+        return unicas, np.bincount(inverso, weights=pesos, minlength=len(unicas)) / np.sqrt(n_tarefa)
@@ -1,6 +1,10 @@
 #Banco de dados local usando no começo do projeto antes de irmos para a AWS RDS
-import psycopg2
+import sqlite3
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from armazenamento import ArmazenamentoSQLite  # noqa: E402
 
 DB_FILE = 'meu_banco.db'
 
@@ -11,81 +15,17 @@ def criar_e_popular_banco():
     """
     
     if os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
+        for arquivo in (DB_FILE, DB_FILE + '-wal', DB_FILE + '-shm'):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
         print(f"♻️ Banco de dados '{DB_FILE}' antigo removido.")
 
     print(f"🎉 Iniciando criação do banco de dados '{DB_FILE}'...")
-    conn = psycopg2.connect(DB_FILE)
+    # Mesmo schema do armazenamento SQLite do app (tabelas + índices, em WAL)
+    armazenamento = ArmazenamentoSQLite(DB_FILE)
+    conn = armazenamento.abrir(criar=True)
     cursor = conn.cursor()
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS nivel_experiencia (
-        nivel_id INTEGER PRIMARY KEY,
-        nome TEXT NOT NULL UNIQUE,
-        descricao TEXT,
-        peso REAL NOT NULL
-    )
-    ''')
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS categoria_skill (
-        categoria_id INTEGER PRIMARY KEY,
-        nome TEXT NOT NULL,
-        tipo TEXT NOT NULL CHECK (tipo IN ('hard_skill', 'soft_skill')), 
-        descricao TEXT
-    )
-    ''')
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS skill (
-        skill_id INTEGER PRIMARY KEY,
-        categoria_id INTEGER NOT NULL,
-        nome TEXT NOT NULL UNIQUE,
-        descricao TEXT,
-        FOREIGN KEY (categoria_id) REFERENCES categoria_skill(categoria_id)
-    )
-    ''')
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS colaborador (
-        colaborador_id INTEGER PRIMARY KEY,
-        nome TEXT NOT NULL,
-        email TEXT UNIQUE,
-        data_cadastro DATE DEFAULT CURRENT_DATE
-    )
-    ''')
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS colaborador_skill (
-        colaborador_id INTEGER NOT NULL,
-        skill_id INTEGER NOT NULL,
-        nivel_experiencia_id INTEGER NOT NULL,
-        confianca REAL,
-        data_avaliacao DATE,
-        PRIMARY KEY (colaborador_id, skill_id),
-        FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
-        FOREIGN KEY (skill_id) REFERENCES skill(skill_id),
-        FOREIGN KEY (nivel_experiencia_id) REFERENCES nivel_experiencia(nivel_id)
-    )
-    ''')
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS interesse (
-        interesse_id INTEGER PRIMARY KEY,
-        nome TEXT NOT NULL UNIQUE,
-        descricao TEXT
-    )
-    ''')
-    
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS colaborador_interesse (
-        colaborador_id INTEGER NOT NULL,
-        interesse_id INTEGER NOT NULL,
-        PRIMARY KEY (colaborador_id, interesse_id),
-        FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
-        FOREIGN KEY (interesse_id) REFERENCES interesse(interesse_id)
-    )
-    ''')
+    armazenamento.criar_schema(conn)
     
     print("✅ Todas as 7 tabelas foram criadas com sucesso.")
 
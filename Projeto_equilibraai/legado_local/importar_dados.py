@@ -1,41 +1,30 @@
 #código usando para colocar os dados dentro do banco de dados local no começo do projeto
 import sqlite3
-import csv
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from armazenamento import ArmazenamentoSQLite  # noqa: E402
+
+DB_FILE = 'meu_banco.db'
 
 def importar_dados_completos():
     print("🚀 Iniciando importação de dados...")
     
-    conn = sqlite3.connect('meu_banco.db')
+    # WAL + executemany em lotes numa transação (em vez de um execute por linha)
+    armazenamento = ArmazenamentoSQLite(DB_FILE)
+    conn = armazenamento.abrir(criar=True)
     cursor = conn.cursor()
     
     print("📖 Lendo colaboradores_100.csv...")
-    with open('colaboradores_100.csv', 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        colaboradores = list(reader)
-        
-        for colab in colaboradores:
-            cursor.execute('''
-            INSERT OR REPLACE INTO colaborador (colaborador_id, nome, email, data_cadastro)
-            VALUES (?, ?, ?, ?)
-            ''', (colab['colaborador_id'], colab['nome'], colab['email'], colab['data_cadastro']))
-    
-    print(f"✅ {len(colaboradores)} colaboradores importados")
+    # Conflitos ignorados, como na carga da nuvem: o CSV tem e-mails repetidos e o 1º colaborador fica
+    total = armazenamento.importar_csv(conn, 'colaboradores_100.csv', 'colaborador', ['colaborador_id'])
+    print(f"✅ {total} colaboradores importados")
     
     print("📖 Lendo colaborador_skills_100.csv...")
-    with open('colaborador_skills_100.csv', 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        skills = list(reader)
-        
-        for skill in skills:
-            cursor.execute('''
-            INSERT OR REPLACE INTO colaborador_skill 
-            (colaborador_id, skill_id, nivel_experiencia_id, confianca, data_avaliacao)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (skill['colaborador_id'], skill['skill_id'], skill['nivel_experiencia_id'], 
-                  skill['confianca'], skill['data_avaliacao']))
-    
-    print(f"✅ {len(skills)} skills de colaboradores importadas")
+    total = armazenamento.importar_csv(conn, 'colaborador_skills_100.csv', 'colaborador_skill',
+                                       ['colaborador_id', 'skill_id'], atualizar=True)
+    print(f"✅ {total} skills de colaboradores importadas")
     
     print("🔍 Verificando dados base...")
     
@@ -48,10 +37,7 @@ def importar_dados_completos():
             (3, 'Avançado', 'Domínio do assunto', 0.8),
             (4, 'Especialista', 'Referência no assunto', 1.0)
         ]
-        cursor.executemany('''
-        INSERT OR IGNORE INTO nivel_experiencia (nivel_id, nome, descricao, peso)
-        VALUES (?, ?, ?, ?)
-        ''', niveis)
+        armazenamento.inserir_linhas(conn, 'nivel_experiencia', ['nivel_id', 'nome', 'descricao', 'peso'], niveis)
     
     cursor.execute("SELECT COUNT(*) FROM categoria_skill")
     if cursor.fetchone()[0] == 0:
@@ -83,7 +69,7 @@ def verificar_estrutura_banco():
     """Verifica se as tabelas existem antes de importar"""
     print("🔍 Verificando estrutura do banco...")
     
-    conn = sqlite3.connect('meu_banco.db')
+    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -0,0 +1,225 @@
+#Livro de carga: a carga atual de cada colaborador é a soma das tarefas atribuídas a ele e ainda não concluídas
+#No banco, cada atribuição é uma linha de alocacao_tarefa e um trigger mantém o total corrente em carga_colaborador
+#(um UPDATE de uma linha por evento), então a carga dos perfis só lê esse total, sem agregar o histórico.
+#Em memória, o LivroCarga guarda a mesma carga por colaborador e os agregados de uma janela móvel (tarefas
+#atribuídas e concluídas e carga atribuída nos últimos N dias). Cada atribuição/conclusão custa O(1): soma no total,
+#soma nos agregados e entra numa fila; quando sai da janela, é descontada dos agregados pela ordem de chegada.
+#Os agregados da janela partem dos eventos lidos na carga completa e seguem com os registrados por este processo;
+#as cargas atuais também acompanham as alterações de outros processos (recarregar, pela atualização incremental).
+#Configuração: EQUILIBRAAI_JANELA_CARGA_DIAS (padrão 30).
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+
+JANELA_PADRAO = float(os.environ.get('EQUILIBRAAI_JANELA_CARGA_DIAS', '30')) * 86400.0
+# Colunas dos agregados da janela (cada evento soma um vetor nessa ordem)
+AGREGADOS = ('tarefas_atribuidas', 'carga_atribuida', 'tarefas_concluidas')
+
+
+def carga_exemplo(ids):
+    """
+    Carga de exemplo (20-89%, como a sorteada antes do livro) para bancos em que o livro não foi instalado.
+    Sai de um hash do colaborador_id, não de um sorteio: cada recarga dá a mesma carga, então o ranking
+    (e o cache de resultados) não muda sem mudança nos dados.
+    """
+    h = np.asarray(ids, dtype=np.int64).astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    h ^= h >> np.uint64(31)
+    return (20 + h % np.uint64(70)).astype(np.float64)
+
+
+class LivroCarga:
+    """
+    Carga atual (%), tarefas abertas e agregados da janela (`janela` s) de cada colaborador, por colaborador_id.
+    Thread-safe. `carregar`/`recarregar` leem do banco pelo armazenamento (armazenamento.py); `atribuir` e
+    `concluir` registram eventos já gravados no banco (ou simulados), com custo constante por evento.
+    """
+
+    def __init__(self, janela=JANELA_PADRAO, relogio=time.time):
+        self.janela = janela
+        self.relogio = relogio
+        self.instalado = None                       # None: ainda não conferido no banco
+        self.ids = np.empty(0, dtype=np.int64)      # colaborador_id de cada linha (na ordem de chegada)
+        self.carga = np.empty(0)
+        self.abertas = np.empty(0, dtype=np.int64)
+        self.na_janela = np.empty((0, len(AGREGADOS)))
+        self._eventos = deque()                     # (instante, linhas, valores) em ordem cronológica
+        self._busca = None                          # (ids ordenados, linha de cada um), refeito quando entra id novo
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _zerar(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.carga = np.empty(0)
+        self.abertas = np.empty(0, dtype=np.int64)
+        self.na_janela = np.empty((0, len(AGREGADOS)))
+        self._eventos.clear()
+        self._busca = None
+
+    def _procurar(self, ids):
+        """Linha de cada id (-1 para quem não está no livro), por busca binária."""
+        if self._busca is None:
+            ordem = np.argsort(self.ids, kind='stable')
+            self._busca = (self.ids[ordem], ordem)
+        ordenados, linhas = self._busca
+        if not len(ordenados):
+            return np.full(len(ids), -1, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(ordenados, ids), len(ordenados) - 1)
+        return np.where(ordenados[pos] == ids, linhas[pos], -1)
+
+    def _linhas(self, ids):
+        """Linha de cada id, criando (com carga zero) as que ainda não existem (O(N): raro depois da carga)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        linhas = self._procurar(ids)
+        faltam = linhas < 0
+        if faltam.any():
+            novos = np.unique(ids[faltam])
+            inicio = len(self.ids)
+            self.ids = np.concatenate([self.ids, novos])
+            self.carga = np.concatenate([self.carga, np.zeros(len(novos))])
+            self.abertas = np.concatenate([self.abertas, np.zeros(len(novos), dtype=np.int64)])
+            self.na_janela = np.vstack([self.na_janela, np.zeros((len(novos), len(AGREGADOS)))])
+            self._busca = None
+            linhas[faltam] = inicio + np.searchsorted(novos, ids[faltam])
+        return linhas
+
+    def _expirar(self, agora):
+        """Desconta dos agregados os eventos que saíram da janela (os mais antigos estão no começo da fila)."""
+        limite = agora - self.janela
+        saindo = []
+        while self._eventos and self._eventos[0][0] < limite:
+            saindo.append(self._eventos.popleft())
+        if saindo:
+            # Um só desconto para todos os que saíram de uma vez
+            np.subtract.at(self.na_janela, np.concatenate([linhas for _, linhas, _ in saindo]),
+                           np.concatenate([valores for _, _, valores in saindo]))
+
+    def _lancar(self, linhas, valores, instante):
+        # A fila fica em ordem cronológica: um instante anterior ao último evento conta como o último
+        if self._eventos and instante < self._eventos[-1][0]:
+            instante = self._eventos[-1][0]
+        np.add.at(self.na_janela, linhas, valores)
+        self._eventos.append((instante, linhas, valores))
+        self._expirar(self.relogio())
+
+    def _movimentar(self, ids, carga, sinal, instante):
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        carga = np.broadcast_to(np.asarray(carga, dtype=np.float64), ids.shape)
+        linhas = self._linhas(ids)
+        np.add.at(self.carga, linhas, sinal * carga)
+        np.add.at(self.abertas, linhas, sinal)
+        # Conclusão de tarefa aberta antes da carga completa pode passar do total lido: nunca fica negativo
+        self.carga[linhas] = np.maximum(self.carga[linhas], 0.0)
+        self.abertas[linhas] = np.maximum(self.abertas[linhas], 0)
+        valores = np.zeros((len(ids), len(AGREGADOS)))
+        if sinal > 0:
+            valores[:, 0], valores[:, 1] = 1.0, carga
+        else:
+            valores[:, 2] = 1.0
+        self._lancar(linhas, valores, self.relogio() if instante is None else instante)
+        return linhas
+
+    def atribuir(self, ids, carga, instante=None):
+        """Tarefas atribuídas (uma por id, com a carga % de cada uma): soma na carga atual e na janela."""
+        with self._lock:
+            self._movimentar(ids, carga, 1, instante)
+
+    def concluir(self, ids, carga, instante=None):
+        """Tarefas concluídas (uma por id, com a carga % que ocupavam): sai da carga atual, conta na janela."""
+        with self._lock:
+            self._movimentar(ids, carga, -1, instante)
+
+    def definir(self, ids, carga, abertas):
+        """Troca os totais dos `ids` pelos lidos do banco (não mexe nos agregados da janela)."""
+        with self._lock:
+            linhas = self._linhas(ids)
+            self.carga[linhas] = np.asarray(carga, dtype=np.float64)
+            self.abertas[linhas] = np.asarray(abertas, dtype=np.int64)
+
+    def carga_percent(self, ids):
+        """Carga atual (%) de cada id, em float64; quem não tem tarefa no livro tem carga 0."""
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._lock:
+            linhas = self._procurar(ids)
+            return np.where(linhas >= 0, self.carga[np.maximum(linhas, 0)] if len(self.carga) else 0.0, 0.0)
+
+    def agregados(self, ids=None):
+        """DataFrame por colaborador: carga atual, tarefas abertas e os agregados da janela móvel."""
+        with self._lock:
+            self._expirar(self.relogio())
+            if ids is None:
+                linhas = np.arange(len(self.ids))
+                ids = self.ids
+            else:
+                ids = np.asarray(ids, dtype=np.int64)
+                linhas = self._procurar(ids)
+            achados = linhas >= 0
+            valores = np.zeros((len(ids), len(AGREGADOS)))
+            valores[achados] = self.na_janela[linhas[achados]]
+            colunas = {'colaborador_id': ids,
+                       'carga_atual_percent': np.where(achados, self.carga[linhas] if len(self.carga) else 0.0, 0.0),
+                       'tarefas_abertas': np.where(achados, self.abertas[linhas] if len(self.abertas) else 0, 0)}
+            colunas.update({nome: valores[:, k] for k, nome in enumerate(AGREGADOS)})
+        df = pd.DataFrame(colunas)
+        return df.astype({'tarefas_atribuidas': np.int64, 'tarefas_concluidas': np.int64})
+
+    def _conferir(self, armazenamento, conn):
+        if self.instalado is None:
+            self.instalado = armazenamento.livro_instalado(conn)
+            if not self.instalado:
+                print("[IA-CLOUD] ⚠️ Livro de carga não instalado no banco (rode migracoes.py): usando carga de exemplo.")
+        return self.instalado
+
+    def carregar(self, armazenamento, conn, ids=()):
+        """
+        Carga completa: totais de carga_colaborador e os eventos da janela (sem varrer o histórico).
+        Os `ids` (a base inteira) ganham linha mesmo sem tarefa, para que o 1º evento de cada um não amplie o livro.
+        """
+        self.instalado = None
+        if not self._conferir(armazenamento, conn):
+            ids = np.unique(np.asarray(ids, dtype=np.int64))
+            with self._lock:
+                self._zerar()
+            self.definir(ids, carga_exemplo(ids), np.zeros(len(ids), dtype=np.int64))
+            return self
+        agora = self.relogio()
+        totais = armazenamento.totais_carga(conn)
+        eventos = armazenamento.eventos_carga(conn, agora - self.janela)
+        with self._lock:
+            self._zerar()
+            self._linhas(np.concatenate([np.asarray(ids, dtype=np.int64),
+                                         totais['colaborador_id'].to_numpy(dtype=np.int64)]))
+            linhas = self._linhas(totais['colaborador_id'].to_numpy())
+            self.carga[linhas] = totais['carga_percent'].to_numpy(dtype=np.float64)
+            self.abertas[linhas] = totais['tarefas_abertas'].to_numpy(dtype=np.int64)
+            if len(eventos):
+                # Um lançamento por evento, já em ordem cronológica
+                linhas = self._linhas(eventos['colaborador_id'].to_numpy())
+                concluida = eventos['concluida'].to_numpy(dtype=bool)
+                valores = np.zeros((len(eventos), len(AGREGADOS)))
+                valores[:, 0] = ~concluida
+                valores[:, 1] = np.where(concluida, 0.0, eventos['carga_percent'].to_numpy(dtype=np.float64))
+                valores[:, 2] = concluida
+                for instante, linha, valor in zip(eventos['instante'].to_numpy(dtype=np.float64), linhas, valores):
+                    self._eventos.append((instante, np.array([linha]), valor[None, :]))
+                np.add.at(self.na_janela, linhas, valores)
+                self._expirar(agora)
+        return self
+
+    def recarregar(self, armazenamento, conn, ids):
+        """Relê do banco só os totais dos `ids` (ex.: alterados por outro processo); sem tarefa aberta, carga 0."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not self._conferir(armazenamento, conn):
+            # Sem o livro no banco, quem já está no livro mantém a carga; só os novos recebem a de exemplo
+            with self._lock:
+                novos = np.unique(ids[self._procurar(ids) < 0])
+            self.definir(novos, carga_exemplo(novos), np.zeros(len(novos), dtype=np.int64))
+            return self
+        totais = armazenamento.totais_carga(conn, ids).set_index('colaborador_id').reindex(ids)
+        self.definir(ids, totais['carga_percent'].fillna(0.0).to_numpy(dtype=np.float64),
+                     totais['tarefas_abertas'].fillna(0).to_numpy(dtype=np.int64))
+        return self
@@ -0,0 +1,269 @@
+#Migrações versionadas do schema de talentos no PostgreSQL (tabelas + índices)
+#Cada migração tem um número e roda uma vez só, na sua própria transação, junto com o registro na tabela
+#schema_migracao. O SQL também é idempotente (IF NOT EXISTS), então um banco criado antes pelo Deploy_nuvem
+#é adotado sem erro. Uma trava (advisory lock) impede dois processos de migrarem ao mesmo tempo.
+#Uso: python migracoes.py            (aplica as pendentes e confere os planos das consultas de perfis)
+import hashlib
+import json
+import time
+import psycopg2
+from armazenamento import QUERY_PERFIS_IDS
+from pool_conexoes import configuracao_banco
+
+TRAVA_MIGRACAO = 7304231  # chave do pg_advisory_lock
+TABELAS_GRANDES = ('colaborador', 'colaborador_skill', 'colaborador_interesse')
+
+SQL_CONTROLE = """
+CREATE TABLE IF NOT EXISTS schema_migracao (
+    versao INTEGER PRIMARY KEY,
+    nome VARCHAR(100) NOT NULL,
+    checksum CHAR(16) NOT NULL,
+    segundos REAL,
+    aplicada_em TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+# (versão, nome, SQL). Nunca altere uma migração já aplicada: crie outra com o próximo número
+MIGRACOES = [
+    (1, 'schema_inicial', """
+CREATE TABLE IF NOT EXISTS nivel_experiencia (
+    nivel_id SERIAL PRIMARY KEY,
+    nome VARCHAR(100) NOT NULL UNIQUE,
+    descricao TEXT,
+    peso REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categoria_skill (
+    categoria_id SERIAL PRIMARY KEY,
+    nome VARCHAR(100) NOT NULL,
+    tipo VARCHAR(50) NOT NULL CHECK (tipo IN ('hard_skill', 'soft_skill')),
+    descricao TEXT
+);
+CREATE TABLE IF NOT EXISTS skill (
+    skill_id SERIAL PRIMARY KEY,
+    categoria_id INTEGER NOT NULL,
+    nome VARCHAR(100) NOT NULL UNIQUE,
+    descricao TEXT,
+    FOREIGN KEY (categoria_id) REFERENCES categoria_skill(categoria_id)
+);
+CREATE TABLE IF NOT EXISTS colaborador (
+    colaborador_id SERIAL PRIMARY KEY,
+    nome VARCHAR(150) NOT NULL,
+    email VARCHAR(150) UNIQUE,
+    data_cadastro DATE DEFAULT CURRENT_DATE
+);
+CREATE TABLE IF NOT EXISTS colaborador_skill (
+    colaborador_id INTEGER NOT NULL,
+    skill_id INTEGER NOT NULL,
+    nivel_experiencia_id INTEGER NOT NULL,
+    confianca REAL,
+    data_avaliacao DATE,
+    PRIMARY KEY (colaborador_id, skill_id),
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
+    FOREIGN KEY (skill_id) REFERENCES skill(skill_id),
+    FOREIGN KEY (nivel_experiencia_id) REFERENCES nivel_experiencia(nivel_id)
+);
+CREATE TABLE IF NOT EXISTS interesse (
+    interesse_id SERIAL PRIMARY KEY,
+    nome VARCHAR(100) NOT NULL UNIQUE,
+    descricao TEXT
+);
+CREATE TABLE IF NOT EXISTS colaborador_interesse (
+    colaborador_id INTEGER NOT NULL,
+    interesse_id INTEGER NOT NULL,
+    PRIMARY KEY (colaborador_id, interesse_id),
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
+    FOREIGN KEY (interesse_id) REFERENCES interesse(interesse_id)
+);
+"""),
+    # O PostgreSQL não indexa chaves estrangeiras sozinho: sem estes índices, os JOINs/filtros pelo lado
+    # da skill ou do interesse (e a checagem de FK ao apagar uma skill) varrem a tabela de vínculos inteira.
+    # Os vínculos levam colaborador_id na chave, então "quem tem a skill X" sai só do índice
+    (2, 'indices_chaves_estrangeiras', """
+CREATE INDEX IF NOT EXISTS idx_colaborador_skill_skill ON colaborador_skill (skill_id, colaborador_id);
+CREATE INDEX IF NOT EXISTS idx_colaborador_skill_nivel ON colaborador_skill (nivel_experiencia_id);
+CREATE INDEX IF NOT EXISTS idx_colaborador_interesse_interesse ON colaborador_interesse (interesse_id, colaborador_id);
+CREATE INDEX IF NOT EXISTS idx_skill_categoria ON skill (categoria_id);
+"""),
+    # Cobertura para a montagem dos perfis: skills e senioridade de um colaborador saem do índice
+    # (index-only scan), sem visitar as linhas da tabela
+    (3, 'indice_cobertura_perfis', """
+CREATE INDEX IF NOT EXISTS idx_colaborador_skill_perfil ON colaborador_skill (colaborador_id, skill_id)
+    INCLUDE (nivel_experiencia_id);
+"""),
+    # Livro de carga (livro_carga.py): cada tarefa atribuída é uma linha de alocacao_tarefa e o trigger mantém
+    # o total corrente de cada colaborador em carga_colaborador (um UPDATE de uma linha por evento), que a carga
+    # dos perfis lê sem agregar o histórico. Os índices servem às tarefas abertas e à janela móvel dos agregados
+    (4, 'livro_carga', """
+CREATE TABLE IF NOT EXISTS alocacao_tarefa (
+    alocacao_id BIGSERIAL PRIMARY KEY,
+    colaborador_id INTEGER NOT NULL,
+    tarefa VARCHAR(200) NOT NULL,
+    carga_percent REAL NOT NULL CHECK (carga_percent >= 0),
+    atribuida_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    concluida_em TIMESTAMPTZ,
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id)
+);
+CREATE TABLE IF NOT EXISTS carga_colaborador (
+    colaborador_id INTEGER PRIMARY KEY,
+    carga_percent REAL NOT NULL DEFAULT 0,
+    tarefas_abertas INTEGER NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id)
+);
+CREATE INDEX IF NOT EXISTS idx_alocacao_tarefa_abertas ON alocacao_tarefa (colaborador_id) WHERE concluida_em IS NULL;
+CREATE INDEX IF NOT EXISTS idx_alocacao_tarefa_atribuida ON alocacao_tarefa (atribuida_em);
+CREATE INDEX IF NOT EXISTS idx_alocacao_tarefa_concluida ON alocacao_tarefa (concluida_em)
+    WHERE concluida_em IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION lancar_carga_colaborador() RETURNS trigger AS $$
+BEGIN
+    -- Tira a contribuição da linha antiga (se estava aberta) e soma a da nova (se está aberta)
+    IF TG_OP <> 'INSERT' AND OLD.concluida_em IS NULL THEN
+        UPDATE carga_colaborador
+           SET carga_percent = carga_percent - OLD.carga_percent, tarefas_abertas = tarefas_abertas - 1,
+               atualizado_em = now()
+         WHERE colaborador_id = OLD.colaborador_id;
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW.concluida_em IS NULL THEN
+        INSERT INTO carga_colaborador AS c (colaborador_id, carga_percent, tarefas_abertas)
+        VALUES (NEW.colaborador_id, NEW.carga_percent, 1)
+        ON CONFLICT (colaborador_id) DO UPDATE
+            SET carga_percent = c.carga_percent + excluded.carga_percent, tarefas_abertas = c.tarefas_abertas + 1,
+                atualizado_em = now();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS trg_livro_carga ON alocacao_tarefa;
+CREATE TRIGGER trg_livro_carga AFTER INSERT OR UPDATE OR DELETE ON alocacao_tarefa
+    FOR EACH ROW EXECUTE FUNCTION lancar_carga_colaborador();
+"""),
+]
+
+# Consultas conferidas com EXPLAIN: a dos perfis por id (atualização incremental) e a busca pelo lado da skill
+QUERY_COLABORADORES_POR_SKILL = """
+SELECT cs.colaborador_id, cs.skill_id
+FROM colaborador_skill cs
+JOIN skill s ON cs.skill_id = s.skill_id
+WHERE s.nome = ANY(%(nomes)s)
+"""
+
+
+def _checksum(sql):
+    return hashlib.sha256(sql.strip().encode('utf-8')).hexdigest()[:16]
+
+
+def versao_schema(conn):
+    """Maior migração aplicada (0 se o controle de migrações ainda não existe)."""
+    cur = conn.cursor()
+    cur.execute("SELECT to_regclass('schema_migracao') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        cur.close()
+        return 0
+    cur.execute("SELECT COALESCE(MAX(versao), 0) FROM schema_migracao")
+    versao = cur.fetchone()[0]
+    cur.close()
+    return versao
+
+
+def aplicar_migracoes(conn, alvo=None):
+    """
+    Aplica, em ordem, as migrações ainda não registradas (até a versão `alvo`, se dada).
+    Retorna a lista de versões aplicadas agora (vazia se o schema já estava em dia).
+    """
+    cur = conn.cursor()
+    conn.rollback()
+    cur.execute("SELECT pg_advisory_lock(%s)", (TRAVA_MIGRACAO,))
+    aplicadas = []
+    try:
+        cur.execute(SQL_CONTROLE)
+        cur.execute("SELECT versao, checksum FROM schema_migracao")
+        registradas = dict(cur.fetchall())
+        conn.commit()
+        for versao, nome, sql in MIGRACOES:
+            if alvo is not None and versao > alvo:
+                break
+            if versao in registradas:
+                if registradas[versao] != _checksum(sql):
+                    print(f"[IA-CLOUD] ⚠️ Migração {versao:03d} ({nome}) mudou depois de aplicada; ignorando.")
+                continue
+            inicio = time.perf_counter()
+            cur.execute(sql)
+            segundos = time.perf_counter() - inicio
+            cur.execute("INSERT INTO schema_migracao (versao, nome, checksum, segundos) VALUES (%s, %s, %s, %s)",
+                        (versao, nome, _checksum(sql), segundos))
+            conn.commit()
+            aplicadas.append(versao)
+            print(f"[IA-CLOUD] 🧱 Migração {versao:03d} ({nome}) aplicada em {segundos:.2f}s.")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.execute("SELECT pg_advisory_unlock(%s)", (TRAVA_MIGRACAO,))
+        conn.commit()
+        cur.close()
+    return aplicadas
+
+
+def _varrer(no, saida):
+    """Lista (tipo do nó, tabela, índice) de todos os nós de leitura do plano."""
+    if 'Relation Name' in no:
+        saida.append((no['Node Type'], no['Relation Name'], no.get('Index Name')))
+    for filho in no.get('Plans', ()):
+        _varrer(filho, saida)
+    return saida
+
+
+def plano(conn, sql, params):
+    """Nós de leitura do plano escolhido pelo PostgreSQL para a consulta."""
+    cur = conn.cursor()
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+    bruto = cur.fetchone()[0]
+    cur.close()
+    if isinstance(bruto, str):
+        bruto = json.loads(bruto)
+    return _varrer(bruto[0]['Plan'], [])
+
+
+def verificar_planos(conn, n_ids=20, n_skills=3, limite_linhas=10000):
+    """
+    Confere com EXPLAIN que as consultas de perfis não varrem (Seq Scan) as tabelas grandes com mais de
+    `limite_linhas` linhas. A amostra usa `n_ids` colaboradores e as `n_skills` skills menos comuns.
+    Retorna {consulta: {'nos': [...], 'seq_scans': [...], 'ok': bool}}.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT colaborador_id FROM colaborador ORDER BY random() LIMIT %s", (n_ids,))
+    ids = [i for i, in cur.fetchall()]
+    cur.execute("""SELECT s.nome FROM skill s JOIN colaborador_skill cs ON cs.skill_id = s.skill_id
+                   GROUP BY s.nome ORDER BY count(*) LIMIT %s""", (n_skills,))
+    nomes = [n for n, in cur.fetchall()]
+    cur.execute("SELECT relname, reltuples FROM pg_class WHERE relname = ANY(%s) AND relkind = 'r' "
+                "AND pg_table_is_visible(oid)", (list(TABELAS_GRANDES),))
+    grandes = {r for r, linhas in cur.fetchall() if linhas >= limite_linhas}
+    cur.close()
+    conn.rollback()
+
+    resultado = {}
+    for consulta, sql, params in (('perfis por ids', QUERY_PERFIS_IDS, {'ids': ids}),
+                                  ('colaboradores por skill', QUERY_COLABORADORES_POR_SKILL, {'nomes': nomes})):
+        nos = plano(conn, sql, params)
+        seq = [rel for tipo, rel, _ in nos if tipo == 'Seq Scan' and rel in grandes]
+        resultado[consulta] = {'nos': nos, 'seq_scans': seq, 'ok': not seq}
+    conn.rollback()
+    return resultado
+
+
+def imprimir_planos(resultado):
+    for consulta, r in resultado.items():
+        print(f"[IA-CLOUD] {'✅' if r['ok'] else '❌'} {consulta}:")
+        for tipo, rel, indice in r['nos']:
+            print(f"     {tipo:18s} {rel}" + (f" ({indice})" if indice else ""))
+
+
+if __name__ == "__main__":
+    conn = psycopg2.connect(**configuracao_banco())
+    aplicadas = aplicar_migracoes(conn)
+    print(f"[IA-CLOUD] ✅ Schema na versão {versao_schema(conn)} "
+          f"({len(aplicadas)} migração(ões) aplicada(s) agora).")
+    imprimir_planos(verificar_planos(conn))
+    conn.close()
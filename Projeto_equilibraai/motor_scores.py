@@ -0,0 +1,649 @@
+#Motor de scores vetorizado: monta a matriz esparsa colaboradores x skill_id uma única vez por carga de dados
+#e calcula as 5 dimensões para todos os colaboradores com poucas operações de matriz (NumPy/SciPy)
+#Os perfis ficam em PerfisCompactos (perfis_compactos.py); o DataFrame só é remontado se alguém pedir motor.df
+import copy
+import itertools
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from perfis_compactos import PerfisCompactos
+from vocabulario_skills import VocabularioSkills
+from store_embeddings import abrir_store, hash_texto
+from indice_ann import N_SONDAS_PADRAO, IndiceIVF
+from indice_skills import IndiceInvertido
+from telemetria import contar, etapa
+
+# Ordem das colunas da matriz de componentes (N x 5)
+DIMENSOES = ['hard', 'soft', 'sen', 'carga', 'asp']
+# Quantidade padrão de colaboradores devolvidos pelo recomendar
+K_PADRAO = 10
+# A partir deste tamanho a aspiração usa o índice ANN (shortlist) em vez da busca exata
+LIMIAR_ANN = 100000
+TAMANHO_SHORTLIST = 2000
+# Top-k podado: quantos colaboradores (no mínimo) são pontuados na 1ª rodada, para fixar o limiar
+LOTE_INICIAL_PODA = 256
+# Teto da aspiração: cosseno com vetores quantizados (float16/int8) pode passar um pouco de 1
+TETO_ASP = 1.05
+FOLGA_TETO = 1e-9
+# Casas decimais do score na ordenação (chave_ordenacao); a folga do teto cobre o arredondamento
+CASAS_ORDENACAO = 9
+# recomendar_lote: memória máxima das matrizes tarefas x colaboradores de um bloco (bytes)
+MEMORIA_LOTE = 256 * 2**20
+# Versões dos dados, únicas no processo: cada motor novo (ou alterado) recebe a próxima (chave do cache_resultados)
+_VERSOES_DADOS = itertools.count(1)
+
+
+def score_carga(carga_percent):
+    """Dimensão de carga: 1 - carga/100, com a carga limitada a [0, 100] (acima de 100% o score é 0, não negativo)."""
+    return 1.0 - np.clip(np.asarray(carga_percent, dtype=np.float64), 0.0, 100.0) / 100.0
+
+
+def matriz_incidencia(listas_ids, vocabulario):
+    """
+    Matriz esparsa binária colaboradores x skills (CSR), já normalizada por linha (L2).
+    Ids fora do vocabulário são ignorados.
+    """
+    tamanhos = np.fromiter((len(l) for l in listas_ids), dtype=np.int64, count=len(listas_ids))
+    ids = np.fromiter((sid for l in listas_ids for sid in l), dtype=np.int64, count=int(tamanhos.sum()))
+    ponteiros = np.concatenate([[0], np.cumsum(tamanhos)])
+    return matriz_incidencia_csr(ponteiros, ids, vocabulario)
+
+
+def matriz_incidencia_csr(ponteiros, ids, vocabulario):
+    """Mesma matriz de `matriz_incidencia`, direto dos arrays CSR (ponteiros, skill_ids) dos perfis."""
+    n = len(ponteiros) - 1
+    linhas = np.repeat(np.arange(n, dtype=np.int32), np.diff(ponteiros))
+    cols = vocabulario.colunas(np.asarray(ids, dtype=np.int64))
+    validos = cols >= 0
+    m = sparse.csr_matrix((np.ones(int(validos.sum())), (linhas[validos], cols[validos])),
+                          shape=(n, len(vocabulario)))
+    m.sum_duplicates()
+    m.data[:] = 1.0
+    return normalizar_linhas(m)
+
+
+def normalizar_linhas(m):
+    """Divide cada linha pela sua norma L2 (linhas vazias continuam zeradas)."""
+    nnz = np.diff(m.indptr)
+    m.data /= np.sqrt(np.repeat(nnz, nnz).astype(np.float64))
+    return m
+
+
+def similaridade(matriz, cols_tarefa, n_tarefa):
+    """Cosseno binário entre a tarefa (colunas requeridas) e todos os colaboradores."""
+    if n_tarefa == 0 or matriz.shape[1] == 0:
+        return np.zeros(matriz.shape[0])
+    vetor = np.zeros(matriz.shape[1])
+    vetor[cols_tarefa] = 1.0 / np.sqrt(n_tarefa)
+    return matriz @ vetor
+
+
+def matriz_tarefas(codificadas, n_colunas):
+    """
+    Matriz esparsa tarefas x skills (CSR) a partir de [(colunas, n_total), ...]: cada linha vale
+    1/sqrt(n_total), o mesmo vetor que `similaridade` monta para uma tarefa.
+    """
+    tamanhos = np.array([len(c) for c, _ in codificadas], dtype=np.int64)
+    cols = np.concatenate([c for c, _ in codificadas]) if len(codificadas) else np.empty(0, dtype=np.int32)
+    valores = np.repeat([1.0 / np.sqrt(n) if n else 0.0 for _, n in codificadas], tamanhos)
+    indptr = np.concatenate([[0], np.cumsum(tamanhos)])
+    return sparse.csr_matrix((valores, cols, indptr), shape=(len(codificadas), n_colunas))
+
+
+def chave_ordenacao(scores):
+    """
+    Score usado para ordenar, arredondado em CASAS_ORDENACAO casas: o ruído da soma em ponto flutuante
+    (~1e-16, que muda com a ordem das operações) conta como empate, e o empate fica na ordem das linhas.
+    Assim o motor e o recomendar_referencia ordenam os empates do mesmo jeito.
+    """
+    return np.round(scores, CASAS_ORDENACAO)
+
+
+def ordenar(scores):
+    """Ranking completo: score decrescente, empates na ordem original (ordenação estável)."""
+    return np.argsort(-chave_ordenacao(scores), kind='stable')
+
+
+def indices_top_k(scores, k):
+    """
+    Índices dos k maiores scores, na mesma ordem que `ordenar(scores)[:k]`, usando seleção
+    parcial (argpartition, O(N)) e ordenando só os k escolhidos.
+    """
+    n = len(scores)
+    if k >= n:
+        return ordenar(scores)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    scores = chave_ordenacao(scores)
+    candidatos = np.argpartition(-scores, k - 1)[:k]
+    limiar = scores[candidatos].min()
+    # Empates no limiar: fica quem vem primeiro, como na ordenação estável
+    acima = np.flatnonzero(scores > limiar)
+    empatados = np.flatnonzero(scores == limiar)[:k - len(acima)]
+    escolhidos = np.concatenate([acima, empatados])
+    return escolhidos[np.lexsort((escolhidos, -scores[escolhidos]))]
+
+
+class MotorScores:
+    """
+    Pré-processa os colaboradores (DataFrame ou PerfisCompactos) uma vez e pontua qualquer tarefa
+    sem loops por colaborador. Produz o mesmo ranking do recomendar_referencia.
+    """
+
+    def __init__(self, df, vocabulario=None, aspiracao=None, store=None, usar_ann=None,
+                 shortlist_asp=TAMANHO_SHORTLIST, n_sondas=N_SONDAS_PADRAO):
+        if isinstance(df, PerfisCompactos):
+            self.perfis, self._df = df, None
+        else:
+            self.perfis, self._df = PerfisCompactos.do_dataframe(df), df
+        self._nomes = None
+        self.vocabulario = vocabulario if vocabulario is not None else VocabularioSkills.do_dataframe(self.df)
+        self.hard = matriz_incidencia_csr(self.perfis.ponteiros['hard'], self.perfis.skills['hard'], self.vocabulario)
+        self.soft = matriz_incidencia_csr(self.perfis.ponteiros['soft'], self.perfis.skills['soft'], self.vocabulario)
+        self.senioridade = self.perfis.senioridade.copy()
+        # Postings skill -> colaboradores, para o top-k podado
+        self.indice_hard = IndiceInvertido(self.hard)
+        self.indice_soft = IndiceInvertido(self.soft)
+        self.avaliados = 0     # colaboradores pontuados por inteiro na última recomendação
+        self.carga = score_carga(self.perfis.carga)
+        # Aspirações: vetores ficam no store mapeado em disco (store_embeddings.py), indexados pelo id.
+        # `aspiracao` pode ser o scorer ou uma função que o devolve (modelo carregado sob demanda, ex.: o
+        # CarregadorModelo, que também diz se já terminou de carregar)
+        self.aspiracao = aspiracao
+        self.store = store
+        self.ids = self.perfis.ids.astype(np.int64)
+        self._linhas_store = None
+        # Índice ANN (IVF) da aspiração: por padrão só a partir de LIMIAR_ANN colaboradores
+        self.usar_ann = len(self.perfis) >= LIMIAR_ANN if usar_ann is None else usar_ann
+        self.shortlist_asp = shortlist_asp
+        self.n_sondas = n_sondas
+        self.indice_asp = None
+        self._asp_ann = None
+        self.versao_dados = next(_VERSOES_DADOS)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def copia(self):
+        """
+        Motor para ser alterado (aplicar_alteracoes) sem mexer neste: arrays e matrizes são trocados, não
+        editados, e o índice ANN é clonado. O store é compartilhado, mas só ganha linhas novas (store_embeddings).
+        """
+        motor = copy.copy(self)
+        if self.indice_asp is not None:
+            motor.indice_asp = self.indice_asp.copia()
+        motor._asp_ann = None
+        return motor
+
+    @property
+    def df(self):
+        """DataFrame no formato antigo (remontado dos perfis compactos na primeira vez que é pedido)."""
+        if self._df is None:
+            self._df = self.perfis.para_dataframe()
+        return self._df
+
+    @property
+    def nomes(self):
+        if self._nomes is None:
+            self._nomes = self.perfis.nomes()
+        return self._nomes
+
+    def score_senioridade(self, req, posicoes=None):
+        senioridade = self.senioridade if posicoes is None else self.senioridade[posicoes]
+        diff = np.abs(req - senioridade)
+        sen = np.where(diff <= 0.2, 1.0, np.where(diff <= 0.4, 0.5, 0.0))
+        sen[senioridade == 0] = 0.0
+        return sen
+
+    def scorer_aspiracao(self):
+        return self.aspiracao() if callable(self.aspiracao) else self.aspiracao
+
+    def aspiracao_pronta(self):
+        """
+        Se a aspiração sai sem esperar o modelo: só um CarregadorModelo ainda carregando faz esperar
+        (se ele nem começou, o carregamento começa em segundo plano).
+        """
+        aquecer = getattr(self.aspiracao, 'aquecer', None)
+        if aquecer is None:
+            return True
+        aquecer()
+        return self.aspiracao.concluido
+
+    def sincronizar_store(self, scorer, posicoes=None):
+        """
+        Garante que o store tem o vetor atual de cada colaborador: só quem é novo ou mudou
+        de aspiração (hash do texto diferente) passa pelo modelo. Retorna a linha de cada colaborador.
+        Com `posicoes`, confere só esses colaboradores (e devolve só as linhas deles).
+        """
+        posicoes = np.arange(len(self)) if posicoes is None else np.asarray(posicoes, dtype=np.int64)
+        ids = self.ids[posicoes]
+        assinatura = scorer.codificador.assinatura
+        if self.store is None:
+            self.store = abrir_store(assinatura)
+        elif len(posicoes) == len(self) and self.store.substituto is not None:
+            # Sincronização completa num store já compactado por outro motor: segue para o atual
+            self.store, self.indice_asp = self.store.atual(), None
+        # Os perfis já guardam as aspirações internadas: cada texto distinto é hasheado uma vez
+        unicos, codigos = np.unique(self.perfis.asp_cod[posicoes], return_inverse=True)
+        textos = self.perfis.asp_unicos[unicos].tolist()
+        hashes = np.array([hash_texto(f"{assinatura}\0{t}") for t in textos], dtype=np.uint64)[codigos]
+        vazias = ~np.array([bool(t) for t in textos], dtype=bool)[codigos]
+        if self.store is None:
+            mudaram = np.flatnonzero(~vazias)
+            substituidas = np.empty(0, dtype=np.int64)
+        else:
+            antes = self.store.linhas(ids)
+            gravados = np.where(antes >= 0, self.store.hashes[np.maximum(antes, 0)], np.uint64(0))
+            mudaram = np.flatnonzero(~vazias & (gravados != hashes))
+            substituidas = antes[mudaram]
+        if len(mudaram):
+            emb = scorer.embeddings([textos[c] for c in codigos[mudaram]], usar_cache=False)
+            if self.store is None:
+                self.store = abrir_store(assinatura, dim=emb.shape[1])
+            self.store.gravar(ids[mudaram], emb, hashes[mudaram])
+            print(f"[IA-CLOUD] 🧠 {len(mudaram)} aspirações (re)calculadas no store de embeddings.")
+        if self.store is None:
+            return np.full(len(posicoes), -1, dtype=np.int64)
+        linhas = self.store.linhas(ids)
+        # Aspiração vazia não pontua, mesmo que exista vetor antigo no store
+        if self.indice_asp is not None:
+            # Atualização incremental do índice: troca a linha de quem mudou e tira quem ficou sem aspiração
+            self.indice_asp.remover(substituidas[substituidas >= 0])
+            self.indice_asp.adicionar(linhas[mudaram])
+            self.indice_asp.remover(linhas[vazias & (linhas >= 0)])
+        linhas[vazias] = -1
+        return linhas
+
+    def _compactar_store(self):
+        """Compacta o store quando as linhas livres passam do limite e remapeia as linhas deste motor."""
+        if self._linhas_store is None or not self.store.precisa_compactar():
+            return
+        self.store, mapa = self.store.compactar()
+        linhas = self._linhas_store
+        self._linhas_store = np.where(linhas >= 0, mapa[np.maximum(linhas, 0)], -1)
+        # O índice ANN guarda linhas do store antigo: é retreinado na próxima busca
+        self.indice_asp = None
+        self._asp_ann = None
+
+    def vetor_aspiracao(self, descricao):
+        """(linha no store de cada colaborador, vetor da tarefa), ou None se a aspiração não pontua."""
+        if self.aspiracao is None or not descricao:
+            return None
+        scorer = self.scorer_aspiracao()
+        if scorer is None:
+            return None
+        if self._linhas_store is None:
+            self._linhas_store = self.sincronizar_store(scorer)
+            self._compactar_store()
+        linhas = self._linhas_store
+        if not (linhas >= 0).any():
+            return None
+        with etapa('recomendar.codificar_aspiracao'):
+            return linhas, scorer.embedding(descricao)
+
+    def score_aspiracao(self, descricao, posicoes=None):
+        """Aspiração de todos os colaboradores, ou só das `posicoes` pedidas."""
+        n = len(self) if posicoes is None else len(posicoes)
+        preparado = self.vetor_aspiracao(descricao)
+        if preparado is None:
+            return np.zeros(n)
+        linhas, vetor_tarefa = preparado
+        if self.usar_ann:
+            # O top-k podado pede a aspiração em duas rodadas: a shortlist da tarefa é buscada uma vez
+            if self._asp_ann is None or self._asp_ann[0] != descricao:
+                self._asp_ann = (descricao, self.score_aspiracao_ann(vetor_tarefa, linhas))
+            asp = self._asp_ann[1]
+            return asp if posicoes is None else asp[posicoes]
+        if posicoes is None:
+            sims = self.store.similaridades(vetor_tarefa)
+            return np.where(linhas >= 0, sims[np.maximum(linhas, 0)], 0.0).astype(np.float64)
+        linhas = linhas[posicoes]
+        sims = self.store.similaridades_linhas(vetor_tarefa, np.maximum(linhas, 0))
+        return np.where(linhas >= 0, sims, 0.0).astype(np.float64)
+
+    def score_aspiracao_ann(self, vetor_tarefa, linhas):
+        """
+        Aspiração via índice IVF: só a shortlist de `shortlist_asp` colaboradores recebe o cosseno exato.
+        Os demais (com aspiração) não são avaliados e ficam com o menor cosseno da shortlist, limitado a 0:
+        nunca ganham de quem o índice avaliou (nem de um cosseno negativo) e não herdam a afinidade da shortlist
+        quando todos ali são positivos. Troca de recall: quem tem afinidade real mas ficou fora da shortlist
+        (ou das `n_sondas` listas sondadas) perde esses pontos; aumentar `shortlist_asp` e `n_sondas` recupera
+        recall ao custo de comparar mais vetores.
+        """
+        validas = linhas >= 0
+        if self.indice_asp is None:
+            self.indice_asp = IndiceIVF(self.store, n_sondas=self.n_sondas).treinar(linhas[validas])
+        cand, sims = self.indice_asp.buscar(vetor_tarefa, self.shortlist_asp)
+        posicao = np.full(self.store.n, -1, dtype=np.int64)
+        posicao[linhas[validas]] = np.flatnonzero(validas)
+        asp = np.zeros(len(self))
+        achados = posicao[cand] >= 0
+        if achados.any():
+            asp[validas] = min(float(sims[achados].min()), 0.0)
+        asp[posicao[cand[achados]]] = sims[achados]
+        return asp
+
+    def componentes(self, tarefa, com_aspiracao=True, posicoes=None):
+        """
+        Matriz N x 5 com o score de cada dimensão (na ordem de DIMENSOES).
+        Com `posicoes`, só as linhas desses colaboradores (len(posicoes) x 5).
+        """
+        with etapa('recomendar.codificar'):
+            (cols_hard, n_hard), (cols_soft, n_soft) = self.vocabulario.codificar_tarefa(tarefa)
+        todos = posicoes is None
+        comp = np.empty((len(self) if todos else len(posicoes), len(DIMENSOES)))
+        with etapa('recomendar.hard'):
+            comp[:, 0] = similaridade(self.hard if todos else self.hard[posicoes], cols_hard, n_hard)
+        with etapa('recomendar.soft'):
+            comp[:, 1] = similaridade(self.soft if todos else self.soft[posicoes], cols_soft, n_soft)
+        with etapa('recomendar.sen'):
+            comp[:, 2] = self.score_senioridade(tarefa['senioridade_peso_requerido'], posicoes)
+        with etapa('recomendar.carga'):
+            comp[:, 3] = self.carga if todos else self.carga[posicoes]
+        # Aspiração só roda o BERT quando a dimensão é necessária
+        with etapa('recomendar.asp'):
+            comp[:, 4] = self.score_aspiracao(tarefa.get('descricao'), posicoes) if com_aspiracao else 0.0
+        return comp
+
+    @staticmethod
+    def soma_ponderada(comp, pesos):
+        # Mesma ordem de operações da média ponderada original
+        return ((comp[:, 0] * pesos['hard']) + (comp[:, 1] * pesos['soft']) + (comp[:, 2] * pesos['sen'])
+                + (comp[:, 3] * pesos['carga']) + (comp[:, 4] * pesos['asp']))
+
+    def tabela(self, linhas, comp, final):
+        """DataFrame de resultado só com as linhas pedidas (já na ordem do ranking)."""
+        return self._tabela(linhas, comp[linhas], final[linhas])
+
+    def _tabela(self, linhas, comp, final):
+        # `comp` e `final` já alinhados com `linhas`
+        return pd.DataFrame({
+            'Nome': self.perfis.nomes(linhas),
+            'Score Final': final,
+            'Hard': comp[:, 0],
+            'Soft': comp[:, 1],
+            'Sen': comp[:, 2],
+            'Carga': comp[:, 3],
+            'Aspiração': comp[:, 4]
+        }, index=linhas)
+
+    def tetos(self, tarefa, pesos, com_aspiracao):
+        """
+        Maior score final possível de cada colaborador com os `pesos` atuais: hard/soft exatos pelas
+        postings do índice invertido (zero para quem não tem nenhuma skill da tarefa), carga e senioridade
+        exatas e aspiração no valor máximo. Custa poucas operações vetoriais, sem o BERT.
+        """
+        (cols_hard, n_hard), (cols_soft, n_soft) = self.vocabulario.codificar_tarefa(tarefa)
+        teto = pesos['carga'] * self.carga
+        teto += pesos['sen'] * self.score_senioridade(tarefa['senioridade_peso_requerido'])
+        teto += (pesos['asp'] * TETO_ASP if com_aspiracao else 0.0) + FOLGA_TETO
+        for indice, cols, n_tarefa, peso in ((self.indice_hard, cols_hard, n_hard, pesos['hard']),
+                                             (self.indice_soft, cols_soft, n_soft, pesos['soft'])):
+            linhas, cosseno = indice.acumular(cols, n_tarefa)
+            teto[linhas] += peso * cosseno
+        return teto
+
+    def recomendar_podado(self, tarefa, pesos, k=K_PADRAO):
+        """
+        Top-k estilo WAND: pontua primeiro os colaboradores de maior teto, usa o k-ésimo score exato
+        como limiar e depois só pontua quem ainda tem teto >= limiar. Mesmo resultado do ranking completo.
+        """
+        com_aspiracao = pesos['asp'] != 0
+        with etapa('recomendar.tetos'):
+            teto = self.tetos(tarefa, pesos, com_aspiracao)
+            posicoes = np.sort(indices_top_k(teto, max(k * 4, LOTE_INICIAL_PODA)))
+        comp = self.componentes(tarefa, com_aspiracao, posicoes)
+        final = self.soma_ponderada(comp, pesos)
+        if len(final) >= k:
+            limiar = np.partition(final, len(final) - k)[len(final) - k]
+            restantes = np.flatnonzero(teto >= limiar)
+            restantes = restantes[~np.isin(restantes, posicoes, assume_unique=True)]
+            if len(restantes):
+                comp_r = self.componentes(tarefa, com_aspiracao, restantes)
+                posicoes = np.concatenate([posicoes, restantes])
+                comp = np.vstack([comp, comp_r])
+                final = np.concatenate([final, self.soma_ponderada(comp_r, pesos)])
+                # Ordem original das linhas: empates resolvidos como no ranking completo
+                ordem = np.argsort(posicoes, kind='stable')
+                posicoes, comp, final = posicoes[ordem], comp[ordem], final[ordem]
+        self.avaliados = len(posicoes)
+        with etapa('recomendar.ranking'):
+            topo = indices_top_k(final, k)
+            return self._tabela(posicoes[topo], comp[topo], final[topo])
+
+    def score_aspiracao_lote(self, descricoes):
+        """Matriz tarefas x colaboradores de aspiração: as descrições são embutidas num lote só."""
+        asp = np.zeros((len(descricoes), len(self)))
+        com_texto = [i for i, d in enumerate(descricoes) if d]
+        preparado = self.vetor_aspiracao(descricoes[com_texto[0]]) if com_texto else None
+        if preparado is None:
+            return asp
+        linhas, _ = preparado
+        vetores = self.scorer_aspiracao().embeddings([descricoes[i] for i in com_texto])
+        validas = linhas >= 0
+        if self.usar_ann:
+            for i, vetor in zip(com_texto, vetores):
+                asp[i] = self.score_aspiracao_ann(vetor, linhas)
+            return asp
+        sims = self.store.similaridades_matriz(vetores)
+        asp[np.ix_(com_texto, np.flatnonzero(validas))] = sims[:, linhas[validas]]
+        return asp
+
+    def componentes_lote(self, tarefas, com_aspiracao=True):
+        """
+        Componentes de várias tarefas de uma vez: 5 matrizes tarefas x colaboradores (na ordem de
+        DIMENSOES), com hard/soft calculados por produto matriz-matriz esparso.
+        """
+        codificadas = [self.vocabulario.codificar_tarefa(t) for t in tarefas]
+        hard = matriz_tarefas([h for h, _ in codificadas], self.hard.shape[1])
+        soft = matriz_tarefas([s for _, s in codificadas], self.soft.shape[1])
+        req = np.array([t['senioridade_peso_requerido'] for t in tarefas], dtype=np.float64)
+        diff = np.abs(req[:, None] - self.senioridade[None, :])
+        sen = np.where(diff <= 0.2, 1.0, np.where(diff <= 0.4, 0.5, 0.0))
+        sen[:, self.senioridade == 0] = 0.0
+        return [
+            (hard @ self.hard.T).toarray(),
+            (soft @ self.soft.T).toarray(),
+            sen,
+            np.broadcast_to(self.carga, (len(tarefas), len(self))),
+            self.score_aspiracao_lote([t.get('descricao') for t in tarefas]) if com_aspiracao
+            else np.zeros((len(tarefas), len(self))),
+        ]
+
+    def blocos_lote(self, tarefas, pesos, tarefas_por_bloco=None):
+        """
+        Gera (início, componentes, score final) para blocos de tarefas, cada bloco pontuado contra
+        todos os colaboradores. O tamanho do bloco é limitado por MEMORIA_LOTE.
+        """
+        if tarefas_por_bloco is None:
+            tarefas_por_bloco = max(1, MEMORIA_LOTE // (8 * (len(DIMENSOES) + 1) * max(1, len(self))))
+        com_aspiracao = pesos['asp'] != 0
+        for inicio in range(0, len(tarefas), tarefas_por_bloco):
+            comp = self.componentes_lote(tarefas[inicio:inicio + tarefas_por_bloco], com_aspiracao)
+            final = ((comp[0] * pesos['hard']) + (comp[1] * pesos['soft']) + (comp[2] * pesos['sen'])
+                     + (comp[3] * pesos['carga']) + (comp[4] * pesos['asp']))
+            yield inicio, comp, final
+
+    def recomendar_lote(self, tarefas, pesos, k=K_PADRAO, tarefas_por_bloco=None):
+        """Top-k de cada tarefa (lista de DataFrames, na ordem de `tarefas`), pontuadas em blocos."""
+        resultados = []
+        with etapa('recomendar_lote'):
+            for _, comp, final in self.blocos_lote(tarefas, pesos, tarefas_por_bloco):
+                for i in range(len(final)):
+                    linhas = indices_top_k(final[i], k)
+                    resultados.append(self._tabela(linhas, np.column_stack([c[i, linhas] for c in comp]),
+                                                   final[i, linhas]))
+        self.avaliados = len(self) * len(tarefas)
+        contar('recomendacoes', len(tarefas))
+        contar('colaboradores_pontuados', self.avaliados)
+        return resultados
+
+    def aplicar_alteracoes(self, perfis, removidos=()):
+        """
+        Atualiza o motor sem reconstruí-lo: `perfis` traz os colaboradores novos ou alterados (mesmas
+        colunas do DataFrame de colaboradores) e `removidos` os ids que saíram da base. Só essas linhas
+        são recodificadas e só as aspirações que mudaram passam pelo modelo; os índices de skills são
+        remontados a partir das matrizes já prontas. As linhas continuam ordenadas por id, como na
+        carga completa. Retorna {'alterados', 'novos', 'removidos'}.
+        """
+        if not isinstance(perfis, PerfisCompactos):
+            perfis = PerfisCompactos.do_dataframe(perfis.reset_index(drop=True))
+        self.versao_dados = next(_VERSOES_DADOS)
+        indice = pd.Index(self.ids)
+        ids_perfis = perfis.ids.astype(np.int64)
+        pos_perfis = indice.get_indexer(ids_perfis)
+        pos_removidos = indice.get_indexer(np.asarray(list(removidos), dtype=np.int64))
+        pos_removidos = np.setdiff1d(pos_removidos[pos_removidos >= 0], pos_perfis)
+        existentes = pos_perfis >= 0
+        sai = np.zeros(len(self), dtype=bool)
+        sai[pos_perfis[existentes]] = True
+        sai[pos_removidos] = True
+        ficam = np.flatnonzero(~sai)
+
+        # A carga vem do livro de carga junto com o perfil (carga_colaborador também entra no change-log)
+        carga_perfis = score_carga(perfis.carga)
+
+        ids = np.concatenate([self.ids[ficam], ids_perfis])
+        ordem = np.argsort(ids, kind='stable')
+        posicao_nova = np.empty(len(ordem), dtype=np.int64)
+        posicao_nova[ordem] = np.arange(len(ordem))
+
+        def juntar(antigos, novos):
+            return np.concatenate([antigos[ficam], novos])[ordem]
+
+        def juntar_matriz(antiga, tipo):
+            antiga = antiga[ficam]
+            antiga.resize(antiga.shape[0], len(self.vocabulario))
+            nova = matriz_incidencia_csr(perfis.ponteiros[tipo], perfis.skills[tipo], self.vocabulario)
+            return sparse.vstack([antiga, nova], format='csr')[ordem]
+
+        linhas_antigas = self._linhas_store
+        if linhas_antigas is not None and self.store.substituto is not None:
+            # Outro motor já compactou o store: estas linhas são da geração antiga, refaz a sincronização inteira
+            linhas_antigas = None
+            self.store, self.indice_asp = self.store.atual(), None
+        if linhas_antigas is not None and len(pos_removidos):
+            if self.indice_asp is not None:
+                self.indice_asp.remover(linhas_antigas[pos_removidos][linhas_antigas[pos_removidos] >= 0])
+            self.store.remover(self.ids[pos_removidos])
+
+        self.perfis = PerfisCompactos.concatenar([self.perfis.subconjunto(ficam), perfis]).subconjunto(ordem)
+        self._df = self._nomes = None
+        self.hard = juntar_matriz(self.hard, 'hard')
+        self.soft = juntar_matriz(self.soft, 'soft')
+        self.senioridade = juntar(self.senioridade, perfis.senioridade)
+        self.carga = juntar(self.carga, carga_perfis)
+        self.ids = ids[ordem]
+        self.indice_hard = IndiceInvertido(self.hard)
+        self.indice_soft = IndiceInvertido(self.soft)
+        self._asp_ann = None
+
+        # Aspiração: só os perfis recebidos são conferidos no store (e no índice ANN)
+        scorer = self.scorer_aspiracao() if linhas_antigas is not None else None
+        if scorer is None:
+            self._linhas_store = None
+        else:
+            linhas = np.empty(len(self), dtype=np.int64)
+            linhas[posicao_nova[:len(ficam)]] = linhas_antigas[ficam]
+            linhas[posicao_nova[len(ficam):]] = self.sincronizar_store(scorer, posicao_nova[len(ficam):])
+            self._linhas_store = linhas
+            self._compactar_store()
+        return {'alterados': int(existentes.sum()), 'novos': int((~existentes).sum()),
+                'removidos': len(pos_removidos)}
+
+    def com_carga(self, posicoes, carga_percent):
+        """
+        Motor novo com a carga dos colaboradores informados trocada (ex.: depois de uma alocação).
+        Este motor não muda: quem o guardou (outra sessão, um ranking em andamento) continua consistente.
+        """
+        motor = copy.copy(self)
+        motor.perfis = self.perfis.com_carga(posicoes, carga_percent)
+        motor.carga = self.carga.copy()
+        motor.carga[posicoes] = score_carga(carga_percent)
+        motor._df = None
+        motor.versao_dados = next(_VERSOES_DADOS)
+        return motor
+
+    def recomendar(self, tarefa, pesos, k=K_PADRAO, completo=False, podar=True):
+        """
+        Top-k colaboradores com o detalhamento por dimensão. Só as k linhas do topo viram DataFrame;
+        `completo=True` devolve o ranking inteiro (todas as linhas ordenadas).
+        Com pesos não negativos o top-k usa a poda por teto (recomendar_podado).
+        """
+        with etapa('recomendar'):
+            if podar and not completo and 0 < k < len(self) and min(pesos[d] for d in DIMENSOES) >= 0:
+                resultado = self.recomendar_podado(tarefa, pesos, k)
+            else:
+                comp = self.componentes(tarefa, com_aspiracao=pesos['asp'] != 0)
+                final = self.soma_ponderada(comp, pesos)
+                self.avaliados = len(self)
+                with etapa('recomendar.ranking'):
+                    linhas = ordenar(final) if completo else indices_top_k(final, k)
+                    resultado = self.tabela(linhas, comp, final)
+        contar('recomendacoes')
+        contar('colaboradores_pontuados', self.avaliados)
+        return resultado
+
+    def componentes_tarefa(self, tarefa):
+        """Scores das 5 dimensões da tarefa para todos os colaboradores, prontos para reclassificar."""
+        return ComponentesTarefa(self, tarefa)
+
+
+class ComponentesTarefa:
+    """
+    Matriz N x 5 (float32) com os scores de uma tarefa, calculada uma vez (inclusive a aspiração, já que o
+    peso dela pode mudar depois). Trocar os pesos vira um produto matriz-vetor + top-k, sem o BERT.
+    Vale enquanto o motor e a versão dos dados forem os mesmos (valido_para).
+    Com o modelo ainda carregando, a coluna da aspiração fica zerada (com_aspiracao=False) e é preenchida
+    no primeiro reclassificar com peso de aspiração depois que o modelo fica pronto: a busca não espera o BERT.
+    """
+
+    def __init__(self, motor, tarefa):
+        self.motor = motor
+        self.tarefa = tarefa
+        self.versao_dados = motor.versao_dados
+        self.com_aspiracao = motor.aspiracao_pronta()
+        with etapa('recomendar'):
+            self.matriz = motor.componentes(tarefa, com_aspiracao=self.com_aspiracao).astype(np.float32)
+        contar('colaboradores_pontuados', len(motor))
+
+    def completar_aspiracao(self, pesos):
+        """Preenche a aspiração que ficou pendente, se o peso dela conta e o modelo já está pronto."""
+        if self.com_aspiracao or pesos['asp'] <= 0 or not self.motor.aspiracao_pronta():
+            return
+        with etapa('recomendar.asp'):
+            matriz = self.matriz.copy()
+            matriz[:, 4] = self.motor.score_aspiracao(self.tarefa.get('descricao'))
+        # Troca a matriz inteira (a mesma ComponentesTarefa pode estar em várias sessões)
+        self.matriz, self.com_aspiracao = matriz, True
+
+    def valido_para(self, motor):
+        # As versões dos dados são únicas entre motores (contador do processo)
+        return motor.versao_dados == self.versao_dados
+
+    def reclassificar(self, pesos, k=K_PADRAO):
+        """
+        Top-k com os `pesos` informados. Em float32 a soma pode diferir do motor na 7ª casa: só empates
+        dentro dessa precisão podem trocar de ordem em relação ao recomendar.
+        """
+        self.completar_aspiracao(pesos)
+        matriz = self.matriz
+        with etapa('reclassificar'):
+            final = matriz @ np.array([pesos[d] for d in DIMENSOES], dtype=np.float32)
+            linhas = indices_top_k(final, k)
+            resultado = self.motor._tabela(linhas, matriz[linhas].astype(np.float64),
+                                           final[linhas].astype(np.float64))
+        contar('reclassificacoes')
+        return resultado
+
+
+# Cache de 1 posição: reaproveita o motor enquanto o mesmo DataFrame (ou PerfisCompactos) for usado
+_motor_cache = None
+
+
+def motor_para(df, vocabulario=None, aspiracao=None):
+    """Retorna o motor dos colaboradores, construindo a matriz só quando os dados mudam."""
+    global _motor_cache
+    if _motor_cache is None or (_motor_cache.perfis is not df and _motor_cache._df is not df):
+        _motor_cache = MotorScores(df, vocabulario, aspiracao)
+    return _motor_cache
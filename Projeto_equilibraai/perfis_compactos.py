@@ -0,0 +1,291 @@
+#Perfis dos colaboradores em arrays compactos, no lugar do DataFrame com listas Python em cada célula
+#Skills em CSR (ponteiros int64 + skill_ids int32, um array para hard e outro para soft), carga em float32,
+#nomes e aspirações internados (cada texto distinto guardado uma vez + um código int32 por colaborador) e
+#uma tabela skill_id -> nome. Um Perfil (com __slots__) lê um colaborador sem copiar nada; para_dataframe()
+#remonta o formato antigo só para quem ainda precisa dele (exibição, compatibilidade).
+#Memória medida com benchmarks/bench_perfis_compactos.py (~6,5 skills por colaborador, nomes todos distintos):
+#~140 MB por milhão de colaboradores (~70 MB em arrays + ~70 MB dos nomes), contra ~1,1 GB do DataFrame de listas.
+#A senioridade fica em float64: em float32 a média (ex.: 0.6) deixa de bater nos limites 0.2/0.4 do calc_sen.
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+COLUNAS = ['id', 'nome', 'senioridade_peso', 'carga_atual_percent', 'skills_hard', 'skills_soft',
+           'skills_hard_ids', 'skills_soft_ids', 'aspiracao_carreira']
+TIPOS = ('hard', 'soft')
+
+
+def _internar(textos):
+    """(textos distintos, código int32 de cada posição), via hash (pd.factorize)."""
+    codigos, unicos = pd.factorize(pd.Series(textos, dtype=object).fillna(''), sort=False)
+    return np.asarray(unicos, dtype=object), codigos.astype(np.int32)
+
+
+def _csr(listas):
+    ponteiros = np.zeros(len(listas) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter((len(l) for l in listas), dtype=np.int64, count=len(listas)), out=ponteiros[1:])
+    valores = np.fromiter((v for l in listas for v in l), dtype=np.int32, count=int(ponteiros[-1]))
+    return ponteiros, valores
+
+
+def _linhas_csr(ponteiros, valores, posicoes):
+    """Sub-CSR só com as `posicoes` (na ordem dada), sem loop por linha."""
+    tamanhos = np.diff(ponteiros)[posicoes]
+    novos = np.zeros(len(posicoes) + 1, dtype=np.int64)
+    np.cumsum(tamanhos, out=novos[1:])
+    origem = np.repeat(ponteiros[:-1][posicoes] - novos[:-1], tamanhos) + np.arange(novos[-1], dtype=np.int64)
+    return novos, valores[origem]
+
+
+def _fatiar(ponteiros, valores):
+    p = ponteiros.tolist()
+    return [valores[p[k]:p[k + 1]] for k in range(len(p) - 1)]
+
+
+def _empacotar_textos(unicos):
+    dados = [t.encode('utf-8') for t in unicos.tolist()]
+    offsets = np.zeros(len(dados) + 1, dtype=np.int64)
+    np.cumsum([len(d) for d in dados], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(dados), dtype=np.uint8)
+
+
+def _desempacotar_textos(offsets, dados):
+    bruto = dados.tobytes()
+    o = offsets.tolist()
+    return np.array([bruto[o[k]:o[k + 1]].decode('utf-8') for k in range(len(o) - 1)] + [None], dtype=object)[:-1]
+
+
+class Perfil:
+    """Um colaborador dentro de um PerfisCompactos (só guarda a referência e a posição)."""
+    __slots__ = ('_perfis', '_pos')
+
+    def __init__(self, perfis, pos):
+        self._perfis = perfis
+        self._pos = pos
+
+    @property
+    def id(self):
+        return int(self._perfis.ids[self._pos])
+
+    @property
+    def nome(self):
+        p = self._perfis
+        return p.nomes_unicos[p.nomes_cod[self._pos]]
+
+    @property
+    def senioridade_peso(self):
+        return float(self._perfis.senioridade[self._pos])
+
+    @property
+    def carga_atual_percent(self):
+        return float(self._perfis.carga[self._pos])
+
+    @property
+    def skills_hard_ids(self):
+        return self._perfis.skill_ids('hard', self._pos)
+
+    @property
+    def skills_soft_ids(self):
+        return self._perfis.skill_ids('soft', self._pos)
+
+    @property
+    def skills_hard(self):
+        return self._perfis.nomes_skill[self.skills_hard_ids].tolist()
+
+    @property
+    def skills_soft(self):
+        return self._perfis.nomes_skill[self.skills_soft_ids].tolist()
+
+    @property
+    def aspiracao_carreira(self):
+        p = self._perfis
+        return p.asp_unicos[p.asp_cod[self._pos]]
+
+    def __repr__(self):
+        return f"Perfil(id={self.id}, nome={self.nome!r})"
+
+
+class PerfisCompactos:
+    """
+    Colunas de todos os colaboradores, na ordem das linhas do motor (id crescente na carga do banco).
+    `ponteiros[tipo]`/`skills[tipo]` formam o CSR de cada tipo de skill; `nomes_skill[skill_id]` é o nome.
+    """
+    __slots__ = ('ids', 'senioridade', 'carga', 'carga_inteira', 'nomes_unicos', 'nomes_cod',
+                 'asp_unicos', 'asp_cod', 'ponteiros', 'skills', 'nomes_skill')
+
+    def __init__(self, ids, nomes_unicos, nomes_cod, senioridade, carga, ponteiros, skills, nomes_skill,
+                 asp_unicos, asp_cod, carga_inteira=True):
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.nomes_unicos = np.asarray(nomes_unicos, dtype=object)
+        self.nomes_cod = np.asarray(nomes_cod, dtype=np.int32)
+        self.senioridade = np.asarray(senioridade, dtype=np.float64)
+        self.carga = np.asarray(carga, dtype=np.float32)
+        self.ponteiros = {t: np.asarray(ponteiros[t], dtype=np.int64) for t in TIPOS}
+        self.skills = {t: np.asarray(skills[t], dtype=np.int32) for t in TIPOS}
+        self.nomes_skill = np.asarray(nomes_skill, dtype=object)
+        self.asp_unicos = np.asarray(asp_unicos, dtype=object)
+        self.asp_cod = np.asarray(asp_cod, dtype=np.int32)
+        self.carga_inteira = carga_inteira
+
+    # Construção
+
+    @classmethod
+    def do_dataframe(cls, df):
+        """A partir do DataFrame de colaboradores (colunas de montar_colaboradores)."""
+        ponteiros, skills = {}, {}
+        maior = 0
+        for t in TIPOS:
+            ponteiros[t], skills[t] = _csr(df[f'skills_{t}_ids'].tolist())
+            if len(skills[t]):
+                maior = max(maior, int(skills[t].max()))
+        # Nome de cada skill como aparece nos perfis (a última ocorrência vale)
+        nomes_skill = np.full(maior + 1, '', dtype=object)
+        for t in TIPOS:
+            nomes = [n for l in df[f'skills_{t}'].tolist() for n in l]
+            if nomes:
+                unicos, codigos = _internar(nomes)
+                nomes_skill[skills[t]] = unicos[codigos]
+        nomes_unicos, nomes_cod = _internar(df['nome'].tolist())
+        asp_unicos, asp_cod = _internar(df['aspiracao_carreira'].tolist())
+        return cls(df['id'].to_numpy(), nomes_unicos, nomes_cod, df['senioridade_peso'].to_numpy(dtype=np.float64),
+                   df['carga_atual_percent'].to_numpy(dtype=np.float32), ponteiros, skills, nomes_skill,
+                   asp_unicos, asp_cod, bool(pd.api.types.is_integer_dtype(df['carga_atual_percent'])))
+
+    @classmethod
+    def concatenar(cls, partes):
+        """Junta vários PerfisCompactos (as tabelas de textos são internadas de novo)."""
+        def textos(unicos, codigos):
+            todos = np.concatenate([getattr(p, unicos) for p in partes])
+            deslocamento = np.cumsum([0] + [len(getattr(p, unicos)) for p in partes[:-1]])
+            cod = np.concatenate([getattr(p, codigos) + d for p, d in zip(partes, deslocamento)])
+            distintos, novo = _internar(todos)
+            return distintos, novo[cod]
+
+        ponteiros, skills = {}, {}
+        for t in TIPOS:
+            tamanhos = np.concatenate([np.diff(p.ponteiros[t]) for p in partes])
+            ponteiros[t] = np.zeros(len(tamanhos) + 1, dtype=np.int64)
+            np.cumsum(tamanhos, out=ponteiros[t][1:])
+            skills[t] = np.concatenate([p.skills[t] for p in partes])
+        nomes_skill = np.full(max(len(p.nomes_skill) for p in partes), '', dtype=object)
+        for p in partes:
+            preenchidos = np.flatnonzero(p.nomes_skill != '')
+            nomes_skill[preenchidos] = p.nomes_skill[preenchidos]
+        return cls(np.concatenate([p.ids for p in partes]), *textos('nomes_unicos', 'nomes_cod'),
+                   np.concatenate([p.senioridade for p in partes]), np.concatenate([p.carga for p in partes]),
+                   ponteiros, skills, nomes_skill, *textos('asp_unicos', 'asp_cod'),
+                   all(p.carga_inteira for p in partes))
+
+    def subconjunto(self, posicoes):
+        """Só as linhas em `posicoes` (na ordem dada); as tabelas de textos são compartilhadas."""
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        ponteiros, skills = {}, {}
+        for t in TIPOS:
+            ponteiros[t], skills[t] = _linhas_csr(self.ponteiros[t], self.skills[t], posicoes)
+        return PerfisCompactos(self.ids[posicoes], self.nomes_unicos, self.nomes_cod[posicoes],
+                               self.senioridade[posicoes], self.carga[posicoes], ponteiros, skills,
+                               self.nomes_skill, self.asp_unicos, self.asp_cod[posicoes], self.carga_inteira)
+
+    def com_carga(self, posicoes, carga_percent):
+        """Cópia com a carga das `posicoes` trocada; os demais arrays são compartilhados (nunca alterados)."""
+        carga = self.carga.copy()
+        carga[posicoes] = carga_percent
+        return PerfisCompactos(self.ids, self.nomes_unicos, self.nomes_cod, self.senioridade, carga, self.ponteiros,
+                               self.skills, self.nomes_skill, self.asp_unicos, self.asp_cod, self.carga_inteira)
+
+    # Acesso
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def empty(self):
+        return len(self.ids) == 0
+
+    def __getitem__(self, pos):
+        n = len(self.ids)
+        if not -n <= pos < n:
+            raise IndexError(pos)
+        return Perfil(self, pos % n)
+
+    def __iter__(self):
+        return (Perfil(self, k) for k in range(len(self.ids)))
+
+    def skill_ids(self, tipo, pos):
+        p = self.ponteiros[tipo]
+        return self.skills[tipo][p[pos]:p[pos + 1]]
+
+    def nomes(self, posicoes=None):
+        """Nome de cada colaborador (array object)."""
+        return self.nomes_unicos[self.nomes_cod if posicoes is None else self.nomes_cod[posicoes]]
+
+    def aspiracoes(self, posicoes=None):
+        """Texto de aspiração de cada colaborador (lista)."""
+        return self.asp_unicos[self.asp_cod if posicoes is None else self.asp_cod[posicoes]].tolist()
+
+    def nomes_skills(self, tipo):
+        """Nomes distintos (ordenados) das skills de um tipo que aparecem em algum perfil."""
+        return sorted(self.nomes_skill[np.unique(self.skills[tipo])].tolist())
+
+    def para_dataframe(self, posicoes=None):
+        """DataFrame no formato de montar_colaboradores (todas as linhas ou só as `posicoes`)."""
+        perfis = self if posicoes is None else self.subconjunto(posicoes)
+        colunas = {'id': perfis.ids.astype(np.int64), 'nome': perfis.nomes(),
+                   'senioridade_peso': perfis.senioridade,
+                   'carga_atual_percent': (perfis.carga.astype(np.int64) if perfis.carga_inteira
+                                           else perfis.carga.astype(np.float64)),
+                   'aspiracao_carreira': perfis.aspiracoes()}
+        for t in TIPOS:
+            ids = perfis.skills[t]
+            colunas[f'skills_{t}_ids'] = _fatiar(perfis.ponteiros[t], ids.astype(np.int64).tolist())
+            colunas[f'skills_{t}'] = _fatiar(perfis.ponteiros[t], perfis.nomes_skill[ids].tolist())
+        return pd.DataFrame({c: colunas[c] for c in COLUNAS})
+
+    # Memória
+
+    def memoria(self):
+        """Bytes ocupados por parte (arrays + objetos str das tabelas internadas)."""
+        def textos(unicos):
+            return unicos.nbytes + sum(sys.getsizeof(t) for t in unicos.tolist())
+
+        return {
+            'ids': self.ids.nbytes,
+            'senioridade': self.senioridade.nbytes,
+            'carga': self.carga.nbytes,
+            'skills': sum(self.ponteiros[t].nbytes + self.skills[t].nbytes for t in TIPOS),
+            'codigos': self.nomes_cod.nbytes + self.asp_cod.nbytes,
+            'nomes': textos(self.nomes_unicos),
+            'aspiracoes': textos(self.asp_unicos),
+            'nomes_skill': textos(self.nomes_skill),
+        }
+
+    # Persistência (snapshot_perfis)
+
+    def salvar(self, pasta):
+        """Um .npy por array + textos em UTF-8 concatenado (offsets), e um perfis.json com o resto."""
+        arrays = {'ids': self.ids, 'senioridade': self.senioridade, 'carga': self.carga,
+                  'nomes_cod': self.nomes_cod, 'asp_cod': self.asp_cod}
+        for t in TIPOS:
+            arrays[f'{t}_ponteiros'], arrays[f'{t}_ids'] = self.ponteiros[t], self.skills[t]
+        for chave in ('nomes_unicos', 'asp_unicos', 'nomes_skill'):
+            arrays[f'{chave}_offsets'], arrays[f'{chave}_dados'] = _empacotar_textos(getattr(self, chave))
+        for chave, valor in arrays.items():
+            np.save(os.path.join(pasta, chave + '.npy'), valor)
+        with open(os.path.join(pasta, 'perfis.json'), 'w', encoding='utf-8') as f:
+            json.dump({'n': len(self), 'carga_inteira': self.carga_inteira}, f)
+
+    @classmethod
+    def carregar(cls, pasta):
+        def ler(chave):
+            return np.load(os.path.join(pasta, chave + '.npy'))
+
+        def textos(chave):
+            return _desempacotar_textos(ler(f'{chave}_offsets'), ler(f'{chave}_dados'))
+
+        with open(os.path.join(pasta, 'perfis.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(ler('ids'), textos('nomes_unicos'), ler('nomes_cod'), ler('senioridade'), ler('carga'),
+                   {t: ler(f'{t}_ponteiros') for t in TIPOS}, {t: ler(f'{t}_ids') for t in TIPOS},
+                   textos('nomes_skill'), textos('asp_unicos'), ler('asp_cod'), meta['carga_inteira'])
@@ -0,0 +1,229 @@
+#Pool de conexões com o PostgreSQL (AWS RDS), compartilhado pelo processo inteiro
+#Cada recarga dos dados reaproveita conexões já abertas em vez de pagar de novo o handshake TCP + TLS.
+#Configuração por variáveis de ambiente (EQUILIBRAAI_DB_*), o que permite apontar para um PostgreSQL local.
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import psycopg2
+
+
+class ConfiguracaoAusente(RuntimeError):
+    """Variável de ambiente obrigatória da conexão não definida."""
+
+
+def configuracao_banco():
+    """Parâmetros de conexão. Host e senha não têm padrão: sem EQUILIBRAAI_DB_HOST/EQUILIBRAAI_DB_PASS, erro."""
+    faltando = [v for v in ('EQUILIBRAAI_DB_HOST', 'EQUILIBRAAI_DB_PASS') if not os.environ.get(v)]
+    if faltando:
+        raise ConfiguracaoAusente(f"Defina {' e '.join(faltando)} com os dados do banco (ver README, "
+                                  f"Configuração de Credenciais).")
+    return {
+        'host': os.environ['EQUILIBRAAI_DB_HOST'],
+        'database': os.environ.get('EQUILIBRAAI_DB_NAME', 'postgres'),
+        'user': os.environ.get('EQUILIBRAAI_DB_USER', 'postgres'),
+        'password': os.environ['EQUILIBRAAI_DB_PASS'],
+        'port': os.environ.get('EQUILIBRAAI_DB_PORT', '5432'),
+        'sslmode': os.environ.get('EQUILIBRAAI_DB_SSLMODE', 'require'),
+        'connect_timeout': int(os.environ.get('EQUILIBRAAI_DB_CONNECT_TIMEOUT', '10')),
+    }
+
+
+def configuracao_pool():
+    """Tamanho e políticas do pool."""
+    return {
+        'tamanho_max': int(os.environ.get('EQUILIBRAAI_POOL_MAX', '5')),
+        'timeout': float(os.environ.get('EQUILIBRAAI_POOL_TIMEOUT', '30')),
+        'max_ocioso': float(os.environ.get('EQUILIBRAAI_POOL_MAX_OCIOSO', '300')),
+        'max_idade': float(os.environ.get('EQUILIBRAAI_POOL_MAX_IDADE', '3600')),
+    }
+
+
+class PoolEsgotado(Exception):
+    """Nenhuma conexão ficou livre dentro do timeout."""
+
+
+class _Conexao:
+    __slots__ = ('conn', 'criada_em', 'devolvida_em')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.criada_em = self.devolvida_em = time.monotonic()
+
+
+class PoolConexoes:
+    """
+    Pool thread-safe de até `tamanho_max` conexões abertas sob demanda.
+    Na retirada: descarta conexões ociosas há mais de `max_ocioso` s ou com mais de `max_idade` s
+    (o RDS/NAT derruba conexões paradas) e testa a conexão com um `SELECT 1`.
+    Na devolução: desfaz transações abertas, para a próxima retirada começar limpa.
+    `fabrica` é qualquer função que abre uma conexão DB-API (psycopg2.connect por padrão).
+    """
+
+    def __init__(self, fabrica=None, tamanho_max=5, timeout=30.0, max_ocioso=300.0, max_idade=3600.0):
+        self.fabrica = fabrica if fabrica is not None else (lambda: psycopg2.connect(**configuracao_banco()))
+        self.tamanho_max = tamanho_max
+        self.timeout = timeout
+        self.max_ocioso = max_ocioso
+        self.max_idade = max_idade
+        self._livres = deque()
+        self._em_uso = {}
+        self._abertas = 0
+        self._cond = threading.Condition()
+        self._fechado = False
+        # Métricas
+        self.retiradas = 0
+        self.criadas = 0
+        self.recicladas = 0
+        self.falhas_checagem = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    # Ciclo de vida de uma conexão
+
+    def _problema(self, item):
+        """None se a conexão pode ser usada; senão 'reciclada' (idade/ociosidade) ou 'falha' (checagem)."""
+        agora = time.monotonic()
+        if agora - item.devolvida_em > self.max_ocioso or agora - item.criada_em > self.max_idade:
+            return 'reciclada'
+        if getattr(item.conn, 'closed', 0):
+            return 'falha'
+        try:
+            cur = item.conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            cur.close()
+            item.conn.rollback()
+            return None
+        except Exception:
+            return 'falha'
+
+    @staticmethod
+    def _fechar(item):
+        try:
+            item.conn.close()
+        except Exception:
+            pass
+
+    def obter(self, timeout=None):
+        """Retira uma conexão (espera até `timeout` s se todas estiverem em uso)."""
+        inicio = time.monotonic()
+        timeout = self.timeout if timeout is None else timeout
+        limite = inicio + timeout
+        while True:
+            with self._cond:
+                while not self._livres and self._abertas >= self.tamanho_max:
+                    restante = limite - time.monotonic()
+                    if self._fechado or restante <= 0 or not self._cond.wait(restante):
+                        raise PoolEsgotado(f"Nenhuma conexão livre em {timeout:g}s (pool de {self.tamanho_max}).")
+                if self._fechado:
+                    raise PoolEsgotado("Pool fechado.")
+                item = self._livres.pop() if self._livres else None
+                if item is None:
+                    self._abertas += 1
+            # Checagem e abertura fora do lock: uma conexão lenta não trava as outras threads
+            problema = self._problema(item) if item is not None else None
+            if problema:
+                self._fechar(item)
+                with self._cond:
+                    self._abertas -= 1
+                    if problema == 'reciclada':
+                        self.recicladas += 1
+                    else:
+                        self.falhas_checagem += 1
+                    self._cond.notify()
+                continue
+            nova = item is None
+            if nova:
+                try:
+                    item = _Conexao(self.fabrica())
+                except Exception:
+                    with self._cond:
+                        self._abertas -= 1
+                        self._cond.notify()
+                    raise
+            espera = time.monotonic() - inicio
+            with self._cond:
+                self.criadas += nova
+                self._em_uso[id(item.conn)] = item
+                self.retiradas += 1
+                self.espera_total += espera
+                self.espera_max = max(self.espera_max, espera)
+            return item.conn
+
+    def devolver(self, conn, descartar=False):
+        """Devolve a conexão ao pool (ou fecha, se quebrada ou `descartar=True`)."""
+        with self._cond:
+            item = self._em_uso.pop(id(conn), None)
+        if item is None:
+            return
+        if not descartar and not getattr(conn, 'closed', 0):
+            try:
+                conn.rollback()
+            except Exception:
+                descartar = True
+        else:
+            descartar = True
+        with self._cond:
+            if descartar or self._fechado:
+                self._abertas -= 1
+            else:
+                item.devolvida_em = time.monotonic()
+                self._livres.append(item)
+            self._cond.notify()
+        if descartar or self._fechado:
+            self._fechar(item)
+
+    @contextmanager
+    def conexao(self, timeout=None):
+        """`with pool.conexao() as conn:` — devolve a conexão mesmo em caso de erro."""
+        conn = self.obter(timeout)
+        try:
+            yield conn
+        finally:
+            # Conexão derrubada no meio do uso (conn.closed) é descartada pelo devolver
+            self.devolver(conn)
+
+    def fechar(self):
+        """Fecha as conexões livres; as em uso são fechadas quando devolvidas."""
+        with self._cond:
+            self._fechado = True
+            livres, self._livres = list(self._livres), deque()
+            self._abertas -= len(livres)
+            self._cond.notify_all()
+        for item in livres:
+            self._fechar(item)
+
+    # Métricas
+
+    def metricas(self):
+        agora = time.monotonic()
+        with self._cond:
+            idades = [agora - i.criada_em for i in list(self._livres) + list(self._em_uso.values())]
+            return {
+                'abertas': self._abertas,
+                'livres': len(self._livres),
+                'em_uso': len(self._em_uso),
+                'retiradas': self.retiradas,
+                'criadas': self.criadas,
+                'recicladas': self.recicladas,
+                'falhas_checagem': self.falhas_checagem,
+                'espera_media_ms': 1000.0 * self.espera_total / self.retiradas if self.retiradas else 0.0,
+                'espera_max_ms': 1000.0 * self.espera_max,
+                'idade_media_s': sum(idades) / len(idades) if idades else 0.0,
+                'idade_max_s': max(idades) if idades else 0.0,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def obter_pool():
+    """Pool único do processo, criado na primeira chamada com a configuração do ambiente."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PoolConexoes(**configuracao_pool())
+        return _pool
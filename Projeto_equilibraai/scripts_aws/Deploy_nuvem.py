@@ -1,189 +1,107 @@
-#Código criado para migrar o servidor local para o AWS RDS PostgreSQL
-import psycopg2
-import csv
-import os
-
-# CONFIGURAÇÕES RDS AWS
-DB_HOST = "equilibraai.chu8u2i8kdfr.sa-east-1.rds.amazonaws.com"
-DB_NAME = "postgres" 
-DB_USER = "postgres" 
-DB_PASS = "FIAP-equilibraAI"
-DB_PORT = "5432"
-
-def get_db_connection():
-    """Conecta ao PostgreSQL no AWS RDS com SSL"""
-    try:
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            database=DB_NAME,
-            user=DB_USER,
-            password=DB_PASS,
-            port=DB_PORT,
-            sslmode='require' 
-        )
-        return conn
-    except Exception as e:
-        print(f"❌ Erro ao conectar no RDS: {e}")
-        return None
-
-def criar_tabelas_postgres():
-    """Cria as tabelas e popula dados MESTRES (Níveis e Categorias)"""
-    print("\n☁️ Criando tabelas no AWS RDS...")
-    
-    conn = get_db_connection()
-    if not conn: return
-    
-    cur = conn.cursor()
-    
-    comandos_sql = [
-        '''
-        CREATE TABLE IF NOT EXISTS nivel_experiencia (
-            nivel_id SERIAL PRIMARY KEY,
-            nome VARCHAR(100) NOT NULL UNIQUE,
-            descricao TEXT,
-            peso REAL NOT NULL
-        )
-        ''',
-        '''
-        CREATE TABLE IF NOT EXISTS categoria_skill (
-            categoria_id SERIAL PRIMARY KEY,
-            nome VARCHAR(100) NOT NULL,
-            tipo VARCHAR(50) NOT NULL CHECK (tipo IN ('hard_skill', 'soft_skill')), 
-            descricao TEXT
-        )
-        ''',
-        '''
-        CREATE TABLE IF NOT EXISTS skill (
-            skill_id SERIAL PRIMARY KEY,
-            categoria_id INTEGER NOT NULL,
-            nome VARCHAR(100) NOT NULL UNIQUE,
-            descricao TEXT,
-            FOREIGN KEY (categoria_id) REFERENCES categoria_skill(categoria_id)
-        )
-        ''',
-        '''
-        CREATE TABLE IF NOT EXISTS colaborador (
-            colaborador_id SERIAL PRIMARY KEY,
-            nome VARCHAR(150) NOT NULL,
-            email VARCHAR(150) UNIQUE,
-            data_cadastro DATE DEFAULT CURRENT_DATE
-        )
-        ''',
-        '''
-        CREATE TABLE IF NOT EXISTS colaborador_skill (
-            colaborador_id INTEGER NOT NULL,
-            skill_id INTEGER NOT NULL,
-            nivel_experiencia_id INTEGER NOT NULL,
-            confianca REAL,
-            data_avaliacao DATE,
-            PRIMARY KEY (colaborador_id, skill_id),
-            FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
-            FOREIGN KEY (skill_id) REFERENCES skill(skill_id),
-            FOREIGN KEY (nivel_experiencia_id) REFERENCES nivel_experiencia(nivel_id)
-        )
-        ''',
-        '''
-        CREATE TABLE IF NOT EXISTS interesse (
-            interesse_id SERIAL PRIMARY KEY,
-            nome VARCHAR(100) NOT NULL UNIQUE,
-            descricao TEXT
-        )
-        ''',
-        '''
-        CREATE TABLE IF NOT EXISTS colaborador_interesse (
-            colaborador_id INTEGER NOT NULL,
-            interesse_id INTEGER NOT NULL,
-            PRIMARY KEY (colaborador_id, interesse_id),
-            FOREIGN KEY (colaborador_id) REFERENCES colaborador(colaborador_id),
-            FOREIGN KEY (interesse_id) REFERENCES interesse(interesse_id)
-        )
-        '''
-    ]
-
-    try:
-        for sql in comandos_sql:
-            cur.execute(sql)
-        conn.commit()
-        print("✅ Tabelas criadas com sucesso no PostgreSQL!")
-        
-        # --- 1. Popular NÍVEIS ---
-        niveis = [
-            (1, 'Iniciante', 'Conhecimento básico', 0.3),
-            (2, 'Intermediário', 'Conhecimento prático', 0.6),
-            (3, 'Avançado', 'Domínio do assunto', 0.8),
-            (4, 'Especialista', 'Referência no assunto', 1.0)
-        ]
-        cur.executemany("INSERT INTO nivel_experiencia (nivel_id, nome, descricao, peso) VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING", niveis)
-        
-        # --- 2. Popular CATEGORIAS  ---
-        categorias = [
-            (1, 'Desenvolvimento Backend', 'hard_skill', 'Tecnologias de servidor'),
-            (2, 'Desenvolvimento Frontend', 'hard_skill', 'Tecnologias de cliente'),
-            (3, 'Data Science', 'hard_skill', 'Análise e modelos de dados'),
-            (4, 'DevOps', 'hard_skill', 'Infraestrutura e CI/CD'),
-            (5, 'Habilidades Comportamentais', 'soft_skill', 'Competências interpessoais')
-        ]
-        cur.executemany("INSERT INTO categoria_skill (categoria_id, nome, tipo, descricao) VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING", categorias)
-
-        conn.commit()
-        print("✅ Dados mestres (Níveis e Categorias) inseridos.")
-        
-    except Exception as e:
-        print(f"⚠️ Erro durante criação de tabelas/mestres: {e}")
-    finally:
-        cur.close()
-        conn.close()
-
-def migrar_dados_csv_para_nuvem():
-    """Lê os CSVs locais e sobe para o RDS"""
-    print("\n🚀 Migrando dados dos CSVs para a Nuvem...")
-    
-    conn = get_db_connection()
-    if not conn: return
-    cur = conn.cursor()
-
-    try:
-        # 1. Migrar Colaboradores
-        if os.path.exists('colaboradores_100.csv'):
-            print("📤 Enviando Colaboradores...")
-            with open('colaboradores_100.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    cur.execute("""
-                        INSERT INTO colaborador (colaborador_id, nome, email, data_cadastro)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (colaborador_id) DO NOTHING
-                    """, (row['colaborador_id'], row['nome'], row['email'], row['data_cadastro']))
-            print("✅ Colaboradores enviados.")
-
-        # 2. Migrar Skills 
-        print("⚙️ Garantindo que Skills existem...")
-        skills_mock = [(i, 1, f'Skill {i}', 'Importada') for i in range(1, 51)]
-        for s in skills_mock:
-            cur.execute("INSERT INTO skill (skill_id, categoria_id, nome, descricao) VALUES (%s, %s, %s, %s) ON CONFLICT (skill_id) DO NOTHING", s)
-        
-        if os.path.exists('colaborador_skills_100.csv'):
-            print("📤 Enviando Vínculos de Skills...")
-            with open('colaborador_skills_100.csv', 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    cur.execute("""
-                        INSERT INTO colaborador_skill (colaborador_id, skill_id, nivel_experiencia_id, confianca, data_avaliacao)
-                        VALUES (%s, %s, %s, %s, %s)
-                        ON CONFLICT (colaborador_id, skill_id) DO NOTHING
-                    """, (row['colaborador_id'], row['skill_id'], row['nivel_experiencia_id'], row['confianca'], row['data_avaliacao']))
-            print("✅ Vínculos de Skills enviados.")
-
-        conn.commit()
-        print("\n🎉 MIGRAÇÃO PARA AWS CONCLUÍDA COM SUCESSO!")
-        
-    except Exception as e:
-        print(f"❌ Erro durante a migração: {e}")
-        conn.rollback()
-    finally:
-        cur.close()
-        conn.close()
-
-if __name__ == "__main__":
-    criar_tabelas_postgres()
+#Código criado para migrar o servidor local para o AWS RDS PostgreSQL
+import psycopg2
+import os
+import sys
+from carga_em_massa import carregar_csv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from migracoes import aplicar_migracoes  # noqa: E402
+from pool_conexoes import configuracao_banco  # noqa: E402
+
+# CONFIGURAÇÕES RDS AWS
+# Host, usuário, senha etc. vêm das variáveis EQUILIBRAAI_DB_* (pool_conexoes.configuracao_banco), como no app
+
+def get_db_connection():
+    """Conecta ao PostgreSQL no AWS RDS (SSL conforme EQUILIBRAAI_DB_SSLMODE)"""
+    try:
+        return psycopg2.connect(**configuracao_banco())
+    except Exception as e:
+        print(f"❌ Erro ao conectar no RDS: {e}")
+        return None
+
+def criar_tabelas_postgres():
+    """Cria as tabelas e popula dados MESTRES (Níveis e Categorias)"""
+    print("\n☁️ Criando tabelas no AWS RDS...")
+    
+    conn = get_db_connection()
+    if not conn: return
+    
+    cur = conn.cursor()
+    
+    try:
+        # Tabelas e índices saem das migrações versionadas (migracoes.py): rodar de novo não refaz nada
+        aplicar_migracoes(conn)
+        print("✅ Tabelas criadas com sucesso no PostgreSQL!")
+        
+        # --- 1. Popular NÍVEIS ---
+        niveis = [
+            (1, 'Iniciante', 'Conhecimento básico', 0.3),
+            (2, 'Intermediário', 'Conhecimento prático', 0.6),
+            (3, 'Avançado', 'Domínio do assunto', 0.8),
+            (4, 'Especialista', 'Referência no assunto', 1.0)
+        ]
+        cur.executemany("INSERT INTO nivel_experiencia (nivel_id, nome, descricao, peso) VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING", niveis)
+        
+        # --- 2. Popular CATEGORIAS  ---
+        categorias = [
+            (1, 'Desenvolvimento Backend', 'hard_skill', 'Tecnologias de servidor'),
+            (2, 'Desenvolvimento Frontend', 'hard_skill', 'Tecnologias de cliente'),
+            (3, 'Data Science', 'hard_skill', 'Análise e modelos de dados'),
+            (4, 'DevOps', 'hard_skill', 'Infraestrutura e CI/CD'),
+            (5, 'Habilidades Comportamentais', 'soft_skill', 'Competências interpessoais')
+        ]
+        cur.executemany("INSERT INTO categoria_skill (categoria_id, nome, tipo, descricao) VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING", categorias)
+
+        conn.commit()
+        print("✅ Dados mestres (Níveis e Categorias) inseridos.")
+        
+    except Exception as e:
+        print(f"⚠️ Erro durante criação de tabelas/mestres: {e}")
+    finally:
+        cur.close()
+        conn.close()
+
+def migrar_dados_csv_para_nuvem():
+    """Lê os CSVs locais e sobe para o RDS (COPY em lotes, retomável: ver carga_em_massa.py)"""
+    print("\n🚀 Migrando dados dos CSVs para a Nuvem...")
+    
+    conn = get_db_connection()
+    if not conn: return
+
+    try:
+        # 1. Migrar Colaboradores
+        if os.path.exists('colaboradores_100.csv'):
+            print("📤 Enviando Colaboradores...")
+            r = carregar_csv(conn, 'colaboradores_100.csv', 'colaborador', ['colaborador_id'])
+            print(f"✅ Colaboradores enviados: {r['linhas']} linhas, {r['inseridas']} novas ({r['linhas_por_s']:,.0f} linhas/s).")
+
+        # 2. Migrar Skills 
+        print("⚙️ Garantindo que Skills existem...")
+        cur = conn.cursor()
+        cur.execute("""
+            INSERT INTO skill (skill_id, categoria_id, nome, descricao)
+            SELECT i, 1, 'Skill ' || i, 'Importada' FROM generate_series(1, 50) AS i
+            ON CONFLICT (skill_id) DO NOTHING
+        """)
+        conn.commit()
+        cur.close()
+        
+        if os.path.exists('colaborador_skills_100.csv'):
+            print("📤 Enviando Vínculos de Skills...")
+            # Vínculos de colaboradores que não entraram (ex.: e-mail repetido no CSV) são descartados
+            r = carregar_csv(conn, 'colaborador_skills_100.csv', 'colaborador_skill', ['colaborador_id', 'skill_id'],
+                             filtro="EXISTS (SELECT 1 FROM colaborador c WHERE c.colaborador_id = s.colaborador_id)")
+            print(f"✅ Vínculos de Skills enviados: {r['linhas']} linhas, {r['inseridas']} novos ({r['linhas_por_s']:,.0f} linhas/s).")
+
+        print("\n🎉 MIGRAÇÃO PARA AWS CONCLUÍDA COM SUCESSO!")
+        
+    except Exception as e:
+        # Os lotes já confirmados ficam no banco; rodar de novo continua do último lote
+        print(f"❌ Erro durante a migração: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    criar_tabelas_postgres()
     migrar_dados_csv_para_nuvem()
\ No newline at end of file
@@ -0,0 +1,131 @@
+#Carga em massa de CSVs no PostgreSQL via COPY (usada pelo Deploy_nuvem)
+#Em vez de um INSERT (uma ida e volta na rede) por linha, o arquivo é lido em lotes de tamanho fixo,
+#cada lote entra numa tabela temporária de staging com COPY FROM STDIN e é mesclado na tabela final com
+#INSERT ... SELECT ... ON CONFLICT. Cada lote é confirmado junto com o offset do arquivo, então uma carga
+#interrompida continua do último lote confirmado.
+import io
+import os
+import time
+
+LINHAS_POR_LOTE = 100000
+
+SQL_PROGRESSO = """
+CREATE TABLE IF NOT EXISTS carga_progresso (
+    arquivo TEXT NOT NULL,
+    tabela VARCHAR(100) NOT NULL,
+    tamanho BIGINT NOT NULL,
+    modificado_em BIGINT NOT NULL,
+    offset_bytes BIGINT NOT NULL,
+    linhas BIGINT NOT NULL,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (arquivo, tabela)
+)
+"""
+
+
+def _ler_progresso(cur, arquivo, tabela, tamanho, modificado_em):
+    """(offset, linhas) já confirmados para este arquivo; recomeça do zero se o arquivo mudou."""
+    cur.execute("SELECT tamanho, modificado_em, offset_bytes, linhas FROM carga_progresso "
+                "WHERE arquivo = %s AND tabela = %s", (arquivo, tabela))
+    linha = cur.fetchone()
+    if linha is None:
+        return 0, 0
+    if (linha[0], linha[1]) != (tamanho, modificado_em):
+        print(f"⚠️ {os.path.basename(arquivo)} mudou desde a última carga; recomeçando do início.")
+        return 0, 0
+    return linha[2], linha[3]
+
+
+def _gravar_progresso(cur, arquivo, tabela, tamanho, modificado_em, offset, linhas):
+    cur.execute("""
+        INSERT INTO carga_progresso (arquivo, tabela, tamanho, modificado_em, offset_bytes, linhas)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (arquivo, tabela) DO UPDATE
+        SET tamanho = EXCLUDED.tamanho, modificado_em = EXCLUDED.modificado_em,
+            offset_bytes = EXCLUDED.offset_bytes, linhas = EXCLUDED.linhas, atualizado_em = now()
+    """, (arquivo, tabela, tamanho, modificado_em, offset, linhas))
+
+
+def _lotes(f, linhas_por_lote):
+    """
+    Lê o arquivo (binário) em lotes de até `linhas_por_lote` registros CSV. Um campo entre aspas com
+    quebra de linha continua na linha seguinte, então o lote nunca corta um registro ao meio.
+    Gera (bytes do lote, nº de registros, offset no fim do lote).
+    """
+    buffer, n, aberto = [], 0, False
+    for linha in f:
+        if not aberto and not linha.strip():
+            continue
+        buffer.append(linha)
+        if linha.count(b'"') % 2:
+            aberto = not aberto
+        if aberto:
+            continue
+        n += 1
+        if n == linhas_por_lote:
+            yield b''.join(buffer), n, f.tell()
+            buffer, n = [], 0
+    if buffer:
+        yield b''.join(buffer), n, f.tell()
+
+
+def carregar_csv(conn, caminho, tabela, chave, linhas_por_lote=LINHAS_POR_LOTE, atualizar=False,
+                 filtro=None, retomar=True, max_lotes=None):
+    """
+    Carrega um CSV (com cabeçalho = nomes das colunas) na `tabela`, em lotes confirmados um a um.
+    `chave`: colunas da chave primária. Conflitos são ignorados (como o ON CONFLICT DO NOTHING da
+    carga original) ou, com atualizar=True, sobrescrevem a linha existente. `filtro` é uma condição
+    SQL sobre as linhas do staging (alias `s`) para descartar linhas, ex.: vínculos órfãos.
+    `retomar=False` ignora o progresso salvo; `max_lotes` para depois de N lotes (carga em etapas).
+    Retorna {'linhas', 'inseridas', 'segundos', 'linhas_por_s', 'retomado_de', 'concluido'}.
+    """
+    caminho = os.path.abspath(caminho)
+    info = os.stat(caminho)
+    cur = conn.cursor()
+    cur.execute(SQL_PROGRESSO)
+    offset, linhas = _ler_progresso(cur, caminho, tabela, info.st_size, info.st_mtime_ns) if retomar else (0, 0)
+    retomado_de = linhas
+    conn.commit()
+
+    staging = f"stg_{tabela}"
+    cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {tabela})")
+    inseridas, lotes = 0, 0
+    inicio = time.perf_counter()
+    with open(caminho, 'rb') as f:
+        colunas = f.readline().decode('utf-8-sig').strip().split(',')
+        lista = ", ".join(colunas)
+        onde = f" WHERE {filtro}" if filtro else ""
+        if atualizar:
+            outras = [c for c in colunas if c not in chave]
+            conflito = (f"ON CONFLICT ({', '.join(chave)}) DO UPDATE SET "
+                        + ", ".join(f"{c} = EXCLUDED.{c}" for c in outras))
+            origem = f"SELECT DISTINCT ON ({', '.join(chave)}) {lista} FROM {staging} s{onde}"
+        else:
+            # Sem alvo: ignora também outras restrições únicas (ex.: e-mail repetido no CSV)
+            conflito = "ON CONFLICT DO NOTHING"
+            origem = f"SELECT {lista} FROM {staging} s{onde}"
+        if offset >= info.st_size:
+            print(f"✔️ {os.path.basename(caminho)} já carregado ({linhas} linhas).")
+        elif offset:
+            print(f"↪️ Retomando {os.path.basename(caminho)} da linha {linhas} (byte {offset}).")
+        f.seek(max(offset, f.tell()))
+        for dados, n, fim in _lotes(f, linhas_por_lote):
+            cur.execute(f"TRUNCATE {staging}")
+            cur.copy_expert(f"COPY {staging} ({lista}) FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')", io.BytesIO(dados))
+            cur.execute(f"INSERT INTO {tabela} ({lista}) {origem} {conflito}")
+            inseridas += cur.rowcount
+            linhas += n
+            _gravar_progresso(cur, caminho, tabela, info.st_size, info.st_mtime_ns, fim, linhas)
+            conn.commit()
+            lotes += 1
+            decorrido = time.perf_counter() - inicio
+            print(f"   📦 {tabela}: {linhas} linhas ({(linhas - retomado_de) / decorrido:,.0f} linhas/s)")
+            if max_lotes is not None and lotes >= max_lotes:
+                break
+        concluido = f.read(1) == b''
+    cur.execute(f"DROP TABLE IF EXISTS {staging}")
+    conn.commit()
+    cur.close()
+    segundos = time.perf_counter() - inicio
+    return {'linhas': linhas, 'inseridas': inseridas, 'segundos': segundos, 'retomado_de': retomado_de,
+            'linhas_por_s': (linhas - retomado_de) / segundos if segundos else 0.0, 'concluido': concluido}
@@ -0,0 +1,72 @@
+#Snapshot local (colunar, NumPy) dos perfis dos colaboradores, para o app subir sem esperar o banco
+#Os arrays do PerfisCompactos vão direto para arquivos .npy (skills em CSR, textos em UTF-8 concatenado +
+#offsets), sem passar por DataFrame. O meta.json guarda a versão do change-log em que os dados foram lidos.
+import json
+import os
+import shutil
+import time
+import pandas as pd
+from vocabulario_skills import VocabularioSkills
+from perfis_compactos import PerfisCompactos
+
+SNAPSHOT_DIR = os.environ.get('EQUILIBRAAI_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_snapshot'))
+FORMATO = 2
+
+
+def salvar_snapshot(perfis, vocabulario, versao=None, vistas=(), diretorio=SNAPSHOT_DIR):
+    """
+    Grava os perfis (PerfisCompactos, ou o DataFrame de montar_colaboradores) e o vocabulário.
+    Cada snapshot vai para uma pasta nova e o ponteiro `atual.json` é trocado de uma vez,
+    então um leitor nunca vê um snapshot pela metade.
+    """
+    if isinstance(perfis, pd.DataFrame):
+        perfis = PerfisCompactos.do_dataframe(perfis)
+    os.makedirs(diretorio, exist_ok=True)
+    nome = f"v{time.time_ns()}"
+    pasta = os.path.join(diretorio, nome)
+    os.makedirs(pasta)
+    perfis.salvar(pasta)
+    vocabulario.salvar(os.path.join(pasta, 'vocabulario.json'))
+    meta = {'formato': FORMATO, 'n': len(perfis), 'versao': versao, 'vistas': sorted(vistas),
+            'criado_em': time.time()}
+    with open(os.path.join(pasta, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    ponteiro = os.path.join(diretorio, 'atual.json')
+    anterior = ler_meta(diretorio)
+    with open(ponteiro + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'pasta': nome}, f)
+    os.replace(ponteiro + '.tmp', ponteiro)
+    if anterior is not None:
+        shutil.rmtree(os.path.join(diretorio, anterior['pasta']), ignore_errors=True)
+    print(f"[IA-CLOUD] 💾 Snapshot local gravado: {len(perfis)} colaboradores (versão {versao}).")
+    return meta
+
+
+def ler_meta(diretorio=SNAPSHOT_DIR):
+    """Metadados do snapshot atual (com a chave 'pasta'), ou None se não houver snapshot utilizável."""
+    try:
+        with open(os.path.join(diretorio, 'atual.json'), 'r', encoding='utf-8') as f:
+            pasta = json.load(f)['pasta']
+        with open(os.path.join(diretorio, pasta, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError, KeyError):
+        return None
+    if meta.get('formato') != FORMATO:
+        return None
+    meta['pasta'] = pasta
+    return meta
+
+
+def carregar_snapshot(diretorio=SNAPSHOT_DIR):
+    """(PerfisCompactos, vocabulário, meta) do snapshot atual, ou None se não existir."""
+    meta = ler_meta(diretorio)
+    if meta is None:
+        return None
+    pasta = os.path.join(diretorio, meta['pasta'])
+    try:
+        perfis = PerfisCompactos.carregar(pasta)
+        return perfis, VocabularioSkills.carregar(os.path.join(pasta, 'vocabulario.json')), meta
+    except OSError:
+        # Snapshot trocado por outro processo no meio da leitura
+        return None
@@ -0,0 +1,341 @@
+#Store de embeddings dos colaboradores em arquivo NumPy mapeado em memória (np.memmap)
+#Guarda um vetor de aspiração por colaborador (indexado pelo id), opcionalmente quantizado em float16 ou int8,
+#e calcula a similaridade com a tarefa em blocos sobre o arquivo mapeado, sem carregar tudo na RAM
+import glob
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+
+DTYPES = {'float32': np.float32, 'float16': np.float16, 'int8': np.int8}
+STORE_DIR = os.environ.get('EQUILIBRAAI_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_embeddings', 'store'))
+STORE_DTYPE = os.environ.get('EQUILIBRAAI_STORE_DTYPE', 'float16')
+CAPACIDADE_INICIAL = 1024
+TAMANHO_BLOCO = 65536
+# Compactação: quando as linhas livres passam desta fração das usadas (e há pelo menos CAPACIDADE_INICIAL linhas)
+FRACAO_COMPACTAR = float(os.environ.get('EQUILIBRAAI_STORE_COMPACTAR', '0.5'))
+
+
+def hash_texto(texto):
+    """Hash de 64 bits do conteúdo, usado para saber se a aspiração de um colaborador mudou."""
+    return np.uint64(int.from_bytes(hashlib.sha256(texto.encode('utf-8')).digest()[:8], 'little'))
+
+
+class StoreEmbeddings:
+    """
+    Arquivos em disco (prefixo `base`):
+      base.vetores.npy  (capacidade x dim)  vetores normalizados, em float32/float16/int8
+      base.escalas.npy  (capacidade,)       escala por vetor (int8: max|v|/127; demais: 1.0)
+      base.ids.npy      (capacidade,)       colaborador_id de cada linha (-1 = linha livre)
+      base.hashes.npy   (capacidade,)       hash do texto que gerou o vetor
+      base.json                             dim, dtype, número de linhas usadas e geração dos arquivos
+    Um único processo escreve por vez (dentro dele, as escritas passam por um lock); leitores só enxergam linhas
+    já gravadas. Uma linha gravada não muda
+    mais: regravar ou remover um colaborador só libera a linha antiga, então quem guardou as linhas (o motor
+    de antes de uma atualização incremental) continua lendo os mesmos vetores.
+    As linhas livres são descartadas por `compactar`, que grava os arquivos de uma nova geração (base.gN.*)
+    e devolve outro StoreEmbeddings; este continua lendo os arquivos antigos já mapeados.
+    """
+
+    def __init__(self, base, dim=None, dtype='float16'):
+        self.base = base
+        self._lock = threading.Lock()
+        self._ordem = None     # (ids ativos ordenados, linha de cada um), refeito sob demanda depois de cada escrita
+        self.substituto = None  # store que saiu da compactação deste (este deixa de publicar o base.json)
+        if os.path.exists(base + '.json'):
+            meta = self._ler_meta()
+            self.dim, self.dtype, self.n = meta['dim'], meta['dtype'], meta['n']
+            self.geracao = meta.get('geracao', 0)
+            self._abrir()
+        else:
+            if dim is None:
+                raise ValueError("Informe 'dim' para criar um store novo.")
+            if dtype not in DTYPES:
+                raise ValueError(f"dtype inválido: {dtype} (use {', '.join(DTYPES)})")
+            os.makedirs(os.path.dirname(os.path.abspath(base)), exist_ok=True)
+            self.dim, self.dtype, self.n, self.geracao = int(dim), dtype, 0, 0
+            self._criar(CAPACIDADE_INICIAL)
+            self._salvar_meta()
+
+    # Arquivos
+
+    def _arquivos(self, geracao=None):
+        geracao = self.geracao if geracao is None else geracao
+        prefixo = self.base if geracao == 0 else f"{self.base}.g{geracao}"
+        return {
+            'vetores': (prefixo + '.vetores.npy', DTYPES[self.dtype], (self.dim,)),
+            'escalas': (prefixo + '.escalas.npy', np.float32, ()),
+            'ids': (prefixo + '.ids.npy', np.int64, ()),
+            'hashes': (prefixo + '.hashes.npy', np.uint64, ()),
+        }
+
+    def _abrir(self):
+        for nome, (caminho, _, _) in self._arquivos().items():
+            setattr(self, nome, np.load(caminho, mmap_mode='r+'))
+
+    def _criar(self, capacidade, copiar=0):
+        """Cria (ou aumenta) os arquivos com `capacidade` linhas, copiando as `copiar` primeiras em blocos."""
+        for nome, (caminho, dtype, forma) in self._arquivos().items():
+            novo = np.lib.format.open_memmap(caminho + '.tmp', mode='w+', dtype=dtype, shape=(capacidade,) + forma)
+            if nome == 'ids':
+                novo[:] = -1
+            antigo = getattr(self, nome, None)
+            for i in range(0, copiar, TAMANHO_BLOCO):
+                j = min(i + TAMANHO_BLOCO, copiar)
+                novo[i:j] = antigo[i:j]
+            novo.flush()
+            del novo
+            os.replace(caminho + '.tmp', caminho)
+        self._abrir()
+
+    def _ler_meta(self):
+        with open(self.base + '.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _salvar_meta(self):
+        # Um store já compactado (ou aberto antes de outra compactação) não volta a publicar a geração antiga
+        if self.substituto is not None:
+            return
+        try:
+            if self._ler_meta().get('geracao', 0) > self.geracao:
+                return
+        except (OSError, ValueError):
+            pass
+        with open(self.base + '.json.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'dim': self.dim, 'dtype': self.dtype, 'n': self.n, 'geracao': self.geracao}, f)
+        os.replace(self.base + '.json.tmp', self.base + '.json')
+
+    def flush(self):
+        for nome in self._arquivos():
+            getattr(self, nome).flush()
+        self._salvar_meta()
+
+    def __len__(self):
+        return len(self._ordenado()[0])
+
+    @property
+    def capacidade(self):
+        return len(self.ids)
+
+    @property
+    def linhas_livres(self):
+        """Linhas usadas que não pertencem mais a ninguém (regravadas ou removidas)."""
+        return self.n - len(self)
+
+    # Escrita
+
+    def _quantizar(self, vetores):
+        normas = np.linalg.norm(vetores, axis=1, keepdims=True)
+        normas[normas == 0] = 1.0
+        vetores = vetores / normas
+        if self.dtype == 'int8':
+            escalas = np.abs(vetores).max(axis=1) / 127.0
+            escalas[escalas == 0] = 1.0
+            q = np.clip(np.rint(vetores / escalas[:, None]), -127, 127).astype(np.int8)
+            return q, escalas.astype(np.float32)
+        return vetores.astype(DTYPES[self.dtype]), np.ones(len(vetores), dtype=np.float32)
+
+    def gravar(self, ids, vetores, hashes=None):
+        """
+        Insere ou atualiza (upsert) os vetores dos colaboradores informados. Cada um vai para uma linha
+        nova no fim do arquivo; a linha antiga (se havia) fica livre, com o vetor intacto.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        vetores = np.asarray(vetores, dtype=np.float32).reshape(len(ids), self.dim)
+        hashes = np.zeros(len(ids), dtype=np.uint64) if hashes is None else np.asarray(hashes, dtype=np.uint64)
+        q, escalas = self._quantizar(vetores)
+        # Id repetido no mesmo lote: vale a última ocorrência
+        _, ultima = np.unique(ids[::-1], return_index=True)
+        repetidos = np.ones(len(ids), dtype=bool)
+        repetidos[len(ids) - 1 - ultima] = False
+
+        with self._lock:
+            antigas = self._linhas(ids)
+            n_antes, n = self.n, self.n + len(ids)
+            if n > self.capacidade:
+                nova = self.capacidade
+                while nova < n:
+                    nova *= 2
+                self._criar(nova, copiar=n_antes)
+
+            linhas = np.arange(n_antes, n)
+            self.vetores[linhas] = q
+            self.escalas[linhas] = escalas
+            self.ids[linhas] = np.where(repetidos, -1, ids)
+            self.hashes[linhas] = hashes
+            self.ids[antigas[antigas >= 0]] = -1
+            # As linhas novas só passam a contar depois de gravadas
+            self.n = n
+            self._ordem = None
+            self.flush()
+
+    def remover(self, ids):
+        """Libera as linhas dos colaboradores (o espaço é reaproveitado só numa compactação)."""
+        with self._lock:
+            linhas = self._linhas(np.asarray(ids, dtype=np.int64))
+            self.ids[linhas[linhas >= 0]] = -1
+            self._ordem = None
+            self.flush()
+
+    # Compactação
+
+    def precisa_compactar(self, fracao=FRACAO_COMPACTAR):
+        return self.substituto is None and self.n >= CAPACIDADE_INICIAL and self.linhas_livres > fracao * self.n
+
+    def compactar(self):
+        """
+        Copia só as linhas ativas (na mesma ordem) para os arquivos de uma nova geração e publica a troca
+        regravando o base.json (os.replace, atômico): quem abrir o store depois já lê a geração nova.
+        Este objeto não muda: as linhas que motores antigos guardaram continuam válidas nele, pelos arquivos
+        já mapeados (os da geração antiga são apagados do disco). Retorna (store novo, linha nova de cada
+        linha antiga, -1 para as descartadas).
+        """
+        with self._lock:
+            ativas = np.flatnonzero(self.ids[:self.n] >= 0)
+            capacidade = CAPACIDADE_INICIAL
+            while capacidade < len(ativas):
+                capacidade *= 2
+            novo = object.__new__(StoreEmbeddings)
+            novo.base, novo.dim, novo.dtype = self.base, self.dim, self.dtype
+            novo.n, novo.geracao = len(ativas), self.geracao + 1
+            novo._lock, novo._ordem, novo.substituto = threading.Lock(), None, None
+            for nome, (caminho, dtype, forma) in novo._arquivos().items():
+                arquivo = np.lib.format.open_memmap(caminho + '.tmp', mode='w+', dtype=dtype,
+                                                    shape=(capacidade,) + forma)
+                if nome == 'ids':
+                    arquivo[:] = -1
+                antigo = getattr(self, nome)
+                for i in range(0, len(ativas), TAMANHO_BLOCO):
+                    bloco = ativas[i:i + TAMANHO_BLOCO]
+                    arquivo[i:i + len(bloco)] = antigo[bloco]
+                arquivo.flush()
+                del arquivo
+                os.replace(caminho + '.tmp', caminho)
+            novo._abrir()
+            novo._salvar_meta()
+            self.substituto = novo
+            novo._apagar_outras_geracoes()
+        mapa = np.full(self.n, -1, dtype=np.int64)
+        mapa[ativas] = np.arange(len(ativas))
+        print(f"[IA-CLOUD] 🗜️ Store de embeddings compactado: {self.n} -> {len(ativas)} linhas.")
+        return novo, mapa
+
+    def _apagar_outras_geracoes(self):
+        # Arquivos mapeados continuam válidos para quem já os abriu (no Windows a remoção falha e fica para depois)
+        manter = {caminho for caminho, _, _ in self._arquivos().values()}
+        antigos = [c for c, _, _ in self._arquivos(0).values()] + glob.glob(glob.escape(self.base) + '.g*.*.npy*')
+        for caminho in antigos:
+            if caminho not in manter:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+
+    def atual(self):
+        """Store em uso depois das compactações feitas a partir deste (ele mesmo, se não foi compactado)."""
+        store = self
+        while store.substituto is not None:
+            store = store.substituto
+        return store
+
+    # Leitura
+
+    def _ordenado(self):
+        ordem = self._ordem
+        if ordem is None:
+            with self._lock:
+                ordem = self._ordem
+                if ordem is None:
+                    ordem = self._ordem = self._ordenar()
+        return ordem
+
+    def _ordenar(self):
+        ativas = np.flatnonzero(self.ids[:self.n] >= 0)
+        ids = np.asarray(self.ids[ativas])
+        ordem = np.argsort(ids, kind='stable')
+        return ids[ordem], ativas[ordem]
+
+    def _linhas(self, ids, ordem=None):
+        ids_ord, linhas_ord = ordem if ordem is not None else self._ordem or self._ordenar()
+        if len(ids_ord) == 0:
+            return np.full(len(ids), -1, dtype=np.int64)
+        k = np.minimum(np.searchsorted(ids_ord, ids), len(ids_ord) - 1)
+        return np.where(ids_ord[k] == ids, linhas_ord[k], -1)
+
+    def linhas(self, ids):
+        """Linha de cada colaborador_id no store (-1 se ausente): busca binária nos ids ativos ordenados."""
+        return self._linhas(np.asarray(ids, dtype=np.int64), self._ordenado())
+
+    def vetor(self, cid):
+        l = int(self.linhas([cid])[0])
+        if l < 0:
+            raise KeyError(cid)
+        return self.vetores[l].astype(np.float32) * self.escalas[l]
+
+    def similaridades(self, vetor_tarefa, bloco=TAMANHO_BLOCO):
+        """
+        Cosseno entre a tarefa e todas as linhas do store: um produto matriz-vetor por bloco
+        sobre o arquivo mapeado (só o bloco corrente fica em memória). Linhas livres trazem o vetor
+        antigo: quem chama só olha as linhas dos seus colaboradores.
+        """
+        n = self.n
+        t = np.asarray(vetor_tarefa, dtype=np.float32)
+        norma = np.linalg.norm(t)
+        if norma == 0:
+            return np.zeros(n, dtype=np.float32)
+        t = t / norma
+        saida = np.empty(n, dtype=np.float32)
+        for i in range(0, n, bloco):
+            j = min(i + bloco, n)
+            saida[i:j] = (self.vetores[i:j].astype(np.float32) @ t) * self.escalas[i:j]
+        return saida
+
+    def similaridades_matriz(self, vetores_tarefas, bloco=TAMANHO_BLOCO):
+        """Versão em lote de `similaridades`: matriz tarefas x linhas, um produto matriz-matriz por bloco."""
+        t = np.asarray(vetores_tarefas, dtype=np.float32)
+        normas = np.linalg.norm(t, axis=1, keepdims=True)
+        normas[normas == 0] = 1.0
+        t = t / normas
+        n = self.n
+        saida = np.empty((len(t), n), dtype=np.float32)
+        for i in range(0, n, bloco):
+            j = min(i + bloco, n)
+            saida[:, i:j] = (t @ self.vetores[i:j].astype(np.float32).T) * self.escalas[i:j]
+        return saida
+
+    def similaridades_linhas(self, vetor_tarefa, linhas):
+        """Cosseno só para as linhas pedidas (lidas em ordem crescente no arquivo mapeado)."""
+        t = np.asarray(vetor_tarefa, dtype=np.float32)
+        norma = np.linalg.norm(t)
+        linhas = np.asarray(linhas, dtype=np.int64)
+        if norma == 0 or len(linhas) == 0:
+            return np.zeros(len(linhas), dtype=np.float32)
+        ordem = np.argsort(linhas, kind='stable')
+        saida = np.empty(len(linhas), dtype=np.float32)
+        saida[ordem] = (self.vetores[linhas[ordem]].astype(np.float32) @ (t / norma)) * self.escalas[linhas[ordem]]
+        return saida
+
+
+_abertos = {}
+_lock_abertos = threading.Lock()
+
+
+def abrir_store(assinatura, dim=None, dtype=STORE_DTYPE, diretorio=STORE_DIR):
+    """
+    Abre o store de aspirações do modelo identificado por `assinatura` (um arquivo por modelo).
+    Se ainda não existir, cria com `dim` colunas; sem `dim`, retorna None.
+    """
+    base = os.path.join(diretorio, 'aspiracoes_' + hashlib.sha256(assinatura.encode('utf-8')).hexdigest()[:12])
+    with _lock_abertos:
+        # Um objeto por arquivo no processo: as compactações ficam encadeadas nele (atual())
+        if base in _abertos:
+            return _abertos[base].atual()
+        if os.path.exists(base + '.json'):
+            store = StoreEmbeddings(base)
+        elif dim is None:
+            return None
+        else:
+            store = StoreEmbeddings(base, dim=dim, dtype=dtype)
+        _abertos[base] = store
+        return store
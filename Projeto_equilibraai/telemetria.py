@@ -0,0 +1,227 @@
+#Telemetria: tempo de cada etapa da carga dos perfis (fetch) e da recomendação, em histogramas de latência
+#Cada etapa é um span (`with etapa('recomendar.hard'):`) que soma a duração no histograma da etapa; os contadores
+#acumulam volumes (colaboradores carregados, pontuados...). Os spans se aninham: 'fetch' contém as consultas e a
+#montagem, 'recomendar' contém codificar/tetos/as 5 dimensões/ranking, e 'recomendar.asp' contém a codificação
+#da tarefa pelo BERT ('recomendar.codificar_aspiracao').
+#Exposição no formato texto do Prometheus: endpoint HTTP (EQUILIBRAAI_METRICAS_PORTA) e/ou arquivo regravado
+#periodicamente (EQUILIBRAAI_METRICAS_ARQUIVO, para o textfile collector do node_exporter).
+#EQUILIBRAAI_TELEMETRIA=0 desliga os spans (viram um contexto vazio).
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIXO = 'equilibraai'
+# Limites (s) dos buckets: de 50 µs (uma dimensão com poucos colaboradores) a 1 min (carga completa do RDS)
+LIMITES_PADRAO = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                  0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+INTERVALO_ARQUIVO = 15.0
+
+
+class Histograma:
+    """Contagem por bucket (não cumulativa), soma, total de observações e maior valor."""
+    __slots__ = ('limites', 'contagens', 'soma', 'total', 'maximo')
+
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)   # a última posição é o bucket +Inf
+        self.soma = 0.0
+        self.total = 0
+        self.maximo = 0.0
+
+    def observar(self, valor):
+        self.contagens[bisect.bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def quantil(self, q):
+        """Estimativa do quantil por interpolação linear dentro do bucket (como o histogram_quantile)."""
+        if not self.total:
+            return 0.0
+        alvo = q * self.total
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            if contagem and acumulado + contagem >= alvo:
+                if i == len(self.limites):
+                    return self.maximo
+                inferior = self.limites[i - 1] if i else 0.0
+                estimativa = inferior + (self.limites[i] - inferior) * (alvo - acumulado) / contagem
+                return min(estimativa, self.maximo)
+            acumulado += contagem
+        return self.maximo
+
+
+class _Span:
+    # O histograma já vem resolvido: na saída só resta somar a duração (custo de ~1 µs por span)
+    __slots__ = ('_histograma', '_lock', '_inicio')
+
+    def __init__(self, histograma, lock):
+        self._histograma = histograma
+        self._lock = lock
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duracao = time.perf_counter() - self._inicio
+        with self._lock:
+            self._histograma.observar(duracao)
+        return False
+
+
+class _SpanVazio:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_SPAN_VAZIO = _SpanVazio()
+
+
+class Telemetria:
+    """Histogramas por etapa e contadores do processo (thread-safe)."""
+
+    def __init__(self, habilitada=True, limites=LIMITES_PADRAO):
+        self.habilitada = habilitada
+        self.limites = limites
+        self._histogramas = {}
+        self._contadores = {}
+        self._lock = threading.Lock()
+
+    def etapa(self, nome):
+        """Span: `with telemetria.etapa('fetch.montagem'):` mede o bloco e soma no histograma da etapa."""
+        if not self.habilitada:
+            return _SPAN_VAZIO
+        histograma = self._histogramas.get(nome)
+        return _Span(histograma if histograma is not None else self._histograma(nome), self._lock)
+
+    def _histograma(self, nome):
+        with self._lock:
+            return self._histogramas.setdefault(nome, Histograma(self.limites))
+
+    def observar(self, nome, segundos):
+        """Soma uma duração medida por fora de um span."""
+        histograma = self._histogramas.get(nome) or self._histograma(nome)
+        with self._lock:
+            histograma.observar(segundos)
+
+    def contar(self, nome, valor=1):
+        if not self.habilitada:
+            return
+        with self._lock:
+            self._contadores[nome] = self._contadores.get(nome, 0) + valor
+
+    def zerar(self):
+        with self._lock:
+            self._histogramas.clear()
+            self._contadores.clear()
+
+    def resumo(self):
+        """Uma linha por etapa (ordem alfabética, o que agrupa fetch.* e recomendar.*), tempos em ms."""
+        with self._lock:
+            itens = sorted(self._histogramas.items())
+            return [{'Etapa': nome, 'Chamadas': h.total, 'Média (ms)': 1000.0 * h.soma / h.total,
+                     'p50 (ms)': 1000.0 * h.quantil(0.5), 'p95 (ms)': 1000.0 * h.quantil(0.95),
+                     'Máx (ms)': 1000.0 * h.maximo, 'Total (s)': h.soma} for nome, h in itens]
+
+    def contadores(self):
+        with self._lock:
+            return dict(self._contadores)
+
+    # Exposição no formato do Prometheus
+
+    def texto_prometheus(self):
+        """Métricas no formato texto de exposição do Prometheus (versão 0.0.4)."""
+        nome_hist = f'{PREFIXO}_etapa_segundos'
+        linhas = [f'# HELP {nome_hist} Duração de cada etapa da carga dos perfis e da recomendação.',
+                  f'# TYPE {nome_hist} histogram']
+        with self._lock:
+            for etapa, h in sorted(self._histogramas.items()):
+                rotulo = f'etapa="{etapa}"'
+                acumulado = 0
+                for limite, contagem in zip(self.limites, h.contagens):
+                    acumulado += contagem
+                    linhas.append(f'{nome_hist}_bucket{{{rotulo},le="{limite:g}"}} {acumulado}')
+                linhas.append(f'{nome_hist}_bucket{{{rotulo},le="+Inf"}} {h.total}')
+                linhas.append(f'{nome_hist}_sum{{{rotulo}}} {h.soma!r}')
+                linhas.append(f'{nome_hist}_count{{{rotulo}}} {h.total}')
+            for nome, valor in sorted(self._contadores.items()):
+                linhas.append(f'# TYPE {PREFIXO}_{nome}_total counter')
+                linhas.append(f'{PREFIXO}_{nome}_total {valor}')
+        return '\n'.join(linhas) + '\n'
+
+    def gravar_prometheus(self, caminho):
+        """Grava o texto das métricas num arquivo (troca atômica: o coletor nunca lê um arquivo pela metade)."""
+        temporario = f'{caminho}.{os.getpid()}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(self.texto_prometheus())
+        os.replace(temporario, caminho)
+
+    def gravar_periodicamente(self, caminho, intervalo=INTERVALO_ARQUIVO):
+        """Thread em segundo plano que regrava o arquivo de métricas a cada `intervalo` s."""
+        def laco():
+            while True:
+                try:
+                    self.gravar_prometheus(caminho)
+                except OSError as e:
+                    print(f"[IA-CLOUD] ⚠️ Não foi possível gravar as métricas em {caminho}: {e}")
+                time.sleep(intervalo)
+        thread = threading.Thread(target=laco, daemon=True)
+        thread.start()
+        return thread
+
+    def servir_prometheus(self, porta, endereco=''):
+        """Endpoint HTTP /metrics numa thread em segundo plano. Devolve o servidor (servidor.shutdown() para)."""
+        telemetria = self
+
+        class Tratador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                corpo = telemetria.texto_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        servidor = ThreadingHTTPServer((endereco, porta), Tratador)
+        servidor.daemon_threads = True
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        print(f"[IA-CLOUD] 📊 Métricas do Prometheus em http://{endereco or '0.0.0.0'}:{servidor.server_port}/metrics")
+        return servidor
+
+
+# Telemetria única do processo
+telemetria = Telemetria(habilitada=os.environ.get('EQUILIBRAAI_TELEMETRIA', '1') != '0')
+
+
+def etapa(nome):
+    return telemetria.etapa(nome)
+
+
+def contar(nome, valor=1):
+    telemetria.contar(nome, valor)
+
+
+def iniciar_exportacao():
+    """Endpoint e/ou arquivo do Prometheus conforme EQUILIBRAAI_METRICAS_PORTA / _ARQUIVO (chamar uma vez)."""
+    porta = os.environ.get('EQUILIBRAAI_METRICAS_PORTA')
+    caminho = os.environ.get('EQUILIBRAAI_METRICAS_ARQUIVO')
+    servidor = telemetria.servir_prometheus(int(porta)) if porta else None
+    if caminho:
+        telemetria.gravar_periodicamente(caminho, float(os.environ.get('EQUILIBRAAI_METRICAS_INTERVALO',
+                                                                       INTERVALO_ARQUIVO)))
+    return servidor
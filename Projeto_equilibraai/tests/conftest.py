@@ -0,0 +1,42 @@
+#Fixtures compartilhadas pelos testes (rodam sem o AWS RDS e sem o BERT, a partir dos helpers dos benchmarks)
+import os
+import sys
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for pasta in (RAIZ, os.path.join(RAIZ, 'benchmarks')):
+    if pasta not in sys.path:
+        sys.path.insert(0, pasta)
+
+from comum import CodificadorSintetico, colaboradores_sinteticos
+from aspiracao import CacheEmbeddings, CarregadorModelo
+from motor_scores import MotorScores
+from store_embeddings import StoreEmbeddings
+
+
+@pytest.fixture
+def carregador():
+    return CarregadorModelo(fabrica=CodificadorSintetico)
+
+
+@pytest.fixture
+def scorer(carregador, tmp_path):
+    """Scorer de aspiração com o codificador sintético e cache temporário."""
+    scorer = carregador.obter()
+    scorer.cache = CacheEmbeddings(str(tmp_path / 'cache'))
+    return scorer
+
+
+@pytest.fixture
+def df():
+    return colaboradores_sinteticos(300, 40, seed=3)
+
+
+@pytest.fixture
+def novo_motor(scorer, tmp_path):
+    """Motor com store float32 em tmp_path (sem ANN, salvo pedido): aspiração igual à do scorer par-a-par."""
+    def criar(df, nome='asp', **kwargs):
+        kwargs.setdefault('usar_ann', False)
+        store = StoreEmbeddings(str(tmp_path / nome), dim=64, dtype='float32')
+        return MotorScores(df, aspiracao=scorer, store=store, **kwargs)
+    return criar
@@ -0,0 +1,56 @@
+#Mesma base sintética gravada no SQLite e no PostgreSQL: a montagem dos perfis tem de sair igual
+#O PostgreSQL vem das variáveis EQUILIBRAAI_DB_* (use um banco local); sem elas, o teste é pulado.
+import pandas as pd
+import pytest
+import dados_sinteticos
+from armazenamento import ArmazenamentoPostgres, ArmazenamentoSQLite
+
+SCHEMA = 'teste_armazenamento'
+N = 500
+
+
+@pytest.fixture
+def postgres():
+    psycopg2 = pytest.importorskip('psycopg2')
+    from pool_conexoes import ConfiguracaoAusente, configuracao_banco
+    try:
+        conn = psycopg2.connect(**configuracao_banco())
+    except (ConfiguracaoAusente, psycopg2.OperationalError) as e:
+        pytest.skip(f"PostgreSQL indisponível: {e}")
+    cur = conn.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}; SET search_path TO {SCHEMA}")
+    conn.commit()
+    yield conn
+    conn.rollback()
+    conn.cursor().execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    conn.commit()
+    conn.close()
+
+
+def montar(armazenamento, conn, ids=None):
+    df = armazenamento.montar_colaboradores(conn, ids)
+    return df.sort_values('id').reset_index(drop=True)
+
+
+def test_sqlite_e_postgres_montam_os_mesmos_perfis(tmp_path, postgres):
+    sqlite = ArmazenamentoSQLite(str(tmp_path / 'teste.db'))
+    conn = sqlite.abrir(criar=True)
+    contagem = dados_sinteticos.popular(sqlite, conn, N, seed=5)
+    esperado = montar(sqlite, conn)
+    conn.close()
+
+    # Uma faixa só: as consultas concorrentes usariam conexões do pool, fora do schema do teste
+    pg = ArmazenamentoPostgres(paralelas=1)
+    assert dados_sinteticos.popular(pg, postgres, N, seed=5) == contagem
+    obtido = montar(pg, postgres)
+
+    assert len(esperado) == N
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False)
+
+    # Montagem parcial (a da atualização incremental), pelos mesmos ids nos dois bancos
+    ids = esperado['id'].iloc[::7].tolist()
+    conn = sqlite.abrir()
+    parcial = montar(sqlite, conn, ids)
+    conn.close()
+    assert parcial['id'].tolist() == ids
+    pd.testing.assert_frame_equal(montar(pg, postgres, ids), parcial, check_dtype=False)
@@ -0,0 +1,59 @@
+#Cache em disco dos embeddings das descrições: gravação concorrente, erros de disco e limite de tamanho
+import os
+import threading
+import numpy as np
+from aspiracao import CacheEmbeddings
+
+
+def test_threads_gravando_a_mesma_chave(tmp_path):
+    cache = CacheEmbeddings(str(tmp_path))
+    chave = cache.chave('sintetico|64', "mesma descrição")
+    erros = []
+
+    def gravar(i):
+        try:
+            for _ in range(50):
+                cache.guardar(chave, np.full(64, i, dtype=np.float32))
+        except Exception as e:
+            erros.append(e)
+
+    threads = [threading.Thread(target=gravar, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not erros
+    assert cache.obter(chave).shape == (64,)
+    pasta = os.path.dirname(cache._caminho(chave))
+    assert os.listdir(pasta) == [chave + '.npy']     # nenhum temporário sobrando
+
+
+def test_erro_de_disco_nao_sobe(tmp_path):
+    cache = CacheEmbeddings(str(tmp_path))
+    chave = cache.chave('sintetico|64', "texto")
+    # Um arquivo no lugar da subpasta: a gravação falha, mas a busca segue sem cache
+    (tmp_path / chave[:2]).write_bytes(b'')
+    cache.guardar(chave, np.ones(64))
+    assert cache.obter(chave) is None
+
+
+def test_tamanho_limitado(tmp_path):
+    cache = CacheEmbeddings(str(tmp_path), max_itens=50)
+    (tmp_path / 'store').mkdir()
+    (tmp_path / 'store' / 'asp.npy').write_bytes(b'store')
+    chaves = [cache.chave('sintetico|64', f"tarefa {i}") for i in range(300)]
+    for i, chave in enumerate(chaves):
+        cache.guardar(chave, np.full(64, i, dtype=np.float32))
+        if i == 40:
+            os.utime(cache._caminho(chaves[0]), (2e9, 2e9))   # a 1ª foi usada agora: fica
+    assert len(cache._arquivos()) <= 50
+    assert cache.obter(chaves[-1])[0] == 299
+    assert cache.obter(chaves[0]) is not None
+    assert (tmp_path / 'store' / 'asp.npy').exists()
+
+
+def test_limite_zero_nao_grava(tmp_path):
+    cache = CacheEmbeddings(str(tmp_path), max_itens=0)
+    chave = cache.chave('sintetico|64', "texto")
+    cache.guardar(chave, np.ones(64))
+    assert cache.obter(chave) is None
@@ -0,0 +1,101 @@
+#Atualização incremental do motor (aplicar_alteracoes) contra o motor remontado do zero com a base nova
+import numpy as np
+import pandas as pd
+from comum import PESOS_PADRAO, TAREFA_PADRAO, colaboradores_sinteticos
+
+TAREFAS = [TAREFA_PADRAO, {**TAREFA_PADRAO, 'descricao': "Backend: APIs e microsserviços",
+                           'skills_hard_requeridas': ['Skill 2', 'Skill 9']}]
+
+
+def alteracoes(df, seed=7):
+    """(perfis alterados e novos, ids removidos, base completa depois das alterações)."""
+    rng = np.random.default_rng(seed)
+    alterados = df.sample(15, random_state=seed).copy()
+    alterados['carga_atual_percent'] = rng.integers(0, 100, len(alterados))
+    alterados['senioridade_peso'] = rng.choice([0.3, 0.6, 0.8, 1.0], len(alterados))
+    alterados['aspiracao_carreira'] = [f"Nova aspiração {i}" for i in range(len(alterados))]
+    # Só skills que já existem na base, para o vocabulário ser o mesmo nos dois motores
+    alterados['skills_hard_ids'] = [sorted(rng.choice(np.arange(1, 21), 3, replace=False).tolist())
+                                    for _ in range(len(alterados))]
+    alterados['skills_hard'] = [[f'Skill {s}' for s in l] for l in alterados['skills_hard_ids']]
+    novos = colaboradores_sinteticos(10, 20, seed=seed)
+    novos['id'] += df['id'].max()
+    novos['nome'] = [f'Colaborador novo {i}' for i in novos['id']]
+    removidos = df.loc[~df['id'].isin(alterados['id']), 'id'].sample(8, random_state=seed).tolist()
+    perfis = pd.concat([alterados, novos], ignore_index=True)
+    base = pd.concat([df[~df['id'].isin(perfis['id']) & ~df['id'].isin(removidos)], perfis])
+    return perfis, removidos, base.sort_values('id').reset_index(drop=True)
+
+
+def test_incremental_igual_recarga_completa(df, novo_motor):
+    antigo = novo_motor(df, 'incremental')
+    antes = [antigo.recomendar(t, PESOS_PADRAO, completo=True) for t in TAREFAS]
+    perfis, removidos, base = alteracoes(df)
+
+    motor = antigo.copia()
+    resumo = motor.aplicar_alteracoes(perfis, removidos)
+    assert resumo == {'alterados': 15, 'novos': 10, 'removidos': 8}
+    completo = novo_motor(base, 'completo')
+    assert len(motor) == len(completo) == len(base)
+    for tarefa in TAREFAS:
+        esperado = completo.recomendar(tarefa, PESOS_PADRAO, completo=True)
+        obtido = motor.recomendar(tarefa, PESOS_PADRAO, completo=True)
+        assert obtido['Nome'].tolist() == esperado['Nome'].tolist()
+        np.testing.assert_allclose(obtido['Score Final'].to_numpy(float), esperado['Score Final'].to_numpy(float),
+                                   atol=1e-9)
+
+    # O motor original (que outras sessões podem estar segurando) não muda
+    assert len(antigo) == len(df)
+    for tarefa, ranking in zip(TAREFAS, antes):
+        pd.testing.assert_frame_equal(antigo.recomendar(tarefa, PESOS_PADRAO, completo=True), ranking)
+
+
+def test_ouvinte_so_com_changelog_e_configuracao(tmp_path, monkeypatch):
+    from armazenamento import ArmazenamentoPostgres, ArmazenamentoSQLite
+    from atualizacao_incremental import OuvinteInativo, criar_ouvinte
+    assert isinstance(criar_ouvinte(ArmazenamentoSQLite(str(tmp_path / 'x.db'))), OuvinteInativo)
+    monkeypatch.delenv('EQUILIBRAAI_DB_HOST', raising=False)
+    ouvinte = criar_ouvinte(ArmazenamentoPostgres())
+    assert isinstance(ouvinte, OuvinteInativo) and ouvinte.pendentes == 0 and ouvinte.zerar() == 0
+
+
+def test_ouvinte_desiste_com_configuracao_invalida():
+    from atualizacao_incremental import OuvinteAlteracoes
+    from pool_conexoes import ConfiguracaoAusente
+    tentativas = []
+
+    def fabrica():
+        tentativas.append(1)
+        raise ConfiguracaoAusente("sem EQUILIBRAAI_DB_HOST")
+
+    ouvinte = OuvinteAlteracoes(fabrica).iniciar()
+    ouvinte._thread.join(2.0)
+    assert not ouvinte._thread.is_alive() and len(tentativas) == 1
+
+
+def test_store_compactado_nao_cresce(df, novo_motor, tmp_path):
+    from store_embeddings import CAPACIDADE_INICIAL, StoreEmbeddings
+    antigo = novo_motor(df, 'compacta')
+    antes = antigo.recomendar(TAREFA_PADRAO, PESOS_PADRAO, completo=True)
+    motor, base = antigo, df
+    for rodada in range(12):
+        base = base.assign(aspiracao_carreira=[f"Aspiração {rodada}-{i}" for i in range(len(base))])
+        motor = motor.copia()
+        motor.aplicar_alteracoes(base, [])
+        motor.recomendar(TAREFA_PADRAO, PESOS_PADRAO)
+        # Cada rodada regrava todas as aspirações; sem compactação o store teria 13 x 300 linhas
+        assert len(motor.store) == len(df)
+        assert motor.store.n <= CAPACIDADE_INICIAL + len(df) and motor.store.capacidade <= 2 * CAPACIDADE_INICIAL
+    assert motor.store.geracao > 0
+    assert len(list(tmp_path.glob('compacta*.vetores.npy'))) == 1
+
+    completo = novo_motor(base, 'completo').recomendar(TAREFA_PADRAO, PESOS_PADRAO, completo=True)
+    obtido = motor.recomendar(TAREFA_PADRAO, PESOS_PADRAO, completo=True)
+    np.testing.assert_allclose(obtido['Score Final'].to_numpy(float), completo['Score Final'].to_numpy(float),
+                               atol=1e-9)
+    # O motor de antes das compactações segue lendo os arquivos já mapeados
+    pd.testing.assert_frame_equal(antigo.recomendar(TAREFA_PADRAO, PESOS_PADRAO, completo=True), antes)
+    # E quem reabre o store enxerga a geração compactada
+    reaberto = StoreEmbeddings(str(tmp_path / 'compacta'))
+    assert reaberto.geracao == motor.store.geracao and len(reaberto) == len(df)
+    np.testing.assert_array_equal(reaberto.vetor(int(df['id'].iloc[0])), motor.store.vetor(int(df['id'].iloc[0])))
@@ -0,0 +1,49 @@
+#ComponentesTarefa (a matriz da demanda que o app guarda na sessão) com o modelo de aspiração ainda carregando
+import threading
+import time
+import numpy as np
+from comum import PESOS_PADRAO, TAREFA_PADRAO, CodificadorSintetico
+from aspiracao import CacheEmbeddings, CarregadorModelo
+from motor_scores import MotorScores
+from store_embeddings import StoreEmbeddings
+
+
+def test_primeira_busca_nao_espera_o_modelo(df, novo_motor, tmp_path):
+    liberar = threading.Event()
+
+    def fabrica():
+        # Simula o BERT demorando a carregar
+        liberar.wait(30)
+        return CodificadorSintetico()
+
+    carregador = CarregadorModelo(fabrica=fabrica)
+    motor = MotorScores(df, aspiracao=carregador, usar_ann=False,
+                        store=StoreEmbeddings(str(tmp_path / 'lento'), dim=64, dtype='float32'))
+    try:
+        inicio = time.perf_counter()
+        componentes = motor.componentes_tarefa(TAREFA_PADRAO)
+        topo = componentes.reclassificar(PESOS_PADRAO, k=10)
+        assert time.perf_counter() - inicio < 5
+        assert carregador.estado == 'carregando' and not componentes.com_aspiracao
+        assert len(topo) == 10 and (topo['Aspiração'] == 0).all()
+        np.testing.assert_array_equal(componentes.matriz[:, 4], 0)
+    finally:
+        liberar.set()
+
+    carregador.obter().cache = CacheEmbeddings(str(tmp_path / 'cache'))
+    # Peso de aspiração zerado não precisa dela: continua pendente
+    componentes.reclassificar({**PESOS_PADRAO, 'asp': 0.0}, k=10)
+    assert not componentes.com_aspiracao
+    # Com o modelo pronto e peso > 0, a coluna é preenchida e o ranking fica igual ao do motor completo
+    topo = componentes.reclassificar(PESOS_PADRAO, k=10)
+    assert componentes.com_aspiracao
+    esperado = novo_motor(df).recomendar(TAREFA_PADRAO, PESOS_PADRAO, k=10)
+    np.testing.assert_allclose(topo['Score Final'].to_numpy(float), esperado['Score Final'].to_numpy(float),
+                               atol=1e-5)
+    np.testing.assert_allclose(np.sort(topo['Aspiração'].to_numpy(float)),
+                               np.sort(esperado['Aspiração'].to_numpy(float)), atol=1e-5)
+
+
+def test_componentes_com_modelo_pronto_ja_tem_aspiracao(df, carregador, scorer, novo_motor):
+    componentes = MotorScores(df, aspiracao=carregador, store=novo_motor(df).store).componentes_tarefa(TAREFA_PADRAO)
+    assert componentes.com_aspiracao and np.abs(componentes.matriz[:, 4]).max() > 0
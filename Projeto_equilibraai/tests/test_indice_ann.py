@@ -0,0 +1,44 @@
+#Aspiração via índice IVF: shortlist inteira igual ao cosseno exato, quem fica fora da shortlist e índice vazio
+import numpy as np
+from indice_ann import IndiceIVF
+from store_embeddings import StoreEmbeddings
+
+DESCRICAO = "Modelo de machine learning para churn"
+
+
+def test_ann_com_shortlist_inteira_igual_exato(df, novo_motor):
+    exato = novo_motor(df, 'exato')
+    ann = novo_motor(df, 'ann', usar_ann=True, shortlist_asp=len(df), n_sondas=10**6)
+    np.testing.assert_allclose(ann.score_aspiracao(DESCRICAO), exato.score_aspiracao(DESCRICAO), atol=1e-6)
+
+
+def test_ann_fora_da_shortlist_abaixo_dos_avaliados(df, novo_motor):
+    exato = novo_motor(df, 'exato').score_aspiracao(DESCRICAO)
+    # Shortlist = as 2 listas sondadas inteiras, com cossenos negativos entre os avaliados
+    motor = novo_motor(df, 'ann', usar_ann=True, shortlist_asp=len(df), n_sondas=2)
+    asp = motor.score_aspiracao(DESCRICAO)
+    linhas, sims = motor.indice_asp.buscar(motor.vetor_aspiracao(DESCRICAO)[1], len(df))
+    avaliados = np.flatnonzero(np.isin(motor._linhas_store, linhas))
+    assert 0 < len(avaliados) < len(df)
+    # Na shortlist, o cosseno exato (inclusive os negativos)
+    np.testing.assert_allclose(asp[avaliados], exato[avaliados], atol=1e-6)
+    assert sims.min() < 0
+    # Fora dela, o menor cosseno avaliado (limitado a 0): ninguém avaliado fica abaixo de quem não foi
+    fora = np.setdiff1d(np.arange(len(df)), avaliados)
+    assert np.all(asp[fora] == min(sims.min(), 0.0))
+    assert asp[avaliados].min() >= asp[fora].max() - 1e-6
+
+
+def test_ann_shortlist_positiva_nao_infla_quem_ficou_fora(df, novo_motor):
+    motor = novo_motor(df, 'ann', usar_ann=True, shortlist_asp=5, n_sondas=1)
+    asp = motor.score_aspiracao(DESCRICAO)
+    linhas, sims = motor.indice_asp.buscar(motor.vetor_aspiracao(DESCRICAO)[1], 5)
+    assert sims.min() > 0
+    fora = ~np.isin(motor._linhas_store, linhas)
+    assert np.all(asp[fora] == 0.0)
+
+
+def test_ivf_vazio_devolve_shortlist_vazia(tmp_path):
+    indice = IndiceIVF(StoreEmbeddings(str(tmp_path / 'vazio'), dim=64, dtype='float32')).treinar([])
+    linhas, sims = indice.buscar(np.ones(64, dtype=np.float32), 10)
+    assert len(linhas) == 0 and len(sims) == 0
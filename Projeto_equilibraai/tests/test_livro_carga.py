@@ -0,0 +1,68 @@
+#Livro de carga: expiração da janela móvel e carga de exemplo quando o livro não está no banco
+import numpy as np
+import pytest
+from livro_carga import LivroCarga, carga_exemplo
+
+
+@pytest.fixture
+def relogio():
+    return [1000.0]
+
+
+@pytest.fixture
+def livro(relogio):
+    return LivroCarga(janela=100, relogio=lambda: relogio[0])
+
+
+def test_atribuir_e_concluir(livro):
+    livro.atribuir([1, 2, 1], [40.0, 25.0, 10.0])
+    livro.concluir([1], [40.0])
+    np.testing.assert_allclose(livro.carga_percent([1, 2, 3]), [10.0, 25.0, 0.0])
+    ag = livro.agregados([1, 2]).set_index('colaborador_id')
+    assert ag.loc[1, 'tarefas_abertas'] == 1 and ag.loc[2, 'tarefas_abertas'] == 1
+    assert ag.loc[1, 'tarefas_atribuidas'] == 2 and ag.loc[1, 'tarefas_concluidas'] == 1
+    assert ag.loc[1, 'carga_atribuida'] == 50.0
+
+
+def test_eventos_saem_da_janela(livro, relogio):
+    livro.atribuir([1, 2], [40.0, 25.0])
+    relogio[0] = 1050.0
+    livro.concluir([1], [40.0])
+    relogio[0] = 1110.0
+    ag = livro.agregados([1, 2]).set_index('colaborador_id')
+    # As atribuições (t=1000) saíram da janela de 100 s; a conclusão (t=1050) e a carga atual ficam
+    assert ag['tarefas_atribuidas'].tolist() == [0, 0]
+    assert ag['carga_atribuida'].tolist() == [0.0, 0.0]
+    assert ag['tarefas_concluidas'].tolist() == [1, 0]
+    assert ag['carga_atual_percent'].tolist() == [0.0, 25.0]
+    relogio[0] = 1200.0
+    ag = livro.agregados([1, 2])
+    assert ag['tarefas_concluidas'].sum() == 0 and ag['carga_atual_percent'].tolist() == [0.0, 25.0]
+
+
+class SemLivro:
+    """Armazenamento de um banco sem a migração do livro de carga."""
+
+    def livro_instalado(self, conn):
+        return False
+
+
+def test_sem_livro_usa_carga_de_exemplo(livro):
+    livro.carregar(SemLivro(), None, ids=[1, 2, 3])
+    carga = livro.carga_percent([1, 2, 3])
+    assert np.all((carga >= 20) & (carga < 90))
+    # Recarga sem o livro: quem já tinha carga mantém, só o id novo recebe uma de exemplo
+    livro.atribuir([2], [5.0])
+    livro.recarregar(SemLivro(), None, [2, 4])
+    np.testing.assert_array_equal(livro.carga_percent([1, 2, 3]), carga + [0.0, 5.0, 0.0])
+    assert 20 <= livro.carga_percent([4])[0] < 90
+
+
+def test_carga_de_exemplo_estavel_entre_recargas(livro):
+    # Derivada do id: a mesma a cada carga completa (e independente da ordem e de quem mais está na base)
+    livro.carregar(SemLivro(), None, ids=np.arange(1, 1001))
+    primeira = livro.carga_percent(np.arange(1, 1001))
+    livro.carregar(SemLivro(), None, ids=np.arange(1000, 0, -1))
+    np.testing.assert_array_equal(livro.carga_percent(np.arange(1, 1001)), primeira)
+    np.testing.assert_array_equal(carga_exemplo([7, 3]), primeira[[6, 2]])
+    assert len(np.unique(primeira)) > 50
@@ -0,0 +1,59 @@
+#Motor vetorizado contra o recomendar_referencia (loop por colaborador), no ranking completo e no top-k
+import numpy as np
+import pandas as pd
+import pytest
+from comum import PESOS_PADRAO, TAREFA_PADRAO, conferir_ranking
+import ia_core_aws
+from motor_scores import indices_top_k, ordenar
+
+TAREFAS = [
+    TAREFA_PADRAO,
+    {**TAREFA_PADRAO, 'descricao': "Modelo de machine learning para churn", 'senioridade_peso_requerido': 0.6,
+     'skills_hard_requeridas': ['Skill 1', 'Skill 7', 'Skill 30']},
+    {**TAREFA_PADRAO, 'descricao': "", 'senioridade_peso_requerido': 1.0, 'skills_hard_requeridas': ['Skill 12']},
+]
+PESOS = [PESOS_PADRAO, {'hard': 0.25, 'soft': 0.1, 'sen': 0.15, 'carga': 0.2, 'asp': 0.3},
+         {'hard': 0.0, 'soft': 0.0, 'sen': 0.5, 'carga': 0.5, 'asp': 0.0}]
+
+
+@pytest.fixture
+def referencia(carregador, scorer, monkeypatch):
+    """recomendar_referencia usando o mesmo scorer sintético do motor."""
+    monkeypatch.setattr(ia_core_aws, 'carregador_modelo', carregador)
+    return ia_core_aws.recomendar_referencia
+
+
+@pytest.mark.parametrize('tarefa', TAREFAS)
+@pytest.mark.parametrize('pesos', PESOS)
+def test_motor_reproduz_referencia(df, novo_motor, referencia, tarefa, pesos):
+    motor = novo_motor(df)
+    ref = referencia(tarefa, df, pesos)
+    if pesos['asp'] == 0:
+        # Com peso 0 o motor nem calcula a aspiração (a coluna vem zerada); o Score Final não muda
+        ref['Aspiração'] = 0.0
+    completo = conferir_ranking(ref, motor.recomendar(tarefa, pesos, completo=True))
+    assert completo['ok'] and completo['mesma_ordem'] and completo['linhas'] == len(df)
+    topo = conferir_ranking(ref, motor.recomendar(tarefa, pesos, k=10))
+    assert topo['ok'] and topo['mesma_ordem'] and topo['linhas'] == 10
+
+
+@pytest.mark.parametrize('pesos', PESOS)
+def test_empates_na_mesma_ordem(df, novo_motor, referencia, pesos):
+    # Perfis repetidos (outros ids, mesmos dados): empates exatos, resolvidos pela ordem das linhas
+    copias = df.sample(60, random_state=1).assign(id=lambda d: d['id'] + 10000)
+    base = pd.concat([df, copias]).sample(frac=1, random_state=2).reset_index(drop=True)
+    motor = novo_motor(base)
+    for tarefa in TAREFAS:
+        ref = referencia(tarefa, base, pesos)
+        if pesos['asp'] == 0:
+            ref['Aspiração'] = 0.0
+        assert list(motor.recomendar(tarefa, pesos, completo=True).index) == list(ref.index)
+        assert list(motor.recomendar(tarefa, pesos, k=25).index) == list(ref.index[:25])
+
+
+def test_ruido_da_soma_conta_como_empate():
+    # 0.3 calculado de três jeitos (diferem em ~1e-16): empate, resolvido pela ordem das linhas
+    scores = np.array([0.3, 0.1 + 0.2, 0.7 - 0.4, 0.9, 0.3 - 1e-6])
+    assert ordenar(scores).tolist() == [3, 0, 1, 2, 4]
+    assert indices_top_k(scores, 3).tolist() == [3, 0, 1]
+    assert indices_top_k(scores[::-1], 2).tolist() == [1, 2]
@@ -0,0 +1,37 @@
+#Top-k por seleção parcial e top-k podado pelo índice invertido, contra o ranking completo
+import numpy as np
+import pytest
+from comum import COLUNAS_SCORE, PESOS_PADRAO, TAREFA_PADRAO
+
+TAREFAS = [
+    TAREFA_PADRAO,
+    {**TAREFA_PADRAO, 'descricao': "Modelo de machine learning para churn", 'senioridade_peso_requerido': 0.6,
+     'skills_hard_requeridas': ['Skill 1', 'Skill 7', 'Skill 30']},
+    {**TAREFA_PADRAO, 'descricao': "", 'senioridade_peso_requerido': 1.0, 'skills_hard_requeridas': ['Skill 12']},
+]
+PESOS = [PESOS_PADRAO, {'hard': 0.25, 'soft': 0.1, 'sen': 0.15, 'carga': 0.2, 'asp': 0.3},
+         {'hard': 0.0, 'soft': 0.0, 'sen': 0.5, 'carga': 0.5, 'asp': 0.0}]
+
+
+def conferir(obtido, esperado):
+    assert list(obtido.index) == list(esperado.index)
+    np.testing.assert_allclose(obtido[COLUNAS_SCORE].to_numpy(float), esperado[COLUNAS_SCORE].to_numpy(float))
+
+
+@pytest.mark.parametrize('tarefa', TAREFAS)
+@pytest.mark.parametrize('pesos', PESOS)
+@pytest.mark.parametrize('k', [1, 10, 50])
+def test_top_k_igual_inicio_do_ranking_completo(df, novo_motor, tarefa, pesos, k):
+    motor = novo_motor(df)
+    completo = motor.recomendar(tarefa, pesos, completo=True)
+    conferir(motor.recomendar(tarefa, pesos, k=k, podar=False), completo.head(k))
+
+
+@pytest.mark.parametrize('tarefa', TAREFAS)
+@pytest.mark.parametrize('pesos', PESOS)
+@pytest.mark.parametrize('k', [1, 10, 50])
+def test_poda_igual_sem_poda(df, novo_motor, tarefa, pesos, k):
+    motor = novo_motor(df)
+    podado = motor.recomendar(tarefa, pesos, k=k)
+    assert motor.avaliados <= len(df)
+    conferir(podado, motor.recomendar(tarefa, pesos, k=k, podar=False))
@@ -0,0 +1,125 @@
+#Vocabulário fixo de skills: mapeia skill_id -> índice de coluna de forma estável
+#Substitui a tokenização de texto (CountVectorizer) que quebrava "Spring Boot", ".NET Core" e descartava "C#"
+import json
+import numpy as np
+
+QUERY_SKILLS = """
+SELECT s.skill_id, s.nome, cat.tipo
+FROM skill s
+JOIN categoria_skill cat ON s.categoria_id = cat.categoria_id
+ORDER BY s.skill_id
+"""
+
+
+class VocabularioSkills:
+    """
+    Vocabulário persistente construído a partir da tabela `skill`.
+    As colunas seguem a ordem de inserção (skill_id crescente na carga inicial) e
+    novas skills entram sempre no final, então um índice nunca muda de significado.
+    """
+
+    def __init__(self):
+        self.ids = []          # coluna -> skill_id
+        self.nomes = []        # coluna -> nome
+        self.tipos = []        # coluna -> 'hard_skill' / 'soft_skill'
+        self.coluna = {}       # skill_id -> coluna
+        self.id_por_nome = {}  # nome -> skill_id
+        self._lookup = np.full(1, -1, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def adicionar(self, skill_id, nome, tipo):
+        """Inclui uma skill no final do vocabulário (ou atualiza nome/tipo se já existir)."""
+        skill_id = int(skill_id)
+        col = self.coluna.get(skill_id)
+        if col is None:
+            col = len(self.ids)
+            self.ids.append(skill_id)
+            self.nomes.append(nome)
+            self.tipos.append(tipo)
+            self.coluna[skill_id] = col
+            if skill_id >= len(self._lookup):
+                novo = np.full(max(skill_id + 1, 2 * len(self._lookup)), -1, dtype=np.int32)
+                novo[:len(self._lookup)] = self._lookup
+                self._lookup = novo
+            self._lookup[skill_id] = col
+        else:
+            self.id_por_nome.pop(self.nomes[col], None)
+            self.nomes[col] = nome
+            self.tipos[col] = tipo
+        self.id_por_nome[nome] = skill_id
+        return col
+
+    # Construção
+
+    @classmethod
+    def do_banco(cls, conn):
+        """Carrega o vocabulário direto da tabela skill (+ categoria para o tipo)."""
+        vocab = cls()
+        cur = conn.cursor()
+        cur.execute(QUERY_SKILLS)
+        for skill_id, nome, tipo in cur.fetchall():
+            vocab.adicionar(skill_id, nome, tipo)
+        cur.close()
+        return vocab
+
+    @classmethod
+    def do_dataframe(cls, df):
+        """Fallback: monta o vocabulário a partir das skills presentes no DataFrame de colaboradores."""
+        pares = {}
+        for tipo, col_ids, col_nomes in (('hard_skill', 'skills_hard_ids', 'skills_hard'),
+                                         ('soft_skill', 'skills_soft_ids', 'skills_soft')):
+            for ids, nomes in zip(df[col_ids], df[col_nomes]):
+                for sid, nome in zip(ids, nomes):
+                    pares[int(sid)] = (nome, tipo)
+        vocab = cls()
+        for sid in sorted(pares):
+            vocab.adicionar(sid, *pares[sid])
+        return vocab
+
+    def salvar(self, caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'ids': self.ids, 'nomes': self.nomes, 'tipos': self.tipos}, f, ensure_ascii=False)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        vocab = cls()
+        for sid, nome, tipo in zip(dados['ids'], dados['nomes'], dados['tipos']):
+            vocab.adicionar(sid, nome, tipo)
+        return vocab
+
+    # Codificação
+
+    def colunas(self, skill_ids):
+        """Converte um array de skill_ids em índices de coluna (-1 para ids desconhecidos)."""
+        ids = np.asarray(skill_ids, dtype=np.int64)
+        cols = np.full(ids.shape, -1, dtype=np.int32)
+        validos = (ids >= 0) & (ids < len(self._lookup))
+        cols[validos] = self._lookup[ids[validos]]
+        return cols
+
+    def codificar(self, skills):
+        """
+        Codifica uma lista de skills (nomes ou skill_ids) em índices de coluna únicos.
+        Retorna (colunas, n_total): n_total conta também as skills fora do vocabulário,
+        que ninguém possui mas continuam fazendo parte do requisito.
+        """
+        ids = set()
+        desconhecidas = set()
+        for s in skills or []:
+            sid = s if isinstance(s, (int, np.integer)) else self.id_por_nome.get(s)
+            if sid is None or int(sid) not in self.coluna:
+                desconhecidas.add(s)
+            else:
+                ids.add(int(sid))
+        cols = np.sort(self.colunas(list(ids))).astype(np.int32)
+        return cols, len(cols) + len(desconhecidas)
+
+    def codificar_tarefa(self, tarefa):
+        """Codifica os requisitos de uma tarefa uma única vez: ((cols_hard, n_hard), (cols_soft, n_soft))."""
+        hard = tarefa.get('skills_hard_ids', tarefa.get('skills_hard_requeridas'))
+        soft = tarefa.get('skills_soft_ids', tarefa.get('skills_soft_requeridas'))
+        return self.codificar(hard), self.codificar(soft)